@@ -0,0 +1,83 @@
+"""
+bench_backfill.py - Throughput Benchmark for the Legacy Log Backfill.
+
+Generates a synthetic corpus of legacy `.log` files in a temporary directory
+and times `backfill()` with a single in-process worker and with a process pool.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m benchmarks.bench_backfill --files 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+from src.core.watcher.logging import format_champion_select
+from src.history.legacy import backfill
+from src.utils.converter import load_champion_mapping
+
+
+def make_pool(rng, names):
+    """Build a random evaluated pool with the attributes the log formatter reads."""
+    cids = rng.sample(sorted(names), 5 + rng.randint(0, 10))
+    champs = [
+        SimpleNamespace(
+            cid=cid,
+            meta=SimpleNamespace(name=names[cid]),
+            score=rng.uniform(-80, 80),
+            norm_gain=rng.uniform(-80, 80),
+            norm_wr=rng.uniform(-80, 80),
+            raw_wr=rng.uniform(45, 58),
+        )
+        for cid in cids
+    ]
+    return SimpleNamespace(team=champs[:5], bench=champs[5:], player=champs[0])
+
+
+def generate_corpus(root, files, seed=0):
+    """Write `files` synthetic legacy logs under `root/<version>/`."""
+    rng = random.Random(seed)
+    names = load_champion_mapping()
+    version_dir = root / "0.1.0"
+    version_dir.mkdir(parents=True)
+    start = datetime(2025, 3, 22)
+    for i in range(files):
+        now = start + timedelta(seconds=i)
+        path = version_dir / f"champion_select_{now.strftime('%Y-%m-%d_%H-%M-%S')}.log"
+        path.write_text(format_champion_select(make_pool(rng, names), now))
+
+
+def main():
+    """Generate the corpus and report backfill throughput per worker count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        t0 = time.perf_counter()
+        generate_corpus(root / "logs", args.files)
+        print(f"generated {args.files} files in {time.perf_counter() - t0:.1f}s")
+
+        for workers in sorted({1, args.workers}):
+            t0 = time.perf_counter()
+            stats = backfill(root / "logs", root / "out.jsonl", workers=workers)
+            elapsed = time.perf_counter() - t0
+            print(
+                f"workers={workers:<3} records={stats['records']:<7} "
+                f"{elapsed:6.2f}s  {stats['files'] / elapsed:10.0f} files/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+bench_batch.py - Core Scaling Benchmark for Batch Evaluation.
+
+Generates seeded synthetic lobbies, scores them with `run_batch` at several
+worker counts and reports lobbies per second and the speed-up over one
+worker.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m benchmarks.bench_batch --lobbies 20000 --workers 1 2 4 8
+"""
+
+import argparse
+import io
+import json
+import os
+
+from src.core.batch import run_batch
+from src.utils.synthetic import LobbyGenerator
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Batch evaluation scaling benchmark.")
+    parser.add_argument("--lobbies", type=int, default=20000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--format", default="jsonl")
+    args = parser.parse_args()
+
+    lines = [json.dumps(g) for g in LobbyGenerator().lobbies(args.lobbies)]
+    print(f"{args.lobbies} lobbies, {os.cpu_count()} CPUs\n")
+    baseline = None
+    for workers in sorted(set(args.workers)):
+        stats = run_batch(lines, io.StringIO(), args.format, workers, args.chunk_size)
+        rate = stats["lobbies"] / stats["seconds"]
+        baseline = baseline or rate
+        print(
+            f"workers={workers:<3} {rate:>9.0f} lobbies/s   "
+            f"speed-up {rate / baseline:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+bench_codec.py - Compression and Throughput Benchmark for the Snapshot Codec.
+
+Encodes sessions built from the real `lobby_clean.json` fixture (replayed with
+bench rerolls and swaps) and fully synthetic sessions, then reports the
+compression ratio against compact JSON and gzip'd JSON, and encode/decode
+throughput.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m benchmarks.bench_codec --sessions 2000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import time
+
+from src.history.codec import decode_snapshots, encode_snapshots
+from src.utils import paths
+from src.utils.converter import load_champion_mapping
+
+
+def churn_session(rng, team, bench, player, pool, length):
+    """Replay a lobby with one bench change (reroll, trade or swap) per poll."""
+    team, bench = list(team), list(bench)
+    snapshots = []
+    for i in range(length):
+        if rng.random() < 0.3 and bench:
+            j = rng.randrange(len(bench))
+            if rng.random() < 0.5 and len(bench) < 10:
+                bench.append(rng.choice(pool))
+            else:
+                k = rng.randrange(len(bench))
+                bench[j], bench[k] = bench[k], bench[j]
+        snapshots.append((team[:], bench[:], player, i * 1000))
+    return snapshots
+
+
+def main():
+    """Report codec size and speed on fixture-based and synthetic sessions."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--length", type=int, default=60)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pool = [int(cid) for cid in load_champion_mapping()]
+    with open(paths.BASE_DIR / "tests" / "fixtures" / "lobby_clean.json") as f:
+        real = json.load(f)
+
+    corpora = {
+        "fixture": [
+            churn_session(
+                rng, real["team"], real["bench"], real["player"][0], pool, args.length
+            )
+            for _ in range(args.sessions)
+        ],
+        "synthetic": [],
+    }
+    for _ in range(args.sessions):
+        lobby = rng.sample(pool, 5 + rng.randint(0, 10))
+        corpora["synthetic"].append(
+            churn_session(rng, lobby[:5], lobby[5:], lobby[0], pool, args.length)
+        )
+
+    for name, sessions in corpora.items():
+        frames = sum(len(s) for s in sessions)
+        as_json = "\n".join(
+            json.dumps({"team": t, "bench": b, "player": p}, separators=(",", ":"))
+            for s in sessions
+            for t, b, p, _ in s
+        ).encode()
+
+        t0 = time.perf_counter()
+        encoded = [encode_snapshots(s) for s in sessions]
+        encode_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for data in encoded:
+            decode_snapshots(data)
+        decode_s = time.perf_counter() - t0
+
+        size = sum(len(e) for e in encoded)
+        print(
+            f"{name:<10} frames={frames} codec={size / frames:5.1f} B/frame "
+            f"json={len(as_json) / frames:5.1f} B/frame "
+            f"json.gz={len(gzip.compress(as_json)) / frames:5.1f} B/frame "
+            f"ratio={len(as_json) / size:4.1f}x "
+            f"encode={frames / encode_s:,.0f}/s decode={frames / decode_s:,.0f}/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+bench_daemon.py - Throughput and Latency Benchmark for the Evaluation Daemon.
+
+Compares three ways of scoring a lobby:
+
+    cold:   `Evaluator(grouped).evaluate()` in-process (reads the assets per call)
+    warm:   `WarmEvaluator.evaluate(grouped)` in-process (no I/O, no socket)
+    daemon: `DaemonClient.evaluate(grouped)` from N concurrent client threads
+
+and reports requests per second with p50/p99 latency for each.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m benchmarks.bench_daemon --requests 2000 --clients 1 4 16
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.core.daemon.client import DaemonClient
+from src.core.daemon.protocol import HAS_UNIX_SOCKETS
+from src.core.daemon.server import EvaluationDaemon, WarmEvaluator
+from src.core.evaluator import Evaluator
+
+GROUPED = {
+    "team": [136, 64, 54, 875, 498],
+    "bench": [203, 517, 86, 245, 141, 893],
+    "player": [498],
+}
+
+
+def percentile(values, q):
+    """Return the value at the q-th percentile, with q between 0 and 100."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def report(label, latencies, elapsed):
+    """Print throughput and latency percentiles for one configuration."""
+    print(
+        f"{label:<24} {len(latencies) / elapsed:>9.0f} req/s   "
+        f"p50 {percentile(latencies, 50) * 1000:>7.3f} ms   "
+        f"p99 {percentile(latencies, 99) * 1000:>7.3f} ms"
+    )
+
+
+def bench_in_process(label, evaluate, requests):
+    """Time sequential in-process evaluations."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(requests):
+        t = time.perf_counter()
+        evaluate(GROUPED)
+        latencies.append(time.perf_counter() - t)
+    report(label, latencies, time.perf_counter() - start)
+
+
+def bench_daemon(address, clients, requests):
+    """Time `requests` evaluations spread over concurrent daemon clients."""
+    per_client = max(1, requests // clients)
+    connections = [DaemonClient(address) for _ in range(clients)]
+    latencies = [[] for _ in range(clients)]
+    barrier = threading.Barrier(clients + 1)
+
+    def run(i):
+        barrier.wait()
+        for _ in range(per_client):
+            t = time.perf_counter()
+            connections[i].evaluate(GROUPED)
+            latencies[i].append(time.perf_counter() - t)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        connection.close()
+    report(f"daemon x{clients}", [x for lat in latencies for x in lat], elapsed)
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Evaluation daemon benchmark.")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--max-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    bench_in_process("cold in-process", lambda g: Evaluator(g).evaluate(), 200)
+    warm = WarmEvaluator()
+    bench_in_process("warm in-process", warm.evaluate, args.requests)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        address = Path(tmp) / "bench.sock" if HAS_UNIX_SOCKETS else ("127.0.0.1", 0)
+        daemon = EvaluationDaemon(address, max_delay=args.max_delay).start()
+        try:
+            for clients in args.clients:
+                bench_daemon(daemon.address, clients, args.requests)
+            stats = DaemonClient(daemon.address).ping()
+            print(
+                f"\n{stats['requests']} requests in {stats['batches']} batches "
+                f"({stats['requests'] / stats['batches']:.1f} per batch)"
+            )
+        finally:
+            daemon.close()
+
+
+if __name__ == "__main__":
+    main()
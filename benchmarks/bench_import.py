@@ -0,0 +1,76 @@
+"""
+bench_import.py - Cold-Start Import Time Benchmark for the Entry Point.
+
+Imports a module in fresh interpreters with `python -X importtime` and reports
+the median cumulative import time plus the modules with the largest self and
+cumulative times, to spot anything heavy creeping back onto the start-up path.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m benchmarks.bench_import --module src.main --runs 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr (str): Interpreter stderr captured with `-X importtime`.
+
+    Returns:
+        dict[str, tuple[int, int]]: Module name to `(self_us, cumulative_us)`.
+    """
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.partition(":")[2].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module):
+    """Import `module` in a fresh interpreter and return its parsed timings."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def main():
+    """Run the benchmark and print a summary."""
+    parser = argparse.ArgumentParser(description="Entry point import time benchmark.")
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.runs)]
+    totals = [timings[args.module][1] / 1000 for timings in runs]
+    print(
+        f"{args.module}: median {statistics.median(totals):.1f} ms, "
+        f"min {min(totals):.1f} ms over {args.runs} runs"
+    )
+
+    last = runs[-1]
+    for label, key in (("self", 0), ("cumulative", 1)):
+        print(f"\nTop {args.top} modules by {label} time:")
+        ranked = sorted(last.items(), key=lambda kv: -kv[1][key])
+        for name, timing in ranked[: args.top]:
+            print(f"  {timing[key] / 1000:>8.2f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
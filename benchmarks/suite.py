@@ -0,0 +1,570 @@
+"""
+suite.py - Benchmark Suite with Per-Commit Baselines and Regression Checks.
+
+Times every hot path of the evaluation pipeline at a realistic size (one
+lobby, the real assets) and a stressed size (full benches, many lobbies),
+stores the samples as a JSON baseline named after the current commit, and
+compares two baselines with a Mann-Whitney U test so that only statistically
+significant changes are flagged.
+
+Each case is timed as `SAMPLES` samples; a sample runs the case enough
+times to take about `min_time / SAMPLES` seconds and records the mean time
+per call. Samples of different cases are interleaved. On shared or
+throttled machines, run each side more than once before trusting a flag.
+
+Baselines are written to `benchmarks/baselines/<commit>.json` (`-dirty` is
+appended when the working tree has uncommitted changes). They are machine
+specific and therefore not tracked by git; compare baselines recorded on the
+same machine.
+
+Functions:
+    - run_suite(names, min_time): Times the selected cases.
+    - save_baseline(results, path): Writes results as a JSON baseline.
+    - compare(old, new, alpha, threshold): Classifies each case as a regression,
+      an improvement or unchanged.
+    - mann_whitney_u(a, b): Two-sided Mann-Whitney U test (normal approximation).
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run
+    python -m benchmarks.suite run --filter evaluate --min-time 0.5
+    python -m benchmarks.suite compare 819cb23 HEAD
+"""
+
+import argparse
+import io
+import json
+import math
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from src.api.client.champion import load_champions
+from src.api.client.sanitize import sanitize_champion_data
+from src.core import evaluator
+from src.core.evaluator import Evaluator
+from src.core.models import PRIMARY, ModelConfig, ModelRegistry
+from src.core.query import get_query_engine
+from src.core.reference import load_reference
+from src.core.scoring import ScoringParams, ScoringTables
+from src.core.sensitivity import analyze
+from src.core.synergy import build_synergy
+from src.core.watcher import display, logging
+from src.utils import paths
+from src.utils.synthetic import PLAYER_PUUID, LobbyGenerator, to_lcu_session
+
+BASELINE_DIR = paths.BASE_DIR / "benchmarks" / "baselines"
+SAMPLES = 15
+MIN_TIME = 1.0
+ALPHA = 0.01
+THRESHOLD = 0.10
+
+CASES = {}
+
+
+def case(name):
+    """
+    Register a benchmark case.
+
+    The decorated function performs any setup and returns the zero-argument
+    callable to be timed.
+
+    Args:
+        name (str): Case name, `<function>/<size>`.
+    """
+
+    def register(setup):
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def _lobby(bench_size=6, seed=0):
+    """Return a grouped lobby with the given bench size."""
+    for grouped in LobbyGenerator(seed).lobbies(1000):
+        if len(grouped["bench"]) == bench_size:
+            return grouped
+    raise ValueError(f"No lobby with a bench of {bench_size}")
+
+
+def _fixture_lobby():
+    """Return the grouped lobby from `tests/fixtures/lobby_clean.json`."""
+    with open(paths.BASE_DIR / "tests" / "fixtures" / "lobby_clean.json", "r") as f:
+        return json.load(f)
+
+
+def _pool(grouped):
+    """Return an evaluated champion pool."""
+    return Evaluator(grouped).evaluate()
+
+
+@case("load_champions/real")
+def _load_champions():
+    return load_champions
+
+
+@case("load_win_rates/real")
+def _load_win_rates():
+    return lambda: evaluator.load_win_rates(evaluator.wr)
+
+
+@case("normalize_win_rates/real")
+def _normalize_real():
+    raw = evaluator.load_win_rates(evaluator.wr)
+    return lambda: evaluator.normalize_win_rates(raw)
+
+
+@case("normalize_win_rates/10k")
+def _normalize_stressed():
+    raw = {str(i): 45 + (i * 7919 % 1000) / 100 for i in range(10000)}
+    return lambda: evaluator.normalize_win_rates(raw)
+
+
+def _gains_case(grouped):
+    evaluator.load_role_weights()
+    pool = _pool(grouped)
+    return lambda: evaluator.compute_raw_composition_gains(pool)
+
+
+@case("compute_raw_composition_gains/fixture")
+def _gains_fixture():
+    return _gains_case(_fixture_lobby())
+
+
+@case("compute_raw_composition_gains/full_bench")
+def _gains_full():
+    return _gains_case(_lobby(bench_size=10))
+
+
+@case("evaluate/fixture")
+def _evaluate_fixture():
+    grouped = _fixture_lobby()
+    return lambda: Evaluator(grouped).evaluate()
+
+
+@case("evaluate/full_bench")
+def _evaluate_full():
+    grouped = _lobby(bench_size=10)
+    return lambda: Evaluator(grouped).evaluate()
+
+
+@case("evaluate/full_bench_synergy")
+def _evaluate_full_synergy():
+    grouped = _lobby(bench_size=10)
+    synergy = build_synergy()
+    return lambda: Evaluator(grouped, synergy=synergy).evaluate()
+
+
+@case("evaluate/full_bench_reference")
+def _evaluate_full_reference():
+    grouped = _lobby(bench_size=10)
+    reference = load_reference()
+    return lambda: Evaluator(grouped, reference=reference).evaluate()
+
+
+@case("evaluate/100_lobbies")
+def _evaluate_many():
+    lobbies = list(LobbyGenerator(1).lobbies(100))
+
+    def run():
+        for grouped in lobbies:
+            Evaluator(grouped).evaluate()
+
+    return run
+
+
+@case("sensitivity/full_bench_2000")
+def _sensitivity_full():
+    grouped = _lobby(bench_size=10)
+    tables = ScoringTables.load()
+    return lambda: analyze(tables, grouped, samples=2000, seed=0)
+
+
+@case("models/shadow_full_bench")
+def _shadow_full():
+    shadows = [
+        ModelConfig(f"rate-{rate}", ScoringParams.default().replace({"dr_rate": rate}))
+        for rate in (2.0, 3.0, 5.0)
+    ]
+    registry = ModelRegistry([ModelConfig(PRIMARY)] + shadows)
+    pool = registry.evaluate(_lobby(bench_size=10))
+    return lambda: registry.shadow(pool)
+
+
+@case("sanitize_champion_data/fixture")
+def _sanitize_fixture():
+    with open(paths.BASE_DIR / "tests" / "fixtures" / "lobby.json", "r") as f:
+        data = json.load(f)
+    return lambda: sanitize_champion_data(data, "15c66f9d-0464-513f-a881-a72d40386dbd")
+
+
+@case("sanitize_champion_data/10k_sessions")
+def _sanitize_many():
+    sessions = [
+        to_lcu_session(g, i) for i, g in enumerate(LobbyGenerator(2).lobbies(10000))
+    ]
+
+    def run():
+        for session in sessions:
+            sanitize_champion_data(session, PLAYER_PUUID)
+
+    return run
+
+
+@case("query/full_bench")
+def _query_full():
+    pool = _pool(_lobby(bench_size=10))
+    engine = get_query_engine()
+    scores = {champ.cid: champ.score for champ in pool.available}
+
+    def run():
+        engine.query(
+            within=pool.available,
+            type="Magic",
+            diff=(None, 2),
+            member=["Catcher", "Enchanter"],
+            scores=scores,
+            limit=3,
+        )
+
+    return run
+
+
+def _display_case(grouped, redraw):
+    pool = _pool(grouped)
+
+    def run():
+        if redraw:
+            display.previous_lobby_data = None
+        with redirect_stdout(io.StringIO()):
+            display.display_lobby_champions(pool)
+
+    return run
+
+
+@case("display_lobby_champions/redraw")
+def _display_redraw():
+    return _display_case(_lobby(bench_size=10), redraw=True)
+
+
+@case("display_lobby_champions/unchanged")
+def _display_unchanged():
+    return _display_case(_lobby(bench_size=10), redraw=False)
+
+
+@case("log_final_champion_select/full_bench")
+def _log_final():
+    pool = _pool(_lobby(bench_size=10))
+    directory = Path(tempfile.mkdtemp(prefix="nomad-bench-"))
+
+    def run():
+        with patch.object(logging, "LOG_PATH", directory):
+            logging.log_final_champion_select(pool)
+
+    return run
+
+
+def calibrate(fn, target):
+    """
+    Choose how many calls of `fn` make up one sample.
+
+    Args:
+        fn (Callable[[], Any]): Zero-argument callable.
+        target (float): Desired seconds per sample.
+
+    Returns:
+        int: Calls per sample.
+    """
+    fn()
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= target / 2 or loops >= 1 << 20:
+            return loops
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(target / elapsed)))
+
+
+def time_sample(fn, loops):
+    """Return the mean seconds per call over one sample of `loops` calls."""
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn()
+    return (time.perf_counter() - start) / loops
+
+
+def run_suite(names=None, min_time=MIN_TIME, samples=SAMPLES, log=None):
+    """
+    Time the selected benchmark cases.
+
+    Samples are interleaved round-robin across cases, so slow drift in
+    machine load spreads over every case instead of skewing one of them.
+
+    Args:
+        names (Iterable[str], optional): Case names. Defaults to every case.
+        min_time (float): Approximate seconds spent measuring each case.
+        samples (int): Samples per case.
+        log (Callable[[str], None], optional): Progress callback.
+
+    Returns:
+        dict[str, dict]: Case name to `loops`, `samples`, `median` and `stdev`.
+    """
+    fns = {name: CASES[name]() for name in names or CASES}
+    loops = {name: calibrate(fn, min_time / samples) for name, fn in fns.items()}
+    timings = {name: [] for name in fns}
+    for _ in range(samples):
+        for name, fn in fns.items():
+            timings[name].append(time_sample(fn, loops[name]))
+
+    results = {}
+    for name, sampled in timings.items():
+        median = statistics.median(sampled)
+        stdev = statistics.stdev(sampled) if len(sampled) > 1 else 0.0
+        results[name] = {
+            "loops": loops[name],
+            "samples": sampled,
+            "median": median,
+            "stdev": stdev,
+        }
+        if log:
+            log(f"{name:<44} {_format_time(median):>10}  ±{stdev / median:.1%}")
+    return results
+
+
+def current_commit():
+    """
+    Return the short commit ID of the working tree.
+
+    Returns:
+        str: Commit ID with `-dirty` appended for uncommitted changes, or
+        `unversioned` outside a git checkout.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=paths.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=paths.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unversioned"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def save_baseline(results, path=None):
+    """
+    Write benchmark results as a JSON baseline.
+
+    Args:
+        results (dict): Output of `run_suite`.
+        path (Path, optional): Output file. Defaults to `BASELINE_DIR/<commit>.json`.
+
+    Returns:
+        Path: The written file.
+    """
+    commit = current_commit()
+    path = path or BASELINE_DIR / f"{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    baseline = {
+        "commit": commit,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} {platform.node()}",
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+    return path
+
+
+def resolve_baseline(ref):
+    """
+    Find a baseline file from a path, commit ID or git revision.
+
+    Args:
+        ref (str): Baseline file path, short commit ID, or any git revision (e.g. `HEAD~1`).
+
+    Returns:
+        Path: Baseline file.
+
+    Raises:
+        FileNotFoundError: If no baseline matches.
+    """
+    candidate = Path(ref)
+    if candidate.suffix == ".json" and candidate.exists():
+        return candidate
+    if not re.fullmatch(r"[0-9a-f]{4,40}(-dirty)?", ref):
+        try:
+            ref = subprocess.run(
+                ["git", "rev-parse", "--short", ref],
+                cwd=paths.BASE_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    matches = sorted(BASELINE_DIR.glob(f"{ref}*.json"))
+    if not matches:
+        raise FileNotFoundError(f"No baseline for {ref!r} in {BASELINE_DIR}")
+    return matches[0]
+
+
+def mann_whitney_u(a, b):
+    """
+    Two-sided Mann-Whitney U test using the normal approximation with tie correction.
+
+    Args:
+        a (Sequence[float]): First sample.
+        b (Sequence[float]): Second sample.
+
+    Returns:
+        float: p-value for the hypothesis that both samples come from the same distribution.
+    """
+    n1, n2 = len(a), len(b)
+    pooled = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+
+    r1 = sum(rank for rank, (_, group) in zip(ranks, pooled) if group == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / math.sqrt(variance)
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def compare(old, new, alpha=ALPHA, threshold=THRESHOLD):
+    """
+    Compare two sets of results case by case.
+
+    A case is a regression (or improvement) only if its median changed by
+    more than `threshold` and the change is significant at level `alpha`.
+
+    Args:
+        old (dict): Baseline results (`run_suite` output).
+        new (dict): Candidate results.
+        alpha (float): Significance level.
+        threshold (float): Minimum relative change of the median.
+
+    Returns:
+        list[dict]: One row per case present in both, with `case`, `old`,
+        `new` (medians), `change` (relative), `p` and `verdict`
+        (`regression`, `improvement` or `unchanged`).
+    """
+    rows = []
+    for name in old:
+        if name not in new:
+            continue
+        before, after = old[name]["median"], new[name]["median"]
+        change = after / before - 1
+        p = mann_whitney_u(old[name]["samples"], new[name]["samples"])
+        verdict = "unchanged"
+        if p < alpha and abs(change) > threshold:
+            verdict = "regression" if change > 0 else "improvement"
+        rows.append(
+            {
+                "case": name,
+                "old": before,
+                "new": after,
+                "change": change,
+                "p": p,
+                "verdict": verdict,
+            }
+        )
+    return rows
+
+
+def _format_time(seconds):
+    """Format a duration with a unit suited to its magnitude."""
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    """Parse arguments and list, run or compare benchmarks."""
+    parser = argparse.ArgumentParser(description="Benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list")
+
+    run = commands.add_parser("run")
+    run.add_argument("--filter", default="", help="Regex selecting case names.")
+    run.add_argument("--min-time", type=float, default=MIN_TIME)
+    run.add_argument("--samples", type=int, default=SAMPLES)
+    run.add_argument("-o", "--output", type=Path, help="Baseline file to write.")
+    run.add_argument("--no-save", action="store_true")
+
+    cmp = commands.add_parser("compare")
+    cmp.add_argument("old", help="Baseline path, commit ID or git revision.")
+    cmp.add_argument("new", nargs="?", default="HEAD")
+    cmp.add_argument("--alpha", type=float, default=ALPHA)
+    cmp.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    if args.command == "list":
+        print("\n".join(CASES))
+        return 0
+
+    if args.command == "run":
+        names = [name for name in CASES if re.search(args.filter, name)]
+        results = run_suite(names, args.min_time, args.samples, log=print)
+        if not args.no_save:
+            print(f"\nSaved baseline {save_baseline(results, args.output)}")
+        return 0
+
+    old_path, new_path = resolve_baseline(args.old), resolve_baseline(args.new)
+    with open(old_path, "r", encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, "r", encoding="utf-8") as f:
+        new = json.load(f)
+    print(f"{old['commit']} -> {new['commit']}\n")
+    rows = compare(old["results"], new["results"], args.alpha, args.threshold)
+    for row in rows:
+        marker = {"regression": "!!", "improvement": "++"}.get(row["verdict"], "  ")
+        print(
+            f"{marker} {row['case']:<44} {_format_time(row['old']):>10} -> "
+            f"{_format_time(row['new']):>10}  {row['change']:+7.1%}  p={row['p']:.3f}"
+        )
+    regressions = [row for row in rows if row["verdict"] == "regression"]
+    print(f"\n{len(regressions)} significant regression(s).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,375 @@
+"""
+pipeline.py - Incremental Asset Build Pipeline.
+
+Runs the data processing scripts as a small DAG of stages. Each stage records
+the content hashes of its inputs and outputs in a state file and is only
+rerun when an input changed, an output is missing, or an output no longer
+matches what the stage produced. Independent stages run in parallel, and a
+timing report is printed at the end.
+
+Stages:
+    - ratings: `ratings_raw.txt` -> `data/raw/ratings_raw.json` (process_ratings.py)
+    - classes: `docs/data/champion_classes.md` -> `data/assets/classes/*/*.json`
+      (process_champion_classes.py)
+    - win_rates: scraped table -> `data/assets/dd_wr.csv` (scraper_dd.py). The
+      source is a remote page, so this stage only runs when forced or when its
+      output is missing.
+    - bundle: all static assets -> `data/assets/assets.bundle` (src/utils/bundle.py)
+    - synergy: champion ratings, class tree and logged outcomes ->
+      `data/assets/synergy/*.npy` (src/core/synergy.py)
+
+Classes:
+    - Stage: A named build step with inputs, outputs, dependencies and a callable.
+
+Functions:
+    - default_stages(): Returns the project's stage graph.
+    - run_pipeline(stages, state_path, force, jobs): Runs stale stages and returns a report.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m scripts.processing.pipeline
+    python -m scripts.processing.pipeline --force win_rates
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src.utils import paths
+
+STATE_PATH = paths.DATA_DIR / ".pipeline_state.json"
+
+
+class Stage:
+    """
+    A named build step.
+
+    Attributes:
+        name (str): Unique stage name.
+        inputs (Callable[[], list[Path]]): Returns the files the stage reads.
+        outputs (Callable[[], list[Path]]): Returns the files the stage writes.
+        run (Callable[[], None]): Performs the stage.
+        deps (tuple[str, ...]): Stages that must finish first.
+        volatile (bool): Inputs cannot be hashed locally (e.g. a remote page);
+            run only when forced or when an output is missing.
+    """
+
+    def __init__(self, name, inputs, outputs, run, deps=(), volatile=False):
+        """Initialize a stage definition."""
+        self.name = name
+        self.inputs = inputs
+        self.outputs = outputs
+        self.run = run
+        self.deps = tuple(deps)
+        self.volatile = volatile
+
+
+def hash_files(files):
+    """
+    Hash a list of files by content.
+
+    Args:
+        files (Iterable[Path]): Files to hash.
+
+    Returns:
+        dict[str, str | None]: Project-relative path to SHA-256 hex digest,
+        or None for files that do not exist.
+    """
+    hashes = {}
+    for path in sorted(files):
+        try:
+            key = path.relative_to(paths.BASE_DIR).as_posix()
+        except ValueError:
+            key = path.as_posix()
+        hashes[key] = (
+            hashlib.sha256(path.read_bytes()).hexdigest() if path.exists() else None
+        )
+    return hashes
+
+
+def is_stale(stage, recorded):
+    """
+    Decide whether a stage needs to run.
+
+    Args:
+        stage (Stage): Stage to check.
+        recorded (dict | None): State recorded after the stage last ran.
+
+    Returns:
+        str | None: Reason the stage is stale, or None if it is up to date.
+    """
+    outputs = hash_files(stage.outputs())
+    if not outputs or None in outputs.values():
+        return "missing output"
+    if stage.volatile:
+        return None
+    if recorded is None:
+        return "no recorded state"
+    if hash_files(stage.inputs()) != recorded["inputs"]:
+        return "input changed"
+    if outputs != recorded["outputs"]:
+        return "output changed"
+    return None
+
+
+def _toposort(stages):
+    """Validate dependencies and return stages keyed by name."""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage.name!r} depends on unknown {dep!r}.")
+    visiting, done = set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"Dependency cycle through stage {name!r}.")
+        visiting.add(name)
+        for dep in by_name[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+
+    for name in by_name:
+        visit(name)
+    return by_name
+
+
+def run_pipeline(stages, state_path=STATE_PATH, force=(), jobs=None):
+    """
+    Run every stale stage, in dependency order and in parallel where possible.
+
+    A stage is checked only after its dependencies finished, so it sees their
+    fresh outputs. If a stage fails, its dependents are skipped.
+
+    Args:
+        stages (list[Stage]): Stage graph.
+        state_path (Path): JSON file holding recorded input/output hashes.
+        force (Iterable[str]): Stage names to run regardless of staleness.
+        jobs (int, optional): Maximum stages running at once.
+
+    Returns:
+        list[dict]: One entry per stage with `stage`, `status`
+        (`ran`, `up to date`, `failed` or `skipped`), `reason` and `seconds`.
+    """
+    by_name = _toposort(stages)
+    force = set(force)
+    state = {}
+    if state_path.exists():
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+
+    report = {}
+    pending = dict(by_name)
+    running = {}
+
+    def execute(stage):
+        reason = "forced" if stage.name in force else None
+        reason = reason or is_stale(stage, state.get(stage.name))
+        if reason is None:
+            return "up to date", None, 0.0
+        start = time.perf_counter()
+        stage.run()
+        return "ran", reason, time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            for name, stage in list(pending.items()):
+                statuses = [report.get(dep, {}).get("status") for dep in stage.deps]
+                if any(s in ("failed", "skipped") for s in statuses):
+                    report[name] = {
+                        "stage": name,
+                        "status": "skipped",
+                        "reason": "dependency failed",
+                        "seconds": 0.0,
+                    }
+                    del pending[name]
+                elif all(s in ("ran", "up to date") for s in statuses):
+                    running[pool.submit(execute, stage)] = stage
+                    del pending[name]
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    status, reason, seconds = future.result()
+                except Exception as e:
+                    status, reason, seconds = "failed", f"{type(e).__name__}: {e}", 0.0
+                report[stage.name] = {
+                    "stage": stage.name,
+                    "status": status,
+                    "reason": reason,
+                    "seconds": seconds,
+                }
+                if status == "ran":
+                    state[stage.name] = {
+                        "inputs": hash_files(stage.inputs()),
+                        "outputs": hash_files(stage.outputs()),
+                    }
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    return [report[stage.name] for stage in stages]
+
+
+def print_report(report, elapsed):
+    """
+    Print a per-stage timing report.
+
+    Args:
+        report (list[dict]): Output of `run_pipeline`.
+        elapsed (float): Wall-clock seconds for the whole pipeline.
+    """
+    print(f"\n{'Stage':<12} {'Status':<12} {'Time':>8}  Reason")
+    print("-" * 60)
+    for entry in report:
+        print(
+            f"{entry['stage']:<12} {entry['status']:<12} "
+            f"{entry['seconds']:>7.2f}s  {entry['reason'] or ''}"
+        )
+    print("-" * 60)
+    print(f"{'total':<25} {elapsed:>7.2f}s")
+
+
+def default_stages():
+    """
+    Build the project's stage graph.
+
+    Script modules are imported inside each stage so that optional
+    dependencies (e.g. the scraper's) are only needed when that stage runs.
+
+    Returns:
+        list[Stage]: Stages in declaration order.
+    """
+    processing = paths.BASE_DIR / "scripts" / "processing"
+    ratings_in = paths.RAW_DIR / "ratings_raw.txt"
+    ratings_out = paths.RAW_DIR / "ratings_raw.json"
+    classes_in = paths.BASE_DIR / "docs" / "data" / "champion_classes.md"
+    classes_out = paths.ASSETS_DIR / "classes"
+    win_rates_out = paths.ASSETS_DIR / "dd_wr.csv"
+
+    def run_ratings():
+        from scripts.processing.process_ratings import process_raw
+
+        process_raw(ratings_in, ratings_out)
+
+    def run_classes():
+        from scripts.processing.process_champion_classes import (
+            process_champion_classes,
+        )
+
+        process_champion_classes(classes_in, classes_out)
+
+    def run_win_rates():
+        from scripts.scraping.scraper_dd import refresh
+
+        refresh()
+
+    def run_bundle():
+        from src.utils.bundle import build_bundle
+
+        build_bundle()
+
+    def bundle_inputs():
+        from src.utils.bundle import source_files
+
+        return source_files()
+
+    def bundle_outputs():
+        from src.utils.bundle import BUNDLE_PATH
+
+        return [BUNDLE_PATH]
+
+    def run_synergy():
+        from src.core.synergy import build_synergy
+
+        build_synergy().save()
+
+    def synergy_inputs():
+        from src.core.synergy import OUTCOMES_PATH
+
+        core = paths.BASE_DIR / "src" / "core"
+        return [
+            paths.ASSETS_DIR / "champion_ratings.json",
+            core / "synergy.py",
+            core / "query.py",
+            OUTCOMES_PATH,
+        ] + sorted(classes_out.glob("*/*.json"))
+
+    def synergy_outputs():
+        from src.core.synergy import SYNERGY_DIR
+
+        return [SYNERGY_DIR / "matrix.npy", SYNERGY_DIR / "champion_ids.npy"]
+
+    return [
+        Stage(
+            "ratings",
+            lambda: [
+                ratings_in,
+                processing / "process_ratings.py",
+                paths.BASE_DIR / "scripts" / "misc" / "champion_old.py",
+            ],
+            lambda: [ratings_out],
+            run_ratings,
+        ),
+        Stage(
+            "classes",
+            lambda: [classes_in, processing / "process_champion_classes.py"],
+            lambda: sorted(classes_out.glob("*/*.json")),
+            run_classes,
+        ),
+        Stage(
+            "win_rates",
+            lambda: [paths.BASE_DIR / "scripts" / "scraping" / "scraper_dd.py"],
+            lambda: [win_rates_out],
+            run_win_rates,
+            volatile=True,
+        ),
+        Stage(
+            "bundle",
+            bundle_inputs,
+            bundle_outputs,
+            run_bundle,
+            deps=("ratings", "classes", "win_rates"),
+        ),
+        Stage(
+            "synergy",
+            synergy_inputs,
+            synergy_outputs,
+            run_synergy,
+            deps=("classes",),
+        ),
+    ]
+
+
+def main():
+    """Parse arguments, run the pipeline and print the timing report."""
+    parser = argparse.ArgumentParser(description="Incremental asset build pipeline.")
+    parser.add_argument(
+        "--force", nargs="*", default=[], help="Stage names to run regardless."
+    )
+    parser.add_argument("--all", action="store_true", help="Force every stage.")
+    parser.add_argument("--jobs", type=int, default=None, help="Parallel stages.")
+    args = parser.parse_args()
+
+    stages = default_stages()
+    force = [s.name for s in stages] if args.all else args.force
+    start = time.perf_counter()
+    report = run_pipeline(stages, force=force, jobs=args.jobs)
+    print_report(report, time.perf_counter() - start)
+    return 1 if any(entry["status"] == "failed" for entry in report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -23,7 +23,7 @@ import json
 import re
 from src.utils import paths
 
-INPUT_PATH = paths.BASE_DIR / "docs" / "champion_classes.md"
+INPUT_PATH = paths.BASE_DIR / "docs" / "data" / "champion_classes.md"
 OUTPUT_PATH = paths.ASSETS_DIR / "classes"
 
 SECTION_PATTERN = re.compile(
@@ -92,9 +92,15 @@ def extract_ratings(section_content):
     return None
 
 
-def process_champion_classes():
-    """Read and processes the Markdown file, extracts champion class data, and saves JSON outputs."""
-    with open(INPUT_PATH, "r", encoding="utf-8") as f:
+def process_champion_classes(input_path=INPUT_PATH, output_path=OUTPUT_PATH):
+    """
+    Read and processes the Markdown file, extracts champion class data, and saves JSON outputs.
+
+    Args:
+        input_path (Path): Markdown document containing the class sections.
+        output_path (Path): Root directory for the per-class JSON files.
+    """
+    with open(input_path, "r", encoding="utf-8") as f:
         md_content = f.read()
 
     headings = extract_headings(md_content)
@@ -116,13 +122,13 @@ def process_champion_classes():
             section_code = section.split(" ")[0]  # extract "A0", "B1", etc.
             section_name = "_".join(section.split(" ")[1:])
             file_name = f"{section_code}_{section_name}.json"
-            output_dir = os.path.join(OUTPUT_PATH, section_code[0])
-            output_path = os.path.join(output_dir, file_name)
+            output_dir = os.path.join(output_path, section_code[0])
+            file_path = os.path.join(output_dir, file_name)
 
             os.makedirs(output_dir, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as json_file:
+            with open(file_path, "w", encoding="utf-8") as json_file:
                 json.dump(ratings, json_file, indent=4)
-            print(f"Saved {output_path}")
+            print(f"Saved {file_path}")
 
 
 if __name__ == "__main__":
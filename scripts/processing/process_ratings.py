@@ -24,15 +24,19 @@ input_file = paths.RAW_DIR / "ratings_raw.txt"
 output_file = paths.ASSETS_DIR / "champion_ratings.json"
 
 
-def process_raw():
+def process_raw(input_path=input_file, output_path=output_file):
     """
     Parse raw champion rating data and converts it into a structured JSON format.
 
+    Args:
+        input_path (Path): Raw tab-separated ratings text file.
+        output_path (Path): Destination JSON file.
+
     Outputs:
         - A JSON file containing all processed champion rating data.
     """
     champion_list = {}
-    with open(input_file, "r", encoding="utf-8") as f:
+    with open(input_path, "r", encoding="utf-8") as f:
         x = 0
         (
             name,
@@ -105,10 +109,10 @@ def process_raw():
 
             x = (x + 1) % 3
 
-    with open(output_file, "w", encoding="utf-8") as json_file:
+    with open(output_path, "w", encoding="utf-8") as json_file:
         json.dump(champion_list, json_file, indent=4)
 
-    print(f"\nProcessed {len(champion_list)} champions and saved to {output_file}.")
+    print(f"\nProcessed {len(champion_list)} champions and saved to {output_path}.")
 
 
 if __name__ == "__main__":
@@ -4,8 +4,22 @@ scrape_dd.py - Champion Data Scraper.
 This script scrapes champion data from a specified website, extracting champion names,
 image keys, win rates, and pick rates. The data is then saved as a CSV file for further analysis.
 
+Pages are fetched over plain HTTP, concurrently when several sources are
+configured, and the champion table is parsed with the standard library's
+`html.parser`. No browser is started. A champion row is a `<tr>` whose
+`<td class="champion-cell">` holds the champion icon and name. The row's
+second and third cells hold the win rate and pick rate.
+
+Classes:
+    - Source: A named page to scrape and the CSV file it refreshes.
+    - ChampionTableParser: Streaming parser collecting champion rows from HTML.
+
 Functions:
-    - scrape_champion_cells(url): Extracts champion-related data from the webpage.
+    - parse_champion_table(html): Extracts champion rows from page HTML.
+    - scrape_champion_cells(url): Fetches and parses one page.
+    - scrape_sources(sources, workers): Fetches and parses several pages concurrently.
+    - write_csv(rows, path): Writes rows with the `dd_wr.csv` header.
+    - refresh(sources, workers): Scrapes every source and writes its CSV.
     - process_url_to_key(url): Extracts the champion key from an image URL.
 
 Usage:
@@ -13,80 +27,218 @@ Run this script to scrape and store champion data.
 
 Example:
 python
-    python scrape_champions.py
+    python -m scripts.scraping.scraper_dd
+    python -m scripts.scraping.scraper_dd --url http://127.0.0.1:8000/ -o /tmp/dd_wr.csv
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
+import argparse
+import csv
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+
+import requests
 
 from src.utils import paths
 
+DD_URL = "https://www.friendsofdirtydoughnuthighmmraramwinrate.com/"
+OUTPUT_PATH = paths.ASSETS_DIR / "dd_wr.csv"
+COLUMNS = ["Champion Name", "Key", "Win Rate", "Pick Rate"]
+CHAMPION_CELL_CLASS = "champion-cell"
+TIMEOUT = 15
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; nomad-scraper)"}
+
+
+class Source:
+    """
+    A page to scrape.
+
+    Attributes:
+        name (str): Unique source name.
+        url (str): Page URL.
+        output (Path): CSV file refreshed from the page.
+    """
+
+    def __init__(self, name, url, output):
+        """Initialize a source definition."""
+        self.name = name
+        self.url = url
+        self.output = output
+
+
+SOURCES = [Source("dd", DD_URL, OUTPUT_PATH)]
+
+
+class ChampionTableParser(HTMLParser):
+    """
+    Collect champion rows from a page in one pass.
+
+    Attributes:
+        rows (list[tuple[str, str, str, str]]): `(name, key, win rate, pick rate)`
+            per champion row, in page order.
+    """
+
+    def __init__(self):
+        """Initialize the parser state."""
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self._cells = None
+        self._text = None
+        self._champion = None
+        self._in_champion = False
+        self._img_src = ""
+
+    def handle_starttag(self, tag, attrs):
+        """Track row and cell boundaries and the champion icon."""
+        if tag == "tr":
+            self._cells, self._champion = [], None
+        elif tag in ("td", "th") and self._cells is not None:
+            self._finish_cell()
+            self._text = []
+            classes = (dict(attrs).get("class") or "").split()
+            self._in_champion = tag == "td" and CHAMPION_CELL_CLASS in classes
+            if self._in_champion:
+                self._champion = len(self._cells)
+                self._img_src = ""
+        elif tag == "img" and self._in_champion and not self._img_src:
+            self._img_src = dict(attrs).get("src") or ""
+
+    def handle_endtag(self, tag):
+        """Close cells and emit champion rows."""
+        if tag in ("td", "th"):
+            self._finish_cell()
+        elif tag == "tr" and self._cells is not None:
+            self._finish_cell()
+            if self._champion is not None:
+                cells = self._cells
+                name, key = cells[self._champion]
+                self.rows.append(
+                    (
+                        name,
+                        key,
+                        cells[1][0] if len(cells) > 1 else "",
+                        cells[2][0] if len(cells) > 2 else "",
+                    )
+                )
+            self._cells = None
+
+    def handle_data(self, data):
+        """Collect cell text."""
+        if self._text is not None:
+            self._text.append(data)
+
+    def _finish_cell(self):
+        """Store the open cell's whitespace-normalized text (and icon key)."""
+        if self._text is None:
+            return
+        text = " ".join("".join(self._text).split())
+        key = process_url_to_key(self._img_src) if self._in_champion else ""
+        self._cells.append((text, key))
+        self._text = None
+        self._in_champion = False
+
+
+def parse_champion_table(html):
+    """
+    Extract champion rows from page HTML.
+
+    Args:
+        html (str): Page source.
+
+    Returns:
+        list[tuple[str, str, str, str]]: `(name, key, win rate, pick rate)` per champion.
+
+    Raises:
+        ValueError: If the page has no champion rows (e.g. the layout changed).
+    """
+    parser = ChampionTableParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.rows:
+        raise ValueError(f"No '{CHAMPION_CELL_CLASS}' rows found in page.")
+    return parser.rows
+
 
-def scrape_champion_cells(url):
+def scrape_champion_cells(url, session=None):
     """
     Extract champion data from the given webpage, including names, image keys, win rates, and pick rates.
 
     Args:
         url (str): The URL of the webpage containing champion data.
+        session (requests.Session, optional): Session to reuse connections.
 
     Returns:
-        pd.DataFrame: A dataframe containing champion names, keys, win rates, and pick rates.
-    """
-    options = Options()
-    options.add_argument("--headless")  # Run in headless mode
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    service = Service(
-        ChromeDriverManager().install()
-    )  # Auto-downloads and sets up ChromeDriver
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get(url)
-
-    try:
-        # Wait until the table is loaded
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "champion-cell"))
-        )
-
-        champion_cells = driver.find_elements(By.CLASS_NAME, "champion-cell")
-        filtered_champions = []
-
-        for cell in champion_cells:
-            img_tag = (
-                cell.find_element(By.TAG_NAME, "img")
-                if cell.find_elements(By.TAG_NAME, "img")
-                else None
-            )
-            img_url = process_url_to_key(
-                img_tag.get_attribute("src") if img_tag else ""
-            )
-            champion_name = cell.text.strip()
-
-            # Find next td elements (win rate & pick rate)
-            parent_row = cell.find_element(By.XPATH, "./parent::tr")
-            td_elements = parent_row.find_elements(By.TAG_NAME, "td")
-
-            winrate = td_elements[1].text.strip() if len(td_elements) > 1 else ""
-            pickrate = td_elements[2].text.strip() if len(td_elements) > 2 else ""
-
-            filtered_champions.append((champion_name, img_url, winrate, pickrate))
-
-        df = pd.DataFrame(
-            filtered_champions,
-            columns=["Champion Name", "Key", "Win Rate", "Pick Rate"],
-        )
-        return df
-
-    finally:
-        driver.quit()
+        list[tuple[str, str, str, str]]: `(name, key, win rate, pick rate)` per champion.
+
+    Raises:
+        requests.RequestException: If the page cannot be fetched.
+        ValueError: If the page has no champion rows.
+    """
+    response = (session or requests).get(url, headers=HEADERS, timeout=TIMEOUT)
+    response.raise_for_status()
+    return parse_champion_table(response.text)
+
+
+def scrape_sources(sources=None, workers=None):
+    """
+    Fetch and parse several sources concurrently.
+
+    Args:
+        sources (list[Source], optional): Sources to scrape; defaults to `SOURCES`.
+        workers (int, optional): Concurrent requests; defaults to one per source.
+
+    Returns:
+        dict[str, list[tuple]]: Source name to parsed rows.
+
+    Raises:
+        requests.RequestException | ValueError: From the first failing source.
+    """
+    sources = SOURCES if sources is None else sources
+    with requests.Session() as session, ThreadPoolExecutor(
+        max_workers=workers or max(1, len(sources))
+    ) as pool:
+        futures = {
+            source.name: pool.submit(scrape_champion_cells, source.url, session)
+            for source in sources
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def write_csv(rows, path):
+    """
+    Write champion rows with the `dd_wr.csv` header.
+
+    Args:
+        rows (Iterable[tuple]): `(name, key, win rate, pick rate)` rows.
+        path (Path): Destination CSV file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(COLUMNS)
+        writer.writerows(rows)
+
+
+def refresh(sources=None, workers=None):
+    """
+    Scrape every source and write its CSV.
+
+    Nothing is written unless every source was scraped successfully.
+
+    Args:
+        sources (list[Source], optional): Sources to refresh; defaults to `SOURCES`.
+        workers (int, optional): Concurrent requests.
+
+    Returns:
+        dict[str, int]: Source name to number of rows written.
+    """
+    sources = SOURCES if sources is None else sources
+    scraped = scrape_sources(sources, workers)
+    for source in sources:
+        write_csv(scraped[source.name], source.output)
+    return {name: len(rows) for name, rows in scraped.items()}
 
 
 def process_url_to_key(url):
@@ -103,12 +255,29 @@ def process_url_to_key(url):
     return url.split("/")[-1].replace(".png", "")
 
 
+def main(argv=None):
+    """Scrape the configured sources (or one `--url`) and save them as CSV."""
+    parser = argparse.ArgumentParser(description="Scrape champion win rates.")
+    parser.add_argument("--url", help="Scrape this page instead of the sources.")
+    parser.add_argument(
+        "-o", "--output", help="CSV file for --url (default: dd_wr.csv)."
+    )
+    args = parser.parse_args(argv)
+
+    sources = SOURCES
+    if args.url:
+        output = Path(args.output) if args.output else OUTPUT_PATH
+        sources = [Source("url", args.url, output)]
+
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    counts = refresh(sources)
+    wall, cpu = time.perf_counter() - start_wall, time.process_time() - start_cpu
+    for source in sources:
+        print(f"{source.name}: {counts[source.name]} champions -> {source.output}")
+    print(f"Done in {wall:.2f}s ({cpu:.2f}s CPU)")
+    return 0
+
+
 if __name__ == "__main__":
     """Entry point for scraping champion data and saving it as a CSV file."""
-    url = "https://www.friendsofdirtydoughnuthighmmraramwinrate.com/"
-    champion_data = scrape_champion_cells(url)
-    path = paths.ASSETS_DIR / "dd_wr.csv"
-    if champion_data is not None:
-        print(champion_data.head())  # Show first few rows
-        champion_data.to_csv(path, index=False)
-        print(f"Data saved to {path}")
+    sys.exit(main())
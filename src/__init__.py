@@ -7,6 +7,7 @@ data processing, champion evaluation, and utility functions.
 Subpackages:
 - api: Interfaces with the League of Legends Client API and external data sources.
 - core: Implements champion evaluation logic and real-time monitoring.
+- history: Compacts and queries historical champion select logs.
 - utils: Provides general utility functions for file handling and data transformations.
 
 Usage:
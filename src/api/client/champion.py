@@ -13,7 +13,7 @@ Classes:
       to available and unavailable champions.
 
 Functions:
-    - load_champions(): Load all champions as ChampionState instances from JSON.
+    - load_champions(): Load all champions as ChampionState instances from the bundle or JSON.
 """
 
 import json
@@ -54,6 +54,7 @@ class ChampionState:
         # Evaluation-time fields
         self.raw_gain = 0.0
         self.norm_gain = 0.0
+        self.synergy = 0.0
         self.raw_wr = 50.0
         self.norm_wr = 0.0
         self.flags = []
@@ -78,6 +79,7 @@ class ChampionState:
         Difficulty: {self.meta.diff}
         Raw Gain: {self.raw_gain}
         Norm Gain: {self.norm_gain}
+        Synergy: {self.synergy}
         Raw WR: {self.raw_wr}
         Norm WR: {self.norm_wr}
         Score: {self.score}
@@ -118,13 +120,22 @@ class ChampionPool:
 
 def load_champions():
     """
-    Load all champions from JSON and return ChampionState instances.
+    Load all champions and return ChampionState instances.
+
+    The data is read from the compiled asset bundle when it is current, and
+    parsed from `champion_ratings.json` otherwise.
 
     Returns:
         dict[str, ChampionState]: Dictionary of champion ID to ChampionState.
     """
-    with open(DATA_PATH, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+    from src.utils.bundle import runtime_bundle
+
+    bundle = runtime_bundle(DATA_PATH)
+    if bundle is not None:
+        raw_data = bundle.champion_data()
+    else:
+        with open(DATA_PATH, "r", encoding="utf-8") as f:
+            raw_data = json.load(f)
     return {
         cid: ChampionState(ChampionMetadata(cid, data))
         for cid, data in raw_data.items()
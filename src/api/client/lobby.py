@@ -7,13 +7,23 @@ champion selection session JSON data.
 
 Functions:
     - fetch_lobby_champions(port, password): Fetches the current champion selection data.
+
+Metrics:
+    - nomad_lcu_requests_total{endpoint="champ_select_session", outcome}: See status.py.
 """
 
-import requests
 import json
 import sys
 
 from src.api.client.sanitize import sanitize_champion_data
+from src.api.client.status import LCU_REQUESTS
+from src.utils.lazy import lazy_import
+
+requests = lazy_import("requests")
+
+_SESSION_OK = LCU_REQUESTS.labels("champ_select_session", "ok")
+_SESSION_HTTP_ERROR = LCU_REQUESTS.labels("champ_select_session", "http_error")
+_SESSION_REQUEST_ERROR = LCU_REQUESTS.labels("champ_select_session", "request_error")
 
 
 def fetch_lobby_champions(port, password):
@@ -33,10 +43,13 @@ def fetch_lobby_champions(port, password):
     try:
         response = requests.get(session_url, verify=False)
         if response.status_code == 200:
+            _SESSION_OK.inc()
             return response.json()
         else:
+            _SESSION_HTTP_ERROR.inc()
             return None
     except requests.RequestException as e:
+        _SESSION_REQUEST_ERROR.inc()
         print("Error fetching data:", e)
         return None
 
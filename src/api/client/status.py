@@ -9,10 +9,26 @@ Classes:
 
 Functions:
     - get_status(port, password): Fetches the current gameflow phase from the LCU API.
+
+Metrics:
+    - nomad_lcu_requests_total{endpoint, outcome}: LCU requests by outcome
+      (`ok`, `http_error` or `request_error`).
 """
 
-import requests
 from enum import Enum
+from src.utils import metrics
+from src.utils.lazy import lazy_import
+
+requests = lazy_import("requests")
+
+LCU_REQUESTS = metrics.counter(
+    "nomad_lcu_requests_total",
+    "LCU API requests by endpoint and outcome.",
+    ["endpoint", "outcome"],
+)
+_STATUS_OK = LCU_REQUESTS.labels("gameflow_phase", "ok")
+_STATUS_HTTP_ERROR = LCU_REQUESTS.labels("gameflow_phase", "http_error")
+_STATUS_REQUEST_ERROR = LCU_REQUESTS.labels("gameflow_phase", "request_error")
 
 
 class Status(Enum):
@@ -50,10 +66,13 @@ def get_status(port, password):
     try:
         response = requests.get(url, headers=headers, verify=False)
         if response.status_code == 200:
+            _STATUS_OK.inc()
             return response.json()
         else:
+            _STATUS_HTTP_ERROR.inc()
             print(f"Error fetching game status: {response.status_code}")
     except requests.RequestException as e:
+        _STATUS_REQUEST_ERROR.inc()
         print(f"Request error: {e}")
 
     return "Unknown"
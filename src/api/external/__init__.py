@@ -5,13 +5,13 @@ This package contains modules responsible for interfacing with external APIs.
 It provides functions to fetch and process data from external sources.
 
 Modules:
-- (List specific modules here if applicable)
+- data_dragon: Cached, patch-aware client for Riot's Data Dragon CDN.
 
 Usage:
 Import the necessary modules from this package to interact with external APIs.
 
 Example:
 python
-    from src.api.external.some_module import some_function
-    result = some_function()
+    from src.api.external.data_dragon import get_champion_names
+    names = get_champion_names()
 """
@@ -1,52 +1,357 @@
 """
-data_dragon.py - Champion Name and ID Fetcher from Riot's Data Dragon API.
+data_dragon.py - Champion Data Fetcher for Riot's Data Dragon API.
 
-This module fetches a mapping of champion IDs to champion names using the
-official Riot Data Dragon endpoint. It is primarily used to populate local
-static data for use in ARAM analysis and overlay tools.
+This module fetches champion data from the official Riot Data Dragon CDN. It
+is primarily used to populate local static data for use in ARAM analysis and
+overlay tools.
+
+The current patch is resolved from `api/versions.json` instead of being
+hard-coded. Every downloaded document is kept in a local content-addressed
+cache under `data/ddragon/`:
+- `objects/<aa>/<sha256>` holds each distinct document once. Champions that
+  did not change between patches share a blob.
+- `index.json` maps document paths, which embed the patch and locale (e.g.
+  `cdn/15.4.1/data/en_US/champion.json`), to a blob digest and the
+  response's `ETag` / `Last-Modified` validators.
+
+Patch-versioned documents never change, so cached ones are served without a
+request. Only `versions.json` is revalidated, with a conditional request.
+When nothing changed, a refresh is one `304 Not Modified` round trip. If
+Data Dragon is unreachable, the cached versions list is used.
+
+Classes:
+    - DataDragonClient: Cached, patch-aware client with concurrent detail fetches.
 
 Functions:
-    - get_champion_names(): Fetch champion names and their numeric IDs from
-    the Data Dragon API.
+    - get_champion_names(version, client): Fetch champion names and their numeric IDs.
 
 Executed as a script, it saves the fetched data as a JSON file to the local
 assets directory.
+
+Example:
+python
+    client = DataDragonClient()
+    version = client.latest_version()
+    names = client.champion_names(version)
+    details = client.champion_details(["Aatrox", "Ahri"], version)
 """
 
-import requests
+import hashlib
 import json
 import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.utils import metrics, paths
 
-from src.utils import paths
+DDRAGON_URL = "https://ddragon.leagueoflegends.com"
+CACHE_DIR = paths.DATA_DIR / "ddragon"
+LOCALE = "en_US"
+WORKERS = 8
+TIMEOUT = 15
 
-CHAMPION_URL = "https://ddragon.leagueoflegends.com/cdn/15.4.1/data/en_US/champion.json"
+VERSIONS_KEY = "api/versions.json"
+_RELEASE = re.compile(r"^\d+\.\d+\.\d+$")
 
+CACHE_LOOKUPS = metrics.counter(
+    "nomad_cache_lookups_total",
+    "Cache lookups by cache and result.",
+    ["cache", "result"],
+)
+_CACHE_HIT = CACHE_LOOKUPS.labels("ddragon", "hit")
+_CACHE_REVALIDATED = CACHE_LOOKUPS.labels("ddragon", "revalidated")
+_CACHE_MISS = CACHE_LOOKUPS.labels("ddragon", "miss")
 
-def get_champion_names():
+
+class DataDragonClient:
+    """
+    Cached, patch-aware Data Dragon client.
+
+    Attributes:
+        base_url (str): Data Dragon root URL.
+        cache_dir (Path): Directory holding `index.json` and `objects/`.
+        locale (str): Locale of champion documents.
+        workers (int): Maximum concurrent requests for detail documents.
+        stats (dict[str, int]): `requests`, `not_modified` and `cache_hits` counts.
+    """
+
+    def __init__(
+        self,
+        base_url=DDRAGON_URL,
+        cache_dir=None,
+        locale=LOCALE,
+        workers=WORKERS,
+        timeout=TIMEOUT,
+    ):
+        """Initialize the client and load the cache index."""
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.locale = locale
+        self.workers = workers
+        self.timeout = timeout
+        self.stats = {"requests": 0, "not_modified": 0, "cache_hits": 0}
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=max(1, workers))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+        self._dirty = False
+
+    def __enter__(self):
+        """Return the client for use in a `with` block."""
+        return self
+
+    def __exit__(self, *exc):
+        """Close the HTTP session."""
+        self.close()
+
+    def close(self):
+        """Write pending index changes and close the HTTP session."""
+        self.flush()
+        self._session.close()
+
+    @property
+    def index_path(self):
+        """Path of the cache index."""
+        return self.cache_dir / "index.json"
+
+    def _load_index(self):
+        """Read the cache index, or start an empty one."""
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def flush(self):
+        """Write the cache index if it changed, replacing it atomically."""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._index, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    def _count(self, stat):
+        """Increment one of the request statistics."""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _object_path(self, digest):
+        """Path of the blob holding a document with the given SHA-256 digest."""
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def _read_object(self, entry):
+        """Read a cached blob, or return None if it is missing."""
+        try:
+            return self._object_path(entry["sha256"]).read_bytes()
+        except (OSError, KeyError):
+            return None
+
+    def _store(self, key, body, headers):
+        """Store a response body as a blob and point `key` at it."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{digest}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+        entry = {"sha256": digest}
+        for header, field in (("ETag", "etag"), ("Last-Modified", "last_modified")):
+            if headers.get(header):
+                entry[field] = headers[header]
+        with self._lock:
+            self._index[key] = entry
+            self._dirty = True
+
+    def fetch(self, key, immutable=True):
+        """
+        Return a document's bytes from the cache or Data Dragon.
+
+        Immutable documents are served from the cache without a request.
+        Mutable ones are revalidated with `If-None-Match` / `If-Modified-Since`,
+        and the cached copy is used if Data Dragon cannot be reached.
+
+        Args:
+            key (str): Path below the Data Dragon root, e.g. `api/versions.json`.
+            immutable (bool): Whether the document never changes once published.
+
+        Returns:
+            bytes: Document body.
+
+        Raises:
+            requests.RequestException: If the document is not cached and cannot be fetched.
+        """
+        entry = self._index.get(key)
+        cached = self._read_object(entry) if entry else None
+        if cached is not None and immutable:
+            self._count("cache_hits")
+            _CACHE_HIT.inc()
+            return cached
+
+        headers = {}
+        if cached is not None:
+            if "etag" in entry:
+                headers["If-None-Match"] = entry["etag"]
+            if "last_modified" in entry:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            self._count("requests")
+            response = self._session.get(
+                f"{self.base_url}/{key}", headers=headers, timeout=self.timeout
+            )
+            if response.status_code == 304 and cached is not None:
+                self._count("not_modified")
+                _CACHE_REVALIDATED.inc()
+                return cached
+            response.raise_for_status()
+        except requests.RequestException:
+            if cached is None:
+                raise
+            _CACHE_HIT.inc()
+            return cached
+        _CACHE_MISS.inc()
+        self._store(key, response.content, response.headers)
+        return response.content
+
+    def fetch_json(self, key, immutable=True):
+        """
+        Return a parsed JSON document.
+
+        Args:
+            key (str): Path below the Data Dragon root.
+            immutable (bool): Whether the document never changes once published.
+
+        Returns:
+            dict | list: Parsed document.
+
+        Raises:
+            requests.RequestException: If the document cannot be fetched.
+            ValueError: If the document is not valid JSON.
+        """
+        return json.loads(self.fetch(key, immutable))
+
+    def versions(self):
+        """
+        Return the released patch versions, newest first.
+
+        Returns:
+            list[str]: Versions such as `15.4.1`; legacy entries are skipped.
+
+        Raises:
+            ValueError: If the versions list is malformed or empty.
+        """
+        versions = self.fetch_json(VERSIONS_KEY, immutable=False)
+        if not isinstance(versions, list):
+            raise ValueError("Malformed versions list.")
+        releases = [v for v in versions if isinstance(v, str) and _RELEASE.match(v)]
+        if not releases:
+            raise ValueError("No released versions listed.")
+        return releases
+
+    def latest_version(self):
+        """
+        Resolve the current patch.
+
+        Returns:
+            str: Newest released version.
+        """
+        return self.versions()[0]
+
+    def _data_key(self, version, name):
+        """Cache key of a patch-versioned data document."""
+        return f"cdn/{version}/data/{self.locale}/{name}"
+
+    def champion_list(self, version=None):
+        """
+        Return the champion summary document for a patch.
+
+        Args:
+            version (str, optional): Patch version; resolved when omitted.
+
+        Returns:
+            dict[str, dict]: Champion ID (e.g. `Aatrox`) to summary data.
+
+        Raises:
+            ValueError: If the document has no `data` mapping.
+        """
+        version = version or self.latest_version()
+        document = self.fetch_json(self._data_key(version, "champion.json"))
+        if not isinstance(document, dict) or not isinstance(document.get("data"), dict):
+            raise ValueError("Malformed response: Missing 'data' key.")
+        self.flush()
+        return document["data"]
+
+    def champion_names(self, version=None):
+        """
+        Map numeric champion keys to champion IDs.
+
+        Args:
+            version (str, optional): Patch version; resolved when omitted.
+
+        Returns:
+            dict[str, str]: Numeric key (e.g. `"266"`) to champion ID (e.g. `"Aatrox"`).
+        """
+        data = self.champion_list(version)
+        return {champ["key"]: champ_id for champ_id, champ in data.items()}
+
+    def champion_details(self, champion_ids=None, version=None, workers=None):
+        """
+        Fetch per-champion detail documents concurrently.
+
+        Args:
+            champion_ids (Iterable[str], optional): Champion IDs; all champions by default.
+            version (str, optional): Patch version; resolved when omitted.
+            workers (int, optional): Maximum concurrent requests; defaults to `workers`.
+
+        Returns:
+            dict[str, dict]: Champion ID to its detail data.
+        """
+        version = version or self.latest_version()
+        if champion_ids is None:
+            champion_ids = list(self.champion_list(version))
+
+        def detail(champ_id):
+            key = self._data_key(version, f"champion/{champ_id}.json")
+            return self.fetch_json(key)["data"][champ_id]
+
+        with ThreadPoolExecutor(max_workers=workers or self.workers) as pool:
+            details = dict(zip(champion_ids, pool.map(detail, champion_ids)))
+        self.flush()
+        return details
+
+
+def get_champion_names(version=None, client=None):
     """
     Fetch champion names and their corresponding IDs from the Data Dragon API.
 
+    Args:
+        version (str, optional): Patch version; the latest patch by default.
+        client (DataDragonClient, optional): Client to use; a cached default otherwise.
+
     Returns:
         dict: A dictionary mapping champion IDs to champion names.
         If the request fails or returns invalid data, returns an empty dictionary.
     """
-    response = requests.get(CHAMPION_URL)
-    if response.status_code == 200:
-        try:
-            data = response.json()
-            if "data" not in data:
-                print("Malformed response: Missing 'data' key.")
-                return {}
-
-            champions = {}
-            for champ in data["data"]:
-                champions[data["data"][champ]["key"]] = champ
-            return champions
-        except (json.JSONDecodeError, KeyError) as e:
-            print(f"Error parsing Data Dragon response: {e}")
-            return {}
-
-    print("Failed to fetch champion data:", response.status_code)
+    owned = client is None
+    client = client or DataDragonClient()
+    try:
+        return client.champion_names(version)
+    except requests.RequestException as e:
+        print("Failed to fetch champion data:", e)
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Error parsing Data Dragon response: {e}")
+    finally:
+        if owned:
+            client.close()
     return {}
 
 
@@ -57,7 +362,8 @@ if __name__ == "__main__":
     Saves champion names and IDs into a local JSON file.
     """
     champions = get_champion_names()
-    file_path = os.path.join(paths.ASSETS_DIR, "champions.json")
-    with open(file_path, "w") as f:
-        json.dump(champions, f, indent=4)
-    print("Champion data saved to data/static/champions.json")
+    if champions:
+        file_path = os.path.join(paths.ASSETS_DIR, "champions.json")
+        with open(file_path, "w") as f:
+            json.dump(champions, f, indent=4)
+        print(f"Champion data saved to {file_path}")
@@ -8,6 +8,16 @@ League of Legends ARAM champion select.
 Submodules:
 - evaluator: Computes champion selection scores based on role weights and win rates.
 - watcher: Monitors and logs ARAM champion select sessions.
+- daemon: Serves warm evaluations over a local socket.
+- batch: Scores JSONL files of grouped lobbies across a process pool.
+- query: Filters and ranks champions with bitmap indexes over static attributes.
+- synergy: Precomputed pairwise champion synergy matrix for the evaluator.
+- scoring: Tunable scoring parameters and the vectorized scoring core.
+- tuning: Parallel search for scoring parameters against historical picks.
+- sensitivity: Probability of each champion ranking first under perturbed parameters.
+- backtest: Compares two scoring-model versions over a corpus of recorded lobbies.
+- models: Registry of primary and shadow scoring models evaluated together.
+- reference: Reference gain distributions for bench-independent normalization.
 
 Usage:
 Import submodules as needed for champion evaluation and monitoring.
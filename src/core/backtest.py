@@ -0,0 +1,498 @@
+"""
+backtest.py - Backtesting Scoring-Model Changes on Recorded Lobbies.
+
+Scores a corpus of grouped lobbies (JSONL, the `batch` input format) with two
+model versions and measures how the recommendations shift between them.
+
+Model versions:
+    - `worktree`: The working tree as it is, uncommitted changes included.
+    - A weights file (`*.json`, see `ScoringParams.load`): The working tree
+      with those parameters.
+    - Any other value is a git ref. The ref's tree is exported to a temporary
+      directory, so refs must contain `batch.py`.
+
+Every model is scored by its own tree's `src.core.batch`, that is by its
+`Evaluator` in a process pool, so local edits to the evaluator are part of
+the `worktree` model. `--synergy` and `--reference` enable those evaluator
+stages for both models; they and weights files need a `batch` that has the
+matching options. Lobbies a model fails on are left unscored and counted as
+failed. Both models are scored concurrently.
+
+Metrics, per lobby with at least two available champions:
+    - Spearman rank correlation and Kendall's tau-b between the two rankings
+      (ties get average ranks).
+    - Top-1 agreement: both models rank the same champion first.
+The largest disagreements are the lobbies with the lowest Spearman
+correlation, with how far the base model's top choice fell in the candidate.
+
+Classes:
+    - Corpus: Lobbies read from a JSONL file, with their available champions.
+    - ModelVersion: A model to score the corpus with.
+
+Functions:
+    - average_ranks(scores, mask): Per-lobby ranks with ties averaged.
+    - spearman(a, b, mask): Per-lobby Spearman correlation.
+    - kendall(a, b, mask): Per-lobby Kendall tau-b.
+    - compare(corpus, base, candidate, top): Metrics and largest disagreements.
+    - backtest(corpus, base, candidate, workers, top): Scores and compares two models.
+    - format_report(report): Renders a report as text.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m src.core.backtest lobbies.jsonl --base HEAD~1 --candidate worktree
+    python -m src.core.backtest lobbies.jsonl --candidate data/assets/weights/v0001.json
+    python -m src.core.backtest lobbies.jsonl --base HEAD~1 --reference
+"""
+
+import argparse
+import csv
+import io
+import json
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from src.core.scoring import ScoringParams, ScoringTables
+from src.utils import paths
+
+WORKTREE = "worktree"
+BLOCK = 16384
+TOP_DISAGREEMENTS = 10
+LOBBY_KEYS = ("player", "team", "bench")
+
+
+class Corpus:
+    """
+    Lobbies read from a JSONL file.
+
+    Attributes:
+        lobbies (list[dict]): Grouped lobbies that can be scored.
+        lines (list[int]): Input line number of each lobby.
+        available (np.ndarray): `(lobbies, width)` available champion IDs,
+            player first; -1 marks padding.
+        skipped (int): Lines that were not valid lobbies of known champions
+            (the player's included).
+    """
+
+    def __init__(self, lobbies, lines, known=None, skipped=0):
+        """
+        Initialize from parsed lobbies.
+
+        Args:
+            lobbies (list[dict]): Grouped lobbies.
+            lines (list[int]): Line number of each lobby.
+            known (Container[str], optional): Champion IDs that can be scored;
+                lobbies with others are skipped.
+            skipped (int): Lines already skipped while parsing.
+        """
+        kept = [
+            (grouped, line)
+            for grouped, line in zip(lobbies, lines)
+            if known is None
+            or all(str(c) in known for key in LOBBY_KEYS for c in grouped[key])
+        ]
+        self.skipped = skipped + len(lobbies) - len(kept)
+        self.lobbies = [grouped for grouped, _ in kept]
+        self.lines = [line for _, line in kept]
+        width = max((1 + len(g["bench"]) for g in self.lobbies), default=1)
+        self.available = np.full((len(self.lobbies), width), -1, dtype=np.int64)
+        for i, grouped in enumerate(self.lobbies):
+            cids = list(grouped["player"]) + list(grouped["bench"])
+            self.available[i, : len(cids)] = cids
+
+    def __len__(self):
+        """Return the number of lobbies."""
+        return len(self.lobbies)
+
+    @classmethod
+    def read(cls, path, known=None):
+        """
+        Read a JSONL file of grouped lobbies, skipping blank and invalid lines.
+
+        Args:
+            path (Path): JSONL file.
+            known (Container[str], optional): Champion IDs that can be scored.
+
+        Returns:
+            Corpus: The lobbies.
+        """
+        lobbies, lines, skipped = [], [], 0
+        with open(path, "r", encoding="utf-8") as f:
+            for number, text in enumerate(f, 1):
+                if not text.strip():
+                    continue
+                try:
+                    grouped = json.loads(text)
+                    valid = bool(grouped["player"]) and all(
+                        str(c).isdigit() for key in LOBBY_KEYS for c in grouped[key]
+                    )
+                except (ValueError, KeyError, TypeError):
+                    valid = False
+                if not valid:
+                    skipped += 1
+                    continue
+                lobbies.append(grouped)
+                lines.append(number)
+        return cls(lobbies, lines, known, skipped)
+
+    @property
+    def mask(self):
+        """`(lobbies, width)` True for real available entries."""
+        return self.available >= 0
+
+    def write(self, path):
+        """Write the lobbies as JSONL, one per line in order."""
+        with open(path, "w", encoding="utf-8") as f:
+            for grouped in self.lobbies:
+                f.write(json.dumps(grouped, separators=(",", ":")) + "\n")
+
+
+class ModelVersion:
+    """
+    A scoring model to backtest.
+
+    Attributes:
+        spec (str): `worktree`, a weights file or a git ref.
+        kind (str): `worktree`, `params` or `ref`.
+        label (str): Display name (the resolved commit for refs).
+        params (ScoringParams | None): Parameters of weights-file models.
+        commit (str | None): Full commit hash of ref models.
+        synergy (bool): Whether the synergy stage is enabled.
+        reference (bool): Whether gains are normalized against the reference.
+    """
+
+    def __init__(self, spec, repo=None, synergy=False, reference=False):
+        """
+        Resolve a model specification.
+
+        Args:
+            spec (str): `worktree`, a path to a weights file or a git ref.
+            repo (Path, optional): Repository root; defaults to `paths.BASE_DIR`.
+            synergy (bool): Enable the synergy stage.
+            reference (bool): Enable reference gain normalization.
+
+        Raises:
+            ValueError: If the spec is neither a weights file nor a commit.
+        """
+        self.spec = spec
+        self.repo = Path(repo or paths.BASE_DIR)
+        self.params = None
+        self.commit = None
+        self.synergy = synergy
+        self.reference = reference
+        if spec == WORKTREE:
+            self.kind, self.label = WORKTREE, WORKTREE
+        elif spec.endswith(".json") and Path(spec).is_file():
+            self.kind, self.label = "params", Path(spec).name
+            self.params = ScoringParams.load(spec)
+        else:
+            result = subprocess.run(
+                ["git", "rev-parse", "--verify", "--quiet", f"{spec}^{{commit}}"],
+                cwd=self.repo,
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                raise ValueError(f"{spec!r} is not a weights file or a git ref.")
+            self.kind = "ref"
+            self.commit = result.stdout.strip()
+            self.label = f"{spec} ({self.commit[:7]})"
+
+    def score(self, corpus, workers=None):
+        """
+        Score every lobby of the corpus with the model tree's own `batch`.
+
+        Args:
+            corpus (Corpus): Lobbies.
+            workers (int, optional): Worker processes of the `batch` run.
+
+        Returns:
+            np.ndarray: `(lobbies, width)` scores aligned with `corpus.available`;
+            `-inf` at padding and for every entry of a lobby the model failed on.
+
+        Raises:
+            ValueError: If the `batch` run failed without writing scores.
+        """
+        with tempfile.TemporaryDirectory(prefix="backtest-") as tmp:
+            tmp = Path(tmp)
+            tree = self.repo
+            if self.kind == "ref":
+                tree = tmp / "tree"
+                self._export(tree)
+            corpus.write(tmp / "lobbies.jsonl")
+            output = tmp / "scores.csv"
+            command = [
+                sys.executable,
+                "-m",
+                "src.core.batch",
+                str(tmp / "lobbies.jsonl"),
+            ]
+            command += ["--format", "csv", "-o", str(output)]
+            if workers:
+                command += ["--workers", str(workers)]
+            if self.kind == "params":
+                command += ["--params", str(Path(self.spec).resolve())]
+            if self.synergy:
+                command.append("--synergy")
+            if self.reference:
+                command.append("--reference")
+            result = subprocess.run(command, cwd=tree, capture_output=True, text=True)
+            # `batch` exits with 1 when some lobbies failed; their rows are missing
+            if result.returncode not in (0, 1) or not output.exists():
+                raise ValueError(
+                    f"{self.label} could not score the corpus:\n{result.stderr.strip()}"
+                )
+            with open(output, "r", encoding="utf-8") as f:
+                return _align_csv(f, corpus)
+
+    def _export(self, directory):
+        """Extract the ref's tree into `directory`."""
+        archive = subprocess.run(
+            ["git", "archive", "--format=tar", self.commit],
+            cwd=self.repo,
+            check=True,
+            capture_output=True,
+        ).stdout
+        directory.mkdir(parents=True)
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(directory, filter="data")
+        if not (directory / "src" / "core" / "batch.py").exists():
+            raise ValueError(f"{self.label} has no src/core/batch.py to score with.")
+
+
+def _align_csv(source, corpus):
+    """Place `batch` CSV scores into the corpus layout; missing lobbies stay `-inf`."""
+    rows = list(csv.DictReader(source))
+    scores = np.full(corpus.available.shape, -np.inf)
+    if not rows:
+        return scores
+    index = np.array([int(r["line"]) for r in rows]) - 1
+    cids = np.array([int(r["cid"]) for r in rows])
+    column = np.argmax(corpus.available[index] == cids[:, None], axis=1)
+    scores[index, column] = [float(r["score"]) for r in rows]
+    return scores
+
+
+def average_ranks(scores, mask):
+    """
+    Rank scores within each lobby; 1 is best and ties share the average rank.
+
+    Args:
+        scores (np.ndarray): `(lobbies, width)` scores.
+        mask (np.ndarray): `(lobbies, width)` real entries.
+
+    Returns:
+        np.ndarray: `(lobbies, width)` ranks; NaN at padding.
+    """
+    other = mask[:, None, :]
+    greater = ((scores[:, None, :] > scores[:, :, None]) & other).sum(axis=2)
+    equal = ((scores[:, None, :] == scores[:, :, None]) & other).sum(axis=2)
+    return np.where(mask, 1 + greater + (equal - 1) / 2, np.nan)
+
+
+def spearman(a, b, mask):
+    """
+    Spearman rank correlation of two score matrices, per lobby.
+
+    Args:
+        a, b (np.ndarray): `(lobbies, width)` scores.
+        mask (np.ndarray): `(lobbies, width)` entries to compare.
+
+    Returns:
+        np.ndarray: `(lobbies,)` correlations; NaN where a ranking is constant.
+    """
+    ra, rb = average_ranks(a, mask), average_ranks(b, mask)
+    count = mask.sum(axis=1, keepdims=True)
+    da = np.where(mask, ra - np.nansum(ra, axis=1, keepdims=True) / count, 0.0)
+    db = np.where(mask, rb - np.nansum(rb, axis=1, keepdims=True) / count, 0.0)
+    denominator = np.sqrt((da**2).sum(axis=1) * (db**2).sum(axis=1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, (da * db).sum(axis=1) / denominator, np.nan)
+
+
+def kendall(a, b, mask):
+    """
+    Kendall's tau-b of two score matrices, per lobby.
+
+    Args:
+        a, b (np.ndarray): `(lobbies, width)` scores.
+        mask (np.ndarray): `(lobbies, width)` entries to compare.
+
+    Returns:
+        np.ndarray: `(lobbies,)` tau-b; NaN where a ranking is constant.
+    """
+    pairs = mask[:, :, None] & mask[:, None, :]
+    pairs &= np.triu(np.ones(pairs.shape[1:], dtype=bool), k=1)
+    with np.errstate(invalid="ignore"):
+        sa = np.sign(a[:, :, None] - a[:, None, :])
+        sb = np.sign(b[:, :, None] - b[:, None, :])
+        concordance = np.where(pairs, sa * sb, 0.0).sum(axis=(1, 2))
+        untied_a = (pairs & (sa != 0)).sum(axis=(1, 2))
+        untied_b = (pairs & (sb != 0)).sum(axis=(1, 2))
+        denominator = np.sqrt(untied_a * untied_b)
+        return np.where(denominator > 0, concordance / denominator, np.nan)
+
+
+def compare(corpus, base, candidate, top=TOP_DISAGREEMENTS):
+    """
+    Compare two models' scores over a corpus.
+
+    Args:
+        corpus (Corpus): Lobbies.
+        base, candidate (np.ndarray): `(lobbies, width)` scores of each model.
+        top (int): Number of largest disagreements to list.
+
+    Returns:
+        dict: `compared` lobby count, `failed` (lobbies a model could not
+        score), mean `spearman` and `kendall`, `top1_agreement` and the
+        `disagreements`.
+    """
+    mask = corpus.mask
+    scored = np.isfinite(base).any(axis=1) & np.isfinite(candidate).any(axis=1)
+    valid = scored & (mask.sum(axis=1) > 1)
+    rho = np.full(len(corpus), np.nan)
+    tau = np.full(len(corpus), np.nan)
+    for start in range(0, len(corpus), BLOCK):
+        part = slice(start, start + BLOCK)
+        rho[part] = spearman(base[part], candidate[part], mask[part])
+        tau[part] = kendall(base[part], candidate[part], mask[part])
+
+    first_base = base.argmax(axis=1)
+    first_candidate = candidate.argmax(axis=1)
+    rows = np.arange(len(corpus))
+    fell_to = 1 + (candidate > candidate[rows, first_base][:, None]).sum(axis=1)
+
+    order = [
+        i
+        for i in np.lexsort((-fell_to, np.nan_to_num(rho, nan=1.0)))
+        if valid[i] and (first_base[i] != first_candidate[i] or rho[i] < 1)
+    ]
+    compared = int(valid.sum())
+    return {
+        "compared": compared,
+        "failed": int(len(corpus) - scored.sum()),
+        "spearman": float(np.nanmean(rho[valid])) if compared else None,
+        "kendall": float(np.nanmean(tau[valid])) if compared else None,
+        "top1_agreement": (
+            float((first_base == first_candidate)[valid].mean()) if compared else None
+        ),
+        "disagreements": [
+            {
+                "line": corpus.lines[i],
+                "player": int(corpus.available[i, 0]),
+                "base_top": int(corpus.available[i, first_base[i]]),
+                "candidate_top": int(corpus.available[i, first_candidate[i]]),
+                "base_top_rank": int(fell_to[i]),
+                "spearman": None if np.isnan(rho[i]) else round(float(rho[i]), 4),
+                "kendall": None if np.isnan(tau[i]) else round(float(tau[i]), 4),
+            }
+            for i in order[:top]
+        ],
+    }
+
+
+def backtest(corpus, base, candidate, workers=None, top=TOP_DISAGREEMENTS):
+    """
+    Score a corpus with two models concurrently and compare them.
+
+    Args:
+        corpus (Corpus): Lobbies.
+        base, candidate (ModelVersion): Models to compare.
+        workers (int, optional): Worker processes per ref model.
+        top (int): Number of largest disagreements to list.
+
+    Returns:
+        dict: `base` and `candidate` labels, `lobbies`, `skipped`, per-model
+        `seconds` and the `compare` results.
+    """
+    seconds = {}
+
+    def run(model):
+        start = time.perf_counter()
+        scores = model.score(corpus, workers)
+        seconds[model.label] = round(time.perf_counter() - start, 3)
+        return scores
+
+    with ThreadPoolExecutor(2) as executor:
+        base_scores, candidate_scores = executor.map(run, (base, candidate))
+    return {
+        "base": base.label,
+        "candidate": candidate.label,
+        "lobbies": len(corpus),
+        "skipped": corpus.skipped,
+        "seconds": seconds,
+        **compare(corpus, base_scores, candidate_scores, top),
+    }
+
+
+def format_report(report):
+    """Render a backtest report as text."""
+
+    def number(value, spec):
+        return "n/a" if value is None else format(value, spec)
+
+    lines = [
+        f"base        {report['base']}",
+        f"candidate   {report['candidate']}",
+        f"lobbies     {report['lobbies']} ({report['skipped']} skipped, "
+        f"{report['failed']} failed, {report['compared']} compared)",
+        f"spearman    {number(report['spearman'], '.4f')}",
+        f"kendall     {number(report['kendall'], '.4f')}",
+        f"top-1       {number(report['top1_agreement'], '.2%')}",
+    ]
+    if report["disagreements"]:
+        lines.append("largest disagreements:")
+    for d in report["disagreements"]:
+        lines.append(
+            f"  line {d['line']:>7}  top {d['base_top']:>4} -> {d['candidate_top']:>4}"
+            f"  (base top now #{d['base_top_rank']})  spearman {d['spearman']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Run a backtest and print the report."""
+    parser = argparse.ArgumentParser(description="Backtest a scoring-model change.")
+    parser.add_argument("corpus", help="JSONL file of grouped lobbies.")
+    parser.add_argument("--base", default="HEAD", help="Base model (default: HEAD).")
+    parser.add_argument(
+        "--candidate", default=WORKTREE, help="Candidate model (default: worktree)."
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=TOP_DISAGREEMENTS)
+    parser.add_argument("--synergy", action="store_true", help="Enable synergy.")
+    parser.add_argument(
+        "--reference", action="store_true", help="Normalize against the reference."
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    try:
+        base, candidate = (
+            ModelVersion(spec, synergy=args.synergy, reference=args.reference)
+            for spec in (args.base, args.candidate)
+        )
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    corpus = Corpus.read(args.corpus, ScoringTables.load().rows)
+    try:
+        report = backtest(corpus, base, candidate, args.workers, args.top)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+batch.py - Streaming Batch Evaluation of Grouped Lobbies.
+
+Scores a JSONL file of grouped lobbies (the `sanitize_champion_data` output
+format, one `{"team": [...], "bench": [...], "player": [...]}` per line) and
+writes ranked results.
+
+Input lines are read lazily and handed to a process pool in chunks. Each
+worker holds a `WarmEvaluator`, parses and evaluates its chunk and returns
+the already-formatted output text. At most `workers * PENDING_PER_WORKER`
+chunks are in flight, and chunks are written in input order, so memory use
+is bounded regardless of the input size and the output lines up with the
+input.
+
+Lobbies are scored with the production evaluator by default. `--params`
+scores with a weights file (see `ScoringParams.load`) instead, and
+`--synergy` and `--reference` enable those evaluator stages.
+
+Output formats:
+    - jsonl: One object per input line: `{"line": n, "player", "team", "bench",
+      "champions": [...]}` with champions ranked by score, or
+      `{"line": n, "error": ...}` for lobbies that could not be evaluated.
+    - csv: Long (columnar) format with one row per available champion:
+      `line,rank,cid,name,score,norm_gain,norm_wr,raw_wr,is_player`.
+      Failed lobbies are omitted and reported on stderr.
+
+Functions:
+    - evaluate_lines(lines, fmt, workers, chunk_size, model): Yields formatted output in input order.
+    - run_batch(source, out, fmt, workers, chunk_size, model): Evaluates a stream and returns counters.
+
+Usage:
+Run from the repository root. Reads stdin when no input file is given and
+writes stdout when no output file is given.
+
+Example:
+python
+    python -m src.core.batch lobbies.jsonl -o scores.jsonl --workers 8
+    cat lobbies.jsonl | python -m src.core.batch --format csv > scores.csv
+    python -m src.core.batch lobbies.jsonl --params data/assets/weights/v0001.json --reference
+"""
+
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from contextlib import ExitStack
+from itertools import islice
+
+from src.core.daemon.server import WarmEvaluator, pool_to_dict
+from src.core.reference import load_reference
+from src.core.scoring import ScoringParams
+from src.core.synergy import load_synergy
+
+CHUNK_SIZE = 256
+PENDING_PER_WORKER = 4
+FORMATS = ("jsonl", "csv")
+CSV_COLUMNS = [
+    "line",
+    "rank",
+    "cid",
+    "name",
+    "score",
+    "norm_gain",
+    "norm_wr",
+    "raw_wr",
+    "is_player",
+]
+
+_warm = None
+
+
+def _init_worker(model=None):
+    """
+    Load the warm evaluator once per process.
+
+    Args:
+        model (dict, optional): Optional `params` (weights file path), `synergy`
+            and `reference` settings; the production evaluator when omitted.
+    """
+    global _warm
+    model = model or {}
+    params = ScoringParams.load(model["params"]) if model.get("params") else None
+    _warm = WarmEvaluator(
+        load_synergy() if model.get("synergy") else None,
+        params,
+        load_reference(params) if model.get("reference") else None,
+    )
+
+
+def _ranked(grouped):
+    """Evaluate a lobby and return its result with champions ranked by score."""
+    result = pool_to_dict(_warm.evaluate(grouped))
+    result["champions"].sort(key=lambda c: c["score"], reverse=True)
+    return result
+
+
+def evaluate_chunk(chunk, fmt="jsonl"):
+    """
+    Parse, evaluate and format a chunk of input lines.
+
+    Args:
+        chunk (list[tuple[int, str]]): `(line_number, raw_line)` pairs.
+        fmt (str): One of `FORMATS`.
+
+    Returns:
+        tuple[str, list[str]]: The formatted output text and one message per
+        lobby that could not be evaluated.
+    """
+    if _warm is None:
+        _init_worker()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    errors = []
+    for line_no, text in chunk:
+        try:
+            result = _ranked(json.loads(text))
+        except Exception as e:
+            message = f"{type(e).__name__}: {e}"
+            errors.append(f"line {line_no}: {message}")
+            if fmt == "jsonl":
+                buffer.write(json.dumps({"line": line_no, "error": message}) + "\n")
+            continue
+
+        if fmt == "jsonl":
+            buffer.write(
+                json.dumps({"line": line_no, **result}, separators=(",", ":")) + "\n"
+            )
+        else:
+            for rank, champ in enumerate(result["champions"], 1):
+                writer.writerow(
+                    [
+                        line_no,
+                        rank,
+                        champ["cid"],
+                        champ["name"],
+                        champ["score"],
+                        champ["norm_gain"],
+                        champ["norm_wr"],
+                        champ["raw_wr"],
+                        int(champ["cid"] == result["player"]),
+                    ]
+                )
+    return buffer.getvalue(), errors
+
+
+def _chunks(lines, chunk_size):
+    """Group non-blank input lines into numbered chunks."""
+    numbered = ((n, line) for n, line in enumerate(lines, 1) if line.strip())
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def evaluate_lines(lines, fmt="jsonl", workers=None, chunk_size=CHUNK_SIZE, model=None):
+    """
+    Evaluate grouped lobbies and yield formatted output in input order.
+
+    Args:
+        lines (Iterable[str]): JSON lines, each holding one grouped lobby.
+        fmt (str): One of `FORMATS`.
+        workers (int, optional): Worker processes. Defaults to `os.cpu_count()`;
+            1 evaluates in-process.
+        chunk_size (int): Lobbies handed to a worker per task.
+        model (dict, optional): Evaluator settings, see `_init_worker`.
+
+    Yields:
+        tuple[str, list[str], int]: Formatted text, error messages and the
+        number of lobbies in each chunk.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; expected one of {FORMATS}")
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(lines, chunk_size)
+
+    if workers == 1:
+        _init_worker(model)
+        for chunk in chunks:
+            yield evaluate_chunk(chunk, fmt) + (len(chunk),)
+        return
+
+    with multiprocessing.Pool(workers, _init_worker, (model,)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((pool.apply_async(evaluate_chunk, (chunk, fmt)), len(chunk)))
+            if len(pending) >= workers * PENDING_PER_WORKER:
+                result, size = pending.popleft()
+                yield result.get() + (size,)
+        while pending:
+            result, size = pending.popleft()
+            yield result.get() + (size,)
+
+
+def run_batch(
+    source, out, fmt="jsonl", workers=None, chunk_size=CHUNK_SIZE, model=None
+):
+    """
+    Evaluate a stream of grouped lobbies and write the results.
+
+    Args:
+        source (Iterable[str]): Input JSON lines.
+        out (TextIO): Output stream.
+        fmt (str): One of `FORMATS`.
+        workers (int, optional): Worker processes.
+        chunk_size (int): Lobbies handed to a worker per task.
+        model (dict, optional): Evaluator settings, see `_init_worker`.
+
+    Returns:
+        dict: Counts of `lobbies` and `errors`, the error messages under
+        `messages` (first 100), and the elapsed `seconds`.
+    """
+    start = time.perf_counter()
+    stats = {"lobbies": 0, "errors": 0, "messages": []}
+    if fmt == "csv":
+        csv.writer(out, lineterminator="\n").writerow(CSV_COLUMNS)
+    batches = evaluate_lines(source, fmt, workers, chunk_size, model)
+    for text, errors, size in batches:
+        out.write(text)
+        stats["lobbies"] += size
+        stats["errors"] += len(errors)
+        stats["messages"].extend(errors[: 100 - len(stats["messages"])])
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def main(argv=None):
+    """Parse arguments, run the batch and report throughput on stderr."""
+    parser = argparse.ArgumentParser(description="Batch-evaluate grouped lobbies.")
+    parser.add_argument("input", nargs="?", help="JSONL input (default: stdin).")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout).")
+    parser.add_argument("--format", choices=FORMATS, default="jsonl")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--params", help="Weights file (default: current weights).")
+    parser.add_argument("--synergy", action="store_true", help="Enable synergy.")
+    parser.add_argument(
+        "--reference", action="store_true", help="Normalize against the reference."
+    )
+    args = parser.parse_args(argv)
+    model = {
+        "params": args.params,
+        "synergy": args.synergy,
+        "reference": args.reference,
+    }
+
+    # Only close the files opened here, never stdin or stdout
+    with ExitStack() as stack:
+        source = sys.stdin
+        if args.input:
+            source = stack.enter_context(open(args.input, "r", encoding="utf-8"))
+        out = sys.stdout
+        if args.output:
+            out = stack.enter_context(
+                open(args.output, "w", encoding="utf-8", newline="")
+            )
+        stats = run_batch(
+            source, out, args.format, args.workers, args.chunk_size, model
+        )
+
+    for message in stats["messages"]:
+        print(message, file=sys.stderr)
+    rate = stats["lobbies"] / stats["seconds"] if stats["seconds"] else 0.0
+    print(
+        f"Evaluated {stats['lobbies']} lobbies ({stats['errors']} failed) "
+        f"in {stats['seconds']:.2f}s: {rate:.0f} lobbies/s",
+        file=sys.stderr,
+    )
+    return 1 if stats["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
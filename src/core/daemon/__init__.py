@@ -0,0 +1,21 @@
+"""
+daemon - Warm Evaluation Daemon.
+
+This subpackage runs the evaluator as a long-lived local service. The daemon
+loads champion metadata, role weights and normalized win rates once and
+answers evaluation requests over a local socket, so callers skip the cold
+start and disk reads of `Evaluator(grouped)`.
+
+Modules:
+- protocol: Length-prefixed JSON framing and socket addressing.
+- server: The daemon, its warm evaluation state and request micro-batching.
+- client: Blocking client and command-line interface.
+
+Usage:
+Start the daemon, then query it from scripts or the command line.
+
+Example:
+python
+    python -m src.core.daemon.server
+    python -m src.core.daemon.client evaluate --team 136 64 54 875 498 --bench 203 517 --player 498
+"""
@@ -0,0 +1,196 @@
+"""
+client.py - Client and Command-Line Interface for the Evaluation Daemon.
+
+Classes:
+    - DaemonClient: Blocking client holding one connection to the daemon.
+
+Usage:
+Start the daemon first (`python -m src.core.daemon.server`), then run from
+the repository root. Results are printed as JSON.
+
+Example:
+python
+    python -m src.core.daemon.client ping
+    python -m src.core.daemon.client evaluate --team 136 64 54 875 498 --bench 203 517 --player 498
+    python -m src.core.daemon.client explain --team 136 64 54 875 498 --bench 203 517 --player 498
+    python -m src.core.daemon.client sensitivity --team 136 64 54 875 498 --bench 203 517 --player 498
+    python -m src.core.daemon.client evaluate-many lobbies.jsonl
+"""
+
+import argparse
+import json
+import sys
+
+from src.core.daemon.protocol import (
+    DEFAULT_ADDRESS,
+    connect,
+    parse_address,
+    recv_frame,
+    send_frame,
+)
+
+
+class DaemonClient:
+    """
+    Blocking client holding one connection to the evaluation daemon.
+
+    Attributes:
+        address (tuple[str, int] | Path): Daemon address.
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, timeout=10.0):
+        """
+        Connect to the daemon.
+
+        Raises:
+            OSError: If the daemon is not running.
+        """
+        self.address = address
+        self._sock = connect(address, timeout)
+        self._next_id = 0
+
+    def call(self, method, **params):
+        """
+        Send a request and wait for its response.
+
+        Args:
+            method (str): Daemon method name.
+            **params: Method parameters.
+
+        Returns:
+            The method's result.
+
+        Raises:
+            RuntimeError: If the daemon reports an error.
+            ConnectionError: If the daemon closes the connection.
+        """
+        self._next_id += 1
+        send_frame(
+            self._sock, {"id": self._next_id, "method": method, "params": params}
+        )
+        response = recv_frame(self._sock)
+        if response is None:
+            raise ConnectionError("Daemon closed the connection.")
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response["result"]
+
+    def ping(self):
+        """Return the daemon version and request counters."""
+        return self.call("ping")
+
+    def evaluate(self, grouped):
+        """
+        Evaluate one lobby.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+
+        Returns:
+            dict: Evaluated lobby (see `server.pool_to_dict`).
+        """
+        return self.call("evaluate", **grouped)
+
+    def evaluate_many(self, lobbies):
+        """
+        Evaluate several lobbies in one round trip.
+
+        Args:
+            lobbies (list[dict]): Grouped lobbies.
+
+        Returns:
+            list[dict]: Evaluated lobbies, in input order.
+        """
+        return self.call("evaluate_many", lobbies=list(lobbies))
+
+    def explain(self, grouped):
+        """
+        Return the per-category breakdown of every available champion's score.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+
+        Returns:
+            dict: Explanation (see `WarmEvaluator.explain`).
+        """
+        return self.call("explain", **grouped)
+
+    def sensitivity(self, grouped, samples=None, seed=None):
+        """
+        Return how stable the lobby's ranking is under perturbed scoring parameters.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+            samples (int, optional): Number of perturbed parameter sets.
+            seed (int, optional): Random seed.
+
+        Returns:
+            dict: Report (see `sensitivity.analyze`).
+        """
+        options = {"samples": samples, "seed": seed}
+        return self.call(
+            "sensitivity",
+            **grouped,
+            **{k: v for k, v in options.items() if v is not None},
+        )
+
+    def close(self):
+        """Close the connection."""
+        self._sock.close()
+
+    def __enter__(self):
+        """Return the client for use in a `with` block."""
+        return self
+
+    def __exit__(self, *exc):
+        """Close the connection when leaving a `with` block."""
+        self.close()
+
+
+def main():
+    """Parse arguments, send one request and print the result."""
+    parser = argparse.ArgumentParser(description="Evaluation daemon client.")
+    parser.add_argument(
+        "--address",
+        type=parse_address,
+        default=DEFAULT_ADDRESS,
+        help="Unix socket path or host:port.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("ping")
+    for name in ("evaluate", "explain", "sensitivity"):
+        lobby = commands.add_parser(name)
+        lobby.add_argument("--team", type=int, nargs="+", required=True)
+        lobby.add_argument("--bench", type=int, nargs="*", default=[])
+        lobby.add_argument("--player", type=int, required=True)
+    many = commands.add_parser("evaluate-many")
+    many.add_argument(
+        "input", nargs="?", help="JSONL file of grouped lobbies (default: stdin)."
+    )
+    args = parser.parse_args()
+
+    try:
+        client = DaemonClient(args.address)
+    except OSError as e:
+        print(f"Could not reach the daemon at {args.address}: {e}", file=sys.stderr)
+        return 1
+
+    with client:
+        if args.command == "ping":
+            result = client.ping()
+        elif args.command == "evaluate-many":
+            source = (
+                open(args.input, "r", encoding="utf-8") if args.input else sys.stdin
+            )
+            with source:
+                lobbies = [json.loads(line) for line in source if line.strip()]
+            result = client.evaluate_many(lobbies)
+        else:
+            grouped = {"team": args.team, "bench": args.bench, "player": [args.player]}
+            result = getattr(client, args.command)(grouped)
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
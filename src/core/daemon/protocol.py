@@ -0,0 +1,144 @@
+"""
+protocol.py - Framing and Addressing for the Evaluation Daemon.
+
+Messages are UTF-8 JSON objects, each preceded by its length as a 4-byte
+big-endian unsigned integer:
+
+    request:   {"id": int, "method": str, "params": dict}
+    response:  {"id": int, "result": ...}  or  {"id": int, "error": str}
+
+The daemon listens on a Unix domain socket. Where `AF_UNIX` is unavailable
+(e.g. CPython on Windows) it falls back to TCP on the loopback interface.
+
+Functions:
+    - encode_frame(message): Serializes a message into a framed byte string.
+    - send_frame(sock, message): Writes one framed message to a socket.
+    - recv_frame(sock): Reads one framed message from a socket.
+    - parse_address(text): Parses a socket path or `host:port` string.
+    - connect(address, timeout): Opens a client connection to the daemon.
+"""
+
+import json
+import socket
+import struct
+import tempfile
+from pathlib import Path
+
+HAS_UNIX_SOCKETS = hasattr(socket, "AF_UNIX")
+SOCKET_PATH = Path(tempfile.gettempdir()) / "nomad-daemon.sock"
+TCP_ADDRESS = ("127.0.0.1", 47913)
+DEFAULT_ADDRESS = SOCKET_PATH if HAS_UNIX_SOCKETS else TCP_ADDRESS
+
+MAX_FRAME = 16 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+
+
+def encode_frame(message):
+    """
+    Serialize a message into a length-prefixed JSON frame.
+
+    Args:
+        message (dict): JSON-serializable message.
+
+    Returns:
+        bytes: Frame ready to be written to a socket.
+
+    Raises:
+        ValueError: If the encoded message exceeds `MAX_FRAME` bytes.
+    """
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if len(payload) > MAX_FRAME:
+        raise ValueError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME}.")
+    return _LENGTH.pack(len(payload)) + payload
+
+
+def send_frame(sock, message):
+    """
+    Write one framed message to a socket.
+
+    Args:
+        sock (socket.socket): Connected socket.
+        message (dict): JSON-serializable message.
+    """
+    sock.sendall(encode_frame(message))
+
+
+def _recv_exact(sock, size):
+    """Read exactly `size` bytes, or return None if the peer closed first."""
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 65536))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock):
+    """
+    Read one framed message from a socket.
+
+    Args:
+        sock (socket.socket): Connected socket.
+
+    Returns:
+        dict | None: The decoded message, or None if the peer closed the
+        connection cleanly between frames.
+
+    Raises:
+        ValueError: If the frame is oversized or not valid JSON.
+        ConnectionError: If the connection drops in the middle of a frame.
+    """
+    header = _recv_exact(sock, _LENGTH.size)
+    if header is None:
+        return None
+    (size,) = _LENGTH.unpack(header)
+    if size > MAX_FRAME:
+        raise ValueError(f"Frame of {size} bytes exceeds {MAX_FRAME}.")
+    payload = _recv_exact(sock, size)
+    if payload is None:
+        raise ConnectionError("Connection closed in the middle of a frame.")
+    return json.loads(payload)
+
+
+def parse_address(text):
+    """
+    Parse a daemon address from the command line.
+
+    Args:
+        text (str): Either `host:port` or a Unix socket path.
+
+    Returns:
+        tuple[str, int] | Path: TCP address or socket path.
+    """
+    host, sep, port = text.rpartition(":")
+    if sep and host and port.isdigit():
+        return host, int(port)
+    return Path(text)
+
+
+def connect(address=DEFAULT_ADDRESS, timeout=None):
+    """
+    Open a client connection to the daemon.
+
+    Args:
+        address (tuple[str, int] | Path): TCP address or Unix socket path.
+        timeout (float, optional): Socket timeout in seconds.
+
+    Returns:
+        socket.socket: Connected socket.
+    """
+    if isinstance(address, tuple):
+        sock = socket.create_connection(address, timeout=timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(address))
+    except OSError:
+        sock.close()
+        raise
+    return sock
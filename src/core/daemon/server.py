@@ -0,0 +1,653 @@
+"""
+server.py - Warm Evaluation Daemon Server.
+
+Keeps champion metadata, role weights and normalized win rates in memory and
+serves evaluation requests over a local socket (see `protocol`). Each
+connection is handled by its own thread, but every request is funnelled
+through a single `MicroBatcher`: requests that arrive while a batch is being
+evaluated are collected and handled together on the next wake-up. All lobbies
+of a batch's `evaluate` and `evaluate_many` requests are scored in one
+vectorized pass (`WarmEvaluator.evaluate_batch`), so the per-lobby cost falls
+as more concurrent clients share a batch.
+
+Methods:
+    - ping: Returns the app version and request/batch counters.
+    - evaluate: `params` is a grouped lobby (`team`, `bench`, `player`);
+      returns the evaluated lobby.
+    - evaluate_many: `params` is `{"lobbies": [grouped, ...]}`; returns a list
+      of evaluated lobbies.
+    - explain: `params` is a grouped lobby; returns the per-category breakdown
+      of every available champion's composition gain.
+    - sensitivity: `params` is a grouped lobby, optionally with `samples` and
+      `seed`; returns each available champion's probability of ranking first
+      under perturbed scoring parameters (see `sensitivity.analyze`).
+
+Classes:
+    - WarmEvaluator: Evaluator backed by preloaded static data.
+    - MicroBatcher: Collects concurrent requests into batches on one worker thread.
+    - EvaluationDaemon: Socket server dispatching requests to the warm evaluator.
+
+Functions:
+    - pool_to_dict(pool): Converts an evaluated ChampionPool to a JSON-ready dict.
+
+Usage:
+Run from the repository root; stop with Ctrl+C.
+
+Example:
+python
+    python -m src.core.daemon.server
+    python -m src.core.daemon.server --address 127.0.0.1:47913
+"""
+
+import argparse
+import queue
+import socketserver
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from src.__version__ import __version__ as version
+from src.api.client.champion import ChampionState, load_champions
+from src.core import evaluator, sensitivity
+from src.core.daemon.protocol import (
+    DEFAULT_ADDRESS,
+    connect,
+    parse_address,
+    recv_frame,
+    send_frame,
+)
+from src.core.scoring import (
+    MAX_TEAMMATES,
+    LobbyBatch,
+    ParamArrays,
+    ScoringParams,
+    ScoringTables,
+    base_vectors,
+)
+
+MAX_BATCH = 64
+MAX_DELAY = 0.0
+
+_STOP = object()
+
+
+def pool_to_dict(pool):
+    """
+    Convert an evaluated champion pool into a JSON-ready dictionary.
+
+    Args:
+        pool (ChampionPool): Evaluated champion pool.
+
+    Returns:
+        dict: `player`, `team`, `bench` (in score order) champion IDs and the
+        evaluated metrics of every available champion under `champions`.
+    """
+    return {
+        "player": int(pool.player.cid),
+        "team": [int(champ.cid) for champ in pool.team],
+        "bench": [int(champ.cid) for champ in pool.bench],
+        "champions": [
+            {
+                "cid": int(champ.cid),
+                "name": champ.meta.name,
+                "score": float(champ.score),
+                "raw_gain": float(champ.raw_gain),
+                "norm_gain": float(champ.norm_gain),
+                "raw_wr": float(champ.raw_wr),
+                "norm_wr": float(champ.norm_wr),
+            }
+            for champ in pool.available
+        ],
+    }
+
+
+class WarmEvaluator:
+    """
+    Evaluator backed by preloaded static data.
+
+    Produces the same results as `Evaluator(grouped).evaluate()` without
+    touching the disk per request.
+
+    Attributes:
+        metadata (dict[str, ChampionMetadata]): Champion ID to static metadata.
+        norm_wr (dict[str, tuple[float, float]]): Output of `normalize_win_rates`.
+        synergy (SynergyMatrix | None): Pairwise synergy stage, if enabled.
+        params (ScoringParams | None): Scoring parameters; the defaults when None.
+        reference (GainReference | None): Reference gain normalization, if enabled.
+    """
+
+    def __init__(self, synergy=None, params=None, reference=None):
+        """
+        Load champion metadata, role weights and win rates.
+
+        Args:
+            synergy (SynergyMatrix, optional): Enables the pairwise synergy stage.
+            params (ScoringParams, optional): Role weights, curve constants and blend.
+            reference (GainReference, optional): Enables reference gain normalization.
+        """
+        self.synergy = synergy
+        self.params = params
+        self.reference = reference
+        self.metadata = {cid: state.meta for cid, state in load_champions().items()}
+        self.norm_wr = evaluator.normalize_win_rates(
+            evaluator.load_win_rates(evaluator.wr)
+        )
+        evaluator.load_role_weights()
+        self._tables = None
+        self._arrays = None
+
+    @property
+    def tables(self):
+        """ScoringTables: Champion tables, built on first use."""
+        if self._tables is None:
+            self._tables = ScoringTables(self.metadata.values(), self.norm_wr)
+        return self._tables
+
+    def _states(self, grouped):
+        """Build fresh champion states for the champions in a lobby."""
+        cids = list(grouped["team"]) + list(grouped["bench"]) + list(grouped["player"])
+        try:
+            return {str(cid): ChampionState(self.metadata[str(cid)]) for cid in cids}
+        except KeyError as e:
+            raise ValueError(f"Unknown champion ID {e.args[0]}") from None
+
+    def evaluate(self, grouped):
+        """
+        Evaluate a lobby.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+
+        Returns:
+            ChampionPool: Pool with scores and metadata populated.
+        """
+        return evaluator.Evaluator(
+            grouped,
+            self._states(grouped),
+            self.norm_wr,
+            self.synergy,
+            self.params,
+            self.reference,
+        ).evaluate()
+
+    def explain(self, grouped):
+        """
+        Break down how each available champion's composition gain is made up.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+
+        Returns:
+            dict: `base` category totals of the teammates, and for every
+            available champion (in score order) its evaluated metrics plus,
+            per category, the raw rating, the role-weighted rating and the
+            diminishing-returns gain, which together with `synergy` sum to
+            `raw_gain`.
+        """
+        pool = self.evaluate(grouped)
+        base = evaluator.team_base(pool)
+
+        weights_by_role = self.params.role_weights if self.params else None
+        curve = self.params.curve if self.params else ()
+        explained = pool_to_dict(pool)
+        for entry, champ in zip(explained["champions"], pool.available):
+            entry["primary"] = champ.meta.primary
+            entry["secondary"] = champ.meta.secondary
+            entry["synergy"] = float(champ.synergy)
+            entry["categories"] = {}
+            for cat in evaluator.CATEGORIES:
+                weighted = evaluator.apply_role_weights(champ, cat, weights_by_role)
+                gain = evaluator.diminishing_returns(
+                    base[cat] + weighted, *curve
+                ) - evaluator.diminishing_returns(base[cat], *curve)
+                entry["categories"][cat] = {
+                    "rating": champ.meta.ratings.get(cat, 0),
+                    "weighted": float(weighted),
+                    "gain": float(gain),
+                }
+        explained["champions"].sort(key=lambda c: c["score"], reverse=True)
+        return {"base": base, **explained}
+
+    def sensitivity(self, grouped, samples=sensitivity.SAMPLES, seed=None):
+        """
+        Report how stable a lobby's ranking is under perturbed parameters.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+            samples (int): Number of perturbed parameter sets.
+            seed (int, optional): Random seed.
+
+        Returns:
+            dict: Report (see `sensitivity.analyze`).
+        """
+        return sensitivity.analyze(self.tables, grouped, self.params, samples, seed)
+
+    def evaluate_batch(self, lobbies):
+        """
+        Evaluate many lobbies in one vectorized pass.
+
+        Each result is exactly `pool_to_dict(self.evaluate(grouped))`: raw
+        gains of all lobbies are computed at once with the evaluator's
+        floating-point operations, then normalized and blended per group of
+        lobbies with the same number of available champions. With the synergy
+        stage enabled, lobbies are evaluated one at a time, as are lobbies
+        with more teammates than a `LobbyBatch` holds.
+
+        Args:
+            lobbies (Sequence[dict]): Grouped lobbies.
+
+        Returns:
+            list[dict | Exception]: Evaluated lobby (see `pool_to_dict`), or
+            the error evaluating it raised, in lobby order.
+        """
+        results = [None] * len(lobbies)
+        valid = []
+        for i, grouped in enumerate(lobbies):
+            try:
+                if self.synergy is not None or not self._check(grouped):
+                    results[i] = pool_to_dict(self.evaluate(grouped))
+                else:
+                    valid.append(i)
+            except Exception as e:
+                results[i] = e
+        if not valid:
+            return results
+
+        params = self.params or ScoringParams.default()
+        if self._arrays is None:
+            self._arrays = ParamArrays.from_params(self.tables, [params])
+        batch = LobbyBatch.from_grouped([lobbies[i] for i in valid], self.tables)
+        base = base_vectors(self.tables, batch)[:, None, :]
+        weighted = (
+            self.tables.ratings[batch.available]
+            * self._arrays.multipliers(self.tables, batch.available)[0]
+        )
+
+        # Summed category by category, in the evaluator's order
+        gained = evaluator.diminishing_returns(base + weighted, *params.curve)
+        per_category = gained - evaluator.diminishing_returns(base, *params.curve)
+        raw = per_category[..., 0]
+        for k in range(1, len(evaluator.CATEGORIES)):
+            raw = raw + per_category[..., k]
+
+        counts = batch.mask.sum(axis=1)
+        for width in np.unique(counts):
+            group = np.flatnonzero(counts == width)
+            gains = np.ascontiguousarray(raw[group, :width])
+            if self.reference is not None:
+                stats = [
+                    self.reference.stats(
+                        dict(zip(evaluator.CATEGORIES, base[j, 0].tolist()))
+                    )
+                    for j in group
+                ]
+                mean, std = (np.array(column) for column in zip(*stats))
+            else:
+                mean = np.mean(gains, axis=1)
+                std = np.maximum(np.std(gains, axis=1), 1e-6)
+            norm_gain = np.round(((gains - mean[:, None]) / std[:, None]) * 50, 2)
+            for j, row, norm in zip(group, gains, norm_gain):
+                results[valid[j]] = self._lobby_dict(
+                    lobbies[valid[j]], row, norm, params
+                )
+        evaluator.EVALUATIONS.inc(len(valid))
+        return results
+
+    def _check(self, grouped):
+        """
+        Raise the error `evaluate` would raise for an invalid lobby.
+
+        Returns:
+            bool: Whether the lobby fits a `LobbyBatch`, that is has at most
+            `MAX_TEAMMATES` teammates.
+        """
+        if self.reference is not None:
+            self.reference.check(self.params)
+        self._states(grouped)
+        player = str(grouped["player"][0])
+        return sum(str(c) != player for c in grouped["team"]) <= MAX_TEAMMATES
+
+    def _lobby_dict(self, grouped, raw_gain, norm_gain, params):
+        """Blend one lobby's normalized gains and win rates into `pool_to_dict` form."""
+        available = [str(grouped["player"][0])] + [str(c) for c in grouped["bench"]]
+        win_rates = [self.norm_wr.get(cid, (50.0, 0.0)) for cid in available]
+        norm_wr = np.array([wr[1] for wr in win_rates])
+        scores = np.round(
+            (norm_gain * params.gain_weight) + (norm_wr * params.wr_weight), 2
+        ).tolist()
+        # Stable, like the evaluator's in-place sort of the bench
+        order = [0] + sorted(
+            range(1, len(available)), key=lambda i: scores[i], reverse=True
+        )
+        return {
+            "player": int(available[0]),
+            "team": [int(cid) for cid in grouped["team"]],
+            "bench": [int(available[i]) for i in order[1:]],
+            "champions": [
+                {
+                    "cid": int(available[i]),
+                    "name": self.metadata[available[i]].name,
+                    "score": scores[i],
+                    "raw_gain": float(raw_gain[i]),
+                    "norm_gain": float(norm_gain[i]),
+                    "raw_wr": float(win_rates[i][0]),
+                    "norm_wr": float(win_rates[i][1]),
+                }
+                for i in order
+            ],
+        }
+
+
+class MicroBatcher:
+    """
+    Collects concurrently submitted items into batches on one worker thread.
+
+    The worker blocks for the first item, then takes whatever else is already
+    queued (waiting up to `max_delay` seconds for more) before calling the
+    handler once for the whole batch.
+
+    Attributes:
+        batches (int): Number of batches handled.
+        items (int): Number of items handled.
+    """
+
+    def __init__(self, handler, max_batch=MAX_BATCH, max_delay=MAX_DELAY):
+        """
+        Start the worker thread.
+
+        Args:
+            handler (Callable[[list], list]): Maps a batch of items to results, in order.
+            max_batch (int): Maximum items per batch.
+            max_delay (float): Seconds to wait for more items after the first.
+        """
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.batches = 0
+        self.items = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="MicroBatcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, item):
+        """
+        Queue an item for the next batch.
+
+        Args:
+            item: Item passed to the handler.
+
+        Returns:
+            Future: Resolves to the handler's result for this item.
+        """
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self):
+        """Stop the worker after the queued items are handled."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self, first):
+        """Gather a batch starting with `first`; returns it and whether to stop."""
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    entry = self._queue.get(timeout=remaining)
+                else:
+                    entry = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self):
+        """Worker loop: collect a batch, handle it and resolve its futures."""
+        stop = False
+        while not stop:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch, stop = self._collect(first)
+            try:
+                results = self.handler([item for item, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class _ConnectionHandler(socketserver.BaseRequestHandler):
+    """Reads framed requests from one connection and writes the responses."""
+
+    def handle(self):
+        """Serve requests until the client disconnects."""
+        while True:
+            try:
+                request = recv_frame(self.request)
+            except ValueError as e:
+                send_frame(self.request, {"id": None, "error": f"Bad frame: {e}"})
+                return
+            except OSError:
+                return
+            if request is None:
+                return
+            response = self.server.daemon.batcher.submit(request).result()
+            try:
+                send_frame(self.request, response)
+            except OSError:
+                return
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+
+
+class EvaluationDaemon:
+    """
+    Local evaluation server.
+
+    Attributes:
+        address (tuple[str, int] | Path): Bound TCP address or socket path.
+        warm (WarmEvaluator): Preloaded evaluator shared by all requests.
+        batcher (MicroBatcher): Batches requests from all connections.
+    """
+
+    def __init__(
+        self, address=DEFAULT_ADDRESS, max_batch=MAX_BATCH, max_delay=MAX_DELAY
+    ):
+        """
+        Load the warm state and bind the listening socket.
+
+        Raises:
+            OSError: If another daemon is already listening on `address`.
+        """
+        self.warm = WarmEvaluator()
+        self.methods = {
+            "ping": self._ping,
+            "evaluate": lambda params: self._evaluated([params])[0],
+            "evaluate_many": lambda params: self._evaluated(params["lobbies"]),
+            "explain": self.warm.explain,
+            "sensitivity": lambda params: self.warm.sensitivity(
+                params, params.get("samples", sensitivity.SAMPLES), params.get("seed")
+            ),
+        }
+
+        if isinstance(address, tuple):
+            self._server = _TCPServer(address, _ConnectionHandler)
+            self.address = self._server.server_address[:2]
+        else:
+            self._remove_stale_socket(address)
+            self._server = _UnixServer(str(address), _ConnectionHandler)
+            self.address = address
+        self._server.daemon = self
+        self.batcher = MicroBatcher(self.handle_batch, max_batch, max_delay)
+        self._thread = None
+
+    @staticmethod
+    def _remove_stale_socket(path):
+        """Delete a socket file left behind by a daemon that is no longer running."""
+        if not path.exists():
+            return
+        try:
+            connect(path, timeout=1.0).close()
+        except OSError:
+            path.unlink()
+        else:
+            raise OSError(f"A daemon is already listening on {path}")
+
+    def _ping(self, params):
+        """Report the daemon version and batching counters."""
+        return {
+            "version": version,
+            "requests": self.batcher.items,
+            "batches": self.batcher.batches,
+        }
+
+    def handle(self, request):
+        """
+        Execute one request.
+
+        Args:
+            request (dict): Decoded request message.
+
+        Returns:
+            dict: Response message carrying either `result` or `error`.
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            method = self.methods.get(request.get("method"))
+            if method is None:
+                raise ValueError(f"Unknown method {request.get('method')!r}")
+            return {"id": request_id, "result": method(request.get("params") or {})}
+        except Exception as e:
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+
+    def _evaluated(self, lobbies):
+        """Evaluate lobbies in one pass, raising the first lobby's error."""
+        results = self.warm.evaluate_batch(lobbies)
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+        return results
+
+    def handle_batch(self, requests):
+        """
+        Execute a batch of requests collected by the micro-batcher.
+
+        The lobbies of every `evaluate` and `evaluate_many` request in the
+        batch are evaluated together in one `evaluate_batch` call; other
+        requests are executed one by one.
+
+        Args:
+            requests (list[dict]): Decoded request messages.
+
+        Returns:
+            list[dict]: Responses in request order.
+        """
+        spans, lobbies = {}, []
+        for i, request in enumerate(requests):
+            if not isinstance(request, dict):
+                continue
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                continue
+            if request.get("method") == "evaluate":
+                spans[i] = (len(lobbies), None)
+                lobbies.append(params)
+            elif request.get("method") == "evaluate_many" and isinstance(
+                params.get("lobbies"), list
+            ):
+                spans[i] = (len(lobbies), len(params["lobbies"]))
+                lobbies.extend(params["lobbies"])
+        results = self.warm.evaluate_batch(lobbies) if lobbies else []
+
+        responses = []
+        for i, request in enumerate(requests):
+            if i not in spans:
+                responses.append(self.handle(request))
+                continue
+            start, count = spans[i]
+            stop = start + (1 if count is None else count)
+            evaluated = results[start:stop]
+            error = next((r for r in evaluated if isinstance(r, Exception)), None)
+            if error is not None:
+                response = {"error": f"{type(error).__name__}: {error}"}
+            else:
+                response = {"result": evaluated if count is not None else evaluated[0]}
+            responses.append({"id": request.get("id"), **response})
+        return responses
+
+    def serve_forever(self):
+        """Serve requests until `close()` is called."""
+        self._server.serve_forever(poll_interval=0.05)
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+
+        Returns:
+            EvaluationDaemon: The running daemon.
+        """
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="EvaluationDaemon", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Stop serving, release the socket and stop the batcher."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+        self._server.server_close()
+        self.batcher.close()
+        if not isinstance(self.address, tuple) and self.address.exists():
+            self.address.unlink()
+
+
+def main():
+    """Parse arguments and run the daemon in the foreground."""
+    parser = argparse.ArgumentParser(description="Warm evaluation daemon.")
+    parser.add_argument(
+        "--address",
+        type=parse_address,
+        default=DEFAULT_ADDRESS,
+        help="Unix socket path or host:port.",
+    )
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-delay", type=float, default=MAX_DELAY)
+    args = parser.parse_args()
+
+    daemon = EvaluationDaemon(args.address, args.max_batch, args.max_delay)
+    print(f"Evaluation daemon listening on {daemon.address}")
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down.")
+    finally:
+        daemon.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,47 +6,129 @@ evaluates champion picks based on role weights and win rates,
 and computes optimal team compositions using a modular, class-based design.
 
 Functions:
+    - load_role_weights(): Loads and validates role weights on first use.
     - check_role_weight_sums(): Validates that role weights per role sum to ~5 within a tolerance.
-    - diminishing_returns(x): Applies diminishing returns to scale category scores non-linearly.
-    - apply_role_weights(champ, category): Applies role-based weight multipliers to category values.
+    - diminishing_returns(x, center, scale, rate): Applies diminishing returns to scale category scores non-linearly.
+    - apply_role_weights(champ, category, weights_by_role): Applies role-based weight multipliers to category values.
     - convert_grouped_to_champs(grouped): Initializes a ChampionPool from grouped champ IDs.
     - load_win_rates(filepath): Loads raw win rates from CSV into {cid: raw win rate} dictionary.
     - normalize_win_rates(raw_wr): Converts raw win rates into normalized Z-scores.
     - assign_win_rates(pool): Loads and assigns normalized win rates to each champion.
-    - compute_raw_composition_gains(pool): Calculates each champion’s raw team contribution.
-    - normalize_composition_gains(pool): Normalizes raw gains to Z-scores.
-    - assign_comp_gains(pool): Computes and normalizes composition gains for all available champions.
-    - compute_scores(pool): Computes final score using a weighted sum of composition gain and win rate.
+    - team_base(pool): Sums the teammates' category ratings.
+    - compute_raw_composition_gains(pool, params): Calculates each champion’s raw team contribution.
+    - normalize_composition_gains(pool, reference): Normalizes raw gains to Z-scores.
+    - apply_synergy(pool, synergy): Adds each available champion's pairwise synergy with the teammates.
+    - assign_comp_gains(pool, synergy, params, reference): Computes and normalizes composition gains for all available champions.
+    - compute_scores(pool, params): Computes final score using a weighted sum of composition gain and win rate.
     - evaluator(grouped): Legacy-compatible function wrapper for Evaluator.evaluate().
 
 Classes:
     - Evaluator: Encapsulates the full evaluation pipeline and champion pool.
+
+The diminishing returns constants (`DR_*`) and the score blend (`GAIN_WEIGHT`,
+`WR_WEIGHT`) are the defaults. Stages that take a `params` argument (a
+`ScoringParams` from `scoring.py`) use its role weights and constants instead.
+
+Metrics:
+    - nomad_evaluator_evaluations_total: Completed evaluations.
+    - nomad_evaluator_evaluation_seconds: Evaluation latency histogram.
+    - nomad_evaluator_evaluations_per_minute: Average rate since the first evaluation.
+    - nomad_cache_lookups_total{cache="role_weights", result}: Role weight cache hits and misses.
 """
 
 import json
+import time
+from pathlib import Path
 import numpy as np
-from src.utils import paths
+from src.utils import metrics, paths
+from src.utils.bundle import runtime_bundle
 from src.api.client.champion import load_champions, ChampionPool
 
 weights = paths.ASSETS_DIR / "classes" / "role_weights.json"
 wr = paths.ASSETS_DIR / "dd_wr.csv"
 
-role_weights = {}
-with open(weights, "r", encoding="utf-8") as file:
-    role_weights = json.load(file)
-
+role_weights = None
 role_weight_sum_tolerance = 0.5
 debug = False
 
+DR_CENTER = 5.0
+DR_SCALE = 10.0
+DR_RATE = 4.0
+GAIN_WEIGHT = 0.7
+WR_WEIGHT = 0.3
+CATEGORIES = ["Damage", "Toughness", "Control", "Mobility", "Utility"]
+
+EVALUATIONS = metrics.counter(
+    "nomad_evaluator_evaluations_total", "Completed champion pool evaluations."
+)
+EVALUATION_SECONDS = metrics.histogram(
+    "nomad_evaluator_evaluation_seconds", "Time spent in Evaluator.evaluate()."
+)
+EVALUATIONS_PER_MINUTE = metrics.gauge(
+    "nomad_evaluator_evaluations_per_minute",
+    "Average evaluations per minute since the first evaluation.",
+)
+CACHE_LOOKUPS = metrics.counter(
+    "nomad_cache_lookups_total",
+    "Cache lookups by cache and result.",
+    ["cache", "result"],
+)
+_ROLE_WEIGHTS_HIT = CACHE_LOOKUPS.labels("role_weights", "hit")
+_ROLE_WEIGHTS_MISS = CACHE_LOOKUPS.labels("role_weights", "miss")
+_first_evaluation = None
+
+
+def _evaluations_per_minute():
+    """Return the average evaluation rate since the first evaluation."""
+    if _first_evaluation is None:
+        return 0.0
+    minutes = max(time.perf_counter() - _first_evaluation, 1.0) / 60
+    return EVALUATIONS.value / minutes
+
+
+EVALUATIONS_PER_MINUTE.set_function(_evaluations_per_minute)
+
+
+def load_role_weights():
+    """
+    Load the role weights on first use and validate them.
+
+    Reading is deferred until a champion is first evaluated so that importing
+    this module does no file I/O. The weights come from the compiled asset
+    bundle when it is current, and from `role_weights.json` otherwise.
 
-def check_role_weight_sums():
+    Returns:
+        dict[str, dict[str, float]]: Role name to category weight multipliers.
+    """
+    global role_weights
+    if role_weights is None:
+        _ROLE_WEIGHTS_MISS.inc()
+        bundle = runtime_bundle(weights)
+        if bundle is not None:
+            loaded = bundle.role_weights()
+        else:
+            with open(weights, "r", encoding="utf-8") as file:
+                loaded = json.load(file)
+        check_role_weight_sums(loaded)
+        role_weights = loaded
+    else:
+        _ROLE_WEIGHTS_HIT.inc()
+    return role_weights
+
+
+def check_role_weight_sums(weights_by_role=None):
     """
     Validate that each role's category weights sum to approximately 5.
 
+    Args:
+        weights_by_role (dict, optional): Weights to check. Defaults to the loaded role weights.
+
     Raises:
         ValueError: If the sum of weights for any role falls outside the acceptable tolerance range.
     """
-    for role, weights in role_weights.items():
+    if weights_by_role is None:
+        weights_by_role = load_role_weights()
+    for role, weights in weights_by_role.items():
         total_weight = sum(weights.values())
         if not (
             5 - role_weight_sum_tolerance
@@ -58,10 +140,7 @@ def check_role_weight_sums():
             )
 
 
-check_role_weight_sums()
-
-
-def diminishing_returns(x):
+def diminishing_returns(x, center=DR_CENTER, scale=DR_SCALE, rate=DR_RATE):
     """
     Apply a diminishing returns function to smooth out large category values.
 
@@ -69,14 +148,17 @@ def diminishing_returns(x):
 
     Args:
         x (float): The raw category value to adjust.
+        center (float): Value at which the curve crosses the identity.
+        scale (float): Height of the curve above `center`.
+        rate (float): How quickly returns diminish; smaller is faster.
 
     Returns:
         float: Adjusted value with diminishing returns applied.
     """
-    return 5 + (10 * (1 - np.exp(-(x - 5) / 4)))
+    return center + (scale * (1 - np.exp(-(x - center) / rate)))
 
 
-def apply_role_weights(champ, category):
+def apply_role_weights(champ, category, weights_by_role=None):
     """
     Compute a weighted category value based on the champion's role alignment.
 
@@ -86,16 +168,19 @@ def apply_role_weights(champ, category):
     Args:
         champ (ChampionState): Champion object containing metadata and ratings.
         category (str): One of the 5 rating categories (Damage, Toughness, etc.).
+        weights_by_role (dict, optional): Role weights to use instead of the loaded ones.
 
     Returns:
         float: Role-weighted contribution in the given category.
     """
-    primary = role_weights.get(champ.meta.primary, {}).get(category, 1.0)
-    secondary = role_weights.get(champ.meta.secondary, {}).get(category, 1.0)
+    if weights_by_role is None:
+        weights_by_role = load_role_weights()
+    primary = weights_by_role.get(champ.meta.primary, {}).get(category, 1.0)
+    secondary = weights_by_role.get(champ.meta.secondary, {}).get(category, 1.0)
     return champ.meta.ratings.get(category, 0) * max(primary, secondary)
 
 
-def convert_grouped_to_champs(grouped):
+def convert_grouped_to_champs(grouped, champions=None):
     """
     Convert raw grouped champion ID data into a structured ChampionPool object.
 
@@ -104,11 +189,14 @@ def convert_grouped_to_champs(grouped):
 
     Args:
         grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+        champions (dict[str, ChampionState], optional): Fresh champion states to
+            use instead of loading them from disk.
 
     Returns:
         ChampionPool: Object encapsulating grouped and categorized champions.
     """
-    champions = load_champions()
+    if champions is None:
+        champions = load_champions()
     return ChampionPool(grouped, champions)
 
 
@@ -123,12 +211,18 @@ def load_win_rates(filepath) -> dict[str, float]:
     The CSV is expected to have the format:
         <name>,<champion_id>,<win_rate>...
 
+    When `filepath` is the bundled `dd_wr.csv` and the compiled asset bundle
+    is current, the rates are read from the bundle instead.
+
     Args:
         filepath (str or Path): Path to the CSV file containing win rate data.
 
     Returns:
         dict[str, float]: A mapping of champion IDs to raw win rate percentages.
     """
+    bundle = runtime_bundle(Path(filepath))
+    if bundle is not None:
+        return bundle.win_rates()
     raw_wr = {}
     with open(filepath, "r", encoding="utf-8") as f:
         next(f)
@@ -168,7 +262,7 @@ def normalize_win_rates(raw_wr: dict[str, float]) -> dict[str, tuple[float, floa
     }
 
 
-def assign_win_rates(pool: ChampionPool):
+def assign_win_rates(pool: ChampionPool, norm_wr=None):
     """
     Load and assign raw and normalized win rates to each champion in the pool.
 
@@ -177,9 +271,11 @@ def assign_win_rates(pool: ChampionPool):
 
     Args:
         pool (ChampionPool): Champion pool to update with win rate data.
+        norm_wr (dict[str, tuple[float, float]], optional): Precomputed output of
+            `normalize_win_rates`. Loaded from disk when omitted.
     """
-    raw_wr = load_win_rates(wr)  # TODO: put in loader class
-    norm_wr = normalize_win_rates(raw_wr)
+    if norm_wr is None:
+        norm_wr = normalize_win_rates(load_win_rates(wr))
     if debug:
         print("WR normalization stats:", norm_wr)
     for champ in pool.available + pool.unavailable:
@@ -188,7 +284,24 @@ def assign_win_rates(pool: ChampionPool):
             champ.raw_wr, champ.norm_wr = norm_wr[cid]
 
 
-def compute_raw_composition_gains(pool: ChampionPool):
+def team_base(pool: ChampionPool):
+    """
+    Sum the category ratings of the player's teammates.
+
+    Args:
+        pool (ChampionPool): The pool containing the unavailable champions.
+
+    Returns:
+        dict[str, float]: Category name to the teammates' total rating.
+    """
+    base = {cat: 0 for cat in CATEGORIES}
+    for champ in pool.unavailable:
+        for cat in base:
+            base[cat] += champ.meta.ratings.get(cat, 0)
+    return base
+
+
+def compute_raw_composition_gains(pool: ChampionPool, params=None):
     """
     Compute how much each available champion would improve the current team composition.
 
@@ -197,22 +310,24 @@ def compute_raw_composition_gains(pool: ChampionPool):
 
     Args:
         pool (ChampionPool): The pool containing available and unavailable champions.
+        params (ScoringParams, optional): Role weights and curve constants to use.
     """
-    base = {cat: 0 for cat in ["Damage", "Toughness", "Control", "Mobility", "Utility"]}
-    for champ in pool.unavailable:
-        for cat in base:
-            base[cat] += champ.meta.ratings.get(cat, 0)
+    weights_by_role = params.role_weights if params is not None else None
+    curve = params.curve if params is not None else ()
+    base = team_base(pool)
 
     for champ in pool.available:
         gain = sum(
-            diminishing_returns(base[cat] + apply_role_weights(champ, cat))
-            - diminishing_returns(base[cat])
+            diminishing_returns(
+                base[cat] + apply_role_weights(champ, cat, weights_by_role), *curve
+            )
+            - diminishing_returns(base[cat], *curve)
             for cat in base
         )
         champ.raw_gain = gain
 
 
-def normalize_composition_gains(pool: ChampionPool):
+def normalize_composition_gains(pool: ChampionPool, reference=None):
     """
     Normalize raw composition gains into Z-scores to produce `norm_gain`.
 
@@ -221,29 +336,56 @@ def normalize_composition_gains(pool: ChampionPool):
 
     Args:
         pool (ChampionPool): The champion pool with raw gain values populated.
+        reference (GainReference, optional): Z-score against the reference
+            distribution of the team (see `reference.py`) instead of the
+            available champions.
     """
-    gains = [champ.raw_gain for champ in pool.available]
-    mean, std = np.mean(gains), max(np.std(gains), 1e-6)
+    if reference is not None:
+        mean, std = reference.stats(team_base(pool))
+    else:
+        gains = [champ.raw_gain for champ in pool.available]
+        mean, std = np.mean(gains), max(np.std(gains), 1e-6)
     if debug:
         print(f"Gain normalization: mean={mean:.4f}, std={std:.4f}")
     for champ in pool.available:
         champ.norm_gain = round(((champ.raw_gain - mean) / std) * 50, 2)
 
 
-def assign_comp_gains(pool: ChampionPool):
+def apply_synergy(pool: ChampionPool, synergy):
+    """
+    Add each available champion's synergy with the current teammates to its raw gain.
+
+    Args:
+        pool (ChampionPool): The champion pool with raw gain values populated.
+        synergy (SynergyMatrix): Precomputed pairwise synergy (see `synergy.py`).
+    """
+    gains = synergy.gains(pool.available, pool.unavailable)
+    for champ, gain in zip(pool.available, gains):
+        champ.synergy = float(gain)
+        champ.raw_gain += champ.synergy
+
+
+def assign_comp_gains(pool: ChampionPool, synergy=None, params=None, reference=None):
     """
     Compute and normalize composition gains for all available champions.
 
-    Combines raw gain calculation and Z-score normalization into a single step.
+    Combines raw gain calculation, the optional synergy stage and Z-score
+    normalization into a single step.
 
     Args:
         pool (ChampionPool): Champion pool to update with composition gain data.
+        synergy (SynergyMatrix, optional): Pairwise synergy to add to raw gains.
+        params (ScoringParams, optional): Role weights and curve constants to use.
+        reference (GainReference, optional): Normalizes against the reference
+            distribution; must be built for the same `params`.
     """
-    compute_raw_composition_gains(pool)
-    normalize_composition_gains(pool)
+    compute_raw_composition_gains(pool, params)
+    if synergy is not None:
+        apply_synergy(pool, synergy)
+    normalize_composition_gains(pool, reference)
 
 
-def compute_scores(pool: ChampionPool):
+def compute_scores(pool: ChampionPool, params=None):
     """
     Compute the final score for each available champion.
 
@@ -253,9 +395,17 @@ def compute_scores(pool: ChampionPool):
 
     Args:
         pool (ChampionPool): The pool of champions with norm_gain and norm_wr assigned.
+        params (ScoringParams, optional): Blend weights to use instead of the defaults.
     """
+    gain_weight, wr_weight = (
+        (params.gain_weight, params.wr_weight)
+        if params is not None
+        else (GAIN_WEIGHT, WR_WEIGHT)
+    )
     for champ in pool.available:
-        champ.score = round((champ.norm_gain * 0.7) + (champ.norm_wr * 0.3), 2)
+        champ.score = round(
+            (champ.norm_gain * gain_weight) + (champ.norm_wr * wr_weight), 2
+        )
     pool.bench.sort(key=lambda c: c.score, reverse=True)
 
 
@@ -277,14 +427,38 @@ class Evaluator:
     returning a ChampionPool enriched with scores, ratings, and normalized metrics.
     """
 
-    def __init__(self, grouped):
+    def __init__(
+        self,
+        grouped,
+        champions=None,
+        norm_wr=None,
+        synergy=None,
+        params=None,
+        reference=None,
+    ):
         """
         Initialize the evaluator with grouped champion IDs.
 
         Args:
             grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+            champions (dict[str, ChampionState], optional): Preloaded champion states.
+            norm_wr (dict[str, tuple[float, float]], optional): Preloaded normalized win rates.
+            synergy (SynergyMatrix, optional): Enables the pairwise synergy stage.
+            params (ScoringParams, optional): Role weights, curve constants and
+                blend to use instead of the defaults.
+            reference (GainReference, optional): Enables reference gain
+                normalization; must be built for the same `params`.
+
+        Raises:
+            ValueError: If `reference` was built for other parameters.
         """
-        self.pool = convert_grouped_to_champs(grouped)
+        if reference is not None:
+            reference.check(params)
+        self.pool = convert_grouped_to_champs(grouped, champions)
+        self.norm_wr = norm_wr
+        self.synergy = synergy
+        self.params = params
+        self.reference = reference
 
     def evaluate(self):
         """
@@ -292,15 +466,21 @@ class Evaluator:
 
         Steps:
             1. Assigns and computes normalized winrates
-            2. Compute and normalize compositional gains
+            2. Compute compositional gains, add synergy (if enabled) and normalize
             3. Compute final scores.
 
         Returns:
             ChampionPool: Pool with scores and metadata populated.
         """
-        assign_win_rates(self.pool)
-        assign_comp_gains(self.pool)
-        compute_scores(self.pool)
+        global _first_evaluation
+        start = time.perf_counter()
+        if _first_evaluation is None:
+            _first_evaluation = start
+        assign_win_rates(self.pool, self.norm_wr)
+        assign_comp_gains(self.pool, self.synergy, self.params, self.reference)
+        compute_scores(self.pool, self.params)
+        EVALUATION_SECONDS.observe(time.perf_counter() - start)
+        EVALUATIONS.inc()
         return self.pool
 
 
@@ -0,0 +1,239 @@
+"""
+models.py - Model Registry for Shadow Evaluation.
+
+Runs candidate scoring models next to the production one during champion
+select. The primary model is evaluated with `Evaluator` (through a
+`WarmEvaluator`) and its pool is what the watcher displays. Every other
+model in the registry is a shadow: all shadows are scored together in one
+call to the vectorized core (`scoring.score_batch`), sharing the champion
+tables, the win rate arrays, the team base vector and the synergy gains, and
+their results are written to the session log for later comparison.
+
+Registry file (`data/assets/models.json`):
+    {
+        "primary": "production",
+        "models": {
+            "production": {},
+            "tuned": {"params": "weights/v0001.json"},
+            "blend-50": {"params": {"gain_weight": 0.5, "wr_weight": 0.5}},
+            "synergy": {"synergy": true},
+            "stable": {"reference": true}
+        }
+    }
+
+`params` is a weights file relative to `data/assets` (see `ScoringParams.load`)
+or overrides of the default parameters by name (see `ScoringParams.replace`);
+`synergy` enables the pairwise synergy stage and `reference` normalizes gains
+against the reference distribution (see `reference.py`). Without a registry
+file there is only the production model and no shadow work.
+
+Shadow results, per model, are aligned with the primary's `[player] + bench`
+order: `{"score": [...], "top": cid}`.
+
+Classes:
+    - ModelConfig: One scoring model's parameters and stages.
+    - ModelRegistry: Evaluates the primary model and scores the shadows.
+
+Example:
+python
+    registry = ModelRegistry.load()
+    pool = registry.evaluate(grouped)
+    shadow = registry.shadow(pool)
+"""
+
+import json
+
+import numpy as np
+
+from src.core.daemon.server import WarmEvaluator
+from src.core.reference import GainReference
+from src.core.scoring import (
+    MAX_TEAMMATES,
+    LobbyBatch,
+    ParamArrays,
+    ScoringParams,
+    ScoringTables,
+    base_vectors,
+    score_batch,
+)
+from src.core.synergy import load_synergy
+from src.utils import paths
+
+REGISTRY_PATH = paths.ASSETS_DIR / "models.json"
+PRIMARY = "production"
+
+
+class ModelConfig:
+    """
+    One scoring model.
+
+    Attributes:
+        name (str): Model name.
+        params (ScoringParams): Role weights, curve constants and blend.
+        synergy (bool): Whether the synergy stage is enabled.
+        reference (bool): Whether gains are normalized against the reference distribution.
+    """
+
+    def __init__(self, name, params=None, synergy=False, reference=False):
+        """Initialize the model; `params` defaults to the current parameters."""
+        self.name = name
+        self.params = params or ScoringParams.default()
+        self.synergy = synergy
+        self.reference = reference
+
+    @classmethod
+    def from_dict(cls, name, data, base_dir=None):
+        """
+        Build a model from its registry entry.
+
+        Args:
+            name (str): Model name.
+            data (dict): Entry with optional `params`, `synergy` and `reference`.
+            base_dir (Path, optional): Directory weights files are relative
+                to; defaults to `paths.ASSETS_DIR`.
+
+        Returns:
+            ModelConfig: The model.
+
+        Raises:
+            ValueError: If the parameters are invalid.
+        """
+        params = data.get("params")
+        if isinstance(params, str):
+            params = ScoringParams.load((base_dir or paths.ASSETS_DIR) / params)
+        elif isinstance(params, dict):
+            params = ScoringParams.default().replace(params)
+        params = params or ScoringParams.default()
+        params.check()
+        return cls(
+            name,
+            params,
+            bool(data.get("synergy", False)),
+            bool(data.get("reference", False)),
+        )
+
+
+class ModelRegistry:
+    """
+    Evaluates the primary model and scores the shadow models of a snapshot.
+
+    Attributes:
+        models (dict[str, ModelConfig]): Model name to model.
+        primary (str): Name of the displayed model.
+        shadows (list[str]): Names of the other models, in registry order.
+        warm (WarmEvaluator): Evaluator of the primary model.
+        tables (ScoringTables): Champion tables shared by the shadows.
+        synergy (SynergyMatrix | None): Matrix shared by models using synergy.
+    """
+
+    def __init__(self, models, primary=PRIMARY):
+        """
+        Load the shared data and stack the shadow parameters.
+
+        Args:
+            models (Iterable[ModelConfig]): Models.
+            primary (str): Name of the displayed model.
+
+        Raises:
+            ValueError: If `primary` is not one of the models.
+        """
+        self.models = {model.name: model for model in models}
+        if primary not in self.models:
+            raise ValueError(f"Primary model {primary!r} is not in the registry.")
+        self.primary = primary
+        self.shadows = [name for name in self.models if name != primary]
+
+        needs_synergy = any(model.synergy for model in self.models.values())
+        self.synergy = load_synergy() if needs_synergy else None
+        main = self.models[primary]
+        self.warm = WarmEvaluator(self.synergy if main.synergy else None, main.params)
+        self.tables = ScoringTables(self.warm.metadata.values(), self.warm.norm_wr)
+        if main.reference:
+            self.warm.reference = GainReference.build(self.tables, main.params)
+        shadows = [self.models[name] for name in self.shadows]
+        self._arrays = (
+            ParamArrays.from_params(self.tables, [m.params for m in shadows])
+            if shadows
+            else None
+        )
+        self._with_synergy = np.array([m.synergy for m in shadows], dtype=bool)
+        self._with_reference = np.array([m.reference for m in shadows], dtype=bool)
+
+    @classmethod
+    def load(cls, path=None):
+        """
+        Read a registry file.
+
+        Args:
+            path (Path, optional): Registry file; defaults to `REGISTRY_PATH`.
+
+        Returns:
+            ModelRegistry: The registry, or only the production model when the
+            file does not exist.
+        """
+        path = path or REGISTRY_PATH
+        if not path.exists():
+            return cls([ModelConfig(PRIMARY)])
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        models = [
+            ModelConfig.from_dict(name, entry, path.parent)
+            for name, entry in data.get("models", {}).items()
+        ]
+        return cls(models, data.get("primary", PRIMARY))
+
+    def evaluate(self, grouped):
+        """
+        Evaluate a snapshot with the primary model.
+
+        Args:
+            grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+
+        Returns:
+            ChampionPool: The primary model's evaluated pool.
+        """
+        return self.warm.evaluate(grouped)
+
+    def shadow(self, pool):
+        """
+        Score the primary's evaluated snapshot with every shadow model.
+
+        Args:
+            pool (ChampionPool): Pool returned by `evaluate`.
+
+        Returns:
+            dict[str, dict]: Shadow model name to `score` (aligned with
+            `[pool.player] + pool.bench`) and `top` champion ID; empty when
+            there are no shadows or the snapshot does not fit a `LobbyBatch`
+            (more than `MAX_TEAMMATES` teammates).
+        """
+        if not self.shadows or len(pool.unavailable) > MAX_TEAMMATES:
+            return {}
+        available = [pool.player] + list(pool.bench)
+        grouped = {
+            "team": [champ.cid for champ in pool.team],
+            "bench": [champ.cid for champ in pool.bench],
+            "player": [pool.player.cid],
+        }
+        batch = LobbyBatch.from_grouped([grouped], self.tables)
+        extra = None
+        if self._with_synergy.any():
+            extra = np.zeros((len(self.shadows), 1, len(available)))
+            extra[self._with_synergy, 0] = self.synergy.gains(
+                available, pool.unavailable
+            )
+        scores = score_batch(
+            self.tables,
+            batch,
+            self._arrays,
+            base_vectors(self.tables, batch),
+            extra,
+            self._with_reference,
+        )[:, 0]
+        return {
+            name: {
+                "score": row.tolist(),
+                "top": int(available[int(np.argmax(row))].cid),
+            }
+            for name, row in zip(self.shadows, scores)
+        }
@@ -0,0 +1,398 @@
+"""
+query.py - Bitmap-Indexed Champion Attribute Queries.
+
+Builds column arrays over the static champion attributes carried by
+`ChampionMetadata` and bitmap indexes over them, so filter-and-rank queries
+over a bench run as a handful of integer bitwise operations.
+
+Each champion is a row, in ascending champion ID order. A bitmap is a Python
+`int` whose bit `i` is set when row `i` matches, so AND, OR and NOT of
+predicates are `&`, `|` and `~` (masked to the champion rows).
+
+Indexes:
+- Equality bitmaps for every value of `primary`, `secondary`, `type`,
+  `attacks` and `ability`.
+- Range-encoded bitmaps for the ordered attributes `diff`, `style` and the
+  rating categories (`damage`, `toughness`, ...): one "value <= v" bitmap per
+  distinct value, so any range is at most two lookups and one AND.
+- Class membership bitmaps. The layout of `data/assets/classes/` defines the
+  class tree: `A0_Controller.json` is the class and `A1_Catchers.json`,
+  `A2_Enchanters.json` are its subclasses. A champion is a member of a
+  subclass when it is its primary or secondary class, and of a class when it
+  is a member of the class itself or of any of its subclasses.
+
+Classes:
+    - ChampionQueryEngine: Column arrays, bitmap indexes and queries.
+
+Functions:
+    - load_class_hierarchy(classes_dir): Reads the class tree from the classes directory.
+    - get_query_engine(): Builds the shared engine over all champions on first use.
+
+Usage:
+Build bitmaps with `eq`, `range` and `member`, combine them with bitwise
+operators, restrict them to a bench with `mask`, then decode with `select`
+or rank with `top`. `query` does all of this from keyword arguments.
+
+Example:
+python
+    engine = get_query_engine()
+    bench = engine.mask(pool.bench)
+    hits = engine.eq("type", "Magic") & engine.range("diff", high=2)
+    hits &= engine.member("Catcher", "Enchanter") & bench
+    engine.top(hits, {c.cid: c.score for c in pool.bench}, 3)
+
+    engine.query(within=pool.bench, type="Magic", diff=(None, 2),
+                 member=["Catcher", "Enchanter"], scores=scores, limit=3)
+"""
+
+import re
+from src.api.client.champion import load_champions
+from src.core.evaluator import CATEGORIES
+from src.utils import paths
+
+CLASSES_DIR = paths.ASSETS_DIR / "classes"
+EQUALITY_ATTRIBUTES = ["primary", "secondary", "type", "attacks", "ability"]
+ORDERED_ATTRIBUTES = ["diff", "style"] + [cat.lower() for cat in CATEGORIES]
+
+_CLASS_FILE = re.compile(r"^[A-Z](\d+)_(.+)$")
+_engine = None
+
+
+def _singular(name):
+    """Turn a class file name into the class name used in ratings."""
+    if name.endswith("men"):
+        return name[:-3] + "man"
+    if name.endswith("s"):
+        return name[:-1]
+    return name
+
+
+def load_class_hierarchy(classes_dir=None):
+    """
+    Read the class tree from the classes directory.
+
+    Args:
+        classes_dir (Path, optional): Directory with one sub-directory per class;
+            defaults to `data/assets/classes`.
+
+    Returns:
+        dict[str, list[str]]: Class name to its subclass names,
+        e.g. `{"Controller": ["Catcher", "Enchanter"], ...}`.
+
+    Raises:
+        ValueError: If a class directory has no `*0_<Class>.json` file.
+    """
+    classes_dir = classes_dir or CLASSES_DIR
+    hierarchy = {}
+    for group in sorted(p for p in classes_dir.iterdir() if p.is_dir()):
+        entries = sorted(
+            (int(match.group(1)), _singular(match.group(2)))
+            for match in map(_CLASS_FILE.match, (p.stem for p in group.glob("*.json")))
+            if match
+        )
+        if not entries or entries[0][0] != 0:
+            raise ValueError(f"Class directory {group.name} has no class file.")
+        hierarchy[entries[0][1]] = [name for _, name in entries[1:]]
+    return hierarchy
+
+
+def _iter_rows(bitmap):
+    """Yield the indexes of the set bits of a bitmap, lowest first."""
+    while bitmap:
+        low = bitmap & -bitmap
+        yield low.bit_length() - 1
+        bitmap ^= low
+
+
+class ChampionQueryEngine:
+    """
+    Column arrays and bitmap indexes over static champion attributes.
+
+    Attributes:
+        cids (list[str]): Champion ID of each row, in ascending numeric order.
+        rows (dict[str, int]): Champion ID to row.
+        columns (dict[str, list]): Attribute name to its value per row.
+        all (int): Bitmap with every row set.
+    """
+
+    def __init__(self, metadata, hierarchy=None):
+        """
+        Build the columns and indexes.
+
+        Args:
+            metadata (Iterable[ChampionMetadata]): Champions to index.
+            hierarchy (dict[str, list[str]], optional): Class tree from
+                `load_class_hierarchy`; without it only primary and secondary
+                classes are members.
+        """
+        metas = sorted(metadata, key=lambda meta: int(meta.cid))
+        self.cids = [str(meta.cid) for meta in metas]
+        self.rows = {cid: row for row, cid in enumerate(self.cids)}
+        self.all = (1 << len(self.cids)) - 1
+
+        self.columns = {"name": [meta.name for meta in metas]}
+        for attr in EQUALITY_ATTRIBUTES + ["diff", "style"]:
+            self.columns[attr] = [getattr(meta, attr) for meta in metas]
+        for cat in CATEGORIES:
+            self.columns[cat.lower()] = [meta.ratings.get(cat, 0) for meta in metas]
+
+        self._equal = {}
+        for attr in EQUALITY_ATTRIBUTES:
+            self._equal[attr] = self._value_bitmaps(self.columns[attr])
+
+        self._at_most = {}
+        for attr in ORDERED_ATTRIBUTES:
+            by_value = self._value_bitmaps(self.columns[attr])
+            cumulative, bitmap = [], 0
+            for value in sorted(by_value):
+                bitmap |= by_value[value]
+                cumulative.append((value, bitmap))
+            self._at_most[attr] = cumulative
+
+        primary, secondary = self._equal["primary"], self._equal["secondary"]
+        self._members = {
+            name: primary.get(name, 0) | secondary.get(name, 0)
+            for name in set(primary) | set(secondary)
+        }
+        for parent, children in (hierarchy or {}).items():
+            bitmap = self._members.get(parent, 0)
+            for child in children:
+                bitmap |= self._members.setdefault(child, 0)
+            self._members[parent] = bitmap
+        self._members.pop("N/A", None)
+
+    @staticmethod
+    def _value_bitmaps(column):
+        """Build one bitmap per distinct value of a column."""
+        bitmaps = {}
+        for row, value in enumerate(column):
+            bitmaps[value] = bitmaps.get(value, 0) | (1 << row)
+        return bitmaps
+
+    def __len__(self):
+        """Return the number of indexed champions."""
+        return len(self.cids)
+
+    @property
+    def classes(self):
+        """Names accepted by `member`, sorted."""
+        return sorted(self._members)
+
+    def values(self, attribute):
+        """
+        List the distinct values of an indexed attribute.
+
+        Args:
+            attribute (str): Attribute name.
+
+        Returns:
+            list: Sorted distinct values.
+
+        Raises:
+            ValueError: If the attribute is not indexed.
+        """
+        if attribute in self._equal:
+            return sorted(self._equal[attribute])
+        if attribute in self._at_most:
+            return [value for value, _ in self._at_most[attribute]]
+        raise ValueError(f"Unknown attribute: {attribute}")
+
+    def mask(self, champions):
+        """
+        Build the bitmap of a set of champions, e.g. a bench.
+
+        Args:
+            champions (Iterable): Champion IDs, or objects with a `cid` attribute.
+
+        Returns:
+            int: Bitmap of the known champions among them.
+        """
+        bitmap, rows = 0, self.rows
+        for champ in champions:
+            row = rows.get(str(getattr(champ, "cid", champ)))
+            if row is not None:
+                bitmap |= 1 << row
+        return bitmap
+
+    def eq(self, attribute, *values):
+        """
+        Match rows whose attribute equals any of the values.
+
+        Args:
+            attribute (str): Indexed attribute name.
+            *values: Accepted values.
+
+        Returns:
+            int: Bitmap of matching rows.
+
+        Raises:
+            ValueError: If the attribute is not indexed.
+        """
+        if attribute in self._at_most:
+            return self._or(self.range(attribute, value, value) for value in values)
+        if attribute not in self._equal:
+            raise ValueError(f"Unknown attribute: {attribute}")
+        index = self._equal[attribute]
+        return self._or(index.get(value, 0) for value in values)
+
+    def _upto(self, attribute, value, inclusive=True):
+        """Return the bitmap of rows with `attribute <= value` (or `<`)."""
+        bitmap = 0
+        for bound, cumulative in self._at_most[attribute]:
+            if bound > value or (bound == value and not inclusive):
+                break
+            bitmap = cumulative
+        return bitmap
+
+    def range(self, attribute, low=None, high=None):
+        """
+        Match rows whose ordered attribute lies in `[low, high]`.
+
+        Args:
+            attribute (str): One of `ORDERED_ATTRIBUTES`.
+            low (optional): Inclusive lower bound; unbounded when None.
+            high (optional): Inclusive upper bound; unbounded when None.
+
+        Returns:
+            int: Bitmap of matching rows.
+
+        Raises:
+            ValueError: If the attribute is not ordered.
+        """
+        if attribute not in self._at_most:
+            raise ValueError(f"Not an ordered attribute: {attribute}")
+        bitmap = self.all if high is None else self._upto(attribute, high)
+        if low is not None:
+            bitmap &= ~self._upto(attribute, low, inclusive=False)
+        return bitmap
+
+    def member(self, *names):
+        """
+        Match members of any of the given classes or subclasses.
+
+        Args:
+            *names (str): Class names such as `"Controller"` or `"Catcher"`.
+
+        Returns:
+            int: Bitmap of matching rows.
+
+        Raises:
+            ValueError: If a name is not a known class.
+        """
+        unknown = [name for name in names if name not in self._members]
+        if unknown:
+            raise ValueError(f"Unknown class: {', '.join(unknown)}")
+        return self._or(self._members[name] for name in names)
+
+    @staticmethod
+    def _or(bitmaps):
+        """Return the union of bitmaps."""
+        result = 0
+        for bitmap in bitmaps:
+            result |= bitmap
+        return result
+
+    def select(self, bitmap):
+        """
+        Decode a bitmap into champion IDs.
+
+        Args:
+            bitmap (int): Rows to decode.
+
+        Returns:
+            list[str]: Champion IDs in row order.
+        """
+        cids = self.cids
+        return [cids[row] for row in _iter_rows(bitmap & self.all)]
+
+    def count(self, bitmap):
+        """Return the number of rows set in a bitmap."""
+        return (bitmap & self.all).bit_count()
+
+    def top(self, bitmap, scores, limit=None):
+        """
+        Rank the rows of a bitmap by score, highest first.
+
+        Args:
+            bitmap (int): Rows to rank.
+            scores (dict | str): Champion ID (str or int) to score, or the name
+                of an ordered attribute to rank by.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            list[tuple[str, float]]: `(champion ID, score)` pairs; ties keep row order.
+        """
+        if isinstance(scores, str):
+            column = self.columns[scores]
+            ranked = [(self.cids[row], column[row]) for row in _iter_rows(bitmap)]
+        else:
+            ranked = []
+            for cid in self.select(bitmap):
+                score = scores.get(cid, scores.get(int(cid)))
+                if score is not None:
+                    ranked.append((cid, score))
+        ranked.sort(key=lambda item: item[1], reverse=True)
+        return ranked if limit is None else ranked[:limit]
+
+    def where(self, within=None, member=None, **conditions):
+        """
+        Combine conditions into one bitmap.
+
+        Args:
+            within (Iterable, optional): Champions to restrict to (see `mask`).
+            member (str | Iterable[str], optional): Classes, any of which must match.
+            **conditions: Attribute name to a value, a list of accepted values,
+                or a `(low, high)` tuple for ordered attributes.
+
+        Returns:
+            int: Bitmap of rows matching every condition.
+
+        Raises:
+            ValueError: If an attribute or class is unknown.
+        """
+        bitmap = self.all if within is None else self.mask(within)
+        if member is not None:
+            bitmap &= self.member(*([member] if isinstance(member, str) else member))
+        for attribute, value in conditions.items():
+            if isinstance(value, tuple):
+                bitmap &= self.range(attribute, *value)
+            elif isinstance(value, (list, set, frozenset)):
+                bitmap &= self.eq(attribute, *value)
+            else:
+                bitmap &= self.eq(attribute, value)
+        return bitmap
+
+    def query(self, within=None, member=None, scores=None, limit=None, **conditions):
+        """
+        Filter champions and optionally rank them.
+
+        Args:
+            within (Iterable, optional): Champions to restrict to, e.g. a bench.
+            member (str | Iterable[str], optional): Classes, any of which must match.
+            scores (dict | str, optional): Ranking (see `top`); row order when omitted.
+            limit (int, optional): Maximum number of results.
+            **conditions: Attribute conditions (see `where`).
+
+        Returns:
+            list[str] | list[tuple[str, float]]: Matching champion IDs, or
+            `(champion ID, score)` pairs when `scores` is given.
+        """
+        bitmap = self.where(within, member, **conditions)
+        if scores is not None:
+            return self.top(bitmap, scores, limit)
+        cids = self.select(bitmap)
+        return cids if limit is None else cids[:limit]
+
+
+def get_query_engine():
+    """
+    Build the shared engine over all champions on first use.
+
+    Returns:
+        ChampionQueryEngine: Engine over `champion_ratings.json` and the class tree.
+    """
+    global _engine
+    if _engine is None:
+        metadata = [state.meta for state in load_champions().values()]
+        _engine = ChampionQueryEngine(metadata, load_class_hierarchy())
+    return _engine
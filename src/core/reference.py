@@ -0,0 +1,145 @@
+"""
+reference.py - Reference Gain Distributions for Stable Normalization.
+
+`normalize_composition_gains` z-scores raw gains over the 6-11 champions of
+one lobby, so a champion's normalized gain depends on who else happens to be
+on the bench. Reference normalization z-scores them against the distribution
+of raw gains over every champion instead, for the same team, so scores are
+comparable across snapshots and sessions.
+
+For a team base vector `b`, a champion's raw gain is separable:
+
+    gain(b) = sum_k d_k(b) * h_k
+    d_k(b) = exp(-(b_k - center) / rate)
+    h_k = scale * (1 - exp(-w_k / rate))
+
+where `w_k` is the champion's role-weighted rating. The coefficients `h` do
+not depend on the team, so their mean vector `mu` and covariance matrix `C`
+over all champions are computed once. For any team the reference mean is
+`d . mu` and the standard deviation `sqrt(d' C d)`: a constant-time lookup
+that is exact for every base vector, with no bucketing.
+
+Synergy gains, when that stage is enabled, are added to the raw gains but are
+not part of the reference, so they shift a champion's normalized gain directly.
+
+A reference keeps the parameters it was built for, and `Evaluator` refuses to
+normalize with it under any other parameters.
+
+Classes:
+    - GainReference: Reference moments and the per-team lookup.
+
+Functions:
+    - load_reference(params): Reference for the given parameters (the default one is shared).
+
+Example:
+python
+    reference = load_reference()
+    pool = Evaluator(grouped, reference=reference).evaluate()
+"""
+
+import numpy as np
+
+from src.core.scoring import (
+    CATEGORIES,
+    ParamArrays,
+    ScoringParams,
+    ScoringTables,
+    reference_moments,
+)
+
+_shared = None
+
+
+class GainReference:
+    """
+    Reference distribution of raw composition gains over every champion.
+
+    Attributes:
+        mean (np.ndarray): `(5,)` mean gain coefficients, in `CATEGORIES` order.
+        cov (np.ndarray): `(5, 5)` covariance of the gain coefficients.
+        params (ScoringParams): Parameters the moments were computed for.
+        center (float): Diminishing-returns center.
+        rate (float): Diminishing-returns rate.
+    """
+
+    def __init__(self, mean, cov, params):
+        """Wrap precomputed moments and the parameters they belong to."""
+        self.mean = np.asarray(mean, dtype=float)
+        self.cov = np.asarray(cov, dtype=float)
+        self.params = params
+        self.center = params.dr_center
+        self.rate = params.dr_rate
+        self._checked = params
+
+    @classmethod
+    def build(cls, tables=None, params=None):
+        """
+        Compute the reference moments from the champion data.
+
+        Args:
+            tables (ScoringTables, optional): Champion tables; loaded when omitted.
+            params (ScoringParams, optional): Parameters; the defaults when omitted.
+
+        Returns:
+            GainReference: The reference.
+        """
+        tables = tables or ScoringTables.load()
+        params = params or ScoringParams.default()
+        mean, cov = reference_moments(tables, ParamArrays.from_params(tables, [params]))
+        return cls(mean[0], cov[0], params)
+
+    def check(self, params=None):
+        """
+        Make sure the reference was built for the parameters of an evaluation.
+
+        Args:
+            params (ScoringParams, optional): Parameters; the defaults when omitted.
+
+        Raises:
+            ValueError: If the reference was built for other parameters.
+        """
+        if params is self._checked:
+            return
+        if (params or ScoringParams.default()) != self.params:
+            raise ValueError(
+                "The gain reference was built for different scoring parameters."
+            )
+        self._checked = params
+
+    def stats(self, base):
+        """
+        Look up the reference mean and standard deviation for a team.
+
+        Args:
+            base (dict[str, float] | Sequence[float]): Team category totals, by
+                category name or in `CATEGORIES` order.
+
+        Returns:
+            tuple[float, float]: Mean and standard deviation (at least 1e-6).
+        """
+        if isinstance(base, dict):
+            base = [base.get(cat, 0) for cat in CATEGORIES]
+        decay = np.exp(-(np.asarray(base, dtype=float) - self.center) / self.rate)
+        variance = max(float(decay @ self.cov @ decay), 0.0)
+        return float(decay @ self.mean), max(float(np.sqrt(variance)), 1e-6)
+
+
+def load_reference(params=None, tables=None):
+    """
+    Return the gain reference for a parameter set.
+
+    The default parameters' reference is built once and shared.
+
+    Args:
+        params (ScoringParams, optional): Parameters; the defaults when omitted.
+        tables (ScoringTables, optional): Champion tables; loaded when omitted.
+
+    Returns:
+        GainReference: The reference.
+    """
+    global _shared
+    if params is not None:
+        return GainReference.build(tables, params)
+    if _shared is None:
+        _shared = GainReference.build(tables)
+    return _shared
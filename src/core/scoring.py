@@ -0,0 +1,588 @@
+"""
+scoring.py - Vectorized Scoring Core and Tunable Scoring Parameters.
+
+`Evaluator` scores one lobby at a time with Python loops. This module
+computes the same scores for many lobbies, and for many parameter sets, with
+NumPy array operations. It is the shared core of the tuning engine and of
+other analyses that re-score lobbies in bulk.
+
+Arrays:
+- `ScoringTables` holds per-champion arrays (ratings, primary and secondary
+  role, normalized win rate) in ascending champion ID order. An extra zero
+  row at index `len(tables)` is used for padding.
+- `LobbyBatch` holds padded row indexes for many lobbies: the teammates
+  (`pool.unavailable`) and the available champions (`pool.available`, the
+  player first), plus a mask of real entries.
+- `ParamArrays` stacks one or more `ScoringParams` into arrays with a leading
+  parameter axis.
+
+`score_batch` returns scores of shape `(params, lobbies, available)`. Within
+a lobby it matches `Evaluator` (norm gains and scores are rounded to two
+decimals the same way), so rankings agree with the live evaluator.
+
+Because gains are z-scored per lobby, `dr_center` and `dr_scale` only scale
+every gain of a lobby by the same factor and do not change rankings;
+`dr_rate`, the blend and the role weights do.
+
+Classes:
+    - ScoringParams: Role weights, diminishing-returns constants and the score blend.
+    - ScoringTables: Per-champion arrays shared by every parameter set.
+    - LobbyBatch: Padded teammate and available-champion rows for many lobbies.
+    - ParamArrays: One or more parameter sets as stacked arrays.
+
+Functions:
+    - base_vectors(tables, batch): Sums the teammates' ratings per lobby.
+    - raw_gains(tables, batch, params, base): Raw composition gains.
+    - normalize_gains(gains, mask): Per-lobby z-scores (x50) over the available champions.
+    - reference_moments(tables, params): Moments of the team-independent gain coefficients.
+    - normalize_reference(gains, base, params, moments, mask): Z-scores against
+      the reference distribution of each lobby's team.
+    - score_batch(tables, batch, params): Final scores.
+
+Example:
+python
+    tables = ScoringTables.load()
+    batch = LobbyBatch.from_grouped(lobbies, tables)
+    scores = score_batch(tables, batch, [ScoringParams.default()])[0]
+"""
+
+import copy
+import json
+
+import numpy as np
+
+from src.api.client.champion import load_champions
+from src.core import evaluator
+from src.core.evaluator import CATEGORIES
+
+MAX_TEAMMATES = 5
+
+
+class ScoringParams:
+    """
+    Tunable scoring parameters.
+
+    Attributes:
+        role_weights (dict[str, dict[str, float]]): Role name to category multipliers.
+        dr_center (float): Diminishing-returns center.
+        dr_scale (float): Diminishing-returns scale.
+        dr_rate (float): Diminishing-returns rate.
+        gain_weight (float): Weight of the normalized composition gain in the score.
+        wr_weight (float): Weight of the normalized win rate in the score.
+    """
+
+    SCALARS = ("dr_center", "dr_scale", "dr_rate", "gain_weight", "wr_weight")
+
+    def __init__(
+        self,
+        role_weights,
+        dr_center=evaluator.DR_CENTER,
+        dr_scale=evaluator.DR_SCALE,
+        dr_rate=evaluator.DR_RATE,
+        gain_weight=evaluator.GAIN_WEIGHT,
+        wr_weight=evaluator.WR_WEIGHT,
+    ):
+        """Initialize the parameters; role weights are copied."""
+        self.role_weights = copy.deepcopy(role_weights)
+        self.dr_center = float(dr_center)
+        self.dr_scale = float(dr_scale)
+        self.dr_rate = float(dr_rate)
+        self.gain_weight = float(gain_weight)
+        self.wr_weight = float(wr_weight)
+
+    @classmethod
+    def default(cls):
+        """Return the parameters the evaluator uses by default."""
+        return cls(evaluator.load_role_weights())
+
+    @property
+    def curve(self):
+        """`(center, scale, rate)` arguments for `diminishing_returns`."""
+        return self.dr_center, self.dr_scale, self.dr_rate
+
+    def __eq__(self, other):
+        """Compare all parameter values."""
+        return isinstance(other, ScoringParams) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        """Return the scalar parameters."""
+        scalars = ", ".join(f"{name}={getattr(self, name):g}" for name in self.SCALARS)
+        return f"ScoringParams({scalars})"
+
+    def names(self):
+        """
+        List the names of all parameters.
+
+        Returns:
+            list[str]: Scalar names, then `role_weights.<Role>.<Category>` names.
+        """
+        return list(self.SCALARS) + [
+            f"role_weights.{role}.{cat}"
+            for role, weights in self.role_weights.items()
+            for cat in weights
+        ]
+
+    def get(self, name):
+        """
+        Return a parameter by name.
+
+        Raises:
+            ValueError: If the name is unknown.
+        """
+        if name in self.SCALARS:
+            return getattr(self, name)
+        parts = name.split(".")
+        if len(parts) == 3 and parts[0] == "role_weights":
+            try:
+                return self.role_weights[parts[1]][parts[2]]
+            except KeyError:
+                pass
+        raise ValueError(f"Unknown parameter: {name}")
+
+    def replace(self, values):
+        """
+        Return a copy with some parameters changed.
+
+        Args:
+            values (dict[str, float]): Parameter name to new value.
+
+        Returns:
+            ScoringParams: The modified copy.
+
+        Raises:
+            ValueError: If a name is unknown.
+        """
+        params = ScoringParams(
+            self.role_weights, *[getattr(self, n) for n in self.SCALARS]
+        )
+        for name, value in values.items():
+            self.get(name)
+            if name in self.SCALARS:
+                setattr(params, name, float(value))
+            else:
+                _, role, cat = name.split(".")
+                params.role_weights[role][cat] = float(value)
+        return params
+
+    def check(self):
+        """
+        Validate the parameters.
+
+        Raises:
+            ValueError: If role weights break `check_role_weight_sums`, or a
+                curve constant or blend weight is out of range.
+        """
+        evaluator.check_role_weight_sums(self.role_weights)
+        if self.dr_rate <= 0 or self.dr_scale <= 0:
+            raise ValueError("dr_rate and dr_scale must be positive.")
+        if self.gain_weight < 0 or self.wr_weight < 0:
+            raise ValueError("Blend weights must not be negative.")
+        if any(
+            w < 0 for weights in self.role_weights.values() for w in weights.values()
+        ):
+            raise ValueError("Role weights must not be negative.")
+
+    def to_dict(self):
+        """Return the parameters as a JSON-serializable dictionary."""
+        return {
+            **{name: getattr(self, name) for name in self.SCALARS},
+            "role_weights": copy.deepcopy(self.role_weights),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build parameters from `to_dict` output or a plain role weights mapping.
+
+        Args:
+            data (dict): Parameters, a versioned weights file (with a `params`
+                key), or a `role_weights.json`-style mapping.
+
+        Returns:
+            ScoringParams: The parameters; missing scalars take the defaults.
+        """
+        if "params" in data:
+            data = data["params"]
+        if "role_weights" not in data:
+            return cls(data)
+        scalars = {name: data[name] for name in cls.SCALARS if name in data}
+        return cls(data["role_weights"], **scalars)
+
+    @classmethod
+    def load(cls, path):
+        """Read parameters from a JSON file (see `from_dict`)."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path):
+        """Write the parameters to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+class ScoringTables:
+    """
+    Per-champion arrays shared by every parameter set.
+
+    Attributes:
+        cids (list[str]): Champion ID of each row, in ascending numeric order.
+        rows (dict[str, int]): Champion ID to row.
+        ratings (np.ndarray): `(champions + 1, 5)` ratings; the last row is zero padding.
+        primary (np.ndarray): Role index of each row's primary class.
+        secondary (np.ndarray): Role index of each row's secondary class.
+        role_names (list[str]): Role name of each role index.
+        norm_wr (np.ndarray): Normalized win rate per row (0.0 when unknown).
+        pad (int): Index of the zero padding row.
+    """
+
+    def __init__(self, metadata, norm_wr):
+        """
+        Build the arrays.
+
+        Args:
+            metadata (Iterable[ChampionMetadata]): Champions to include.
+            norm_wr (dict[str, tuple[float, float]]): Output of `normalize_win_rates`.
+        """
+        metas = sorted(metadata, key=lambda meta: int(meta.cid))
+        self.cids = [str(meta.cid) for meta in metas]
+        self.rows = {cid: row for row, cid in enumerate(self.cids)}
+        self.pad = len(metas)
+        self.ratings = np.zeros((len(metas) + 1, len(CATEGORIES)))
+        for row, meta in enumerate(metas):
+            self.ratings[row] = [meta.ratings.get(cat, 0) for cat in CATEGORIES]
+        self.role_names = sorted(
+            {m.primary for m in metas} | {m.secondary for m in metas}
+        )
+        role_index = {name: i for i, name in enumerate(self.role_names)}
+        self.primary = np.array([role_index[m.primary] for m in metas], dtype=np.intp)
+        self.secondary = np.array(
+            [role_index[m.secondary] for m in metas], dtype=np.intp
+        )
+        self.norm_wr = np.zeros(len(metas) + 1)
+        self.norm_wr[:-1] = [norm_wr.get(cid, (50.0, 0.0))[1] for cid in self.cids]
+
+    @classmethod
+    def load(cls):
+        """Build tables from the champion ratings and the win rate CSV."""
+        metadata = [state.meta for state in load_champions().values()]
+        norm_wr = evaluator.normalize_win_rates(evaluator.load_win_rates(evaluator.wr))
+        return cls(metadata, norm_wr)
+
+    def __len__(self):
+        """Return the number of champions."""
+        return self.pad
+
+    def role_weight_table(self, params):
+        """
+        Arrange one parameter set's role weights by role index.
+
+        Roles without weights get 1.0 in every category, as in
+        `apply_role_weights`.
+
+        Args:
+            params (ScoringParams): Parameters.
+
+        Returns:
+            np.ndarray: `(roles, 5)` weights, one row per `role_names` entry.
+        """
+        return np.array(
+            [
+                [params.role_weights.get(name, {}).get(cat, 1.0) for cat in CATEGORIES]
+                for name in self.role_names
+            ]
+        )
+
+
+class LobbyBatch:
+    """
+    Padded rows of many lobbies.
+
+    Attributes:
+        mates (np.ndarray): `(lobbies, MAX_TEAMMATES)` teammate rows (`pool.unavailable`).
+        available (np.ndarray): `(lobbies, width)` available rows, player first.
+        mask (np.ndarray): `(lobbies, width)` True for real available entries.
+    """
+
+    def __init__(self, mates, available, mask):
+        """Wrap prepared row arrays."""
+        self.mates = mates
+        self.available = available
+        self.mask = mask
+
+    def __len__(self):
+        """Return the number of lobbies."""
+        return len(self.mates)
+
+    @classmethod
+    def from_grouped(cls, lobbies, tables, width=None):
+        """
+        Encode grouped lobbies.
+
+        Args:
+            lobbies (Sequence[dict]): `{"team", "bench", "player"}` lobbies.
+            tables (ScoringTables): Row lookup.
+            width (int, optional): Available slots per lobby; the widest lobby by default.
+
+        Returns:
+            LobbyBatch: The encoded lobbies.
+
+        Raises:
+            ValueError: If a lobby has an unknown champion, more than `width`
+                available champions or more than `MAX_TEAMMATES` teammates.
+        """
+        rows = tables.rows
+
+        def row(cid):
+            try:
+                return rows[str(cid)]
+            except KeyError:
+                raise ValueError(f"Unknown champion ID {cid}") from None
+
+        mate_rows, avail_rows = [], []
+        for grouped in lobbies:
+            player = str(grouped["player"][0])
+            mate_rows.append([row(c) for c in grouped["team"] if str(c) != player])
+            avail_rows.append([row(player)] + [row(c) for c in grouped["bench"]])
+
+        width = width or max((len(r) for r in avail_rows), default=1)
+        mates = np.full((len(mate_rows), MAX_TEAMMATES), tables.pad, dtype=np.intp)
+        available = np.full((len(avail_rows), width), tables.pad, dtype=np.intp)
+        for i, (m, a) in enumerate(zip(mate_rows, avail_rows)):
+            if len(a) > width:
+                raise ValueError(
+                    f"Lobby {i} has more than {width} available champions."
+                )
+            if len(m) > MAX_TEAMMATES:
+                raise ValueError(f"Lobby {i} has more than {MAX_TEAMMATES} teammates.")
+            mates[i, : len(m)] = m
+            available[i, : len(a)] = a
+        return cls(mates, available, available != tables.pad)
+
+    def take(self, index):
+        """Return a batch with the selected lobbies."""
+        return LobbyBatch(self.mates[index], self.available[index], self.mask[index])
+
+
+class ParamArrays:
+    """
+    Parameter sets stacked along a leading axis.
+
+    Attributes:
+        weights (np.ndarray): `(params, roles, 5)` role weights (see
+            `ScoringTables.role_weight_table`).
+        center (np.ndarray): `(params, 1, 1, 1)` diminishing-returns centers.
+        scale (np.ndarray): `(params, 1, 1, 1)` scales.
+        rate (np.ndarray): `(params, 1, 1, 1)` rates.
+        gain_weight (np.ndarray): `(params, 1, 1)` gain blend weights.
+        wr_weight (np.ndarray): `(params, 1, 1)` win rate blend weights.
+        moments (tuple[np.ndarray, np.ndarray] | None): Cached `reference_moments`.
+    """
+
+    def __init__(self, weights, center, scale, rate, gain_weight, wr_weight):
+        """
+        Wrap stacked parameter arrays.
+
+        Args:
+            weights (np.ndarray): `(params, roles, 5)` role weights.
+            center, scale, rate, gain_weight, wr_weight (Sequence[float]): One
+                value per parameter set.
+        """
+        self.weights = np.asarray(weights, dtype=float)
+        self.center = np.asarray(center, dtype=float).reshape(-1, 1, 1, 1)
+        self.scale = np.asarray(scale, dtype=float).reshape(-1, 1, 1, 1)
+        self.rate = np.asarray(rate, dtype=float).reshape(-1, 1, 1, 1)
+        self.gain_weight = np.asarray(gain_weight, dtype=float).reshape(-1, 1, 1)
+        self.wr_weight = np.asarray(wr_weight, dtype=float).reshape(-1, 1, 1)
+        self.moments = None
+
+    @classmethod
+    def from_params(cls, tables, params):
+        """
+        Stack parameter sets.
+
+        Args:
+            tables (ScoringTables): Champion tables.
+            params (Sequence[ScoringParams]): Parameter sets.
+
+        Returns:
+            ParamArrays: The stacked parameters.
+        """
+        return cls(
+            np.stack([tables.role_weight_table(p) for p in params]),
+            *[[getattr(p, name) for p in params] for name in ScoringParams.SCALARS],
+        )
+
+    def __len__(self):
+        """Return the number of parameter sets."""
+        return len(self.weights)
+
+    def multipliers(self, tables, rows):
+        """
+        Compute role multipliers for the given champion rows.
+
+        Matches `apply_role_weights`: the larger of the primary and secondary
+        role weights. Padding rows get the first role's weights; their
+        ratings are zero, so the multiplier has no effect.
+
+        Args:
+            tables (ScoringTables): Champion tables.
+            rows (np.ndarray): Champion rows of any shape.
+
+        Returns:
+            np.ndarray: `(params, *rows.shape, 5)` multipliers.
+        """
+        primary = np.append(tables.primary, 0)[rows]
+        secondary = np.append(tables.secondary, 0)[rows]
+        return np.maximum(self.weights[:, primary], self.weights[:, secondary])
+
+
+def _as_arrays(tables, params):
+    """Accept `ParamArrays`, one `ScoringParams` or a sequence of them."""
+    if isinstance(params, ParamArrays):
+        return params
+    if isinstance(params, ScoringParams):
+        params = [params]
+    return ParamArrays.from_params(tables, params)
+
+
+def base_vectors(tables, batch):
+    """
+    Sum the teammates' category ratings per lobby.
+
+    The result does not depend on the parameters, so it can be shared.
+
+    Returns:
+        np.ndarray: `(lobbies, 5)` team base vectors.
+    """
+    return tables.ratings[batch.mates].sum(axis=1)
+
+
+def raw_gains(tables, batch, params, base=None):
+    """
+    Compute raw composition gains, as `compute_raw_composition_gains` does.
+
+    Args:
+        tables (ScoringTables): Champion tables.
+        batch (LobbyBatch): Lobbies.
+        params (ParamArrays | ScoringParams | Sequence[ScoringParams]): Parameters.
+        base (np.ndarray, optional): Precomputed `base_vectors`.
+
+    Returns:
+        np.ndarray: `(params, lobbies, width)` gains; padding entries are 0.
+    """
+    arrays = _as_arrays(tables, params)
+    if base is None:
+        base = base_vectors(tables, batch)
+    ratings = tables.ratings[batch.available]
+    weighted = ratings[None] * arrays.multipliers(tables, batch.available)
+    base = base[None, :, None, :]
+    center, scale, rate = arrays.center, arrays.scale, arrays.rate
+    # dr(b + w) - dr(b) = scale * (exp(-(b - c) / r) - exp(-(b + w - c) / r))
+    decay = np.exp(-(base - center) / rate)
+    gains = (scale * decay * (1 - np.exp(-weighted / rate))).sum(axis=-1)
+    return np.where(batch.mask[None], gains, 0.0)
+
+
+def normalize_gains(gains, mask):
+    """
+    Z-score gains per lobby over the available champions, as `normalize_composition_gains` does.
+
+    Args:
+        gains (np.ndarray): `(..., lobbies, width)` raw gains.
+        mask (np.ndarray): `(lobbies, width)` real entries.
+
+    Returns:
+        np.ndarray: Normalized gains (x50, rounded to 2 decimals); 0 at padding.
+    """
+    count = mask.sum(axis=-1, keepdims=True)
+    mean = np.where(mask, gains, 0.0).sum(axis=-1, keepdims=True) / count
+    deviation = np.where(mask, gains - mean, 0.0)
+    std = np.maximum(np.sqrt((deviation**2).sum(axis=-1, keepdims=True) / count), 1e-6)
+    return np.where(mask, np.round(deviation / std * 50, 2), 0.0)
+
+
+def reference_moments(tables, params):
+    """
+    Compute the mean and covariance of every champion's gain coefficients.
+
+    A champion's raw gain for a team base vector `b` is
+    `sum_k exp(-(b_k - center) / rate) * h_k` with the team-independent
+    coefficients `h_k = scale * (1 - exp(-w_k / rate))` (see `reference.py`).
+
+    Args:
+        tables (ScoringTables): Champion tables.
+        params (ParamArrays | ScoringParams | Sequence[ScoringParams]): Parameters.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: `(params, 5)` means and `(params, 5, 5)`
+        covariances over all champions; cached on `ParamArrays` inputs.
+    """
+    arrays = _as_arrays(tables, params)
+    if arrays.moments is not None:
+        return arrays.moments
+    rows = np.arange(len(tables))
+    weighted = tables.ratings[rows][None] * arrays.multipliers(tables, rows)
+    h = arrays.scale[:, :, :, 0] * (1 - np.exp(-weighted / arrays.rate[:, :, :, 0]))
+    mean = h.mean(axis=1)
+    deviation = h - mean[:, None, :]
+    cov = np.einsum("pnk,pnl->pkl", deviation, deviation) / len(tables)
+    arrays.moments = (mean, cov)
+    return arrays.moments
+
+
+def normalize_reference(gains, base, params, moments, mask):
+    """
+    Z-score gains against the reference distribution of each lobby's team.
+
+    Args:
+        gains (np.ndarray): `(params, lobbies, width)` raw gains.
+        base (np.ndarray): `(lobbies, 5)` team base vectors.
+        params (ParamArrays): Parameters the gains were computed with.
+        moments (tuple[np.ndarray, np.ndarray]): Output of `reference_moments`.
+        mask (np.ndarray): `(lobbies, width)` real entries.
+
+    Returns:
+        np.ndarray: Normalized gains (x50, rounded to 2 decimals); 0 at padding.
+    """
+    mean, cov = moments
+    decay = np.exp(-(base[None] - params.center[:, :, :, 0]) / params.rate[:, :, :, 0])
+    ref_mean = np.einsum("plk,pk->pl", decay, mean)[..., None]
+    variance = np.einsum("plk,pkm,plm->pl", decay, cov, decay)
+    ref_std = np.maximum(np.sqrt(np.maximum(variance, 0.0)), 1e-6)[..., None]
+    return np.where(mask, np.round((gains - ref_mean) / ref_std * 50, 2), 0.0)
+
+
+def score_batch(tables, batch, params, base=None, extra=None, reference=False):
+    """
+    Score many lobbies for one or more parameter sets.
+
+    Args:
+        tables (ScoringTables): Champion tables.
+        batch (LobbyBatch): Lobbies.
+        params (ParamArrays | ScoringParams | Sequence[ScoringParams]): Parameters.
+        base (np.ndarray, optional): Precomputed `base_vectors`.
+        extra (np.ndarray, optional): `(params, lobbies, width)` gains added to
+            the raw gains before normalization, such as the synergy stage's.
+        reference (bool | Sequence[bool]): Normalize against the reference
+            distribution (`normalize_reference`) instead of per lobby; one
+            flag for all parameter sets or one per set.
+
+    Returns:
+        np.ndarray: `(params, lobbies, width)` scores, rounded to 2 decimals
+        like `compute_scores`; padding entries are `-inf`.
+    """
+    arrays = _as_arrays(tables, params)
+    if base is None:
+        base = base_vectors(tables, batch)
+    gains = raw_gains(tables, batch, arrays, base)
+    if extra is not None:
+        gains = gains + extra
+    norm_gain = normalize_gains(gains, batch.mask)
+    reference = np.broadcast_to(np.asarray(reference, dtype=bool), (len(arrays),))
+    if reference.any():
+        moments = reference_moments(tables, arrays)
+        stable = normalize_reference(gains, base, arrays, moments, batch.mask)
+        norm_gain = np.where(reference[:, None, None], stable, norm_gain)
+    norm_wr = tables.norm_wr[batch.available][None]
+    scores = np.round(norm_gain * arrays.gain_weight + norm_wr * arrays.wr_weight, 2)
+    return np.where(batch.mask[None], scores, -np.inf)
@@ -0,0 +1,216 @@
+"""
+sensitivity.py - Sensitivity of Rankings to Parameter Perturbations.
+
+Measures how fragile a recommendation is. Thousands of perturbed copies of
+the scoring parameters (see `ScoringParams`) are sampled and the lobby is
+re-scored for all of them in one array operation with the vectorized core
+(`scoring.score_batch`). For each available champion the analysis reports
+the probability of being ranked first and its mean rank.
+
+Perturbations:
+    - Role weights: multiplied by log-normal noise (`weight_noise`), then each
+      role is rescaled to its original sum, so `check_role_weight_sums` still holds.
+    - Blend: `gain_weight` moves by normal noise (`blend_noise`, relative to
+      `gain_weight + wr_weight`) and `wr_weight` takes the remainder.
+    - Curve: `dr_rate` is multiplied by log-normal noise (`rate_noise`).
+      `dr_center` and `dr_scale` are kept; they do not change rankings.
+
+Ties for first place share the probability equally.
+
+Functions:
+    - perturb(tables, params, samples, ...): Samples perturbed parameter arrays.
+    - first_place_probabilities(scores): Probability of each column ranking first.
+    - mean_ranks(scores): Mean rank of each column.
+    - analyze(tables, grouped, params, samples, seed): Sensitivity report of one lobby.
+
+Usage:
+Run from the repository root, or ask the daemon (`sensitivity` method).
+
+Example:
+python
+    python -m src.core.sensitivity --team 136 64 54 875 498 --bench 203 517 86 --player 498
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from src.core.scoring import (
+    LobbyBatch,
+    ParamArrays,
+    ScoringParams,
+    ScoringTables,
+    score_batch,
+)
+
+SAMPLES = 2000
+WEIGHT_NOISE = 0.15
+BLEND_NOISE = 0.1
+RATE_NOISE = 0.15
+
+
+def perturb(
+    tables,
+    params,
+    samples=SAMPLES,
+    weight_noise=WEIGHT_NOISE,
+    blend_noise=BLEND_NOISE,
+    rate_noise=RATE_NOISE,
+    seed=None,
+):
+    """
+    Sample perturbed copies of a parameter set.
+
+    Args:
+        tables (ScoringTables): Champion tables.
+        params (ScoringParams): Parameters to perturb.
+        samples (int): Number of parameter sets.
+        weight_noise (float): Log-normal sigma of the role weight noise.
+        blend_noise (float): Normal sigma of the blend noise, relative to the blend total.
+        rate_noise (float): Log-normal sigma of the `dr_rate` noise.
+        seed (int, optional): Random seed.
+
+    Returns:
+        ParamArrays: `samples` parameter sets.
+    """
+    rng = np.random.default_rng(seed)
+    base = tables.role_weight_table(params)
+    weighted = np.array([name in params.role_weights for name in tables.role_names])
+
+    noise = np.exp(rng.normal(0.0, weight_noise, (samples,) + base.shape))
+    noise[:, ~weighted] = 1.0
+    weights = base * noise
+    weights *= (base.sum(axis=1) / np.maximum(weights.sum(axis=2), 1e-12))[..., None]
+
+    total = params.gain_weight + params.wr_weight
+    gain = np.clip(
+        params.gain_weight + rng.normal(0.0, blend_noise * total, samples), 0.0, total
+    )
+    rate = params.dr_rate * np.exp(rng.normal(0.0, rate_noise, samples))
+    return ParamArrays(
+        weights,
+        np.full(samples, params.dr_center),
+        np.full(samples, params.dr_scale),
+        rate,
+        gain,
+        total - gain,
+    )
+
+
+def first_place_probabilities(scores):
+    """
+    Compute how often each column is ranked first.
+
+    Args:
+        scores (np.ndarray): `(samples, width)` scores; `-inf` marks padding.
+
+    Returns:
+        np.ndarray: `(width,)` probabilities summing to 1.
+    """
+    winners = scores == scores.max(axis=1, keepdims=True)
+    return (winners / winners.sum(axis=1, keepdims=True)).mean(axis=0)
+
+
+def mean_ranks(scores):
+    """
+    Compute each column's mean rank (1 = first; ties share the better rank).
+
+    Args:
+        scores (np.ndarray): `(samples, width)` scores.
+
+    Returns:
+        np.ndarray: `(width,)` mean ranks.
+    """
+    return 1 + (scores[:, None, :] > scores[:, :, None]).sum(axis=2).mean(axis=0)
+
+
+def analyze(tables, grouped, params=None, samples=SAMPLES, seed=None, **noise):
+    """
+    Report how stable a lobby's ranking is under parameter perturbations.
+
+    Args:
+        tables (ScoringTables): Champion tables.
+        grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+        params (ScoringParams, optional): Parameters to perturb; the defaults when omitted.
+        samples (int): Number of perturbed parameter sets.
+        seed (int, optional): Random seed.
+        **noise: `weight_noise`, `blend_noise` or `rate_noise` overrides (see `perturb`).
+
+    Returns:
+        dict: `samples`, `stability` (probability that the unperturbed top
+        choice stays first) and `champions`, every available champion in
+        unperturbed score order with its `cid`, `score`, `p_first` and
+        `mean_rank`.
+
+    Raises:
+        ValueError: If the lobby has an unknown champion ID.
+    """
+    params = params or ScoringParams.default()
+    batch = LobbyBatch.from_grouped([grouped], tables)
+    baseline = score_batch(tables, batch, [params])[0, 0]
+    scores = score_batch(
+        tables, batch, perturb(tables, params, samples, seed=seed, **noise)
+    )[:, 0]
+    p_first = first_place_probabilities(scores)
+    ranks = mean_ranks(scores)
+
+    available = list(grouped["player"]) + list(grouped["bench"])
+    order = sorted(range(len(available)), key=lambda i: -baseline[i])
+    return {
+        "samples": samples,
+        "stability": float(p_first[order[0]]),
+        "champions": [
+            {
+                "cid": int(available[i]),
+                "score": float(baseline[i]),
+                "p_first": float(p_first[i]),
+                "mean_rank": float(ranks[i]),
+            }
+            for i in order
+        ],
+    }
+
+
+def main(argv=None):
+    """Analyze one lobby and print the report."""
+    parser = argparse.ArgumentParser(description="Ranking sensitivity of a lobby.")
+    parser.add_argument("--team", type=int, nargs="+", required=True)
+    parser.add_argument("--bench", type=int, nargs="*", default=[])
+    parser.add_argument("--player", type=int, required=True)
+    parser.add_argument("--params", help="Weights file to perturb (default: current).")
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--weight-noise", type=float, default=WEIGHT_NOISE)
+    parser.add_argument("--blend-noise", type=float, default=BLEND_NOISE)
+    parser.add_argument("--rate-noise", type=float, default=RATE_NOISE)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args(argv)
+
+    grouped = {"team": args.team, "bench": args.bench, "player": [args.player]}
+    params = ScoringParams.load(args.params) if args.params else None
+    report = analyze(
+        ScoringTables.load(),
+        grouped,
+        params,
+        args.samples,
+        args.seed,
+        weight_noise=args.weight_noise,
+        blend_noise=args.blend_noise,
+        rate_noise=args.rate_noise,
+    )
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"stability {report['stability']:.1%} over {report['samples']} samples")
+    for entry in report["champions"]:
+        print(
+            f"{entry['cid']:>5}  score {entry['score']:>7.2f}  "
+            f"P(first) {entry['p_first']:>6.1%}  mean rank {entry['mean_rank']:.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
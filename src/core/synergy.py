@@ -0,0 +1,374 @@
+"""
+synergy.py - Precomputed Pairwise Champion Synergy Matrix.
+
+The composition gain sums per-category ratings, so it cannot express pair
+effects such as engage plus follow-up, or two tanks being redundant. This
+module computes a symmetric champion-by-champion synergy matrix offline and
+stores it as `.npy` files that are memory-mapped at runtime:
+
+    data/assets/synergy/matrix.npy         float32, champions x champions
+    data/assets/synergy/champion_ids.npy   uint16 champion ID of each row
+
+The prior comes from class data. Each champion belongs to its primary class
+(weight 1) and secondary class (weight `SECONDARY_WEIGHT`), and to their
+parent classes in the class tree. `PAIR_RULES` scores pairs of classes, so
+`matrix = M @ W @ M.T` for a membership matrix `M` and a rule matrix `W`.
+Sharing a damage type adds `SAME_DAMAGE_TYPE`.
+
+Logged outcomes can refine the prior. Each pair's observed win rate lift
+over the overall win rate is shrunk towards the prior, with
+`PRIOR_STRENGTH` games of weight. Outcomes are JSONL records such as
+`{"team": [412, 222, ...], "win": true}`.
+
+Values are in raw composition gain points. The evaluator stage adds each
+candidate's summed synergy with its teammates to its raw gain, which is one
+row gather and sum per candidate.
+
+Classes:
+    - SynergyMatrix: Champion ID to row mapping plus the pairwise matrix.
+
+Functions:
+    - build_prior(metadata, hierarchy): Computes the class-based prior matrix.
+    - read_outcomes(path): Reads logged game outcomes.
+    - apply_outcomes(synergy, games, scale, strength): Shrinks observed pair lift into the matrix.
+    - build_synergy(outcomes_path): Builds the matrix from the assets and optional outcomes.
+    - load_synergy(directory): Memory-maps the stored matrix, building it when missing.
+
+Usage:
+Build the matrix with the asset pipeline or by running this module, then
+pass `load_synergy()` to `Evaluator` to enable the stage.
+
+Example:
+python
+    python -m src.core.synergy --outcomes data/logs/outcomes.jsonl
+
+    synergy = load_synergy()
+    synergy.pair(412, 222)  # Thresh with Jinx
+    pool = Evaluator(grouped, synergy=synergy).evaluate()
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from src.api.client.champion import load_champions
+from src.core.query import load_class_hierarchy
+from src.utils import paths
+
+SYNERGY_DIR = paths.ASSETS_DIR / "synergy"
+OUTCOMES_PATH = paths.LOGS_DIR / "outcomes.jsonl"
+SECONDARY_WEIGHT = 0.5
+SAME_DAMAGE_TYPE = -0.05
+OUTCOME_SCALE = 10.0
+PRIOR_STRENGTH = 30
+
+PAIR_RULES = {
+    # Engage or pick followed up by burst and long-range damage.
+    ("Catcher", "Burst"): 0.3,
+    ("Catcher", "Artillery"): 0.25,
+    ("Vanguard", "Burst"): 0.25,
+    ("Vanguard", "Battlemage"): 0.2,
+    ("Vanguard", "Marksman"): 0.15,
+    ("Vanguard", "Diver"): 0.1,
+    # Peel and buffs for carries.
+    ("Enchanter", "Marksman"): 0.3,
+    ("Enchanter", "Juggernaut"): 0.15,
+    ("Enchanter", "Skirmisher"): 0.1,
+    ("Warden", "Marksman"): 0.2,
+    # Redundant roles.
+    ("Tank", "Tank"): -0.3,
+    ("Controller", "Controller"): -0.2,
+    ("Slayer", "Slayer"): -0.15,
+    ("Marksman", "Marksman"): -0.1,
+}
+
+_shared = None
+
+
+class SynergyMatrix:
+    """
+    Pairwise synergy between champions.
+
+    Attributes:
+        cids (list[str]): Champion ID of each row.
+        rows (dict[str, int]): Champion ID to row.
+        matrix (np.ndarray): Symmetric synergy matrix with a zero diagonal.
+    """
+
+    def __init__(self, cids, matrix):
+        """
+        Wrap a matrix and its row order.
+
+        Args:
+            cids (Iterable): Champion ID of each row.
+            matrix (np.ndarray): Square matrix, e.g. a read-only memory map.
+
+        Raises:
+            ValueError: If the matrix shape does not match the champion IDs.
+        """
+        self.cids = [str(cid) for cid in cids]
+        self.rows = {cid: row for row, cid in enumerate(self.cids)}
+        if matrix.shape != (len(self.cids), len(self.cids)):
+            raise ValueError(
+                f"Synergy matrix shape {matrix.shape} does not match "
+                f"{len(self.cids)} champions."
+            )
+        self.matrix = matrix
+
+    def __len__(self):
+        """Return the number of champions."""
+        return len(self.cids)
+
+    def _rows(self, champions):
+        """Map champion IDs or objects with a `cid` to rows, -1 when unknown."""
+        rows = self.rows
+        return np.array(
+            [rows.get(str(getattr(c, "cid", c)), -1) for c in champions], dtype=np.intp
+        )
+
+    def pair(self, a, b):
+        """
+        Return the synergy of two champions.
+
+        Args:
+            a (int | str): Champion ID.
+            b (int | str): Champion ID.
+
+        Returns:
+            float: Synergy, or 0.0 if either champion is unknown.
+        """
+        ra, rb = self.rows.get(str(a)), self.rows.get(str(b))
+        if ra is None or rb is None:
+            return 0.0
+        return float(self.matrix[ra, rb])
+
+    def gains(self, candidates, teammates):
+        """
+        Sum each candidate's synergy with a set of teammates.
+
+        Args:
+            candidates (Sequence): Champion IDs or objects with a `cid`.
+            teammates (Sequence): Champion IDs or objects with a `cid`.
+
+        Returns:
+            np.ndarray: One summed synergy per candidate; 0.0 for unknown candidates.
+        """
+        cand = self._rows(candidates)
+        mates = self._rows(teammates)
+        mates = mates[mates >= 0]
+        gains = np.zeros(len(cand))
+        known = cand >= 0
+        if len(mates) and known.any():
+            gains[known] = self.matrix[np.ix_(cand[known], mates)].sum(axis=1)
+        return gains
+
+    def save(self, directory=None):
+        """
+        Write the matrix and its champion IDs, replacing each file atomically.
+
+        Args:
+            directory (Path, optional): Output directory; defaults to `SYNERGY_DIR`.
+
+        Returns:
+            Path: The directory written.
+        """
+        directory = directory or SYNERGY_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "champion_ids": np.array([int(cid) for cid in self.cids], dtype="<u2"),
+            "matrix": np.asarray(self.matrix, dtype="<f4"),
+        }
+        for name, array in arrays.items():
+            tmp = directory / f"{name}.tmp.npy"
+            np.save(tmp, array)
+            os.replace(tmp, directory / f"{name}.npy")
+        return directory
+
+
+def _memberships(metadata, hierarchy):
+    """Return class names and the champion-by-class membership weight matrix."""
+    parents = {child: parent for parent, kids in hierarchy.items() for child in kids}
+    classes = sorted(
+        set(hierarchy)
+        | set(parents)
+        | {name for pair in PAIR_RULES for name in pair}
+        | {m.primary for m in metadata}
+        | {m.secondary for m in metadata}
+    )
+    column = {name: i for i, name in enumerate(classes)}
+    members = np.zeros((len(metadata), len(classes)))
+    for row, meta in enumerate(metadata):
+        for name, weight in ((meta.primary, 1.0), (meta.secondary, SECONDARY_WEIGHT)):
+            for role in (name, parents.get(name)):
+                if role and role != "N/A":
+                    members[row, column[role]] = max(members[row, column[role]], weight)
+    return column, members
+
+
+def build_prior(metadata, hierarchy=None):
+    """
+    Compute the class-based synergy prior.
+
+    Args:
+        metadata (Iterable[ChampionMetadata]): Champions to include.
+        hierarchy (dict[str, list[str]], optional): Class tree; defaults to
+            `load_class_hierarchy()`.
+
+    Returns:
+        SynergyMatrix: Prior over the champions, in ascending champion ID order.
+    """
+    metadata = sorted(metadata, key=lambda meta: int(meta.cid))
+    if hierarchy is None:
+        hierarchy = load_class_hierarchy()
+    column, members = _memberships(metadata, hierarchy)
+
+    rules = np.zeros((len(column), len(column)))
+    for (a, b), value in PAIR_RULES.items():
+        rules[column[a], column[b]] = rules[column[b], column[a]] = value
+    matrix = members @ rules @ members.T
+
+    damage = np.array([meta.type for meta in metadata])
+    matrix += SAME_DAMAGE_TYPE * (damage[:, None] == damage[None, :])
+    np.fill_diagonal(matrix, 0.0)
+    return SynergyMatrix([meta.cid for meta in metadata], matrix.astype(np.float32))
+
+
+def read_outcomes(path=None):
+    """
+    Read logged game outcomes.
+
+    Args:
+        path (Path, optional): JSONL file; defaults to `OUTCOMES_PATH`.
+
+    Returns:
+        list[tuple[list[int], bool]]: `(team champion IDs, won)` per game;
+        empty if the file does not exist. Malformed lines are skipped.
+    """
+    path = path or OUTCOMES_PATH
+    games = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    games.append(
+                        ([int(c) for c in record["team"]], bool(record["win"]))
+                    )
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return games
+
+
+def apply_outcomes(synergy, games, scale=OUTCOME_SCALE, strength=PRIOR_STRENGTH):
+    """
+    Refine a synergy matrix with observed pair win rates.
+
+    For each pair seen together `n` times, the observed lift (pair win rate
+    minus overall win rate, times `scale`) is blended with the prior as
+    `(n * observed + strength * prior) / (n + strength)`.
+
+    Args:
+        synergy (SynergyMatrix): Prior.
+        games (Iterable[tuple[Iterable, bool]]): `(team champion IDs, won)` per game.
+        scale (float): Gain points per unit of win rate lift.
+        strength (float): Games of evidence the prior is worth.
+
+    Returns:
+        SynergyMatrix: Refined matrix; the prior itself when there are no games.
+    """
+    size = len(synergy)
+    seen = np.zeros((size, size))
+    wins = np.zeros((size, size))
+    total = won = 0
+    for team, win in games:
+        rows = synergy._rows(team)
+        rows = np.unique(rows[rows >= 0])
+        block = np.ix_(rows, rows)
+        seen[block] += 1
+        wins[block] += win
+        total += 1
+        won += win
+    if not total:
+        return synergy
+
+    prior = np.asarray(synergy.matrix, dtype=np.float64)
+    lift = np.divide(wins, seen, out=np.zeros_like(wins), where=seen > 0) - won / total
+    refined = (seen * lift * scale + strength * prior) / (seen + strength)
+    np.fill_diagonal(refined, 0.0)
+    return SynergyMatrix(synergy.cids, refined.astype(np.float32))
+
+
+def build_synergy(outcomes_path=None):
+    """
+    Build the synergy matrix from the champion assets and optional outcomes.
+
+    Args:
+        outcomes_path (Path, optional): Outcome log; defaults to `OUTCOMES_PATH`.
+
+    Returns:
+        SynergyMatrix: Prior refined by any logged outcomes.
+    """
+    metadata = [state.meta for state in load_champions().values()]
+    return apply_outcomes(build_prior(metadata), read_outcomes(outcomes_path))
+
+
+def load_synergy(directory=None):
+    """
+    Memory-map the stored synergy matrix, building and saving it when missing.
+
+    The default directory's matrix is loaded once and shared.
+
+    Args:
+        directory (Path, optional): Matrix directory; defaults to `SYNERGY_DIR`.
+
+    Returns:
+        SynergyMatrix: Matrix backed by a read-only memory map.
+    """
+    global _shared
+    if directory is None and _shared is not None:
+        return _shared
+    path = directory or SYNERGY_DIR
+    if not (path / "matrix.npy").exists() or not (path / "champion_ids.npy").exists():
+        build_synergy().save(path)
+    synergy = SynergyMatrix(
+        np.load(path / "champion_ids.npy"),
+        np.load(path / "matrix.npy", mmap_mode="r"),
+    )
+    if directory is None:
+        _shared = synergy
+    return synergy
+
+
+def main(argv=None):
+    """Build and save the synergy matrix, then print the strongest pairs."""
+    parser = argparse.ArgumentParser(description="Build the champion synergy matrix.")
+    parser.add_argument("--outcomes", help="Outcome log (JSONL) to refine the prior.")
+    parser.add_argument("-o", "--output", help="Output directory.")
+    parser.add_argument("--top", type=int, default=10, help="Pairs to print.")
+    args = parser.parse_args(argv)
+
+    outcomes = Path(args.outcomes) if args.outcomes else None
+    output = Path(args.output) if args.output else None
+    synergy = build_synergy(outcomes)
+    directory = synergy.save(output)
+    print(f"Synergy matrix ({len(synergy)} champions) -> {directory}")
+
+    names = {cid: state.meta.name for cid, state in load_champions().items()}
+    upper = np.triu_indices(len(synergy), k=1)
+    values = np.asarray(synergy.matrix)[upper]
+    for label, order in (("best", np.argsort(-values)), ("worst", np.argsort(values))):
+        print(f"{label} pairs:")
+        for i in order[: args.top]:
+            a, b = synergy.cids[upper[0][i]], synergy.cids[upper[1][i]]
+            print(f"  {names.get(a, a):<14} {names.get(b, b):<14} {values[i]:+.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
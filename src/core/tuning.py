@@ -0,0 +1,671 @@
+"""
+tuning.py - Parallel Tuning of Role Weights and the Score Blend.
+
+Searches for scoring parameters (see `ScoringParams` in `scoring.py`) that
+best explain a historical dataset of champion picks, and writes the winner
+as a new versioned weights file together with a report.
+
+Dataset:
+Each example is a lobby (`team`, `bench`, `player`) plus the champion the
+player finally picked (`pick`). Examples come from the structured session
+logs, using the last snapshot before the player's final change of champion
+(the lobby the pick was made from, see `decision_example`), or from a JSONL
+file with one `{"team", "bench", "player", "pick"}` object per line. Only
+examples whose pick was available are kept.
+
+Objective:
+The mean reciprocal rank (MRR) of the picked champion among the available
+champions, scored with the vectorized core. Top-1 agreement is reported too.
+
+Search:
+    - grid: Every combination of listed values.
+    - random: Uniform samples from ranges (seeded).
+    - coordinate: Coordinate descent from the current parameters, trying
+      `value +/- step` per parameter and halving the step when a round does
+      not improve.
+
+Candidates are scored in a process pool; every worker holds the encoded
+dataset and scores its candidates with array operations. Changing a role
+weight rescales that role's other categories so the role still sums to 5,
+and every candidate must pass `check_role_weight_sums`; candidates that
+cannot are rejected. Z-scoring makes `dr_center` and `dr_scale` irrelevant
+to rankings, and only the ratio of `gain_weight` to `wr_weight` matters, so
+the default search tunes `gain_weight` and `dr_rate`.
+
+Weights files are written to `data/assets/weights/v<NNNN>.json` as
+`{"version", "created", "params", "report"}` and can be loaded with
+`ScoringParams.load` and passed to `Evaluator(params=...)`.
+
+Classes:
+    - PickDataset: Lobbies with the champion that was picked.
+    - Tuner: Scores candidates in parallel and runs the search strategies.
+
+Functions:
+    - decision_example(records): The lobby a session's final pick was made from.
+    - pick_metrics(scores, labels): MRR and top-1 agreement per parameter set.
+    - constrain(params, names): Rebalances changed roles so they sum to 5.
+    - grid_candidates(base, grid): Candidates for a grid search.
+    - random_candidates(base, ranges, trials, seed): Candidates for a random search.
+    - write_weights(params, report, directory): Writes the next versioned weights file.
+    - format_report(report): Renders a report as text.
+
+Usage:
+Run from the repository root.
+
+Example:
+python
+    python -m src.core.tuning --strategy random --param gain_weight=0:1 --trials 200
+    python -m src.core.tuning --dataset picks.jsonl --strategy grid --param dr_rate=2,4,6
+    python -m src.core.tuning --strategy coordinate --param "role_weights.Catcher.*"
+"""
+
+import argparse
+import fnmatch
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from src.core.scoring import (
+    LobbyBatch,
+    ParamArrays,
+    ScoringParams,
+    ScoringTables,
+    score_batch,
+)
+from src.utils import paths
+
+WEIGHTS_DIR = paths.ASSETS_DIR / "weights"
+ROLE_TOTAL = 5.0
+DEFAULT_PARAMS = ("gain_weight", "dr_rate")
+CANDIDATES_PER_TASK = 4
+LOBBIES_PER_BLOCK = 8192
+TOP_CANDIDATES = 5
+
+_worker = None
+
+
+class PickDataset:
+    """
+    Lobbies with the champion that was picked.
+
+    Attributes:
+        lobbies (list[dict]): Grouped lobbies (`team`, `bench`, `player`).
+        picks (list[str]): Picked champion ID per lobby.
+    """
+
+    def __init__(self, lobbies, picks):
+        """Initialize from aligned lobbies and picks."""
+        self.lobbies = list(lobbies)
+        self.picks = [str(pick) for pick in picks]
+
+    def __len__(self):
+        """Return the number of examples."""
+        return len(self.lobbies)
+
+    @classmethod
+    def from_examples(cls, examples):
+        """
+        Build a dataset from `{"team", "bench", "player", "pick"}` objects.
+
+        Examples whose pick was not available, or with nothing to choose
+        between, are skipped.
+        """
+        lobbies, picks = [], []
+        for example in examples:
+            available = [
+                str(c) for c in list(example["player"]) + list(example["bench"])
+            ]
+            if len(available) > 1 and str(example["pick"]) in available:
+                lobbies.append(
+                    {
+                        "team": list(example["team"]),
+                        "bench": list(example["bench"]),
+                        "player": list(example["player"]),
+                    }
+                )
+                picks.append(example["pick"])
+        return cls(lobbies, picks)
+
+    @classmethod
+    def from_jsonl(cls, path):
+        """Read examples from a JSONL file (see `from_examples`)."""
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_examples(json.loads(line) for line in f if line.strip())
+
+    @classmethod
+    def from_session_logs(cls, source_dir=None):
+        """
+        Build examples from structured session logs.
+
+        Args:
+            source_dir (Path, optional): Directory searched recursively;
+                defaults to `paths.LOGS_DIR`.
+
+        Returns:
+            PickDataset: One example per completed session (see
+            `decision_example`).
+        """
+        from src.core.watcher.session_log import read_session_records
+        from src.history.store import iter_log_files
+
+        sessions, final = {}, set()
+        for path in iter_log_files(source_dir or paths.LOGS_DIR):
+            for record in read_session_records(path):
+                session = record.get("session")
+                if session is None:
+                    continue
+                sessions.setdefault(session, {})[record["seq"]] = record
+                if record.get("final"):
+                    final.add(session)
+        return cls.from_examples(
+            decision_example([r for _, r in sorted(sessions[s].items())])
+            for s in sorted(final)
+        )
+
+    def encode(self, tables):
+        """
+        Encode the dataset for the scoring core.
+
+        Args:
+            tables (ScoringTables): Champion tables.
+
+        Returns:
+            tuple[LobbyBatch, np.ndarray]: Lobby rows and the column of each
+            pick within its lobby's available champions.
+        """
+        batch = LobbyBatch.from_grouped(self.lobbies, tables)
+        pick_rows = np.array([tables.rows[p] for p in self.picks], dtype=np.intp)
+        labels = np.argmax(batch.available == pick_rows[:, None], axis=1)
+        return batch, labels
+
+
+def decision_example(records):
+    """
+    Build the example for the player's final pick from a session's snapshots.
+
+    The lobby is the last snapshot before the player's champion last changed,
+    which is the bench the final pick was made from. If the player never
+    changed champion, the lobby is the final snapshot and the pick is the
+    champion they kept over that bench.
+
+    Args:
+        records (Sequence[dict]): The session's snapshot records, in `seq` order.
+
+    Returns:
+        dict: `{"team", "bench", "player", "pick"}` example.
+    """
+    pick = records[-1]["player"]
+    lobby = records[-1]
+    for record in reversed(records):
+        if record["player"] != pick:
+            lobby = record
+            break
+    return {
+        "team": lobby["team"],
+        "bench": lobby["bench"],
+        "player": [lobby["player"]],
+        "pick": pick,
+    }
+
+
+def pick_metrics(scores, labels):
+    """
+    Measure how highly the picked champions are ranked.
+
+    Ties count against the pick: a pick tied with another champion is not
+    ranked first.
+
+    Args:
+        scores (np.ndarray): `(params, lobbies, width)` scores.
+        labels (np.ndarray): Column of each pick.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Sum of reciprocal ranks and number of
+        top-1 picks, one per parameter set.
+    """
+    picked = np.take_along_axis(scores, labels[None, :, None], axis=2)
+    ahead = (scores >= picked).sum(axis=2)
+    return (1.0 / ahead).sum(axis=1), (ahead == 1).sum(axis=1)
+
+
+def _score_candidates(tables, batch, labels, candidates):
+    """Return `{"mrr", "top1"}` per candidate over the whole dataset."""
+    arrays = ParamArrays.from_params(tables, candidates)
+    reciprocal = np.zeros(len(candidates))
+    top1 = np.zeros(len(candidates))
+    for start in range(0, len(batch), LOBBIES_PER_BLOCK):
+        index = slice(start, start + LOBBIES_PER_BLOCK)
+        scores = score_batch(tables, batch.take(index), arrays)
+        r, t = pick_metrics(scores, labels[index])
+        reciprocal += r
+        top1 += t
+    n = max(len(batch), 1)
+    return [{"mrr": r / n, "top1": t / n} for r, t in zip(reciprocal, top1)]
+
+
+def _init_worker(tables, batch, labels):
+    """Keep the encoded dataset in a worker process."""
+    global _worker
+    _worker = (tables, batch, labels)
+
+
+def _score_task(candidate_dicts):
+    """Score a task's candidates in a worker process."""
+    candidates = [ScoringParams.from_dict(d) for d in candidate_dicts]
+    return _score_candidates(*_worker, candidates)
+
+
+def constrain(params, names):
+    """
+    Rebalance every role with a changed weight so that it sums to 5 again.
+
+    The changed categories keep their values; the role's other categories are
+    scaled proportionally.
+
+    Args:
+        params (ScoringParams): Candidate parameters.
+        names (Iterable[str]): Names of the parameters that were changed.
+
+    Returns:
+        ScoringParams | None: Valid parameters, or None if the candidate
+        cannot satisfy the constraints.
+    """
+    changed = {}
+    for name in names:
+        if name.startswith("role_weights."):
+            _, role, cat = name.split(".")
+            changed.setdefault(role, set()).add(cat)
+    for role, fixed in changed.items():
+        weights = params.role_weights[role]
+        fixed_total = sum(weights[cat] for cat in fixed)
+        free = [cat for cat in weights if cat not in fixed]
+        free_total = sum(weights[cat] for cat in free)
+        if free_total <= 0 or fixed_total >= ROLE_TOTAL:
+            return None
+        factor = (ROLE_TOTAL - fixed_total) / free_total
+        for cat in free:
+            weights[cat] *= factor
+    try:
+        params.check()
+    except ValueError:
+        return None
+    return params
+
+
+def grid_candidates(base, grid):
+    """
+    Build candidates for a grid search.
+
+    Args:
+        base (ScoringParams): Values of parameters not in the grid.
+        grid (dict[str, list[float]]): Parameter name to values to try.
+
+    Returns:
+        list[ScoringParams | None]: One candidate per combination; None when
+        a combination breaks the constraints.
+    """
+    names = list(grid)
+    return [
+        constrain(base.replace(dict(zip(names, values))), names)
+        for values in itertools.product(*(grid[name] for name in names))
+    ]
+
+
+def random_candidates(base, ranges, trials, seed=0):
+    """
+    Build candidates for a random search.
+
+    Args:
+        base (ScoringParams): Values of parameters not sampled.
+        ranges (dict[str, tuple[float, float]]): Parameter name to `(low, high)`.
+        trials (int): Number of candidates.
+        seed (int): Random seed.
+
+    Returns:
+        list[ScoringParams | None]: Candidates; None when one breaks the constraints.
+    """
+    rng = random.Random(seed)
+    names = list(ranges)
+    return [
+        constrain(
+            base.replace({n: rng.uniform(*ranges[n]) for n in names}),
+            names,
+        )
+        for _ in range(trials)
+    ]
+
+
+class Tuner:
+    """
+    Scores candidate parameter sets against a dataset in parallel.
+
+    Attributes:
+        tables (ScoringTables): Champion tables.
+        base (ScoringParams): Starting parameters.
+        size (int): Number of examples.
+        evaluated (int): Candidates scored so far.
+        rejected (int): Candidates rejected by the constraints.
+        results (list[tuple[dict, ScoringParams]]): Metrics and parameters of
+            every scored candidate.
+    """
+
+    def __init__(self, dataset, tables=None, base=None, workers=None):
+        """
+        Encode the dataset and start the worker pool.
+
+        Args:
+            dataset (PickDataset): Examples to score against.
+            tables (ScoringTables, optional): Champion tables; loaded when omitted.
+            base (ScoringParams, optional): Starting parameters; the defaults when omitted.
+            workers (int, optional): Worker processes; defaults to `os.cpu_count()`.
+                1 scores in-process.
+
+        Raises:
+            ValueError: If the dataset is empty.
+        """
+        if not len(dataset):
+            raise ValueError("The dataset has no usable examples.")
+        self.tables = tables or ScoringTables.load()
+        self.base = base or ScoringParams.default()
+        self.size = len(dataset)
+        self.evaluated = 0
+        self.rejected = 0
+        self.results = []
+        self._data = (self.tables, *dataset.encode(self.tables))
+        workers = workers or os.cpu_count() or 1
+        self._pool = (
+            multiprocessing.Pool(workers, _init_worker, self._data)
+            if workers > 1
+            else None
+        )
+
+    def __enter__(self):
+        """Return the tuner for use in a `with` block."""
+        return self
+
+    def __exit__(self, *exc):
+        """Stop the worker pool."""
+        self.close()
+
+    def close(self):
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+
+    def score(self, candidates):
+        """
+        Score candidates, skipping rejected (None) ones.
+
+        Args:
+            candidates (list[ScoringParams | None]): Candidates.
+
+        Returns:
+            list[dict | None]: `{"mrr", "top1"}` per candidate, None where rejected.
+        """
+        valid = [c for c in candidates if c is not None]
+        self.rejected += len(candidates) - len(valid)
+        starts = range(0, len(valid), CANDIDATES_PER_TASK)
+        tasks = [valid[start:][:CANDIDATES_PER_TASK] for start in starts]
+        if self._pool is None:
+            scored = [_score_candidates(*self._data, task) for task in tasks]
+        else:
+            scored = self._pool.map(
+                _score_task, [[c.to_dict() for c in task] for task in tasks]
+            )
+        metrics = iter([m for task in scored for m in task])
+        results = []
+        for candidate in candidates:
+            if candidate is None:
+                results.append(None)
+                continue
+            m = next(metrics)
+            self.results.append((m, candidate))
+            results.append(m)
+        self.evaluated += len(valid)
+        return results
+
+    def best(self):
+        """Return the `(metrics, params)` with the highest MRR so far."""
+        return max(self.results, key=lambda result: result[0]["mrr"])
+
+    def grid(self, grid):
+        """Run a grid search; see `grid_candidates`."""
+        self.score(grid_candidates(self.base, grid))
+        return self.best()
+
+    def random(self, ranges, trials, seed=0):
+        """Run a random search; see `random_candidates`."""
+        self.score(random_candidates(self.base, ranges, trials, seed))
+        return self.best()
+
+    def coordinate_descent(self, names, step=0.25, rounds=10, min_step=0.01):
+        """
+        Run coordinate descent from the base parameters.
+
+        Each round tries `value * (1 +/- step)` for every parameter (all in
+        parallel), moves every parameter whose best move improved the MRR,
+        and halves the step when no move helped.
+
+        Args:
+            names (list[str]): Parameters to tune.
+            step (float): Initial relative step.
+            rounds (int): Maximum rounds.
+            min_step (float): Stop when the step falls below this.
+
+        Returns:
+            tuple[dict, ScoringParams]: Best metrics and parameters.
+        """
+        current = self.base
+        (current_metrics,) = self.score([current])
+        for _ in range(rounds):
+            if step < min_step:
+                break
+            moves = [
+                (name, current.get(name) * (1 + sign * step))
+                for name in names
+                for sign in (1, -1)
+            ]
+            candidates = [constrain(current.replace({n: v}), [n]) for n, v in moves]
+            improved = {}
+            for (name, value), m in zip(moves, self.score(candidates)):
+                if m and m["mrr"] > current_metrics["mrr"]:
+                    if name not in improved or m["mrr"] > improved[name][1]:
+                        improved[name] = (value, m["mrr"])
+            if not improved:
+                step /= 2
+                continue
+            combined = constrain(
+                current.replace({n: v for n, (v, _) in improved.items()}), improved
+            )
+            (combined_metrics,) = self.score([combined])
+            if combined_metrics and combined_metrics["mrr"] > current_metrics["mrr"]:
+                current, current_metrics = combined, combined_metrics
+            else:
+                name = max(improved, key=lambda n: improved[n][1])
+                current = constrain(current.replace({name: improved[name][0]}), [name])
+                current_metrics = self.score([current])[0]
+        return self.best()
+
+    def report(self, strategy, baseline, seconds):
+        """
+        Summarize the search.
+
+        Args:
+            strategy (str): Strategy name.
+            baseline (dict): Metrics of the base parameters.
+            seconds (float): Elapsed time.
+
+        Returns:
+            dict: Dataset size, counts, baseline and best metrics, changed
+            parameters and the top candidates.
+        """
+        best_metrics, best = self.best()
+        changed = {
+            name: {"from": self.base.get(name), "to": best.get(name)}
+            for name in best.names()
+            if not np.isclose(self.base.get(name), best.get(name))
+        }
+        top = sorted(self.results, key=lambda r: r[0]["mrr"], reverse=True)
+        return {
+            "strategy": strategy,
+            "examples": self.size,
+            "evaluated": self.evaluated,
+            "rejected": self.rejected,
+            "seconds": round(seconds, 3),
+            "baseline": baseline,
+            "best": best_metrics,
+            "changed": changed,
+            "top": [
+                {**m, "params": {n: p.get(n) for n in changed}}
+                for m, p in top[:TOP_CANDIDATES]
+            ],
+        }
+
+
+def write_weights(params, report, directory=None):
+    """
+    Write parameters and their report as the next versioned weights file.
+
+    Args:
+        params (ScoringParams): Parameters to write.
+        report (dict): Tuning report.
+        directory (Path, optional): Output directory; defaults to `WEIGHTS_DIR`.
+
+    Returns:
+        Path: The written file, `v<NNNN>.json`.
+    """
+    directory = directory or WEIGHTS_DIR
+    directory.mkdir(parents=True, exist_ok=True)
+    versions = [
+        int(p.stem[1:]) for p in directory.glob("v*.json") if p.stem[1:].isdigit()
+    ]
+    version = max(versions, default=0) + 1
+    path = directory / f"v{version:04d}.json"
+    document = {
+        "version": version,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "params": params.to_dict(),
+        "report": report,
+    }
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+    os.replace(tmp, path)
+    return path
+
+
+def format_report(report):
+    """Render a tuning report as text."""
+    lines = [
+        f"strategy   {report['strategy']}",
+        f"examples   {report['examples']}",
+        f"evaluated  {report['evaluated']} ({report['rejected']} rejected) "
+        f"in {report['seconds']:.2f}s",
+        f"baseline   MRR {report['baseline']['mrr']:.4f}  "
+        f"top-1 {report['baseline']['top1']:.2%}",
+        f"best       MRR {report['best']['mrr']:.4f}  "
+        f"top-1 {report['best']['top1']:.2%}",
+    ]
+    for name, change in report["changed"].items():
+        lines.append(f"  {name:<36} {change['from']:>8.4f} -> {change['to']:>8.4f}")
+    return "\n".join(lines)
+
+
+def _parse_specs(specs, base):
+    """
+    Parse `--param` specs into grid values, ranges and names.
+
+    `name=a,b,c` lists grid values, `name=low:high` is a range and a bare
+    name uses +/-50% of the current value. Names may be `fnmatch` patterns.
+    """
+    grid, ranges = {}, {}
+    for spec in specs:
+        pattern, _, values = spec.partition("=")
+        names = fnmatch.filter(base.names(), pattern)
+        if not names:
+            raise ValueError(f"No parameter matches {pattern!r}")
+        for name in names:
+            if ":" in values:
+                low, high = values.split(":")
+                ranges[name] = (float(low), float(high))
+            elif values:
+                grid[name] = [float(v) for v in values.split(",")]
+            else:
+                current = base.get(name)
+                ranges[name] = (current * 0.5, current * 1.5)
+                grid[name] = [current * f for f in (0.5, 0.75, 1.0, 1.25, 1.5)]
+    return grid, ranges
+
+
+def main(argv=None):
+    """Run a search, print the report and write the best parameters."""
+    parser = argparse.ArgumentParser(description="Tune scoring parameters.")
+    parser.add_argument(
+        "--dataset", help="JSONL of lobbies with picks (default: logs)."
+    )
+    parser.add_argument("--logs", help="Session log directory (default: data/logs).")
+    parser.add_argument(
+        "--strategy", choices=("grid", "random", "coordinate"), default="coordinate"
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="name, name=a,b,c (grid) or name=low:high (random); repeatable.",
+    )
+    parser.add_argument("--base", help="Weights file to start from.")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--step", type=float, default=0.25)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("-o", "--output", help="Weights directory.")
+    parser.add_argument(
+        "--no-write", action="store_true", help="Only print the report."
+    )
+    args = parser.parse_args(argv)
+
+    if args.dataset:
+        dataset = PickDataset.from_jsonl(args.dataset)
+    else:
+        dataset = PickDataset.from_session_logs(Path(args.logs) if args.logs else None)
+    base = ScoringParams.load(args.base) if args.base else ScoringParams.default()
+    grid, ranges = _parse_specs(args.param or DEFAULT_PARAMS, base)
+
+    if not len(dataset):
+        print(
+            "No usable examples: every pick must be an available champion.",
+            file=sys.stderr,
+        )
+        return 1
+
+    start = time.perf_counter()
+    with Tuner(dataset, base=base, workers=args.workers) as tuner:
+        (baseline,) = tuner.score([base])
+        if args.strategy == "grid":
+            tuner.grid(grid)
+        elif args.strategy == "random":
+            tuner.random(ranges, args.trials, args.seed)
+        else:
+            tuner.coordinate_descent(list(ranges), args.step, args.rounds)
+        report = tuner.report(args.strategy, baseline, time.perf_counter() - start)
+        _, best = tuner.best()
+
+    print(format_report(report))
+    if not args.no_write and report["changed"]:
+        output = Path(args.output) if args.output else None
+        print(f"Wrote {write_weights(best, report, output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,9 @@ Modules:
 - watcher: Coordinates LCU polling, evaluation, and user interaction loop.
 - display: Handles terminal display of team and bench state during champion select.
 - logging: Saves final champion select state to disk after the phase ends.
+- session_log: Streams every evaluated snapshot to a structured JSONL log.
+- tracing: Per-stage latency spans and histograms exported per session.
+- profiler: Optional per-cycle profiling of the polling loop.
 
 Usage:
 Import `main()` to start monitoring, or individual utilities for integration with
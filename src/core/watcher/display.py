@@ -24,6 +24,9 @@ def display_lobby_champions(pool):
 
     Args:
         pool (ChampionPool): The evaluated pool of champions, including team, bench, and player.
+
+    Returns:
+        bool: True if the screen was redrawn, False if the state was unchanged.
     """
     global previous_lobby_data
 
@@ -34,7 +37,7 @@ def display_lobby_champions(pool):
     }
 
     if current_ids == previous_lobby_data:
-        return
+        return False
 
     previous_lobby_data = current_ids
 
@@ -63,3 +66,4 @@ def display_lobby_champions(pool):
 
     sys.stdout.write("\n".join(output_lines) + "\n")
     sys.stdout.flush()
+    return True
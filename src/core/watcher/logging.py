@@ -6,34 +6,31 @@ Files are written in a readable format, organized by version and timestamp.
 
 Responsibilities:
 - Generate timestamped filenames.
-- Format the evaluated champion pool into a human-readable log.
+- Format the evaluated champion pool into a human-readable log (`format_champion_select`).
 - Save log files to the appropriate versioned log directory.
 """
 
 from datetime import datetime
+from src.core.watcher.session_log import LOG_BYTES
 from src.utils import paths
 from src.__version__ import __version__ as version
 
-LOG_PATH = paths.DATA_DIR / "logs" / version
-LOG_PATH.mkdir(parents=True, exist_ok=True)
+LOG_PATH = paths.LOGS_DIR / version
+_FINAL_BYTES = LOG_BYTES.labels("final")
 
 
-def log_final_champion_select(pool):
+def format_champion_select(pool, now):
     """
-    Log the final evaluated champion state to a timestamped `.log` file.
-
-    Includes:
-    - Champion IDs and names for team and bench
-    - Evaluated scores (total score, comp gain, win rate impact)
-    - Highlight for the player's selected champion
+    Render an evaluated champion pool in the fixed-width `.log` text format.
 
     Args:
-        pool (ChampionPool): Evaluated champion pool at the end of champion select.
-    """
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M")
-    log_file = LOG_PATH / f"champion_select_{timestamp}.log"
+        pool (ChampionPool): Evaluated champion pool.
+        now (datetime): Timestamp written in the header line.
 
-    log_lines = [f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S,%f')} ==="]
+    Returns:
+        str: The log file contents.
+    """
+    log_lines = [f"{now.strftime('%Y-%m-%d %H:%M:%S,%f')} ==="]
     log_lines.append("Champion Select:")
     log_lines.append(
         f" {'Key':<6} {'Champion':<18}  | {'Score':<10} {'Comp Score':<10} {'WR Score':<10} {'Raw WR':<10}"
@@ -53,6 +50,26 @@ def log_final_champion_select(pool):
         log_lines.append(
             f"  {champ.cid:<6} {champ.meta.name:<18} | {champ.score:<10.1f} {champ.norm_gain:<10.1f} {champ.norm_wr:<10.1f} {champ.raw_wr:<10.1f}"
         )
+    return "\n".join(log_lines)
+
+
+def log_final_champion_select(pool):
+    """
+    Log the final evaluated champion state to a timestamped `.log` file.
+
+    Includes:
+    - Champion IDs and names for team and bench
+    - Evaluated scores (total score, comp gain, win rate impact)
+    - Highlight for the player's selected champion
+
+    Args:
+        pool (ChampionPool): Evaluated champion pool at the end of champion select.
+    """
+    now = datetime.now()
+    LOG_PATH.mkdir(parents=True, exist_ok=True)
+    log_file = LOG_PATH / f"champion_select_{now.strftime('%Y-%m-%d_%H-%M-%S')}.log"
 
+    data = format_champion_select(pool, now)
     with open(log_file, "w", encoding="utf-8") as f:
-        f.write("\n".join(log_lines))
+        f.write(data)
+    _FINAL_BYTES.inc(len(data.encode("utf-8")))
@@ -0,0 +1,434 @@
+"""
+profiler.py - Built-in Profiling for the Champion Select Loop.
+
+Measures where each polling cycle of the watcher spends its time. Every cycle
+is split into phases (status, fetch, sanitize, evaluate, display, log) that
+are timed with `time.perf_counter`. On sampled cycles, the profiler also:
+- runs `cProfile` for a function-level summary,
+- samples the watcher thread's stack from a background thread to build
+  flamegraph-compatible collapsed stacks, rooted at the current phase,
+- records each phase's peak allocation with `tracemalloc`.
+
+Reports are written when a champion select session ends:
+    <session>.txt        Phase timing table, peak memory and top functions.
+    <session>.prof       Raw `cProfile` stats (`python -m pstats`, snakeviz).
+    <session>.collapsed  Collapsed stacks (`flamegraph.pl`, speedscope).
+
+Profiling is enabled with `--profile` or by setting `NOMAD_PROFILE=1`. When it
+is disabled the watcher uses `NULL_PROFILER`, whose methods do nothing and
+whose `phase()` returns a shared no-op context manager, so the loop pays only
+a few attribute lookups per phase.
+
+Classes:
+    - NullProfiler: Disabled profiler; every method is a no-op.
+    - CycleProfiler: Per-cycle phase timer, cProfile and stack sampler.
+
+Functions:
+    - profiling_requested(flag): Returns whether profiling is enabled by flag or env var.
+    - create_profiler(enabled): Returns a CycleProfiler or NULL_PROFILER.
+
+Example:
+python
+    profiler = create_profiler(enabled=True)
+    profiler.begin_session("20250322-181502-1a2b3c")
+    profiler.begin_cycle()
+    with profiler.phase("fetch"):
+        lobby_data = fetch_lobby_champions(port, password)
+    profiler.end_cycle()
+    reports = profiler.end_session()
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from src.utils import paths
+from src.__version__ import __version__ as version
+
+PROFILE_ENV = "NOMAD_PROFILE"
+PROFILE_PATH = paths.LOGS_DIR / version / "profiles"
+PHASES = ("status", "fetch", "sanitize", "evaluate", "display", "log")
+
+SAMPLE_EVERY = 1
+SAMPLE_INTERVAL = 0.005
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 10
+
+
+def profiling_requested(flag=False):
+    """
+    Decide whether profiling is enabled.
+
+    Args:
+        flag (bool): Value of the `--profile` command-line flag.
+
+    Returns:
+        bool: True if the flag is set or `NOMAD_PROFILE` holds a truthy value.
+    """
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    return bool(flag) or value not in ("", "0", "false", "no", "off")
+
+
+def create_profiler(enabled=False, **kwargs):
+    """
+    Build the profiler used by the watcher loop.
+
+    Args:
+        enabled (bool): Value of the `--profile` command-line flag.
+        **kwargs: Passed to `CycleProfiler` when profiling is enabled.
+
+    Returns:
+        CycleProfiler | NullProfiler: A new profiler, or `NULL_PROFILER`.
+    """
+    if not profiling_requested(enabled):
+        return NULL_PROFILER
+    return CycleProfiler(**kwargs)
+
+
+class _NullPhase:
+    """Context manager that does nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class NullProfiler:
+    """Disabled profiler; every method is a no-op."""
+
+    enabled = False
+
+    def begin_session(self, session_id=None):
+        """Do nothing."""
+
+    def begin_cycle(self):
+        """Do nothing."""
+
+    def phase(self, name):
+        """Return the shared no-op context manager."""
+        return _NULL_PHASE
+
+    def end_cycle(self):
+        """Do nothing."""
+
+    def end_session(self):
+        """Do nothing; no reports are written."""
+        return None
+
+    def close(self):
+        """Do nothing."""
+
+
+NULL_PROFILER = NullProfiler()
+
+
+class _Phase:
+    """Context manager timing one phase of a profiled cycle."""
+
+    __slots__ = ("profiler", "name", "start", "memory")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        profiler._current = self.name
+        self.memory = None
+        if profiler._sampling and profiler._tracing:
+            import tracemalloc
+
+            tracemalloc.reset_peak()
+            self.memory = tracemalloc.get_traced_memory()[0]
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        profiler._current = None
+        profiler.timings.setdefault(self.name, []).append(elapsed)
+        if self.memory is not None:
+            import tracemalloc
+
+            grown = tracemalloc.get_traced_memory()[1] - self.memory
+            peaks = profiler.peaks
+            peaks[self.name] = max(peaks.get(self.name, 0), grown)
+        return False
+
+
+class CycleProfiler:
+    """
+    Per-cycle phase timer, cProfile collector and stack sampler.
+
+    Phase timings are recorded on every cycle; cProfile, stack sampling and
+    memory tracing only run on every `sample_every`-th cycle.
+
+    Attributes:
+        directory (Path): Directory receiving the session reports.
+        sample_every (int): Profile one cycle out of this many.
+        interval (float): Seconds between stack samples.
+        memory (bool): Whether to trace allocations with `tracemalloc`.
+        session_id (str | None): Session currently being profiled.
+        cycles (int): Cycles seen in the current session.
+        sampled (int): Cycles profiled in the current session.
+        timings (dict[str, list[float]]): Phase name to per-cycle seconds.
+        peaks (dict[str, int]): Phase name to peak bytes allocated.
+        stacks (Counter): Collapsed stack string to sample count.
+    """
+
+    enabled = True
+
+    def __init__(
+        self,
+        directory=None,
+        sample_every=SAMPLE_EVERY,
+        interval=SAMPLE_INTERVAL,
+        memory=True,
+    ):
+        """Initialize the profiler; sessions start with `begin_session()`."""
+        if sample_every < 1:
+            raise ValueError(f"sample_every must be >= 1, got {sample_every}.")
+        self.directory = directory or PROFILE_PATH
+        self.sample_every = sample_every
+        self.interval = interval
+        self.memory = memory
+        self.session_id = None
+        self._profile = None
+        self._sampling = False
+        self._tracing = False
+        self._current = None
+        self._target = None
+        self._root = None
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._reset()
+
+    def _reset(self):
+        """Clear the statistics collected for a session."""
+        self.cycles = 0
+        self.sampled = 0
+        self.timings = {}
+        self.peaks = {}
+        self.stacks = Counter()
+
+    def begin_session(self, session_id=None):
+        """
+        Start collecting statistics for a new session.
+
+        Args:
+            session_id (str, optional): Name used for the report files.
+        """
+        import cProfile
+
+        if self.session_id is not None:
+            self.end_session()
+        self._reset()
+        self.session_id = session_id or time.strftime("%Y%m%d-%H%M%S")
+        self._profile = cProfile.Profile()
+        self._target = threading.get_ident()
+        if self.memory:
+            import tracemalloc
+
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._sample_loop, name="cycle-profiler", daemon=True
+            )
+            self._thread.start()
+
+    def begin_cycle(self):
+        """Mark the start of a polling cycle; the caller's frame becomes the stack root."""
+        if self.session_id is None:
+            self.begin_session()
+        self.cycles += 1
+        self._sampling = (self.cycles - 1) % self.sample_every == 0
+        if self._sampling:
+            self.sampled += 1
+            self._root = sys._getframe(1)
+            self._profile.enable()
+            self._active.set()
+
+    def phase(self, name):
+        """
+        Time a phase of the current cycle.
+
+        Args:
+            name (str): Phase name, e.g. one of `PHASES`.
+
+        Returns:
+            _Phase: Context manager recording the phase.
+        """
+        return _Phase(self, name)
+
+    def end_cycle(self):
+        """Mark the end of a polling cycle."""
+        if self._sampling:
+            with self._lock:
+                self._active.clear()
+            self._profile.disable()
+            self._root = None
+            self._sampling = False
+
+    def end_session(self):
+        """
+        Stop profiling the current session and write its reports.
+
+        Returns:
+            dict[str, Path] | None: Report kind (`summary`, `stats`, `collapsed`)
+            to file path, or None if no session was open.
+        """
+        if self.session_id is None:
+            return None
+        self.end_cycle()
+        reports = self._write_reports()
+        if self._tracing:
+            import tracemalloc
+
+            tracemalloc.stop()
+            self._tracing = False
+        self.session_id = None
+        self._profile = None
+        return reports
+
+    def close(self):
+        """Write reports for any open session and stop the sampler thread."""
+        self.end_session()
+        if self._thread is not None:
+            self._stop.set()
+            self._active.set()
+            self._thread.join()
+            self._active.clear()
+            self._thread = None
+
+    def _sample_loop(self):
+        """Sampler thread: record the watcher's stack while a cycle is profiled."""
+        while not self._stop.is_set():
+            if not self._active.wait(0.1):
+                continue
+            time.sleep(self.interval)
+            with self._lock:
+                if self._active.is_set() and not self._stop.is_set():
+                    self._sample()
+
+    def _sample(self):
+        """Record one collapsed stack of the watcher thread."""
+        frame = sys._current_frames().get(self._target)
+        root = self._root
+        labels = []
+        while frame is not None and frame is not root:
+            code = frame.f_code
+            # co_qualname is new in Python 3.11; 3.10 labels use the bare name
+            name = getattr(code, "co_qualname", code.co_name)
+            labels.append(f"{frame.f_globals.get('__name__', '?')}:{name}")
+            frame = frame.f_back
+        if root is None or frame is None:
+            return
+        labels.append(self._current or "other")
+        self.stacks[";".join(reversed(labels))] += 1
+
+    def summary(self):
+        """
+        Summarize phase timings of the current session.
+
+        Returns:
+            list[dict]: One row per phase with `phase`, `count`, `mean_ms`,
+            `p50_ms`, `p95_ms`, `max_ms`, `total_ms` and `peak_kib`.
+        """
+        order = [p for p in PHASES if p in self.timings]
+        order += sorted(p for p in self.timings if p not in PHASES)
+        rows = []
+        for name in order:
+            values = sorted(self.timings[name])
+            total = sum(values)
+            rows.append(
+                {
+                    "phase": name,
+                    "count": len(values),
+                    "mean_ms": total / len(values) * 1000,
+                    "p50_ms": _percentile(values, 50) * 1000,
+                    "p95_ms": _percentile(values, 95) * 1000,
+                    "max_ms": values[-1] * 1000,
+                    "total_ms": total * 1000,
+                    "peak_kib": self.peaks[name] / 1024 if name in self.peaks else None,
+                }
+            )
+        return rows
+
+    def _write_reports(self):
+        """Write the summary, cProfile stats and collapsed stacks for the session."""
+        import pstats
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / self.session_id
+        reports = {
+            "summary": base.with_suffix(".txt"),
+            "stats": base.with_suffix(".prof"),
+            "collapsed": base.with_suffix(".collapsed"),
+        }
+
+        lines = [
+            f"Profile for session {self.session_id}: "
+            f"{self.cycles} cycle(s), {self.sampled} sampled",
+            "",
+            f"{'Phase':<10} {'Count':>6} {'Mean ms':>9} {'p50 ms':>9} "
+            f"{'p95 ms':>9} {'Max ms':>9} {'Total ms':>10} {'Peak KiB':>9}",
+            "-" * 78,
+        ]
+        for row in self.summary():
+            peak = "-" if row["peak_kib"] is None else f"{row['peak_kib']:.1f}"
+            lines.append(
+                f"{row['phase']:<10} {row['count']:>6} {row['mean_ms']:>9.2f} "
+                f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['max_ms']:>9.2f} "
+                f"{row['total_ms']:>10.1f} {peak:>9}"
+            )
+
+        if self.sampled:
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=stream)
+            stats.dump_stats(reports["stats"])
+            stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            lines += ["", "Top functions by cumulative time (sampled cycles):"]
+            lines.append(stream.getvalue().strip())
+        else:
+            reports.pop("stats")
+
+        if self._tracing:
+            import tracemalloc
+
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [
+                    tracemalloc.Filter(False, tracemalloc.__file__),
+                    tracemalloc.Filter(False, __file__),
+                ]
+            )
+            lines += ["", "Top retained allocations at session end:"]
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                lines.append(f"  {stat}")
+
+        with open(reports["summary"], "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        with open(reports["collapsed"], "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        return reports
+
+
+def _percentile(values, q):
+    """Return the nearest-rank q-th percentile of a sorted, non-empty list."""
+    rank = max(1, -(-len(values) * q // 100))
+    return values[int(rank) - 1]
@@ -0,0 +1,363 @@
+"""
+session_log.py - Structured Session Log for ARAM Champion Select.
+
+Appends every evaluated snapshot of a champion select session to an
+append-only, schema-versioned JSONL file. Records are serialized and written
+by a background thread so the watcher loop never blocks on disk I/O.
+
+Responsibilities:
+- Assign session IDs and per-session snapshot sequence numbers.
+- Convert evaluated ChampionPool snapshots into structured records.
+- Batch writes, and fsync when a session ends.
+- Rotate the active file by size or age and gzip rotated segments.
+- Survive write errors: records that cannot be written are dropped and
+  counted, and the last error is kept for `close()` to report.
+
+Record schema (version 1):
+    {
+        "schema": 1,                 # SCHEMA_VERSION
+        "app_version": "0.1.0",      # Nomad version that wrote the record
+        "session": "20250322-181502-1a2b3c",
+        "seq": 0,                    # snapshot index within the session
+        "ts": 1742667302.51,         # wall-clock time (seconds since epoch)
+        "final": false,              # true for the last snapshot of a session
+        "player": 136,
+        "team": [136, 64, 54, 875, 498],
+        "bench": [203, 517, 86],     # ranked order, as displayed
+        "score": [...],              # aligned with [player] + bench
+        "norm_gain": [...],
+        "norm_wr": [...],
+        "raw_wr": [...],
+        "shadow": {                  # only when shadow models are registered
+            "tuned": {"score": [...], "top": 64}
+        }
+    }
+"""
+
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from src.utils import metrics, paths
+from src.__version__ import __version__ as version
+
+SCHEMA_VERSION = 1
+SESSION_LOG_PATH = paths.LOGS_DIR / version / "sessions"
+ACTIVE_LOG_NAME = "session_log.jsonl"
+
+BATCH_SIZE = 32
+FLUSH_INTERVAL = 1.0
+MAX_BYTES = 8 * 1024 * 1024
+MAX_AGE = 24 * 60 * 60
+
+LOG_BYTES = metrics.counter(
+    "nomad_log_bytes_written_total", "Bytes written to log files.", ["log"]
+)
+_SESSION_BYTES = LOG_BYTES.labels("session")
+LOG_RECORDS_DROPPED = metrics.counter(
+    "nomad_log_records_dropped_total",
+    "Log records dropped because they could not be written.",
+    ["log"],
+)
+_SESSION_DROPPED = LOG_RECORDS_DROPPED.labels("session")
+
+_SESSION_END = object()
+_STOP = object()
+
+
+def new_session_id():
+    """
+    Generate a unique, time-sortable session identifier.
+
+    Returns:
+        str: Session ID of the form `YYYYmmdd-HHMMSS-xxxxxx`.
+    """
+    return f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def snapshot_record(pool, session_id, seq, ts, final=False, shadow=None):
+    """
+    Convert an evaluated champion pool into a structured log record.
+
+    Args:
+        pool (ChampionPool): Evaluated champion pool for a single snapshot.
+        session_id (str): Identifier of the session the snapshot belongs to.
+        seq (int): Snapshot index within the session.
+        ts (float): Wall-clock timestamp of the snapshot.
+        final (bool): Whether this is the last snapshot of the session.
+        shadow (dict, optional): Shadow model results (see `ModelRegistry.shadow`).
+
+    Returns:
+        dict: Record following the schema described in the module docstring.
+    """
+    available = [pool.player] + list(pool.bench)
+    record = {
+        "schema": SCHEMA_VERSION,
+        "app_version": version,
+        "session": session_id,
+        "seq": seq,
+        "ts": round(ts, 3),
+        "final": final,
+        "player": int(pool.player.cid),
+        "team": [int(champ.cid) for champ in pool.team],
+        "bench": [int(champ.cid) for champ in pool.bench],
+        "score": [float(champ.score) for champ in available],
+        "norm_gain": [float(champ.norm_gain) for champ in available],
+        "norm_wr": [float(champ.norm_wr) for champ in available],
+        "raw_wr": [float(champ.raw_wr) for champ in available],
+    }
+    if shadow:
+        record["shadow"] = shadow
+    return record
+
+
+class SessionLogWriter:
+    """
+    Background, append-only writer for structured champion select records.
+
+    The watcher thread only enqueues snapshots; serialization, batching,
+    rotation and compression all happen on the writer thread.
+
+    Attributes:
+        directory (Path): Directory holding the active and rotated log files.
+        batch_size (int): Number of records buffered before a write.
+        flush_interval (float): Maximum seconds a record waits in the buffer.
+        max_bytes (int): Rotate the active file once it exceeds this size.
+        max_age (float): Rotate the active file once it is older than this (seconds).
+        compress (bool): Whether rotated segments are gzip-compressed.
+        session_id (str | None): ID of the session currently being logged.
+        dropped (int): Records lost to serialization or write errors.
+        error (Exception | None): The most recent such error.
+    """
+
+    def __init__(
+        self,
+        directory=None,
+        batch_size=BATCH_SIZE,
+        flush_interval=FLUSH_INTERVAL,
+        max_bytes=MAX_BYTES,
+        max_age=MAX_AGE,
+        compress=True,
+    ):
+        """Initialize the writer; call `start()` to launch the background thread."""
+        self.directory = directory or SESSION_LOG_PATH
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.compress = compress
+        self.session_id = None
+        self.dropped = 0
+        self.error = None
+        self._seq = 0
+        self._last = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._file = None
+        self._opened_at = 0.0
+
+    @property
+    def active_path(self):
+        """Path of the file currently being appended to."""
+        return self.directory / ACTIVE_LOG_NAME
+
+    def start(self):
+        """Start the background writer thread (idempotent)."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="session-log-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def begin_session(self):
+        """
+        Start a new session, ending the previous one if still open.
+
+        Returns:
+            str: The new session ID.
+        """
+        if self.session_id is not None:
+            self.end_session()
+        self.session_id = new_session_id()
+        self._seq = 0
+        return self.session_id
+
+    def log_snapshot(self, pool, shadow=None):
+        """
+        Queue an evaluated snapshot for the current session.
+
+        Evaluated pools are not mutated after `Evaluator.evaluate()` returns,
+        so the record is built on the writer thread.
+
+        Args:
+            pool (ChampionPool): Evaluated champion pool.
+            shadow (dict, optional): Shadow model results for the same snapshot.
+        """
+        if self.session_id is None:
+            self.begin_session()
+        self._flush_last(final=False)
+        self._last = (pool, self.session_id, self._seq, time.time(), shadow)
+        self._seq += 1
+
+    def end_session(self):
+        """Mark the last snapshot as final and request a flush + fsync."""
+        if self.session_id is None:
+            return
+        self._flush_last(final=True)
+        self._queue.put(_SESSION_END)
+        self.session_id = None
+
+    def close(self):
+        """
+        End any open session, drain the queue and stop the writer thread.
+
+        Returns:
+            str | None: A summary of the records that could not be written, if any.
+        """
+        self.end_session()
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self.dropped:
+            return (
+                f"Session log: {self.dropped} record(s) could not be written "
+                f"({type(self.error).__name__}: {self.error})"
+            )
+        return None
+
+    def _flush_last(self, final):
+        """Enqueue the held-back snapshot, marking it final if requested."""
+        if self._last is not None:
+            pool, session_id, seq, ts, shadow = self._last
+            self._queue.put((pool, session_id, seq, ts, final, shadow))
+            self._last = None
+
+    def _run(self):
+        """Writer loop: batch records, write them, and fsync on session end."""
+        buffer = []
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush(buffer)
+                continue
+
+            if item is _STOP:
+                self._flush(buffer, sync=True)
+                try:
+                    self._close_file()
+                except OSError as e:
+                    self.error = e
+                return
+            if item is _SESSION_END:
+                self._flush(buffer, sync=True)
+                continue
+
+            try:
+                record = snapshot_record(*item)
+                buffer.append(json.dumps(record, separators=(",", ":")))
+            except Exception as e:
+                self._drop(1, e)
+                continue
+            if len(buffer) >= self.batch_size:
+                self._flush(buffer)
+
+    def _flush(self, buffer, sync=False):
+        """Write the buffer, dropping its records if the write fails."""
+        try:
+            self._write(buffer, sync)
+        except Exception as e:
+            self._drop(len(buffer), e)
+            buffer.clear()
+            # Reopen on the next write; the handle may be unusable
+            file, self._file = self._file, None
+            if file is not None:
+                try:
+                    file.close()
+                except OSError:
+                    pass
+
+    def _drop(self, count, error):
+        """Count records lost to an error and remember the error."""
+        self.dropped += count
+        self.error = error
+        _SESSION_DROPPED.inc(count)
+
+    def _write(self, buffer, sync=False):
+        """Append buffered lines to the active file and clear the buffer."""
+        if buffer:
+            f = self._open_file()
+            data = "\n".join(buffer) + "\n"
+            f.write(data)
+            _SESSION_BYTES.inc(len(data.encode("utf-8")))
+            buffer.clear()
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+            if self._should_rotate():
+                self._rotate()
+        elif sync and self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _open_file(self):
+        """Open (or reuse) the active log file in append mode."""
+        if self._file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.active_path
+            self._opened_at = path.stat().st_mtime if path.exists() else time.time()
+            self._file = open(path, "a", encoding="utf-8")
+        return self._file
+
+    def _close_file(self):
+        """Close the active log file if open."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _should_rotate(self):
+        """Return True if the active file exceeds the size or age limit."""
+        return (
+            self._file.tell() >= self.max_bytes
+            or time.time() - self._opened_at >= self.max_age
+        )
+
+    def _rotate(self):
+        """Move the active file aside and compress it."""
+        self._close_file()
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        rotated = self.directory / f"session_log-{stamp}.jsonl"
+        os.replace(self.active_path, rotated)
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+
+
+def read_session_records(path):
+    """
+    Read structured records from a `.jsonl` or `.jsonl.gz` session log.
+
+    Args:
+        path (str or Path): Log file to read.
+
+    Yields:
+        dict: Records in file order. Blank or truncated lines are skipped.
+    """
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
@@ -0,0 +1,441 @@
+"""
+tracing.py - End-to-End Latency Tracing for the Champion Select Loop.
+
+Wraps each stage of a polling cycle (status, fetch, sanitize, evaluate,
+display, log) in a lightweight span timed with the monotonic
+`time.perf_counter_ns` clock. Span durations are recorded in fixed-size,
+log-linear latency histograms kept in memory, and the most recent spans are
+kept in a bounded ring buffer for debugging.
+
+Detection-to-display latency is recorded as the `detection_to_display`
+histogram. It runs from the start of the status request in the poll that
+observed a lobby change to the moment the redrawn table was flushed to the
+terminal. Cycles that did not redraw are not counted. Time between the client
+changing state and the next poll (up to `POLL_INTERVAL`) is not observable.
+
+At the end of a session the histograms are exported as a JSON summary to
+`data/logs/<version>/latency/<session>.json`. Running this module aggregates
+those summaries by app version, so p50/p99 latency can be compared across
+releases.
+
+Summary schema:
+    {
+        "schema": 1,
+        "app_version": "0.1.0",
+        "session": "20250322-181502-1a2b3c",
+        "cycles": 42,
+        "stages": {"fetch": {"count": .., "p50_ms": .., "p99_ms": .., ...}, ...},
+        "histograms": {"fetch": {"count": .., "buckets": {"<index>": count}, ...}, ...}
+    }
+
+Classes:
+    - LatencyHistogram: Log-linear histogram of durations in nanoseconds.
+    - Tracer: Records spans and per-stage histograms for a session.
+
+Functions:
+    - load_summaries(files): Merges exported summaries by app version.
+
+Metrics:
+    - nomad_watcher_stage_seconds{stage}: Span durations, for live scraping.
+
+Example:
+python
+    python -m src.core.watcher.tracing
+    python -m src.core.watcher.tracing data/logs/0.1.0/latency/*.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from src.utils import metrics, paths
+from src.__version__ import __version__ as version
+
+SCHEMA_VERSION = 1
+LATENCY_PATH = paths.LOGS_DIR / version / "latency"
+STAGES = ("status", "fetch", "sanitize", "evaluate", "display", "shadow", "log")
+END_TO_END = "detection_to_display"
+RECENT_SPANS = 1024
+
+STAGE_SECONDS = metrics.histogram(
+    "nomad_watcher_stage_seconds", "Watcher stage latency.", ["stage"]
+)
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def bucket_index(ns):
+    """
+    Map a duration to its histogram bucket.
+
+    Durations below `2 * SUB_BUCKETS` ns get one bucket each; above that, every
+    power of two is split into `SUB_BUCKETS` equal buckets, so the relative
+    bucket width stays below `1 / SUB_BUCKETS`.
+
+    Args:
+        ns (int): Non-negative duration in nanoseconds.
+
+    Returns:
+        int: Bucket index.
+    """
+    shift = max(0, ns.bit_length() - SUB_BUCKET_BITS - 1)
+    return (shift << SUB_BUCKET_BITS) + (ns >> shift)
+
+
+def bucket_bounds(index):
+    """
+    Return the duration range covered by a bucket.
+
+    Args:
+        index (int): Bucket index from `bucket_index`.
+
+    Returns:
+        tuple[int, int]: Inclusive lower and exclusive upper bound in nanoseconds.
+    """
+    shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    mantissa = index - (shift << SUB_BUCKET_BITS)
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations in nanoseconds.
+
+    Attributes:
+        count (int): Number of recorded durations.
+        total (int): Sum of recorded durations.
+        min (int | None): Smallest recorded duration.
+        max (int | None): Largest recorded duration.
+        buckets (dict[int, int]): Bucket index to count.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+
+    def record(self, ns):
+        """
+        Record one duration.
+
+        Args:
+            ns (int): Duration in nanoseconds; negative values are clamped to 0.
+        """
+        ns = max(0, ns)
+        index = bucket_index(ns)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ns
+        if self.min is None or ns < self.min:
+            self.min = ns
+        if self.max is None or ns > self.max:
+            self.max = ns
+
+    def merge(self, other):
+        """
+        Add another histogram's counts to this one.
+
+        Args:
+            other (LatencyHistogram): Histogram to merge in.
+
+        Returns:
+            LatencyHistogram: This histogram.
+        """
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    def percentile(self, q):
+        """
+        Estimate the q-th percentile.
+
+        Returns the midpoint of the bucket holding the nearest-rank sample,
+        clamped to the recorded minimum and maximum.
+
+        Args:
+            q (float): Percentile in [0, 100].
+
+        Returns:
+            float | None: Duration in nanoseconds, or None if the histogram is empty.
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * q // 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                return min(max((low + high - 1) / 2, self.min), self.max)
+        return float(self.max)
+
+    def summary(self):
+        """
+        Summarize the histogram in milliseconds.
+
+        Returns:
+            dict: `count`, `mean_ms`, `min_ms`, `p50_ms`, `p90_ms`, `p99_ms`
+            and `max_ms` (None when empty).
+        """
+        row = {"count": self.count}
+        if not self.count:
+            for key in ("mean_ms", "min_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms"):
+                row[key] = None
+            return row
+        row["mean_ms"] = self.total / self.count / 1e6
+        row["min_ms"] = self.min / 1e6
+        for q in (50, 90, 99):
+            row[f"p{q}_ms"] = self.percentile(q) / 1e6
+        row["max_ms"] = self.max / 1e6
+        return row
+
+    def to_dict(self):
+        """
+        Export the histogram as JSON-compatible data.
+
+        Returns:
+            dict: `count`, `total_ns`, `min_ns`, `max_ns` and `buckets`.
+        """
+        return {
+            "count": self.count,
+            "total_ns": self.total,
+            "min_ns": self.min,
+            "max_ns": self.max,
+            "buckets": {str(i): c for i, c in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Rebuild a histogram exported with `to_dict`.
+
+        Args:
+            data (dict): Exported histogram.
+
+        Returns:
+            LatencyHistogram: The rebuilt histogram.
+        """
+        histogram = cls()
+        histogram.count = data["count"]
+        histogram.total = data["total_ns"]
+        histogram.min = data["min_ns"]
+        histogram.max = data["max_ns"]
+        histogram.buckets = {int(i): c for i, c in data["buckets"].items()}
+        return histogram
+
+
+class _Span:
+    """Context manager timing one stage and entering the matching profiler phase."""
+
+    __slots__ = ("tracer", "name", "start", "phase")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+        self.phase = tracer.profiler.phase(name)
+
+    def __enter__(self):
+        self.phase.__enter__()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        self.phase.__exit__(*exc)
+        self.tracer.record(self.name, self.start, end)
+        return False
+
+
+class Tracer:
+    """
+    Records stage spans and latency histograms for champion select sessions.
+
+    Attributes:
+        directory (Path): Directory receiving exported session summaries.
+        profiler (CycleProfiler | NullProfiler): Profiler whose phases mirror the spans.
+        session_id (str | None): Session currently being traced.
+        cycles (int): Cycles started in the current session.
+        histograms (dict[str, LatencyHistogram]): Stage name to latency histogram.
+        spans (deque): Recent `(cycle, name, start_ns, end_ns)` spans.
+    """
+
+    def __init__(self, directory=None, profiler=None, recent=RECENT_SPANS):
+        """Initialize the tracer; `profiler` defaults to the disabled profiler."""
+        if profiler is None:
+            from src.core.watcher.profiler import NULL_PROFILER as profiler
+        self.directory = directory or LATENCY_PATH
+        self.profiler = profiler
+        self.session_id = None
+        self.spans = deque(maxlen=recent)
+        self._cycle_start = None
+        self._reset()
+
+    def _reset(self):
+        """Clear the statistics collected for a session."""
+        self.cycles = 0
+        self.histograms = {}
+        self.spans.clear()
+
+    def begin_session(self, session_id):
+        """
+        Start tracing a new session, clearing the previous one's histograms.
+
+        Args:
+            session_id (str): Session identifier used for the exported summary.
+        """
+        self._reset()
+        self.session_id = session_id
+
+    def begin_cycle(self):
+        """Mark the start of a polling cycle; end-to-end latency is measured from here."""
+        self.cycles += 1
+        self._cycle_start = time.perf_counter_ns()
+
+    def span(self, name):
+        """
+        Time one stage of the current cycle.
+
+        Args:
+            name (str): Stage name, e.g. one of `STAGES`.
+
+        Returns:
+            _Span: Context manager recording the stage.
+        """
+        return _Span(self, name)
+
+    def record(self, name, start_ns, end_ns):
+        """
+        Record a finished span.
+
+        Args:
+            name (str): Stage name.
+            start_ns (int): Monotonic start timestamp in nanoseconds.
+            end_ns (int): Monotonic end timestamp in nanoseconds.
+        """
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram()
+        histogram.record(end_ns - start_ns)
+        STAGE_SECONDS.labels(name).observe((end_ns - start_ns) / 1e9)
+        self.spans.append((self.cycles, name, start_ns, end_ns))
+
+    def mark_displayed(self):
+        """Record detection-to-display latency for the current cycle."""
+        if self._cycle_start is not None:
+            self.record(END_TO_END, self._cycle_start, time.perf_counter_ns())
+
+    def summary(self):
+        """
+        Summarize the current session.
+
+        Returns:
+            dict: Session summary following the schema in the module docstring.
+        """
+        names = [n for n in STAGES + (END_TO_END,) if n in self.histograms]
+        names += sorted(n for n in self.histograms if n not in names)
+        return {
+            "schema": SCHEMA_VERSION,
+            "app_version": version,
+            "session": self.session_id,
+            "cycles": self.cycles,
+            "stages": {n: self.histograms[n].summary() for n in names},
+            "histograms": {n: self.histograms[n].to_dict() for n in names},
+        }
+
+    def end_session(self):
+        """
+        Export the current session's summary and stop tracing it.
+
+        Returns:
+            Path | None: Written summary file, or None if no cycle was traced.
+        """
+        if self.session_id is None:
+            return None
+        path = None
+        if self.cycles:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{self.session_id}.json"
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.summary(), f, indent=2)
+        self.session_id = None
+        self._cycle_start = None
+        return path
+
+
+def load_summaries(files):
+    """
+    Merge exported session summaries by app version.
+
+    Args:
+        files (Iterable[Path]): Summary JSON files.
+
+    Returns:
+        dict[str, dict[str, LatencyHistogram]]: App version to stage name to
+        merged histogram.
+    """
+    merged = {}
+    for file in files:
+        with open(file, "r", encoding="utf-8") as f:
+            summary = json.load(f)
+        if summary.get("schema") != SCHEMA_VERSION:
+            raise ValueError(f"{file}: unsupported schema {summary.get('schema')!r}.")
+        stages = merged.setdefault(summary["app_version"], {})
+        for name, data in summary["histograms"].items():
+            histogram = LatencyHistogram.from_dict(data)
+            if name in stages:
+                stages[name].merge(histogram)
+            else:
+                stages[name] = histogram
+    return merged
+
+
+def _version_key(value):
+    """Sort key ordering dotted version strings numerically where possible."""
+    return [(0, int(p), "") if p.isdigit() else (1, 0, p) for p in value.split(".")]
+
+
+def main(argv=None):
+    """Print p50/p99 latency per stage and app version from exported summaries."""
+    parser = argparse.ArgumentParser(description="Aggregate latency summaries.")
+    parser.add_argument(
+        "files", nargs="*", help="Summary files (default: all versions' logs)."
+    )
+    args = parser.parse_args(argv)
+    files = args.files or sorted(paths.LOGS_DIR.glob("*/latency/*.json"))
+    merged = load_summaries(files)
+    if not merged:
+        print("No latency summaries found.")
+        return 1
+
+    print(
+        f"{'Version':<10} {'Stage':<22} {'Count':>7} {'p50 ms':>9} "
+        f"{'p99 ms':>9} {'Max ms':>9}"
+    )
+    print("-" * 71)
+    for app_version in sorted(merged, key=_version_key):
+        stages = merged[app_version]
+        names = [n for n in STAGES + (END_TO_END,) if n in stages]
+        names += sorted(n for n in stages if n not in names)
+        for name in names:
+            row = stages[name].summary()
+            print(
+                f"{app_version:<10} {name:<22} {row['count']:>7} "
+                f"{row['p50_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
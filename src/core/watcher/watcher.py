@@ -9,22 +9,73 @@ Responsibilities:
 - Poll LCU for lobby status and champion select phase.
 - Fetch and sanitize lobby champion data.
 - Evaluate team compositions using the Evaluator pipeline.
+- Score registered shadow models (see `models.py`) after the display update.
 - Call display and logging handlers with evaluated results.
+- Stream every evaluated snapshot, with its shadow results, to the structured
+  session log.
+- Trace per-stage and detection-to-display latency into session summaries.
+- Optionally profile each polling cycle (`--profile` or `NOMAD_PROFILE=1`).
+- Update operational metrics, served with `--metrics-port` or written with
+  `--metrics-file` at exit.
+
+Metrics:
+    - nomad_watcher_polls_total{status}: Gameflow status polls by observed status.
+    - nomad_watcher_sessions_total: Champion select sessions monitored.
+    - nomad_watcher_fetch_failures_total: Lobby fetches that returned no data.
+    - nomad_watcher_consecutive_failures: Current `failure_count`.
+    - nomad_watcher_frames_total{result}: Display updates (`redrawn` or `unchanged`).
+
+The model registry (and NumPy with it) is loaded when champion select is
+first detected, so waiting for the client and for a game stays cheap to start.
 """
 
+import argparse
 import time
 from src.api.client.acquire import get_credentials
 from src.api.client.lobby import fetch_lobby_champions
 from src.api.client.sanitize import sanitize_champion_data
 from src.api.client.status import Status, get_status
-from src.core.evaluator import evaluator
 from src.core.watcher.display import display_lobby_champions
 from src.core.watcher.logging import log_final_champion_select
+from src.core.watcher.profiler import create_profiler
+from src.core.watcher.session_log import SessionLogWriter
+from src.core.watcher.tracing import Tracer
+from src.utils import metrics
 
 WAIT_INTERVAL = 10
 POLL_INTERVAL = 1
 MAX_FAILS_BEFORE_EXIT = 10
 
+POLLS = metrics.counter(
+    "nomad_watcher_polls_total", "Gameflow status polls by observed status.", ["status"]
+)
+SESSIONS = metrics.counter(
+    "nomad_watcher_sessions_total", "Champion select sessions monitored."
+)
+FETCH_FAILURES = metrics.counter(
+    "nomad_watcher_fetch_failures_total", "Lobby fetches that returned no data."
+)
+CONSECUTIVE_FAILURES = metrics.gauge(
+    "nomad_watcher_consecutive_failures", "Lobby fetch failures since the last success."
+)
+FRAMES = metrics.counter(
+    "nomad_watcher_frames_total", "Display updates by result.", ["result"]
+)
+_FRAMES_REDRAWN = FRAMES.labels("redrawn")
+_FRAMES_UNCHANGED = FRAMES.labels("unchanged")
+_KNOWN_STATUSES = {status.value for status in Status}
+
+
+def count_poll(status):
+    """
+    Count a gameflow status poll.
+
+    Args:
+        status (str): Status returned by `get_status`; values outside `Status`
+            are counted as `other` to keep label cardinality bounded.
+    """
+    POLLS.labels(status if status in _KNOWN_STATUSES else "other").inc()
+
 
 def wait_for_champ_select(port, password):
     """
@@ -39,6 +90,7 @@ def wait_for_champ_select(port, password):
     """
     while True:
         status = get_status(port, password)
+        count_poll(status)
         if status == Status.CHAMPSELECT.value:
             print("\nChampion Select detected. Fetching lobby data...")
             return
@@ -46,7 +98,9 @@ def wait_for_champ_select(port, password):
         time.sleep(WAIT_INTERVAL)
 
 
-def monitor_lobby(port, password, puuid):
+def monitor_lobby(
+    port, password, puuid, profile=False, metrics_port=None, metrics_file=None
+):
     """
     Continuously monitor the ARAM lobby state during champion select.
 
@@ -55,44 +109,171 @@ def monitor_lobby(port, password, puuid):
     - Polls the lobby to fetch team composition.
     - Evaluates champions and displays the result.
     - Logs the final champion state when champion select ends.
+    - Appends every evaluated snapshot to the structured session log.
+    - Exports per-stage latency histograms when each session ends.
+    - Profiles each polling cycle when profiling is enabled.
+    - Serves or dumps operational metrics when requested.
 
     Args:
         port (str): Port for LCU authentication.
         password (str): Password/token for LCU authentication.
         puuid (str): The player's Riot PUUID (used to identify their selected champion).
+        profile (bool): Profile the loop; also enabled by the `NOMAD_PROFILE` env var.
+        metrics_port (int, optional): Serve metrics on this localhost port.
+        metrics_file (str | Path, optional): Write metrics to this file at exit.
+    """
+    server = metrics.serve(metrics_port) if metrics_port is not None else None
+    session_log = SessionLogWriter().start()
+    profiler = create_profiler(profile)
+    tracer = Tracer(profiler=profiler)
+    try:
+        _monitor_sessions(port, password, puuid, session_log, tracer)
+    finally:
+        dropped = session_log.close()
+        if dropped:
+            print(f"\n{dropped}")
+        tracer.end_session()
+        report_profile(profiler.end_session())
+        profiler.close()
+        if server is not None:
+            server.shutdown()
+        if metrics_file is not None:
+            metrics.dump(metrics_file)
+
+
+def report_profile(reports):
+    """
+    Print where a session's profiling reports were written.
+
+    Args:
+        reports (dict[str, Path] | None): Output of `CycleProfiler.end_session()`.
+    """
+    if reports:
+        print(f"\nProfile written to {reports['summary'].parent}:")
+        for path in reports.values():
+            print(f"  {path.name}")
+
+
+def _monitor_sessions(port, password, puuid, session_log, tracer):
+    """
+    Run the champion select polling loop, one iteration per game.
+
+    Args:
+        port (str): Port for LCU authentication.
+        password (str): Password/token for LCU authentication.
+        puuid (str): The player's Riot PUUID.
+        session_log (SessionLogWriter): Writer receiving every evaluated snapshot.
+        tracer (Tracer): Tracer timing each stage; its profiler is driven too.
     """
+    profiler = tracer.profiler
     pool = None
+    registry = None
     while True:
         wait_for_champ_select(port, password)
+        if registry is None:
+            from src.core.models import ModelRegistry
+
+            registry = ModelRegistry.load()
+
+        SESSIONS.inc()
+        session_log.begin_session()
+        tracer.begin_session(session_log.session_id)
+        profiler.begin_session(session_log.session_id)
         failure_count = 0
 
         while True:
-            status = get_status(port, password)
+            profiler.begin_cycle()
+            tracer.begin_cycle()
+            with tracer.span("status"):
+                status = get_status(port, password)
+            count_poll(status)
             if status != Status.CHAMPSELECT.value:
+                session_log.end_session()
                 if pool:
-                    log_final_champion_select(pool)
+                    with tracer.span("log"):
+                        log_final_champion_select(pool)
+                profiler.end_cycle()
+                tracer.end_session()
+                report_profile(profiler.end_session())
                 print("\nChampion Select ended. Waiting for next game...\n")
                 break
 
-            lobby_data = fetch_lobby_champions(port, password)
+            with tracer.span("fetch"):
+                lobby_data = fetch_lobby_champions(port, password)
             if lobby_data:
-                sanitized_data = sanitize_champion_data(lobby_data, puuid)
-                pool = evaluator(sanitized_data)
-                display_lobby_champions(pool)
+                with tracer.span("sanitize"):
+                    sanitized_data = sanitize_champion_data(lobby_data, puuid)
+                with tracer.span("evaluate"):
+                    pool = registry.evaluate(sanitized_data)
+                with tracer.span("display"):
+                    redrawn = display_lobby_champions(pool)
+                if redrawn:
+                    tracer.mark_displayed()
+                    _FRAMES_REDRAWN.inc()
+                else:
+                    _FRAMES_UNCHANGED.inc()
+                with tracer.span("shadow"):
+                    shadow = registry.shadow(pool)
+                with tracer.span("log"):
+                    session_log.log_snapshot(pool, shadow)
                 failure_count = 0
+                CONSECUTIVE_FAILURES.set(0)
             else:
                 failure_count += 1
+                FETCH_FAILURES.inc()
+                CONSECUTIVE_FAILURES.set(failure_count)
                 if failure_count >= MAX_FAILS_BEFORE_EXIT:
+                    profiler.end_cycle()
                     print("\nFailed to fetch lobby data multiple times. Exiting early.")
                     return
+            profiler.end_cycle()
 
             time.sleep(POLL_INTERVAL)
 
 
+def parse_args(argv=None):
+    """
+    Parse the watcher's command-line arguments.
+
+    Args:
+        argv (list[str], optional): Arguments; defaults to `sys.argv[1:]`.
+
+    Returns:
+        argparse.Namespace: Parsed `profile`, `metrics_port` and `metrics_file`.
+    """
+    parser = argparse.ArgumentParser(description="ARAM champion select monitor.")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile each polling cycle and write reports when a session ends "
+        "(also enabled by NOMAD_PROFILE=1).",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus-style metrics at http://127.0.0.1:PORT/metrics.",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Write Prometheus-style metrics to this file at exit.",
+    )
+    return parser.parse_args(argv)
+
+
 def main():
     """Entry point for initializing credentials and monitoring the champion select process."""
+    args = parse_args()
     port, password, puuid = get_credentials()
-    monitor_lobby(port, password, puuid)
+    monitor_lobby(
+        port,
+        password,
+        puuid,
+        profile=args.profile,
+        metrics_port=args.metrics_port,
+        metrics_file=args.metrics_file,
+    )
 
 
 if __name__ == "__main__":
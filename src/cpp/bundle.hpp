@@ -0,0 +1,222 @@
+// bundle.hpp - Loader for the compiled binary asset bundle.
+//
+// Memory-maps data/assets/assets.bundle (built by src/utils/bundle.py) and
+// exposes each section as a typed view into the mapping, without copying or
+// parsing. With `verify`, every section is checked against the SHA-256 stored
+// in its table entry. See the Python module docstring for the file layout.
+
+#pragma once
+
+#include <array>
+#include <cstdint>
+#include <cstring>
+#include <map>
+#include <string>
+
+#ifdef _WIN32
+#ifndef NOMINMAX
+#define NOMINMAX
+#endif
+#include <windows.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+namespace nomad {
+
+// Minimal SHA-256 (FIPS 180-4), used to verify section payloads.
+inline std::array<uint8_t, 32> sha256(const uint8_t* data, uint64_t size) {
+    static const uint32_t k[64] = {
+        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2};
+    uint32_t h[8] = {0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
+                     0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19};
+    auto rotr = [](uint32_t x, int n) { return (x >> n) | (x << (32 - n)); };
+
+    auto compress = [&](const uint8_t* block) {
+        uint32_t w[64];
+        for (int i = 0; i < 16; ++i) {
+            w[i] = uint32_t(block[4 * i]) << 24 | uint32_t(block[4 * i + 1]) << 16 |
+                   uint32_t(block[4 * i + 2]) << 8 | uint32_t(block[4 * i + 3]);
+        }
+        for (int i = 16; i < 64; ++i) {
+            uint32_t s0 = rotr(w[i - 15], 7) ^ rotr(w[i - 15], 18) ^ (w[i - 15] >> 3);
+            uint32_t s1 = rotr(w[i - 2], 17) ^ rotr(w[i - 2], 19) ^ (w[i - 2] >> 10);
+            w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+        }
+        uint32_t a = h[0], b = h[1], c = h[2], d = h[3], e = h[4], f = h[5], g = h[6], hh = h[7];
+        for (int i = 0; i < 64; ++i) {
+            uint32_t t1 = hh + (rotr(e, 6) ^ rotr(e, 11) ^ rotr(e, 25)) + ((e & f) ^ (~e & g)) + k[i] + w[i];
+            uint32_t t2 = (rotr(a, 2) ^ rotr(a, 13) ^ rotr(a, 22)) + ((a & b) ^ (a & c) ^ (b & c));
+            hh = g; g = f; f = e; e = d + t1; d = c; c = b; b = a; a = t1 + t2;
+        }
+        h[0] += a; h[1] += b; h[2] += c; h[3] += d; h[4] += e; h[5] += f; h[6] += g; h[7] += hh;
+    };
+
+    uint64_t full = size / 64 * 64;
+    for (uint64_t at = 0; at < full; at += 64) compress(data + at);
+
+    // Final block(s): remaining bytes, 0x80, zero padding, big-endian bit length
+    uint8_t tail[128] = {};
+    uint64_t rest = size - full;
+    if (rest) std::memcpy(tail, data + full, rest);
+    tail[rest] = 0x80;
+    uint64_t blocks = rest + 9 > 64 ? 2 : 1;
+    uint64_t bits = size * 8;
+    for (int i = 0; i < 8; ++i) tail[blocks * 64 - 1 - i] = uint8_t(bits >> (8 * i));
+    for (uint64_t i = 0; i < blocks; ++i) compress(tail + 64 * i);
+
+    std::array<uint8_t, 32> digest;
+    for (int i = 0; i < 8; ++i) {
+        for (int j = 0; j < 4; ++j) digest[4 * i + j] = uint8_t(h[i] >> (24 - 8 * j));
+    }
+    return digest;
+}
+
+struct Section {
+    std::string dtype;  // NumPy dtype string, e.g. "<u2", "<f8", "|S12"
+    uint32_t rows = 0;
+    uint32_t cols = 0;  // 0 for 1-D sections
+    const char* data = nullptr;
+    uint64_t nbytes = 0;
+
+    template <typename T>
+    const T* as() const { return reinterpret_cast<const T*>(data); }
+
+    // Fixed-width byte string element i (trailing NULs stripped).
+    std::string str(uint32_t i) const {
+        size_t width = nbytes / (rows ? rows : 1);
+        const char* s = data + i * width;
+        return std::string(s, strnlen(s, width));
+    }
+};
+
+class AssetBundle {
+public:
+    AssetBundle() = default;
+    AssetBundle(const AssetBundle&) = delete;
+    AssetBundle& operator=(const AssetBundle&) = delete;
+    ~AssetBundle() { unmap(); }
+
+    // Map the bundle and index its sections. With `verify`, also check every
+    // section's SHA-256; returns false on any format or integrity error.
+    bool load(const std::string& path, bool verify = false) {
+        unmap();
+        sections_.clear();
+        if (map(path) && index(verify)) return true;
+        unmap();
+        sections_.clear();
+        return false;
+    }
+
+    const Section* get(const std::string& name) const {
+        auto it = sections_.find(name);
+        return it == sections_.end() ? nullptr : &it->second;
+    }
+
+private:
+    static constexpr size_t kHeaderSize = 12;
+    static constexpr size_t kEntrySize = 80;
+    static constexpr uint16_t kFormatVersion = 2;
+
+    bool index(bool verify) {
+        if (size_ < kHeaderSize || std::memcmp(data_, "NMDB", 4) != 0) return false;
+
+        uint16_t version = read<uint16_t>(4);
+        uint16_t count = read<uint16_t>(6);
+        if (version != kFormatVersion || size_ < kHeaderSize + count * kEntrySize) {
+            return false;
+        }
+
+        for (uint16_t i = 0; i < count; ++i) {
+            size_t at = kHeaderSize + i * kEntrySize;
+            Section section;
+            std::string name(data_ + at, strnlen(data_ + at, 16));
+            section.dtype.assign(data_ + at + 16, strnlen(data_ + at + 16, 8));
+            section.rows = read<uint32_t>(at + 24);
+            section.cols = read<uint32_t>(at + 28);
+            uint64_t offset = read<uint64_t>(at + 32);
+            section.nbytes = read<uint64_t>(at + 40);
+            if (offset > size_ || section.nbytes > size_ - offset) return false;
+            section.data = data_ + offset;
+            if (verify) {
+                auto digest = sha256(reinterpret_cast<const uint8_t*>(section.data), section.nbytes);
+                if (std::memcmp(digest.data(), data_ + at + 48, 32) != 0) return false;
+            }
+            sections_[name] = section;
+        }
+        return true;
+    }
+
+    template <typename T>
+    T read(size_t offset) const {
+        T value;
+        std::memcpy(&value, data_ + offset, sizeof(T));
+        return value;
+    }
+
+#ifdef _WIN32
+    bool map(const std::string& path) {
+        file_ = CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ | FILE_SHARE_DELETE,
+                            nullptr, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, nullptr);
+        if (file_ == INVALID_HANDLE_VALUE) return false;
+        LARGE_INTEGER size;
+        if (!GetFileSizeEx(file_, &size) || size.QuadPart == 0) return false;
+        mapping_ = CreateFileMappingA(file_, nullptr, PAGE_READONLY, 0, 0, nullptr);
+        if (!mapping_) return false;
+        data_ = static_cast<const char*>(MapViewOfFile(mapping_, FILE_MAP_READ, 0, 0, 0));
+        size_ = data_ ? static_cast<size_t>(size.QuadPart) : 0;
+        return data_ != nullptr;
+    }
+
+    void unmap() {
+        if (data_) UnmapViewOfFile(data_);
+        if (mapping_) CloseHandle(mapping_);
+        if (file_ != INVALID_HANDLE_VALUE) CloseHandle(file_);
+        data_ = nullptr;
+        size_ = 0;
+        mapping_ = nullptr;
+        file_ = INVALID_HANDLE_VALUE;
+    }
+
+    HANDLE file_ = INVALID_HANDLE_VALUE;
+    HANDLE mapping_ = nullptr;
+#else
+    bool map(const std::string& path) {
+        int fd = open(path.c_str(), O_RDONLY);
+        if (fd < 0) return false;
+        struct stat info;
+        if (fstat(fd, &info) != 0 || info.st_size == 0) {
+            close(fd);
+            return false;
+        }
+        void* addr = mmap(nullptr, static_cast<size_t>(info.st_size), PROT_READ, MAP_PRIVATE, fd, 0);
+        close(fd);  // The mapping stays valid after the descriptor is closed
+        if (addr == MAP_FAILED) return false;
+        data_ = static_cast<const char*>(addr);
+        size_ = static_cast<size_t>(info.st_size);
+        return true;
+    }
+
+    void unmap() {
+        if (data_) munmap(const_cast<char*>(data_), size_);
+        data_ = nullptr;
+        size_ = 0;
+    }
+#endif
+
+    const char* data_ = nullptr;
+    size_t size_ = 0;
+    std::map<std::string, Section> sections_;
+};
+
+}  // namespace nomad
@@ -3,13 +3,27 @@
 #include <vector>
 #include <nlohmann/json.hpp>
 
+#include "bundle.hpp"
+
 using json = nlohmann::json;
 using namespace std;
 
 vector<string> loadChampionData() {
-    ifstream file("data\\champions.json");
     vector<string> champions;
 
+    nomad::AssetBundle bundle;
+    if (bundle.load("data/assets/assets.bundle")) {
+        const nomad::Section* names = bundle.get("names");
+        if (names) {
+            for (uint32_t i = 0; i < names->rows; ++i) {
+                champions.push_back(names->str(i));
+            }
+            return champions;
+        }
+    }
+
+    ifstream file("data\\champions.json");
+
     if (!file) {
         cerr << "Error: Unable to open champions.json. Run riot_api.py first." << endl;
         return champions;
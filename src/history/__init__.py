@@ -0,0 +1,23 @@
+"""
+src.history - Champion Select History Package.
+
+This package turns the logs written by the watcher into data that can be
+analyzed across thousands of games without re-parsing text files.
+
+Submodules:
+- store: Compacts structured session logs into a columnar store partitioned by version and date.
+- query: Memory-maps columnar partitions and computes aggregates over them.
+- legacy: Parses legacy fixed-width `.log` files into structured records.
+- index: Inverted index from champion ID to snapshot IDs, split by role.
+- codec: Delta-encoded binary codec for lobby snapshot recordings.
+
+Usage:
+Run the compaction job, then query the resulting partitions.
+
+Example:
+python
+    from src.history.store import compact
+    from src.history.query import list_partitions, bench_frequency
+    compact()
+    counts = bench_frequency(list_partitions())
+"""
@@ -0,0 +1,287 @@
+"""
+codec.py - Delta-Encoded Binary Codec for Champion Select Snapshots.
+
+Consecutive snapshots of a champion select differ by at most a few champion
+IDs, so a recording is stored as periodic keyframes with XOR delta frames in
+between.
+
+Each snapshot is a fixed frame of `SLOTS` uint16 champion IDs:
+
+    [player, team0..team4, bench0..bench9]
+
+Lists are left-aligned and padded with 0 (never a valid champion ID).
+
+Stream layout (little-endian):
+
+    header:   b"NMDS" | version u8 | keyframe_interval u16
+    keyframe: 0x01 | dt_ms varint | 16 x u16 champion IDs
+    delta:    0x02 | dt_ms varint | changed-slot mask u16 | u16 (new XOR old) per changed slot
+
+`dt_ms` is the time since the previous frame in milliseconds; in the first
+frame it is the absolute start time (milliseconds since the Unix epoch), so
+decoded timestamps can be joined with the session logs. Version 1 streams
+wrote 0 there and decode to times relative to the first frame. A keyframe is
+written every `keyframe_interval` frames so a reader can resynchronize.
+
+Classes:
+    - SnapshotEncoder: Streaming encoder writing frames to a binary file object.
+    - SnapshotDecoder: Streaming decoder yielding snapshots from a binary file object.
+
+Functions:
+    - frame_from_record(record): Builds `(team, bench, player, ts_ms)` from a session log record.
+    - encode_snapshots(snapshots, keyframe_interval): Encodes snapshots into bytes.
+    - decode_snapshots(data): Decodes bytes into a list of snapshots.
+"""
+
+import io
+import struct
+
+MAGIC = b"NMDS"
+CODEC_VERSION = 2
+READABLE_VERSIONS = (1, 2)
+TEAM_SLOTS = 5
+BENCH_SLOTS = 10
+SLOTS = 1 + TEAM_SLOTS + BENCH_SLOTS
+KEYFRAME_INTERVAL = 32
+
+KEYFRAME = 0x01
+DELTA = 0x02
+
+_HEADER = struct.Struct("<4sBH")
+_FRAME = struct.Struct(f"<{SLOTS}H")
+_U16 = struct.Struct("<H")
+
+
+def pack_frame(team, bench, player):
+    """
+    Pack a snapshot into a fixed tuple of `SLOTS` champion IDs.
+
+    Args:
+        team (Sequence[int]): Team champion IDs (at most 5).
+        bench (Sequence[int]): Bench champion IDs (at most 10).
+        player (int): The player's champion ID.
+
+    Returns:
+        tuple[int, ...]: Frame of length `SLOTS`, zero-padded.
+
+    Raises:
+        ValueError: If the team or bench exceeds its slot count.
+    """
+    if len(team) > TEAM_SLOTS or len(bench) > BENCH_SLOTS:
+        raise ValueError(
+            f"Snapshot exceeds {TEAM_SLOTS} team / {BENCH_SLOTS} bench slots."
+        )
+    return (
+        (int(player),)
+        + tuple(int(c) for c in team)
+        + (0,) * (TEAM_SLOTS - len(team))
+        + tuple(int(c) for c in bench)
+        + (0,) * (BENCH_SLOTS - len(bench))
+    )
+
+
+def unpack_frame(frame):
+    """
+    Convert a packed frame back into `(team, bench, player)`.
+
+    Args:
+        frame (Sequence[int]): Frame of length `SLOTS`.
+
+    Returns:
+        tuple[list[int], list[int], int]: Team, bench and player champion IDs.
+    """
+    split = 1 + TEAM_SLOTS
+    team = [c for c in frame[1:split] if c]
+    bench = [c for c in frame[split:] if c]
+    return team, bench, frame[0]
+
+
+def frame_from_record(record):
+    """
+    Extract `(team, bench, player, ts_ms)` from a structured session log record.
+
+    Args:
+        record (dict): Structured session log record.
+
+    Returns:
+        tuple[list[int], list[int], int, int]: Team, bench and player champion
+        IDs, and the record time in milliseconds since the Unix epoch.
+    """
+    ts_ms = round(record["ts"] * 1000)
+    return record["team"], record["bench"], record["player"], ts_ms
+
+
+def _write_varint(out, value):
+    """Write a non-negative integer as an unsigned LEB128 varint."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class SnapshotEncoder:
+    """
+    Streaming snapshot encoder.
+
+    Attributes:
+        stream (BinaryIO): Writable binary file object.
+        keyframe_interval (int): Frames between keyframes (1 = keyframes only).
+        frames (int): Number of frames written so far.
+    """
+
+    def __init__(self, stream, keyframe_interval=KEYFRAME_INTERVAL):
+        """Write the stream header and prepare to encode frames."""
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1.")
+        self.stream = stream
+        self.keyframe_interval = keyframe_interval
+        self.frames = 0
+        self._prev = None
+        self._prev_ms = None
+        stream.write(_HEADER.pack(MAGIC, CODEC_VERSION, keyframe_interval))
+
+    def write(self, team, bench, player, ts_ms=None):
+        """
+        Encode one snapshot.
+
+        Args:
+            team (Sequence[int]): Team champion IDs.
+            bench (Sequence[int]): Bench champion IDs, in display order.
+            player (int): The player's champion ID.
+            ts_ms (int, optional): Snapshot time in milliseconds since the Unix
+                epoch; stored absolute in the first timed frame, then as a delta.
+
+        Returns:
+            int: Number of bytes written for this frame.
+        """
+        frame = pack_frame(team, bench, player)
+        dt_ms = 0
+        if ts_ms is not None:
+            dt_ms = (
+                max(0, ts_ms - self._prev_ms) if self._prev_ms is not None else ts_ms
+            )
+            self._prev_ms = ts_ms
+
+        out = bytearray()
+        if self._prev is None or self.frames % self.keyframe_interval == 0:
+            out.append(KEYFRAME)
+            _write_varint(out, dt_ms)
+            out += _FRAME.pack(*frame)
+        else:
+            out.append(DELTA)
+            _write_varint(out, dt_ms)
+            mask = 0
+            changed = bytearray()
+            for slot, (new, old) in enumerate(zip(frame, self._prev)):
+                if new != old:
+                    mask |= 1 << slot
+                    changed += _U16.pack(new ^ old)
+            out += _U16.pack(mask)
+            out += changed
+
+        self.stream.write(out)
+        self._prev = frame
+        self.frames += 1
+        return len(out)
+
+
+class SnapshotDecoder:
+    """
+    Streaming snapshot decoder.
+
+    Iterating yields `(team, bench, player, ts_ms)` tuples, where `ts_ms` is
+    the snapshot time in milliseconds since the Unix epoch (relative to the
+    first frame for version 1 streams). Frames are read from the
+    stream one at a time, so memory use does not grow with the recording.
+
+    Attributes:
+        stream (BinaryIO): Readable binary file object.
+        keyframe_interval (int): Keyframe interval recorded in the header.
+    """
+
+    def __init__(self, stream):
+        """
+        Read and validate the stream header.
+
+        Raises:
+            ValueError: If the header magic or version is not recognized.
+        """
+        self.stream = stream
+        header = stream.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError("Truncated snapshot stream header.")
+        magic, codec_version, self.keyframe_interval = _HEADER.unpack(header)
+        if magic != MAGIC or codec_version not in READABLE_VERSIONS:
+            raise ValueError("Not a Nomad snapshot stream (bad magic or version).")
+
+    def _read(self, size):
+        """Read exactly `size` bytes or raise on a truncated stream."""
+        data = self.stream.read(size)
+        if len(data) != size:
+            raise ValueError("Truncated snapshot stream.")
+        return data
+
+    def _read_varint(self):
+        """Read an unsigned LEB128 varint from the stream."""
+        value = shift = 0
+        while True:
+            byte = self._read(1)[0]
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def __iter__(self):
+        """Decode frames in order until the end of the stream."""
+        prev = None
+        ts_ms = 0
+        while True:
+            kind = self.stream.read(1)
+            if not kind:
+                return
+            ts_ms += self._read_varint()
+            if kind[0] == KEYFRAME:
+                frame = _FRAME.unpack(self._read(_FRAME.size))
+            elif kind[0] == DELTA and prev is not None:
+                (mask,) = _U16.unpack(self._read(2))
+                changed = self._read(2 * mask.bit_count())
+                frame = list(prev)
+                for i, slot in enumerate(s for s in range(SLOTS) if mask >> s & 1):
+                    frame[slot] ^= changed[2 * i] | changed[2 * i + 1] << 8
+                frame = tuple(frame)
+            else:
+                raise ValueError("Corrupt snapshot stream: unexpected frame type.")
+            prev = frame
+            yield unpack_frame(frame) + (ts_ms,)
+
+
+def encode_snapshots(snapshots, keyframe_interval=KEYFRAME_INTERVAL):
+    """
+    Encode `(team, bench, player)` snapshots into a byte string.
+
+    Args:
+        snapshots (Iterable[tuple]): Snapshots as `(team, bench, player)` or
+            `(team, bench, player, ts_ms)`.
+        keyframe_interval (int): Frames between keyframes.
+
+    Returns:
+        bytes: Encoded stream.
+    """
+    buffer = io.BytesIO()
+    encoder = SnapshotEncoder(buffer, keyframe_interval)
+    for snapshot in snapshots:
+        encoder.write(*snapshot)
+    return buffer.getvalue()
+
+
+def decode_snapshots(data):
+    """
+    Decode a byte string produced by `encode_snapshots`.
+
+    Args:
+        data (bytes): Encoded stream.
+
+    Returns:
+        list[tuple[list[int], list[int], int, int]]: `(team, bench, player, ts_ms)` snapshots.
+    """
+    return list(SnapshotDecoder(io.BytesIO(data)))
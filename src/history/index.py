@@ -0,0 +1,437 @@
+"""
+index.py - Champion-to-Snapshot Inverted Index over History.
+
+Maps each champion ID to the sorted list of snapshot IDs it appeared in, split
+by role, so questions like "every lobby where 203 was on my bench" are answered
+by slicing a posting list instead of scanning the logs.
+
+Roles:
+    - team: Champion was on the player's team (including the player's pick).
+    - bench: Champion was on the bench.
+    - player: Champion was the player's pick.
+    - outscored: Champion was available and scored higher than the player's pick.
+
+Storage layout (one directory per segment, plus `meta.json`):
+
+    data/history/index/segment-000000/<role>_offsets.npy   # int64, CSR offsets by champion ID
+    data/history/index/segment-000000/<role>_postings.npy  # uint32 snapshot IDs
+    data/history/index/segment-000000/session.npy          # session ID per snapshot
+    data/history/index/segment-000000/seq.npy              # seq per snapshot
+
+`meta.json` also records how far each session log has been read, so an
+update only parses the records appended since the previous one.
+
+Snapshot IDs are assigned in insertion order, so each segment covers a
+contiguous, increasing ID range. New sessions are written as a new segment,
+and segments are merged size-tiered: the newest segments are merged together
+while they hold more than `1 / MERGE_RATIO` of the snapshots of the segment
+before them. Each segment is therefore less than half the size of the one
+before it, so a posting list lookup is O(log n) slices, and each snapshot is
+rewritten O(log n) times instead of on every merge.
+
+Classes:
+    - SnapshotIndex: Persistent, incrementally updated inverted index.
+"""
+
+import json
+import shutil
+from bisect import bisect_right
+from functools import reduce
+
+import numpy as np
+
+from src.utils import paths
+from src.history.store import iter_log_files
+from src.core.watcher.session_log import read_session_records
+
+INDEX_DIR = paths.HISTORY_DIR / "index"
+ROLES = ("team", "bench", "player", "outscored")
+MERGE_RATIO = 2
+EMPTY = np.zeros(0, dtype=np.uint32)
+
+
+def record_terms(record):
+    """
+    Compute the champion IDs a record contributes to each role.
+
+    Args:
+        record (dict): Structured session log record.
+
+    Returns:
+        dict[str, list[int]]: Role to champion IDs.
+    """
+    scores = record.get("score") or []
+    picked = scores[0] if scores else None
+    outscored = []
+    if picked is not None:
+        outscored = [
+            cid
+            for cid, score in zip(record["bench"], scores[1:])
+            if score is not None and score > picked
+        ]
+    return {
+        "team": list(record["team"]),
+        "bench": list(record["bench"]),
+        "player": [record["player"]],
+        "outscored": outscored,
+    }
+
+
+def build_csr(cids, sids):
+    """
+    Build CSR offsets and postings from parallel champion/snapshot ID arrays.
+
+    Args:
+        cids (np.ndarray): Champion ID of each posting.
+        sids (np.ndarray): Snapshot ID of each posting, non-decreasing.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: `(offsets, postings)` where the postings
+        of champion `c` are `postings[offsets[c]:offsets[c + 1]]`.
+    """
+    order = np.argsort(cids, kind="stable")
+    counts = np.bincount(cids, minlength=1)
+    offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    return offsets, sids[order].astype(np.uint32)
+
+
+def read_new_records(path, offset=0):
+    """
+    Read the records written to a session log after a byte offset.
+
+    Gzip-rotated files are immutable and are always read whole. For plain
+    files only complete lines are consumed, so a record that is still being
+    written is read by the next call.
+
+    Args:
+        path (Path): Log file.
+        offset (int): Number of bytes already consumed.
+
+    Returns:
+        tuple[list[dict], int]: New records and the offset consumed up to.
+    """
+    if str(path).endswith(".gz"):
+        return list(read_session_records(path)), path.stat().st_size
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    records = []
+    for line in data[:end].splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records, offset + end
+
+
+class SnapshotIndex:
+    """
+    Persistent inverted index from champion ID to snapshot IDs.
+
+    Attributes:
+        directory (Path): Index root directory.
+        next_sid (int): Snapshot ID the next indexed snapshot will receive.
+        sessions (set[str]): Session IDs already indexed.
+    """
+
+    def __init__(self, directory=None):
+        """Open (or create) the index stored under `directory`."""
+        self.directory = directory or INDEX_DIR
+        self.next_sid = 0
+        self.sessions = set()
+        self._files = {}
+        self._pending = []
+        self._segments = []
+        self._starts = []
+        meta_path = self.directory / "meta.json"
+        if meta_path.exists():
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            self.next_sid = meta["next_sid"]
+            self.sessions = set(meta["sessions"])
+            self._files = meta.get("files", {})
+            self._pending = meta.get("pending", [])
+            for seg in meta["segments"]:
+                self._segments.append(self._load_segment(seg))
+            self._starts = [seg["start"] for seg in self._segments]
+
+    def __len__(self):
+        """Return the number of indexed snapshots."""
+        return self.next_sid
+
+    def add_records(self, records):
+        """
+        Index new snapshots as a new segment.
+
+        Records belonging to sessions that are already indexed are skipped,
+        so re-indexing the same logs is a no-op.
+
+        Args:
+            records (Iterable[dict]): Structured session log records.
+
+        Returns:
+            int: Number of snapshots added.
+        """
+        records = [r for r in records if r["session"] not in self.sessions]
+        if not records:
+            return 0
+
+        start = self.next_sid
+        pairs = {role: ([], []) for role in ROLES}
+        for offset, record in enumerate(records):
+            for role, cids in record_terms(record).items():
+                pairs[role][0].extend(cids)
+                pairs[role][1].extend([start + offset] * len(cids))
+
+        columns = {
+            "session": np.array([r["session"] for r in records], dtype=str),
+            "seq": np.array([r["seq"] for r in records], dtype=np.int32),
+        }
+        for role, (cids, sids) in pairs.items():
+            offsets, postings = build_csr(
+                np.array(cids, dtype=np.int64), np.array(sids, dtype=np.int64)
+            )
+            columns[f"{role}_offsets"] = offsets
+            columns[f"{role}_postings"] = postings
+
+        name = f"segment-{start:09d}"
+        self._write_segment(name, columns)
+        self._segments.append(
+            self._load_segment(
+                {"name": name, "start": start, "end": start + len(records)}
+            )
+        )
+        self._starts.append(start)
+        self.next_sid = start + len(records)
+        self.sessions.update(r["session"] for r in records)
+
+        sizes = [seg["end"] - seg["start"] for seg in self._segments]
+        first, total = len(sizes) - 1, sizes[-1]
+        while first > 0 and total * MERGE_RATIO > sizes[first - 1]:
+            first -= 1
+            total += sizes[first]
+        self._merge(first)
+        return len(records)
+
+    def update_from_logs(self, source_dir=None):
+        """
+        Index the sessions completed since the last update.
+
+        Only data appended since the previous update is read: each log file's
+        size, modification time, inode and consumed offset are kept in
+        `meta.json`, unchanged files are skipped and growing files are read
+        from their offset. A session is complete once its final record has
+        been written; records of open sessions are kept in `meta.json` until
+        a later update sees the final one.
+
+        Args:
+            source_dir (Path, optional): Root of the session logs. Defaults to `paths.LOGS_DIR`.
+
+        Returns:
+            int: Number of snapshots added.
+        """
+        source_dir = source_dir or paths.LOGS_DIR
+        by_session = {}
+        for record in self._pending:
+            by_session.setdefault(record["session"], {})[record["seq"]] = record
+
+        files = {}
+        for path in iter_log_files(source_dir):
+            key = path.relative_to(source_dir).as_posix()
+            stat = path.stat()
+            state = self._files.get(key)
+            if (
+                state
+                and state["inode"] == stat.st_ino
+                and state["size"] == stat.st_size
+                and state["mtime_ns"] == stat.st_mtime_ns
+            ):
+                files[key] = state
+                continue
+            # A different inode or a shorter file means the path was rotated
+            resume = (
+                state
+                and state["inode"] == stat.st_ino
+                and state["offset"] <= stat.st_size
+            )
+            records, offset = read_new_records(path, state["offset"] if resume else 0)
+            files[key] = {
+                "inode": stat.st_ino,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "offset": offset,
+            }
+            for record in records:
+                if record["session"] not in self.sessions:
+                    by_session.setdefault(record["session"], {})[record["seq"]] = record
+
+        records, pending = [], []
+        for _, seqs in sorted(by_session.items()):
+            complete = any(r.get("final") for r in seqs.values())
+            (records if complete else pending).extend(
+                r for _, r in sorted(seqs.items())
+            )
+        self._files = files
+        self._pending = pending
+        added = self.add_records(records)
+        if not added:
+            self._save_meta()
+        return added
+
+    def postings(self, role, cid):
+        """
+        Return the sorted snapshot IDs where `cid` appeared in `role`.
+
+        Args:
+            role (str): One of `ROLES`.
+            cid (int): Champion ID.
+
+        Returns:
+            np.ndarray: Sorted uint32 snapshot IDs.
+        """
+        if role not in ROLES:
+            raise ValueError(f"Unknown role {role!r}; expected one of {ROLES}")
+        parts = []
+        for seg in self._segments:
+            offsets = seg[f"{role}_offsets"]
+            if 0 <= cid < len(offsets) - 1:
+                lo, hi = offsets[cid], offsets[cid + 1]
+                if hi > lo:
+                    parts.append(seg[f"{role}_postings"][lo:hi])
+        if not parts:
+            return EMPTY
+        # Copy, so no caller keeps a segment mapped after it is merged
+        return np.concatenate(parts) if len(parts) > 1 else np.array(parts[0])
+
+    def intersect(self, *terms):
+        """
+        Return snapshot IDs matching every `(role, cid)` term.
+
+        Args:
+            *terms (tuple[str, int]): Role/champion pairs to intersect.
+
+        Returns:
+            np.ndarray: Sorted uint32 snapshot IDs.
+        """
+        lists = sorted((self.postings(role, cid) for role, cid in terms), key=len)
+        if not lists:
+            return EMPTY
+        return reduce(
+            lambda acc, p: np.intersect1d(acc, p, assume_unique=True),
+            lists[1:],
+            lists[0],
+        )
+
+    def resolve(self, sids):
+        """
+        Map snapshot IDs back to `(session, seq)` pairs.
+
+        Args:
+            sids (Iterable[int]): Snapshot IDs.
+
+        Returns:
+            list[tuple[str, int]]: Session ID and seq of each snapshot.
+        """
+        resolved = []
+        for sid in sids:
+            seg = self._segments[bisect_right(self._starts, int(sid)) - 1]
+            i = int(sid) - seg["start"]
+            resolved.append((str(seg["session"][i]), int(seg["seq"][i])))
+        return resolved
+
+    def compact(self):
+        """Merge all segments into a single segment."""
+        self._merge(0)
+
+    def _merge(self, first):
+        """
+        Merge the segments from index `first` to the newest into one segment.
+
+        The merged segments' memory maps are released before their
+        directories are deleted, since mapped files cannot be deleted on
+        Windows.
+
+        Args:
+            first (int): Index of the oldest segment to merge.
+        """
+        merged = self._segments[first:]
+        if len(merged) <= 1:
+            self._save_meta()
+            return
+
+        columns = {
+            name: np.concatenate([np.asarray(seg[name]) for seg in merged])
+            for name in ("session", "seq")
+        }
+        for role in ROLES:
+            cids, sids = [], []
+            for seg in merged:
+                offsets = np.asarray(seg[f"{role}_offsets"])
+                cids.append(np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)))
+                sids.append(np.asarray(seg[f"{role}_postings"]))
+            # Segments are in snapshot order, so a stable sort keeps postings sorted
+            cids, sids = np.concatenate(cids), np.concatenate(sids).astype(np.int64)
+            columns[f"{role}_offsets"], columns[f"{role}_postings"] = build_csr(
+                cids, sids
+            )
+        del offsets
+
+        start, end = merged[0]["start"], merged[-1]["end"]
+        name = f"segment-{start:09d}-{end:09d}"
+        self._write_segment(name, columns)
+        stale = [seg["name"] for seg in merged]
+        for seg in merged:
+            seg.clear()
+        self._segments[first:] = [
+            self._load_segment({"name": name, "start": start, "end": end})
+        ]
+        self._starts = [seg["start"] for seg in self._segments]
+        self._save_meta()
+        for old in stale:
+            shutil.rmtree(self.directory / old)
+
+    def _write_segment(self, name, columns):
+        """Write a segment's arrays to disk."""
+        path = self.directory / name
+        path.mkdir(parents=True, exist_ok=True)
+        for column, array in columns.items():
+            np.save(path / f"{column}.npy", array)
+
+    def _load_segment(self, seg):
+        """Memory-map a segment's arrays."""
+        path = self.directory / seg["name"]
+        loaded = dict(seg)
+        for column in ["session", "seq"] + [
+            f"{role}_{kind}" for role in ROLES for kind in ("offsets", "postings")
+        ]:
+            loaded[column] = np.load(path / f"{column}.npy", mmap_mode="r")
+        return loaded
+
+    def _save_meta(self):
+        """Persist the segment list, indexed sessions and log read positions."""
+        meta = {
+            "next_sid": self.next_sid,
+            "segments": [
+                {"name": s["name"], "start": s["start"], "end": s["end"]}
+                for s in self._segments
+            ],
+            "sessions": sorted(self.sessions),
+            "files": self._files,
+            "pending": self._pending,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / "meta.json.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        tmp.replace(self.directory / "meta.json")
+
+
+if __name__ == "__main__":
+    """Entry point for updating the inverted index from the session logs."""
+    index = SnapshotIndex()
+    added = index.update_from_logs()
+    print(f"Indexed {added} new snapshots ({len(index)} total).")
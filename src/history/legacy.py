@@ -0,0 +1,225 @@
+"""
+legacy.py - Parser and Backfill Driver for Legacy `.log` Files.
+
+Reads the fixed-width text logs written by `log_final_champion_select` and
+converts them into the structured record schema used by `session_log.py`,
+so the columnar store can be built from history that predates structured
+logging.
+
+A legacy file holds the final snapshot of a single champion select:
+
+    2025-03-22 18:15:02,123456 ===
+    Champion Select:
+     Key    Champion            | Score      Comp Score WR Score   Raw WR
+    --------------------------------------------------------------------------------
+    > 136    Aurelion Sol       | 12.3       10.1       17.4       52.1
+      64     Lee Sin
+    Bench ===
+      203    Kindred            | 40.2       30.5       62.8       57.5
+
+Functions:
+    - parse_legacy_lines(lines, session_id, app_version, fallback_ts): Parses one log stream.
+    - parse_legacy_file(path): Parses one `.log` file into a record.
+    - backfill(source_dir, output_path, workers, chunksize): Converts a log directory in parallel.
+"""
+
+import json
+import multiprocessing
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+from src.utils import paths
+from src.core.watcher.session_log import SCHEMA_VERSION
+
+LOG_GLOB = "champion_select_*.log"
+BACKFILL_NAME = "legacy_backfill.jsonl"
+
+HEADER_TS_FORMAT = "%Y-%m-%d %H:%M:%S,%f"
+FILENAME_TS_PATTERN = re.compile(
+    r"champion_select_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}(?:-\d{2})?)"
+)
+VERSION_PATTERN = re.compile(r"^\d+\.\d+\.\d+")
+
+
+def parse_champion_line(line):
+    """
+    Parse a single team or bench line.
+
+    Args:
+        line (str): Raw line from a legacy log.
+
+    Returns:
+        tuple[bool, int, list[float] | None] | None: `(is_player, champion_id, values)`
+        where values are `[score, norm_gain, norm_wr, raw_wr]` if present,
+        or None if the line is not a champion line.
+    """
+    is_player = line.startswith(">")
+    left, sep, right = line[1:].partition("|")
+    tokens = left.split(None, 1)
+    if not tokens or not tokens[0].isdigit():
+        return None
+
+    values = None
+    if sep:
+        try:
+            values = [float(v) for v in right.split()[:4]]
+        except ValueError:
+            values = None
+        if values is not None and len(values) != 4:
+            values = None
+    return is_player, int(tokens[0]), values
+
+
+def parse_legacy_lines(lines, session_id, app_version, fallback_ts):
+    """
+    Parse a legacy log stream into a structured record.
+
+    Args:
+        lines (Iterable[str]): Lines of a single legacy log.
+        session_id (str): Session ID to assign to the record.
+        app_version (str): Version directory the log was found in.
+        fallback_ts (float): Timestamp used if the header line is missing or malformed.
+
+    Returns:
+        dict | None: Structured record, or None if no player line was found.
+    """
+    ts = fallback_ts
+    in_bench = False
+    player = None
+    player_values = None
+    team, bench, bench_values = [], [], []
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if line.endswith(" ===") and not line.startswith("Bench"):
+            try:
+                ts = datetime.strptime(line[:-4].strip(), HEADER_TS_FORMAT).timestamp()
+            except ValueError:
+                pass
+            continue
+        if line.startswith("Bench ==="):
+            in_bench = True
+            continue
+
+        parsed = parse_champion_line(line)
+        if parsed is None:
+            continue
+        is_player, cid, values = parsed
+        if in_bench:
+            bench.append(cid)
+            bench_values.append(values)
+        else:
+            team.append(cid)
+            if is_player:
+                player, player_values = cid, values
+
+    if player is None:
+        return None
+
+    available = [player_values] + bench_values
+    record = {
+        "schema": SCHEMA_VERSION,
+        "app_version": app_version,
+        "session": session_id,
+        "seq": 0,
+        "ts": round(ts, 3),
+        "final": True,
+        "player": player,
+        "team": team,
+        "bench": bench,
+    }
+    for i, field in enumerate(("score", "norm_gain", "norm_wr", "raw_wr")):
+        record[field] = [v[i] if v is not None else None for v in available]
+    return record
+
+
+def _fallback_ts(path):
+    """Derive a timestamp from the log filename, falling back to its mtime."""
+    match = FILENAME_TS_PATTERN.search(path.name)
+    if match:
+        stamp = match.group(1)
+        fmt = "%Y-%m-%d_%H-%M-%S" if stamp.count("-") == 4 else "%Y-%m-%d_%H-%M"
+        return datetime.strptime(stamp, fmt).timestamp()
+    return path.stat().st_mtime
+
+
+def parse_legacy_file(path):
+    """
+    Parse a single legacy `.log` file.
+
+    The app version is taken from the containing `data/logs/<version>/` directory.
+
+    Args:
+        path (str or Path): Path to the legacy log file.
+
+    Returns:
+        dict | None: Structured record, or None if the file is malformed or unreadable.
+    """
+    path = Path(path)
+    parent = path.parent.name
+    app_version = parent if VERSION_PATTERN.match(parent) else "unknown"
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return parse_legacy_lines(
+                f, f"legacy-{path.stem}", app_version, _fallback_ts(path)
+            )
+    except OSError:
+        return None
+
+
+def backfill(source_dir=None, output_path=None, workers=None, chunksize=64):
+    """
+    Convert every legacy log under a directory into a structured JSONL file.
+
+    Files are parsed by a process pool; each worker streams one file at a
+    time so its memory use does not grow with the corpus. Records are
+    written in sorted file order as they arrive.
+
+    Args:
+        source_dir (Path, optional): Root to search for legacy logs. Defaults to `paths.LOGS_DIR`.
+        output_path (Path, optional): Output JSONL file. Defaults to
+            `paths.LOGS_DIR / "legacy_backfill.jsonl"`, where compaction picks it up.
+        workers (int, optional): Worker processes. Defaults to `os.cpu_count()`;
+            1 parses in-process.
+        chunksize (int): Files handed to a worker per task.
+
+    Returns:
+        dict[str, int]: Counts of `files`, `records` written and `skipped` files.
+    """
+    source_dir = Path(source_dir or paths.LOGS_DIR)
+    output_path = Path(output_path or paths.LOGS_DIR / BACKFILL_NAME)
+    workers = workers or os.cpu_count() or 1
+    files = sorted(source_dir.rglob(LOG_GLOB))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp")
+    stats = {"files": len(files), "records": 0, "skipped": 0}
+
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        if workers == 1:
+            results = map(parse_legacy_file, files)
+            stats = _write_records(results, out, stats)
+        else:
+            with multiprocessing.Pool(workers) as pool:
+                results = pool.imap(parse_legacy_file, files, chunksize)
+                stats = _write_records(results, out, stats)
+    os.replace(tmp_path, output_path)
+    return stats
+
+
+def _write_records(results, out, stats):
+    """Write parsed records as JSONL lines and update the backfill counters."""
+    for record in results:
+        if record is None:
+            stats["skipped"] += 1
+            continue
+        out.write(json.dumps(record, separators=(",", ":")) + "\n")
+        stats["records"] += 1
+    return stats
+
+
+if __name__ == "__main__":
+    """Entry point for backfilling legacy logs into the structured format."""
+    print(backfill())
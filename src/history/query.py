@@ -0,0 +1,144 @@
+"""
+query.py - Aggregate Queries over the Columnar History Store.
+
+Memory-maps the `.npy` columns written by `store.py` and computes aggregates
+with vectorized NumPy operations, so only the columns a query touches are
+paged in.
+
+Functions:
+    - list_partitions(store_dir, version): Lists partition directories.
+    - load_partition(path, columns): Memory-maps the requested columns of a partition.
+    - picked_vs_best(partitions): Compares the picked champion's score with the best available.
+    - bench_frequency(partitions, final_only): Counts how often each champion was on the bench.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+from src.utils import paths
+
+
+def list_partitions(store_dir=None, version=None):
+    """
+    List partition directories in the history store.
+
+    Args:
+        store_dir (Path, optional): Root of the columnar store. Defaults to `paths.HISTORY_DIR`.
+        version (str, optional): Restrict to a single app version.
+
+    Returns:
+        list[Path]: Sorted partition directories.
+    """
+    store_dir = store_dir or paths.HISTORY_DIR
+    pattern = f"{version}/*" if version else "*/*"
+    return sorted(
+        p for p in store_dir.glob(pattern) if p.is_dir() and not p.name.endswith(".tmp")
+    )
+
+
+def load_partition(path, columns):
+    """
+    Memory-map the given columns of a partition.
+
+    Args:
+        path (Path): Partition directory.
+        columns (Iterable[str]): Column names to load.
+
+    Returns:
+        dict[str, np.ndarray]: Column name to read-only memory-mapped array.
+    """
+    return {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in columns}
+
+
+def picked_vs_best(partitions):
+    """
+    Compare the player's picked champion with the best-scored available option.
+
+    Only final snapshots (the state at the end of champion select) are used.
+
+    Args:
+        partitions (Iterable[Path]): Partition directories to aggregate.
+
+    Returns:
+        dict: Aggregate with keys:
+            - sessions (int): Number of final snapshots considered.
+            - picked_mean (float): Average score of the picked champion.
+            - best_mean (float): Average score of the best available champion.
+            - mean_gap (float): Average `best - picked` score difference.
+            - picked_best_rate (float): Fraction of sessions where the pick was the best option.
+    """
+    picked_sum = best_sum = 0.0
+    best_hits = sessions = 0
+    for path in partitions:
+        cols = load_partition(path, ("final", "avail_offsets", "avail_score"))
+        starts = np.asarray(cols["avail_offsets"][:-1])
+        if not len(starts):
+            continue
+        scores = np.asarray(cols["avail_score"], dtype=np.float64)
+        best = np.fmax.reduceat(scores, starts)
+        picked = scores[starts]
+        final = np.asarray(cols["final"])
+        valid = final & ~np.isnan(picked)
+
+        sessions += int(valid.sum())
+        picked_sum += float(picked[valid].sum())
+        best_sum += float(best[valid].sum())
+        best_hits += int((picked[valid] >= best[valid]).sum())
+
+    if not sessions:
+        return {
+            "sessions": 0,
+            "picked_mean": 0.0,
+            "best_mean": 0.0,
+            "mean_gap": 0.0,
+            "picked_best_rate": 0.0,
+        }
+    return {
+        "sessions": sessions,
+        "picked_mean": picked_sum / sessions,
+        "best_mean": best_sum / sessions,
+        "mean_gap": (best_sum - picked_sum) / sessions,
+        "picked_best_rate": best_hits / sessions,
+    }
+
+
+def bench_frequency(partitions, final_only=True):
+    """
+    Count how often each champion appeared on the bench.
+
+    Args:
+        partitions (Iterable[Path]): Partition directories to aggregate.
+        final_only (bool): Count only final snapshots (one per session) if True,
+            otherwise every logged snapshot.
+
+    Returns:
+        Counter[int, int]: Champion ID to bench appearance count.
+    """
+    counts = np.zeros(0, dtype=np.int64)
+    for path in partitions:
+        cols = load_partition(path, ("final", "avail_offsets", "avail_cid"))
+        offsets = np.asarray(cols["avail_offsets"])
+        cids = np.asarray(cols["avail_cid"])
+
+        # Entry 0 of each snapshot is the player's pick, the rest is the bench
+        lengths = np.diff(offsets)
+        snapshot_of = np.repeat(np.arange(len(lengths)), lengths)
+        mask = np.ones(len(cids), dtype=bool)
+        mask[offsets[:-1][lengths > 0]] = False
+        if final_only:
+            mask &= np.asarray(cols["final"])[snapshot_of]
+
+        partial = np.bincount(cids[mask], minlength=len(counts))
+        if len(partial) > len(counts):
+            counts = np.pad(counts, (0, len(partial) - len(counts)))
+        counts[: len(partial)] += partial
+
+    return Counter({int(cid): int(n) for cid, n in enumerate(counts) if n})
+
+
+if __name__ == "__main__":
+    """Entry point for printing headline aggregates over the history store."""
+    partitions = list_partitions()
+    print(picked_vs_best(partitions))
+    print(bench_frequency(partitions).most_common(10))
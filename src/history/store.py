@@ -0,0 +1,165 @@
+"""
+store.py - Columnar History Store for Champion Select Logs.
+
+Compacts structured session log records (see `session_log.py`) into a
+columnar store of plain NumPy `.npy` files, one directory per partition:
+
+    data/history/<app_version>/<YYYY-MM-DD>/<column>.npy
+
+Each column is a separate `.npy` file so readers can memory-map exactly the
+columns they need. Ragged per-snapshot lists (team, available champions) are
+flattened into a single array plus an offsets array of length `snapshots + 1`.
+
+Columns:
+    - session (str), seq (int32), ts (float64), final (bool), player (uint16)
+    - team_offsets (int64), team_cid (uint16)
+    - avail_offsets (int64), avail_cid (uint16), avail_score, avail_norm_gain,
+      avail_norm_wr, avail_raw_wr (float32); the first available entry of each
+      snapshot is the player's champion, the rest are the ranked bench.
+
+Functions:
+    - records_to_columns(records): Flattens structured records into column arrays.
+    - write_partition(path, records): Atomically writes one partition.
+    - compact(source_dir, store_dir): Rebuilds all partitions from the session logs.
+"""
+
+import shutil
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from src.utils import paths
+from src.core.watcher.session_log import read_session_records
+
+AVAILABLE_FIELDS = ("score", "norm_gain", "norm_wr", "raw_wr")
+
+
+def partition_key(record):
+    """
+    Return the `(app_version, date)` partition a record belongs to.
+
+    Args:
+        record (dict): Structured session log record.
+
+    Returns:
+        tuple[str, str]: Version string and local `YYYY-MM-DD` date.
+    """
+    day = datetime.fromtimestamp(record["ts"]).strftime("%Y-%m-%d")
+    return record["app_version"], day
+
+
+def records_to_columns(records):
+    """
+    Flatten structured session log records into column arrays.
+
+    Args:
+        records (list[dict]): Records sorted in the order they should be stored.
+
+    Returns:
+        dict[str, np.ndarray]: Column name to array, as described in the module docstring.
+    """
+    team_lengths = [len(r["team"]) for r in records]
+    avail_lengths = [1 + len(r["bench"]) for r in records]
+
+    columns = {
+        "session": np.array([r["session"] for r in records], dtype=str),
+        "seq": np.array([r["seq"] for r in records], dtype=np.int32),
+        "ts": np.array([r["ts"] for r in records], dtype=np.float64),
+        "final": np.array([r.get("final", False) for r in records], dtype=bool),
+        "player": np.array([r["player"] for r in records], dtype=np.uint16),
+        "team_offsets": np.concatenate(([0], np.cumsum(team_lengths))).astype(np.int64),
+        "team_cid": np.array(
+            [cid for r in records for cid in r["team"]], dtype=np.uint16
+        ),
+        "avail_offsets": np.concatenate(([0], np.cumsum(avail_lengths))).astype(
+            np.int64
+        ),
+        "avail_cid": np.array(
+            [cid for r in records for cid in [r["player"]] + r["bench"]],
+            dtype=np.uint16,
+        ),
+    }
+    for field in AVAILABLE_FIELDS:
+        columns[f"avail_{field}"] = np.array(
+            [
+                value if value is not None else np.nan
+                for r, n in zip(records, avail_lengths)
+                for value in (r.get(field) or [None] * n)
+            ],
+            dtype=np.float32,
+        )
+    return columns
+
+
+def write_partition(path, records):
+    """
+    Write a partition's columns to `path`, replacing any previous contents.
+
+    Columns are written to a temporary sibling directory first and swapped
+    in, so readers never observe a half-written partition.
+
+    Args:
+        path (Path): Partition directory.
+        records (list[dict]): Records belonging to the partition.
+    """
+    columns = records_to_columns(records)
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+    for name, array in columns.items():
+        np.save(tmp / f"{name}.npy", array)
+    shutil.rmtree(path, ignore_errors=True)
+    tmp.rename(path)
+
+
+def iter_log_files(source_dir):
+    """
+    List structured session log files (plain and gzip-rotated) under a directory.
+
+    Args:
+        source_dir (Path): Root directory to search recursively.
+
+    Returns:
+        list[Path]: Sorted list of `.jsonl` and `.jsonl.gz` files.
+    """
+    return sorted(
+        list(source_dir.rglob("*.jsonl")) + list(source_dir.rglob("*.jsonl.gz"))
+    )
+
+
+def compact(source_dir=None, store_dir=None):
+    """
+    Rebuild the columnar store from all structured session logs.
+
+    Compaction is idempotent: records are de-duplicated on `(session, seq)`
+    and every partition that has source records is rewritten from scratch.
+
+    Args:
+        source_dir (Path, optional): Root of the session logs. Defaults to `paths.LOGS_DIR`.
+        store_dir (Path, optional): Root of the columnar store. Defaults to `paths.HISTORY_DIR`.
+
+    Returns:
+        dict[tuple[str, str], int]: Number of snapshots written per `(version, date)` partition.
+    """
+    source_dir = source_dir or paths.LOGS_DIR
+    store_dir = store_dir or paths.HISTORY_DIR
+
+    partitions = defaultdict(dict)
+    for path in iter_log_files(source_dir):
+        for record in read_session_records(path):
+            key = (record["session"], record["seq"])
+            partitions[partition_key(record)].setdefault(key, record)
+
+    written = {}
+    for (app_version, day), by_key in sorted(partitions.items()):
+        records = sorted(by_key.values(), key=lambda r: (r["ts"], r["seq"]))
+        write_partition(store_dir / app_version / day, records)
+        written[(app_version, day)] = len(records)
+    return written
+
+
+if __name__ == "__main__":
+    """Entry point for compacting session logs into the columnar history store."""
+    for (app_version, day), count in compact().items():
+        print(f"{app_version}/{day}: {count} snapshots")
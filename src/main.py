@@ -3,6 +3,8 @@ main.py - Entry Point for ARAM Champion Select Monitoring.
 
 This script serves as the main entry point for monitoring League of Legends ARAM champion select.
 It retrieves authentication credentials and initiates the champion select monitoring process.
+Pass `--profile` (or set `NOMAD_PROFILE=1`) to profile each polling cycle, and
+`--metrics-port` / `--metrics-file` to expose operational metrics.
 
 Functions:
     - main(): Retrieves credentials and starts the monitoring process.
@@ -13,16 +15,26 @@ Run this script to start monitoring ARAM champion select.
 Example:
 python
     python main.py
+    python main.py --profile
+    python main.py --metrics-port 9464
 """
 
 from src.api.client.acquire import get_credentials
-from src.core.watcher.watcher import monitor_lobby
+from src.core.watcher.watcher import monitor_lobby, parse_args
 
 
 def main():
     """Retrieve authentication credentials and starts monitoring ARAM champion select."""
+    args = parse_args()
     port, password, puuid = get_credentials()
-    monitor_lobby(port, password, puuid)
+    monitor_lobby(
+        port,
+        password,
+        puuid,
+        profile=args.profile,
+        metrics_port=args.metrics_port,
+        metrics_file=args.metrics_file,
+    )
 
 
 if __name__ == "__main__":
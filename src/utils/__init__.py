@@ -7,6 +7,11 @@ These utilities include file handling and data transformations.
 Submodules:
 - paths: Defines common file paths used across modules.
 - converter: Handles data format conversions and transformations.
+- champion_index: Cached champion name/ID lookups with prefix and fuzzy search.
+- bundle: Compiles static assets into a memory-mappable binary bundle.
+- lazy: Defers importing heavy modules until first use.
+- synthetic: Generates seeded synthetic lobbies and champion select sessions.
+- metrics: In-process counters, gauges and histograms in Prometheus text format.
 
 Usage:
 Import the required utility functions or modules as needed.
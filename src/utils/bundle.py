@@ -0,0 +1,474 @@
+"""
+bundle.py - Compiled Binary Asset Bundle.
+
+Compiles the static assets (champion ratings, champion names, role weights,
+class ratings and win rates) into one versioned binary file that can be
+memory-mapped and read without parsing, by both Python and the C++ overlay
+(`src/cpp/bundle.hpp`).
+
+File layout (little-endian):
+
+    header:  magic b"NMDB" | format u16 | section count u16 | header size u32
+    table:   one 80-byte entry per section:
+             name 16s | dtype 8s | rows u32 | cols u32 | offset u64 | nbytes u64 | sha256 32s
+    data:    section payloads, each aligned to 8 bytes
+
+`dtype` is a NumPy dtype string (`<u2`, `<f8`, `|u1`, `|S24`, ...). Rating
+columns follow `CATEGORIES`. Champion rows are sorted by champion ID; `order`
+lists them in `champion_ratings.json` order. Role weight rows follow
+`role_names`; roles without weights get 1.0, matching the evaluator's default,
+and `weight_roles` lists the roles of `role_weights.json` in file order.
+`mapping_*` and `wr_*` hold `champions.json` and `dd_wr.csv` in file order.
+Values read from JSON or CSV are stored as float64, so they round-trip exactly.
+
+The bundle embeds the SHA-256 of every source asset, so `ensure_bundle()`
+rebuilds it whenever any source's content changes.
+
+At runtime, the asset loaders (`load_champions`, `load_role_weights`,
+`load_win_rates`, `load_champion_mapping`) read their data through
+`runtime_bundle()` instead of parsing the sources. That check only compares
+modification times, and a missing, older-format or outdated bundle makes them
+parse the JSON and CSV files as before.
+
+Functions:
+    - source_files(): Lists the source assets compiled into the bundle.
+    - build_bundle(path): Compiles the sources into a bundle file.
+    - load_bundle(path, verify): Memory-maps a bundle.
+    - ensure_bundle(path): Rebuilds the bundle if stale, then loads it.
+    - runtime_bundle(source): Returns the bundle to read a source asset from, if it is current.
+
+Classes:
+    - AssetBundle: Read-only view over a memory-mapped bundle.
+"""
+
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from src.utils import paths
+
+BUNDLE_PATH = paths.ASSETS_DIR / "assets.bundle"
+MAGIC = b"NMDB"
+FORMAT_VERSION = 2
+# Column order of the rating sections, part of the file format; it matches
+# `evaluator.CATEGORIES`, which cannot be imported here without a cycle
+CATEGORIES = ["Damage", "Toughness", "Control", "Mobility", "Utility"]
+
+_HEADER = struct.Struct("<4sHHI")
+_ENTRY = struct.Struct("<16s8sIIQQ32s")
+_ALIGN = 8
+_runtime = {}
+
+
+def source_files():
+    """
+    List the source assets compiled into the bundle.
+
+    This module itself is included so that layout changes also trigger a rebuild.
+
+    Returns:
+        list[Path]: Source paths in a stable order.
+    """
+    classes = paths.ASSETS_DIR / "classes"
+    return [
+        paths.PWD.parent / "bundle.py",
+        paths.ASSETS_DIR / "champion_ratings.json",
+        paths.ASSETS_DIR / "champions.json",
+        paths.ASSETS_DIR / "dd_wr.csv",
+        classes / "role_weights.json",
+    ] + sorted(classes.glob("*/*.json"))
+
+
+def _sha256(path):
+    """Return the SHA-256 digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).digest()
+
+
+def _number(value):
+    """Return a rating as an int when it is integral, as it is in the JSON source."""
+    return int(value) if value.is_integer() else value
+
+
+def _relative(path):
+    """Return a path relative to the project root as bytes, for the manifest."""
+    return path.relative_to(paths.BASE_DIR).as_posix().encode("utf-8")
+
+
+def compile_sections():
+    """
+    Read the source assets and convert them into bundle sections.
+
+    Returns:
+        dict[str, np.ndarray]: Section name to 1-D or 2-D array.
+    """
+    with open(paths.ASSETS_DIR / "champion_ratings.json", "r", encoding="utf-8") as f:
+        ratings = json.load(f)
+    with open(paths.ASSETS_DIR / "classes" / "role_weights.json", "r") as f:
+        role_weights = json.load(f)
+
+    with open(paths.ASSETS_DIR / "champions.json", "r", encoding="utf-8") as f:
+        mapping = json.load(f)
+
+    raw_wr = {}
+    with open(paths.ASSETS_DIR / "dd_wr.csv", "r", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            raw_wr[int(row[1])] = float(row[2].strip().strip("%"))
+
+    cids = sorted(int(cid) for cid in ratings)
+    champs = [ratings[str(cid)] for cid in cids]
+    role_names = sorted(
+        set(role_weights)
+        | {c["Primary"] for c in champs}
+        | {c["Secondary"] for c in champs}
+    )
+    role_index = {name: i for i, name in enumerate(role_names)}
+    damage_types = sorted({c["Damage Type"] for c in champs})
+
+    class_files = sorted((paths.ASSETS_DIR / "classes").glob("*/*.json"))
+    class_ratings = []
+    for path in class_files:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        class_ratings.append([data.get(cat, 0) for cat in CATEGORIES])
+
+    sources = source_files()
+    return {
+        "champion_ids": np.array(cids, dtype="<u2"),
+        "order": np.array([cids.index(int(cid)) for cid in ratings], dtype="<u2"),
+        "names": np.array([c["name"].encode("utf-8") for c in champs]),
+        "ratings": np.array(
+            [[c["Ratings"].get(cat, 0) for cat in CATEGORIES] for c in champs],
+            dtype="<f8",
+        ),
+        "primary": np.array([role_index[c["Primary"]] for c in champs], dtype="u1"),
+        "secondary": np.array([role_index[c["Secondary"]] for c in champs], dtype="u1"),
+        "role_names": np.array([name.encode("utf-8") for name in role_names]),
+        "role_weights": np.array(
+            [
+                [role_weights.get(name, {}).get(cat, 1.0) for cat in CATEGORIES]
+                for name in role_names
+            ],
+            dtype="<f8",
+        ),
+        "weight_roles": np.array(
+            [role_index[name] for name in role_weights], dtype="u1"
+        ),
+        "damage_type": np.array(
+            [damage_types.index(c["Damage Type"]) for c in champs], dtype="u1"
+        ),
+        "damage_types": np.array([t.encode("utf-8") for t in damage_types]),
+        "difficulty": np.array([c["Difficulty"] for c in champs], dtype="u1"),
+        "style": np.array([c["Style"] for c in champs], dtype="u1"),
+        "attacks_active": np.array(
+            [c["Basic Attacks"] == "active" for c in champs], dtype="u1"
+        ),
+        "abilities_active": np.array(
+            [c["Abilities"] == "active" for c in champs], dtype="u1"
+        ),
+        "win_rates": np.array([raw_wr.get(cid, np.nan) for cid in cids], dtype="<f8"),
+        "wr_ids": np.array(list(raw_wr), dtype="<u2"),
+        "wr_values": np.array(list(raw_wr.values()), dtype="<f8"),
+        "mapping_ids": np.array([int(cid) for cid in mapping], dtype="<u2"),
+        "mapping_names": np.array([name.encode("utf-8") for name in mapping.values()]),
+        "class_names": np.array([p.stem.encode("utf-8") for p in class_files]),
+        "class_ratings": np.array(class_ratings, dtype="<f4").reshape(-1, 5),
+        "source_paths": np.array([_relative(p) for p in sources]),
+        "source_hashes": np.frombuffer(
+            b"".join(_sha256(p) for p in sources), dtype="u1"
+        ).reshape(-1, 32),
+    }
+
+
+def build_bundle(path=BUNDLE_PATH):
+    """
+    Compile all source assets into a bundle file.
+
+    The bundle is written to a temporary file and atomically moved into place.
+
+    Args:
+        path (Path): Output bundle path.
+
+    Returns:
+        Path: The written bundle path.
+    """
+    sections = compile_sections()
+    header_size = _HEADER.size + _ENTRY.size * len(sections)
+    offset = -(-header_size // _ALIGN) * _ALIGN
+
+    table, payloads = [], []
+    for name, array in sections.items():
+        if len(name) > 16:
+            raise ValueError(f"Section name {name!r} exceeds 16 bytes.")
+        data = np.ascontiguousarray(array).tobytes()
+        rows = array.shape[0]
+        cols = array.shape[1] if array.ndim == 2 else 0
+        table.append(
+            _ENTRY.pack(
+                name.encode("ascii"),
+                array.dtype.str.encode("ascii"),
+                rows,
+                cols,
+                offset,
+                len(data),
+                hashlib.sha256(data).digest(),
+            )
+        )
+        padding = -len(data) % _ALIGN
+        payloads.append(data + b"\0" * padding)
+        offset += len(data) + padding
+
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), header_size)
+    blob = header + b"".join(table)
+    blob += b"\0" * (-len(blob) % _ALIGN)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(blob + b"".join(payloads))
+    os.replace(tmp, path)
+    return path
+
+
+class AssetBundle:
+    """
+    Read-only view over a memory-mapped asset bundle.
+
+    Sections are exposed as NumPy arrays backed directly by the mapping.
+
+    Attributes:
+        path (Path): Bundle file path.
+        sections (dict[str, np.ndarray]): Section name to array view.
+        hashes (dict[str, bytes]): Section name to SHA-256 of its payload.
+    """
+
+    def __init__(self, path, verify=False):
+        """
+        Map the bundle and index its sections.
+
+        Raises:
+            ValueError: If the file is not a bundle, has an unsupported format,
+                or (with `verify`) a section fails its integrity hash.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, _ = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a format {FORMAT_VERSION} asset bundle.")
+
+        self.sections = {}
+        self.hashes = {}
+        for i in range(count):
+            name, dtype, rows, cols, offset, nbytes, digest = _ENTRY.unpack_from(
+                self._mmap, _HEADER.size + i * _ENTRY.size
+            )
+            name = name.rstrip(b"\0").decode("ascii")
+            dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+            array = np.frombuffer(
+                self._mmap, dtype=dtype, count=nbytes // dtype.itemsize, offset=offset
+            )
+            if verify and hashlib.sha256(array.tobytes()).digest() != digest:
+                raise ValueError(f"Section {name!r} of {path} is corrupt.")
+            self.sections[name] = array.reshape(rows, cols) if cols else array
+            self.hashes[name] = digest
+
+    def __getitem__(self, name):
+        """Return the array for a section."""
+        return self.sections[name]
+
+    def strings(self, name):
+        """
+        Decode a fixed-width byte string section.
+
+        Args:
+            name (str): Section name (e.g. `names`, `role_names`).
+
+        Returns:
+            list[str]: Decoded strings.
+        """
+        return [s.decode("utf-8") for s in self.sections[name]]
+
+    def champion_data(self):
+        """
+        Rebuild the contents of `champion_ratings.json`.
+
+        Returns:
+            dict[str, dict]: Champion ID (as a string) to champion fields, in
+            file order.
+        """
+        ids = self["champion_ids"].tolist()
+        names = self.strings("names")
+        roles = self.strings("role_names")
+        damage_types = self.strings("damage_types")
+        ratings = self["ratings"].tolist()
+        primary, secondary = self["primary"].tolist(), self["secondary"].tolist()
+        damage, difficulty = self["damage_type"].tolist(), self["difficulty"].tolist()
+        style = self["style"].tolist()
+        attacks, abilities = self["attacks_active"], self["abilities_active"]
+        return {
+            str(ids[row]): {
+                "name": names[row],
+                "Primary": roles[primary[row]],
+                "Secondary": roles[secondary[row]],
+                "Ratings": {
+                    cat: _number(value) for cat, value in zip(CATEGORIES, ratings[row])
+                },
+                "Basic Attacks": "active" if attacks[row] else "inactive",
+                "Style": style[row],
+                "Abilities": "active" if abilities[row] else "inactive",
+                "Damage Type": damage_types[damage[row]],
+                "Difficulty": difficulty[row],
+            }
+            for row in self["order"].tolist()
+        }
+
+    def champion_names(self):
+        """
+        Rebuild the contents of `champions.json`.
+
+        Returns:
+            dict[str, str]: Champion ID (as a string) to name, in file order.
+        """
+        ids = self["mapping_ids"].tolist()
+        return {str(cid): name for cid, name in zip(ids, self.strings("mapping_names"))}
+
+    def role_weights(self):
+        """
+        Rebuild the contents of `role_weights.json`.
+
+        Returns:
+            dict[str, dict[str, float]]: Role name to category weights, in file order.
+        """
+        roles = self.strings("role_names")
+        weights = self["role_weights"].tolist()
+        return {
+            roles[i]: dict(zip(CATEGORIES, weights[i]))
+            for i in self["weight_roles"].tolist()
+        }
+
+    def win_rates(self):
+        """
+        Rebuild the raw win rates of `dd_wr.csv`, as `load_win_rates` returns them.
+
+        Returns:
+            dict[str, float]: Champion ID (as a string) to win rate, in file order.
+        """
+        ids = self["wr_ids"].tolist()
+        return {str(cid): wr for cid, wr in zip(ids, self["wr_values"].tolist())}
+
+    def is_stale(self):
+        """
+        Check whether any source asset changed since the bundle was built.
+
+        Returns:
+            bool: True if a source was added, removed or modified.
+        """
+        built = {
+            source: bytes(digest)
+            for source, digest in zip(
+                self.strings("source_paths"), self["source_hashes"]
+            )
+        }
+        current = source_files()
+        if len(built) != len(current):
+            return True
+        for path in current:
+            key = _relative(path).decode("utf-8")
+            if key not in built or built[key] != _sha256(path):
+                return True
+        return False
+
+    def close(self):
+        """
+        Release the array views and unmap the file.
+
+        If arrays obtained from the bundle are still referenced elsewhere, the
+        mapping stays open until they are garbage collected.
+        """
+        self.sections = {}
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+
+def load_bundle(path=BUNDLE_PATH, verify=False):
+    """
+    Memory-map an asset bundle.
+
+    Args:
+        path (Path): Bundle file path.
+        verify (bool): Check every section against its stored SHA-256.
+
+    Returns:
+        AssetBundle: The mapped bundle.
+    """
+    return AssetBundle(path, verify)
+
+
+def ensure_bundle(path=BUNDLE_PATH):
+    """
+    Load the bundle, rebuilding it first if it is missing, invalid or stale.
+
+    Args:
+        path (Path): Bundle file path.
+
+    Returns:
+        AssetBundle: An up-to-date mapped bundle.
+    """
+    if path.exists():
+        try:
+            bundle = load_bundle(path)
+            if not bundle.is_stale():
+                return bundle
+            bundle.close()
+        except (ValueError, struct.error):
+            pass
+    build_bundle(path)
+    return load_bundle(path)
+
+
+def runtime_bundle(source, path=None):
+    """
+    Return the bundle to read a source asset from, if it is current.
+
+    Freshness is checked by modification time only (one `stat` per source), so
+    the runtime loaders neither hash nor parse the sources. The result is
+    cached per bundle path for the life of the process.
+
+    Args:
+        source (Path): Source asset the caller would otherwise parse.
+        path (Path, optional): Bundle file path; defaults to `assets.bundle` in
+            the assets directory.
+
+    Returns:
+        AssetBundle | None: The mapped bundle, or None if it is missing, has
+        another format, is older than one of its sources or does not contain
+        `source`.
+    """
+    path = path or paths.ASSETS_DIR / BUNDLE_PATH.name
+    if path not in _runtime:
+        bundle, sources = None, ()
+        try:
+            sources = source_files()
+            built = path.stat().st_mtime_ns
+            if all(source.stat().st_mtime_ns <= built for source in sources):
+                bundle = load_bundle(path)
+        except (OSError, ValueError, struct.error):
+            bundle = None
+        _runtime[path] = bundle, set(sources)
+    bundle, sources = _runtime[path]
+    return bundle if bundle is not None and source in sources else None
+
+
+if __name__ == "__main__":
+    """Entry point for compiling the asset bundle."""
+    bundle = ensure_bundle()
+    print(f"Bundle {bundle.path}: {', '.join(bundle.sections)}")
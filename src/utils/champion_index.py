@@ -0,0 +1,289 @@
+"""
+champion_index.py - Bidirectional Champion Name/ID Index.
+
+Loads champion names once and answers lookups in both directions:
+- ID to name, using the names in `champions.json` (e.g. `96 -> "KogMaw"`).
+- Name to ID, matching any known spelling after normalization. Spellings
+  come from `champions.json` and the display names in `dd_wr.csv`, so
+  `"Kog'Maw"`, `"kogmaw"` and `"KOG MAW"` all resolve to 96, and
+  `"Wukong"` resolves to `MonkeyKing`.
+
+Normalized names are also stored in a character trie, which backs prefix
+search (`search("ka")`) and typo-tolerant search (`fuzzy("kogmow")`, by
+Levenshtein distance with pruning) for interactive queries.
+
+Classes:
+    - ChampionIndex: ID <-> name maps plus a trie over normalized names.
+
+Functions:
+    - normalize_name(name): Case-folds a name and strips non-alphanumerics.
+    - load_champion_index(assets_dir): Builds the index once per assets directory.
+
+Usage:
+Import `load_champion_index` for lookups, or run the module to search
+interactively.
+
+Example:
+python
+    index = load_champion_index()
+    index.id("kog'maw")        # 96
+    index.name(96)             # "KogMaw"
+    index.search("ka", 3)      # [(145, "Kaisa"), (429, "Kalista"), (43, "Karma")]
+    index.fuzzy("kogmow")      # [(96, "KogMaw")]
+
+    python -m src.utils.champion_index ka kogmow
+"""
+
+import csv
+import sys
+from src.utils import paths
+from src.utils.converter import load_champion_mapping
+
+_END = None
+_indexes = {}
+
+
+def normalize_name(name):
+    """
+    Normalize a champion name for lookups.
+
+    Args:
+        name (str): Any spelling, e.g. `"Kog'Maw"` or `"Nunu & Willump"`.
+
+    Returns:
+        str: Lower-case alphanumerics only, e.g. `"kogmaw"`.
+    """
+    return "".join(ch for ch in name.casefold() if ch.isalnum())
+
+
+class ChampionIndex:
+    """
+    Bidirectional champion name/ID index with prefix and fuzzy search.
+
+    Attributes:
+        names (dict[int, str]): Champion ID to canonical name.
+        ids (dict[str, int]): Normalized spelling to champion ID.
+    """
+
+    def __init__(self, names, aliases=()):
+        """
+        Build the index.
+
+        Args:
+            names (dict): Champion ID (int or str) to canonical name.
+            aliases (Iterable[tuple[str, int | str]]): Extra `(spelling, ID)` pairs.
+        """
+        self.names = {int(cid): name for cid, name in names.items()}
+        self.ids = {}
+        self._trie = {}
+        for cid, name in self.names.items():
+            self._add(name, cid)
+        for alias, cid in aliases:
+            if int(cid) in self.names:
+                self._add(alias, int(cid))
+
+    def _add(self, spelling, cid):
+        """Register a spelling of a champion's name."""
+        key = normalize_name(spelling)
+        if not key or key in self.ids:
+            return
+        self.ids[key] = cid
+        node = self._trie
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[_END] = cid
+
+    def __len__(self):
+        """Return the number of champions."""
+        return len(self.names)
+
+    def __contains__(self, cid):
+        """Return whether a champion ID is known."""
+        try:
+            return int(cid) in self.names
+        except (TypeError, ValueError):
+            return False
+
+    def name(self, cid, default=None):
+        """
+        Look up a champion's canonical name.
+
+        Args:
+            cid (int | str): Champion ID.
+            default: Value returned for unknown IDs.
+
+        Returns:
+            str: Canonical name, or `default`.
+        """
+        try:
+            return self.names.get(int(cid), default)
+        except (TypeError, ValueError):
+            return default
+
+    def id(self, name, default=None):
+        """
+        Look up a champion ID by any known spelling of its name.
+
+        Args:
+            name (str): Champion name; case, spaces and punctuation are ignored.
+            default: Value returned for unknown names.
+
+        Returns:
+            int: Champion ID, or `default`.
+        """
+        return self.ids.get(normalize_name(name), default)
+
+    def substitute(self, data, unknown="Unknown"):
+        """
+        Replace lists of champion IDs with names.
+
+        Args:
+            data (dict[str, Iterable]): Lists of champion IDs.
+            unknown (str): Name used for unknown IDs.
+
+        Returns:
+            dict[str, list[str]]: Same keys with names instead of IDs.
+        """
+        return {
+            key: [self.name(cid, unknown) for cid in value]
+            for key, value in data.items()
+        }
+
+    def _results(self, cids, limit):
+        """Turn champion IDs into unique `(id, name)` pairs, keeping order."""
+        results, seen = [], set()
+        for cid in cids:
+            if cid not in seen:
+                seen.add(cid)
+                results.append((cid, self.names[cid]))
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+    def search(self, prefix, limit=10):
+        """
+        Find champions whose name starts with a prefix.
+
+        Args:
+            prefix (str): Typed prefix; normalized like names.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            list[tuple[int, str]]: `(id, name)` pairs in alphabetical order of
+            the matched spelling.
+        """
+        node = self._trie
+        for ch in normalize_name(prefix):
+            node = node.get(ch)
+            if node is None:
+                return []
+
+        def walk(node):
+            if _END in node:
+                yield node[_END]
+            for ch in sorted(k for k in node if k is not _END):
+                yield from walk(node[ch])
+
+        return self._results(walk(node), limit)
+
+    def fuzzy(self, query, max_distance=None, limit=5):
+        """
+        Find champions whose name is within an edit distance of a query.
+
+        Walks the trie while computing one Levenshtein row per node, and
+        prunes branches whose best possible distance exceeds `max_distance`.
+
+        Args:
+            query (str): Possibly misspelled name.
+            max_distance (int, optional): Maximum Levenshtein distance; by
+                default one edit per three characters, at most two.
+            limit (int, optional): Maximum number of results.
+
+        Returns:
+            list[tuple[int, str]]: `(id, name)` pairs, closest first.
+        """
+        key = normalize_name(query)
+        if max_distance is None:
+            max_distance = min(2, len(key) // 3)
+        matches = []
+
+        def walk(node, ch, previous, spelling):
+            row = [previous[0] + 1]
+            for i in range(1, len(key) + 1):
+                row.append(
+                    min(
+                        row[i - 1] + 1,
+                        previous[i] + 1,
+                        previous[i - 1] + (key[i - 1] != ch),
+                    )
+                )
+            if _END in node and row[-1] <= max_distance:
+                matches.append((row[-1], spelling, node[_END]))
+            if min(row) <= max_distance:
+                for next_ch, child in node.items():
+                    if next_ch is not _END:
+                        walk(child, next_ch, row, spelling + next_ch)
+
+        first = list(range(len(key) + 1))
+        for ch, child in self._trie.items():
+            if ch is not _END:
+                walk(child, ch, first, ch)
+        matches.sort()
+        return self._results((cid for _, _, cid in matches), limit)
+
+
+def _display_name_aliases(csv_path):
+    """Read `(display name, ID)` pairs from a win rate CSV, if present."""
+    try:
+        with open(csv_path, "r", encoding="utf-8", newline="") as f:
+            return [
+                (row["Champion Name"], row["Key"])
+                for row in csv.DictReader(f)
+                if row.get("Key", "").isdigit()
+            ]
+    except OSError:
+        return []
+
+
+def load_champion_index(assets_dir=None):
+    """
+    Build the champion index once per assets directory.
+
+    Args:
+        assets_dir (Path, optional): Directory with `champions.json` and
+            `dd_wr.csv`; defaults to `paths.ASSETS_DIR`.
+
+    Returns:
+        ChampionIndex: The shared index.
+    """
+    assets_dir = assets_dir or paths.ASSETS_DIR
+    index = _indexes.get(assets_dir)
+    if index is None:
+        names = load_champion_mapping(assets_dir / "champions.json")
+        aliases = _display_name_aliases(assets_dir / "dd_wr.csv")
+        index = _indexes[assets_dir] = ChampionIndex(names, aliases)
+    return index
+
+
+def main(argv=None):
+    """Print prefix and fuzzy matches for each query, or read queries from stdin."""
+    index = load_champion_index()
+    queries = sys.argv[1:] if argv is None else argv
+    interactive = not queries
+    if interactive:
+        print("Type part of a champion name (empty line to quit).")
+        queries = iter(lambda: input("> ").strip(), "")
+    for query in queries:
+        matches = index.search(query) or index.fuzzy(query)
+        if not matches:
+            print(f"{query}: no match")
+        for cid, name in matches:
+            print(f"{query}: {cid:<5} {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except (EOFError, KeyboardInterrupt):
+        pass
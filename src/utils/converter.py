@@ -4,8 +4,13 @@ converter.py - Champion ID Mapping Utility.
 This module provides functions to load and process champion ID-to-name mappings
 for League of Legends champion data.
 
+Each mapping file is read once per process and shared by later calls, so
+converting large batches of lobbies does not re-read `champions.json`. For
+name-to-ID lookups and name search, see `src.utils.champion_index`.
+
 Functions:
-    - load_champion_mapping(): Loads the champion ID-to-name mapping from champions.json.
+    - load_champion_mapping(path): Loads the champion ID-to-name mapping from champions.json.
+    - clear_champion_mapping_cache(): Forgets loaded mappings, e.g. after assets are refreshed.
     - substitute_champion_ids(data): Converts champion IDs into readable champion names.
 
 Usage:
@@ -22,22 +27,47 @@ python
 import json
 from src.utils import paths
 
+_mappings = {}
+
 
-def load_champion_mapping():
+def load_champion_mapping(path=None):
     """
     Load the champion ID-to-name mapping from the data/champions.json file.
 
+    The file is read on the first call only; later calls return the same
+    dictionary, which callers must not modify. The default file is read from
+    the compiled asset bundle when it is current.
+
+    Args:
+        path (Path, optional): Mapping file; defaults to `champions.json` in the assets directory.
+
     Returns:
         dict: A dictionary mapping champion IDs (as strings) to champion names.
     """
-    champions_file = paths.ASSETS_DIR / "champions.json"
+    champions_file = path or paths.ASSETS_DIR / "champions.json"
+    mapping = _mappings.get(champions_file)
+    if mapping is not None:
+        return mapping
 
     if not champions_file.exists():
         print(f"Error: {champions_file} not found.")
         return {}
 
+    from src.utils.bundle import runtime_bundle
+
+    bundle = runtime_bundle(champions_file)
+    if bundle is not None:
+        mapping = _mappings[champions_file] = bundle.champion_names()
+        return mapping
+
     with champions_file.open("r") as f:
-        return json.load(f)
+        mapping = _mappings[champions_file] = json.load(f)
+    return mapping
+
+
+def clear_champion_mapping_cache():
+    """Forget loaded mappings so the next call re-reads the files."""
+    _mappings.clear()
 
 
 def substitute_champion_ids(data):
@@ -0,0 +1,43 @@
+"""
+lazy.py - Deferred Module Imports.
+
+Heavy third-party modules (e.g. `requests`) add noticeable start-up time but
+are only needed once the client is found. `lazy_import` returns a module
+object that is registered in `sys.modules` immediately but only executed on
+first attribute access, so `module.attr` call sites and `unittest.mock.patch`
+targets keep working unchanged.
+
+Functions:
+    - lazy_import(name): Returns a module whose loading is deferred until first use.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name):
+    """
+    Import a module lazily.
+
+    If the module is already imported, it is returned as-is.
+
+    Args:
+        name (str): Absolute module name.
+
+    Returns:
+        ModuleType: The (possibly not yet executed) module.
+
+    Raises:
+        ModuleNotFoundError: If the module cannot be found.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,523 @@
+"""
+metrics.py - In-Process Metrics Registry.
+
+A small, dependency-free metrics registry with counters, gauges and
+histograms, rendered in the Prometheus text exposition format (0.0.4).
+Modules create their metrics once at import time and update them on the hot
+path; an update is a dictionary lookup and a locked addition.
+
+Metrics can carry labels. A labelled metric is updated through the child
+returned by `labels(...)`, which callers may keep to skip the lookup:
+
+    LOOKUPS = metrics.counter(
+        "nomad_cache_lookups_total", "Cache lookups.", ["cache", "result"]
+    )
+    LOOKUPS.labels(cache="role_weights", result="hit").inc()
+
+The registry can be served over HTTP on a localhost port (`serve`) or written
+to a file (`dump`), e.g. when the watcher exits.
+
+Classes:
+    - Counter: Monotonically increasing value.
+    - Gauge: Value that can go up and down, or is computed on collection.
+    - Histogram: Cumulative bucketed distribution with sum and count.
+    - Registry: Named collection of metrics with text rendering.
+
+Functions:
+    - counter(name, documentation, labelnames): Gets or creates a counter in `REGISTRY`.
+    - gauge(name, documentation, labelnames): Gets or creates a gauge in `REGISTRY`.
+    - histogram(name, documentation, labelnames, buckets): Gets or creates a histogram.
+    - serve(port, host, registry): Serves `/metrics` from a background thread.
+    - dump(path, registry): Writes the rendered metrics to a file.
+
+Example:
+python
+    from src.utils import metrics
+    server = metrics.serve(9464)
+    # curl http://127.0.0.1:9464/metrics
+    metrics.dump("metrics.prom")
+"""
+
+import bisect
+import math
+import os
+import re
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9464
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+_NAME = re.compile(r"^[a-zA-Z_:][a-zA-Z0-9_:]*$")
+_LABEL = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+
+
+def _format_value(value):
+    """Render a sample value the way Prometheus expects."""
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    """Render `(name, value)` pairs as a label set, or an empty string."""
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    """Base class handling names, labels and children."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        if not _NAME.match(name):
+            raise ValueError(f"Invalid metric name {name!r}.")
+        for label in labelnames:
+            if not _LABEL.match(label) or label.startswith("__") or label == "le":
+                raise ValueError(f"Invalid label name {label!r} for {name}.")
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """
+        Return the child metric for a set of label values.
+
+        Args:
+            *values: Label values in `labelnames` order.
+            **kwargs: Label values by name (instead of positional values).
+
+        Returns:
+            The child metric, created on first use.
+
+        Raises:
+            ValueError: If the label values do not match `labelnames`.
+        """
+        if kwargs:
+            if values or set(kwargs) != set(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(v) for v in values)
+        if len(values) != len(self.labelnames) or not self.labelnames:
+            raise ValueError(f"{self.name} expects labels {self.labelnames}.")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _unlabelled(self):
+        """Return the single child of a metric without labels."""
+        if self.labelnames:
+            raise ValueError(f"{self.name} has labels; use .labels(...) first.")
+        return self._children[()]
+
+    def samples(self):
+        """
+        Collect the metric's samples.
+
+        Returns:
+            list[tuple[str, tuple, float]]: `(name, label pairs, value)` per sample.
+        """
+        samples = []
+        for values, child in sorted(self._children.items()):
+            pairs = tuple(zip(self.labelnames, values))
+            samples.extend(child.samples(self.name, pairs))
+        return samples
+
+
+class _CounterChild:
+    """Value of one counter label set."""
+
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        """Increase the counter by a non-negative amount."""
+        if amount < 0:
+            raise ValueError("Counters can only increase.")
+        with self.lock:
+            self.value += amount
+
+    def samples(self, name, pairs):
+        return [(name, pairs, self.value)]
+
+
+class Counter(_Metric):
+    """Monotonically increasing value, e.g. requests or bytes written."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        """Increase the counter of a metric without labels."""
+        self._unlabelled().inc(amount)
+
+    @property
+    def value(self):
+        """Current value of a metric without labels."""
+        return self._unlabelled().value
+
+
+class _GaugeChild:
+    """Value of one gauge label set."""
+
+    __slots__ = ("value", "function", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.function = None
+        self.lock = threading.Lock()
+
+    def set(self, value):
+        """Set the gauge to a value."""
+        self.value = float(value)
+
+    def inc(self, amount=1):
+        """Increase the gauge."""
+        with self.lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        """Decrease the gauge."""
+        with self.lock:
+            self.value -= amount
+
+    def set_function(self, function):
+        """Compute the gauge's value by calling `function()` on collection."""
+        self.function = function
+
+    def get(self):
+        """Return the current value."""
+        return float(self.function()) if self.function else self.value
+
+    def samples(self, name, pairs):
+        return [(name, pairs, self.get())]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. consecutive failures."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        """Set a gauge without labels."""
+        self._unlabelled().set(value)
+
+    def inc(self, amount=1):
+        """Increase a gauge without labels."""
+        self._unlabelled().inc(amount)
+
+    def dec(self, amount=1):
+        """Decrease a gauge without labels."""
+        self._unlabelled().dec(amount)
+
+    def set_function(self, function):
+        """Compute a gauge without labels by calling `function()` on collection."""
+        self._unlabelled().set_function(function)
+
+    @property
+    def value(self):
+        """Current value of a gauge without labels."""
+        return self._unlabelled().get()
+
+
+class _HistogramChild:
+    """Bucket counts of one histogram label set."""
+
+    __slots__ = ("bounds", "counts", "sum", "lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        """Record one observation."""
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @property
+    def count(self):
+        """Number of observations."""
+        return sum(self.counts)
+
+    def samples(self, name, pairs):
+        samples = []
+        cumulative = 0
+        with self.lock:
+            counts, total = list(self.counts), self.sum
+        for bound, count in zip(self.bounds + (math.inf,), counts):
+            cumulative += count
+            le = pairs + (("le", _format_value(bound)),)
+            samples.append((f"{name}_bucket", le, cumulative))
+        samples.append((f"{name}_sum", pairs, total))
+        samples.append((f"{name}_count", pairs, cumulative))
+        return samples
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed distribution with sum and count, e.g. latencies."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Initialize the histogram with sorted, finite upper bounds."""
+        bounds = tuple(float(b) for b in buckets if b != math.inf)
+        if not bounds or list(bounds) != sorted(set(bounds)):
+            raise ValueError(f"Buckets of {name} must be sorted and unique.")
+        self.bounds = bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value):
+        """Record one observation on a histogram without labels."""
+        self._unlabelled().observe(value)
+
+    @property
+    def count(self):
+        """Number of observations of a histogram without labels."""
+        return self._unlabelled().count
+
+
+class Registry:
+    """
+    Named collection of metrics.
+
+    Attributes:
+        metrics (dict[str, _Metric]): Metric name to metric, in creation order.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry."""
+        self.metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name, documentation, labelnames, **kwargs):
+        """Return the existing metric `name`, or register a new one."""
+        with self._lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = cls(name, documentation, labelnames, **kwargs)
+                self.metrics[name] = metric
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} is already registered differently.")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Get or create a gauge."""
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Get or create a histogram."""
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get_sample_value(self, name, labels=None):
+        """
+        Look up a single sample, mainly for tests.
+
+        Args:
+            name (str): Sample name, e.g. `x_total` or `x_bucket`.
+            labels (dict, optional): Exact label set of the sample.
+
+        Returns:
+            float | None: The sample value, or None if it does not exist.
+        """
+        wanted = {k: str(v) for k, v in (labels or {}).items()}
+        for metric in list(self.metrics.values()):
+            for sample, pairs, value in metric.samples():
+                if sample == name and dict(pairs) == wanted:
+                    return value
+        return None
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text ending with a newline.
+        """
+        lines = []
+        for metric in list(self.metrics.values()):
+            doc = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {metric.name} {doc}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, pairs, value in metric.samples():
+                lines.append(f"{sample}{_format_labels(pairs)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(name, documentation, labelnames=()):
+    """
+    Get or create a counter in the default registry.
+
+    Args:
+        name (str): Metric name, conventionally ending in `_total`.
+        documentation (str): One-line help text.
+        labelnames (Iterable[str]): Label names.
+
+    Returns:
+        Counter: The registered counter.
+
+    Raises:
+        ValueError: If the name is taken by a different metric.
+    """
+    return REGISTRY.counter(name, documentation, labelnames)
+
+
+def gauge(name, documentation, labelnames=()):
+    """
+    Get or create a gauge in the default registry.
+
+    Args:
+        name (str): Metric name.
+        documentation (str): One-line help text.
+        labelnames (Iterable[str]): Label names.
+
+    Returns:
+        Gauge: The registered gauge.
+
+    Raises:
+        ValueError: If the name is taken by a different metric.
+    """
+    return REGISTRY.gauge(name, documentation, labelnames)
+
+
+def histogram(name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+    """
+    Get or create a histogram in the default registry.
+
+    Args:
+        name (str): Metric name, conventionally with a unit suffix like `_seconds`.
+        documentation (str): One-line help text.
+        labelnames (Iterable[str]): Label names.
+        buckets (Iterable[float]): Sorted bucket upper bounds.
+
+    Returns:
+        Histogram: The registered histogram.
+
+    Raises:
+        ValueError: If the name is taken by a different metric.
+    """
+    return REGISTRY.histogram(name, documentation, labelnames, buckets)
+
+
+START_TIME = gauge(
+    "nomad_process_start_time_seconds", "Start time of the process since the epoch."
+)
+START_TIME.set(time.time())
+
+
+def serve(port=DEFAULT_PORT, host="127.0.0.1", registry=REGISTRY):
+    """
+    Serve the registry at `http://host:port/metrics` from a daemon thread.
+
+    Args:
+        port (int): TCP port; 0 picks a free port (see `server.server_port`).
+        host (str): Interface to bind, localhost by default.
+        registry (Registry): Registry to expose.
+
+    Returns:
+        ThreadingHTTPServer: The running server; call `shutdown()` to stop it.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    )
+    thread.start()
+    return server
+
+
+def dump(path, registry=REGISTRY):
+    """
+    Write the rendered registry to a file, replacing it atomically.
+
+    Args:
+        path (str | Path): Destination file, e.g. for node_exporter's textfile collector.
+        registry (Registry): Registry to write.
+    """
+    path = os.fspath(path)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(registry.render())
+    os.replace(tmp, path)
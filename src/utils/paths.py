@@ -12,6 +12,8 @@ Constants:
     - DATA_DIR: Directory containing all project data.
     - RAW_DIR: Subdirectory for raw data storage.
     - ASSETS_DIR: Subdirectory for storing asset files.
+    - LOGS_DIR: Subdirectory for champion select logs, organized by version.
+    - HISTORY_DIR: Subdirectory for the compacted columnar history store.
     - TEST_DIR: Directory for unit tests.
 
 Functions:
@@ -35,6 +37,8 @@ API_DIR = BASE_DIR / "src" / "api"
 DATA_DIR = BASE_DIR / "data"
 RAW_DIR = DATA_DIR / "raw"
 ASSETS_DIR = DATA_DIR / "assets"
+LOGS_DIR = DATA_DIR / "logs"
+HISTORY_DIR = DATA_DIR / "history"
 TEST_DIR = BASE_DIR / "test"
 
 
@@ -45,6 +49,8 @@ def print_dirs():
     print(f"Data Directory: {DATA_DIR}")
     print(f"Raw Directory: {RAW_DIR}")
     print(f"Assets Directory: {ASSETS_DIR}")
+    print(f"Logs Directory: {LOGS_DIR}")
+    print(f"History Directory: {HISTORY_DIR}")
     print(f"Test directory: {TEST_DIR}")
 
 
@@ -0,0 +1,379 @@
+"""
+synthetic.py - Seeded Synthetic ARAM Lobby Generator.
+
+Produces reproducible champion select data for benchmarks and stress tests,
+in both forms used by the project:
+
+    - grouped: `{"team": [...], "bench": [...], "player": [cid]}`, the
+      `sanitize_champion_data` output consumed by the evaluator.
+    - raw: LCU `/lol-champ-select/v1/session` JSON with the same schema as
+      `tests/fixtures/lobby.json`, which `sanitize_champion_data` turns back
+      into the grouped form (using `PLAYER_PUUID` for the local player).
+
+Two generation modes are provided:
+
+    - Independent lobbies (`LobbyGenerator.lobbies`): five distinct
+      teammates and a uniformly sized bench of 0-10 distinct champions,
+      drawn in NumPy batches for throughput.
+    - Sessions (`LobbyGenerator.sessions`): one snapshot per LCU poll of a
+      whole champion select. Players start with random champions and an
+      empty bench; over time they reroll (the old champion goes to the
+      bench, oldest dropped beyond 10), swap with the bench and trade with
+      each other.
+
+The same seed always produces the same output.
+
+Classes:
+    - LobbyGenerator: Seeded generator of grouped lobbies and sessions.
+
+Functions:
+    - to_lcu_session(grouped, game_id, counter, player_puuid): Builds raw LCU session JSON.
+    - to_lcu_json(grouped, game_id, counter, player_puuid): Same, serialized from a
+      precompiled template (several times faster than `json.dumps`).
+
+Usage:
+Run from the repository root. Writes JSONL to stdout unless `-o` is given.
+
+Example:
+python
+    python -m src.utils.synthetic --count 1000000 --seed 7 -o lobbies.jsonl
+    python -m src.utils.synthetic --sessions 1000 --format lcu -o sessions.jsonl
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+
+from src.utils import paths
+
+PLAYER_PUUID = "00000000-0000-4000-8000-000000000000"
+TEAM_SIZE = 5
+MAX_BENCH = 10
+BATCH_SIZE = 65536
+
+SESSION_LENGTH = (40, 90)
+REROLLS = (0, 2)
+REROLL_RATE = 0.08
+SWAP_RATE = 0.06
+TRADE_RATE = 0.02
+
+
+def default_champion_ids():
+    """
+    Return the champion IDs known to the evaluator.
+
+    Returns:
+        list[int]: Champion IDs from `champion_ratings.json`, sorted.
+    """
+    with open(paths.ASSETS_DIR / "champion_ratings.json", "r", encoding="utf-8") as f:
+        return sorted(int(cid) for cid in json.load(f))
+
+
+def _puuid(game_id, cell_id):
+    """Return a deterministic, well-formed PUUID for a teammate."""
+    return f"{game_id & 0xFFFFFFFF:08x}-0000-4000-8000-{cell_id + 1:012x}"
+
+
+def _member(cell_id, champion_id, puuid, team, visible=True):
+    """Build one `myTeam` / `theirTeam` entry of the LCU session."""
+    return {
+        "assignedPosition": "",
+        "cellId": cell_id,
+        "championId": champion_id,
+        "championPickIntent": 0,
+        "nameVisibilityType": "VISIBLE" if visible else "HIDDEN",
+        "obfuscatedPuuid": "",
+        "obfuscatedSummonerId": 0,
+        "puuid": puuid,
+        "selectedSkinId": champion_id * 1000,
+        "spell1Id": 32 if visible else 0,
+        "spell2Id": 4 if visible else 0,
+        "summonerId": 0,
+        "team": team,
+        "wardSkinId": -1,
+    }
+
+
+def to_lcu_session(grouped, game_id=0, counter=0, player_puuid=PLAYER_PUUID):
+    """
+    Build a raw LCU champion select session from a grouped lobby.
+
+    The local player is always on the blue side (team 1, cells 0-4) and the
+    hidden enemy team occupies cells 5-9.
+
+    Args:
+        grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+        game_id (int): Value of `gameId`; also seeds teammate PUUIDs.
+        counter (int): Value of `counter` (the LCU's update sequence number).
+        player_puuid (str): PUUID assigned to the local player.
+
+    Returns:
+        dict: Session JSON matching `/lol-champ-select/v1/session`.
+    """
+    player = grouped["player"][0] if grouped["player"] else None
+    local_cell = 0
+    my_team = []
+    for cell_id, cid in enumerate(grouped["team"]):
+        is_player = cid == player
+        if is_player:
+            local_cell = cell_id
+        puuid = player_puuid if is_player else _puuid(game_id, cell_id)
+        my_team.append(_member(cell_id, cid, puuid, 1))
+    their_team = [
+        _member(TEAM_SIZE + i, 0, "", 2, visible=False) for i in range(TEAM_SIZE)
+    ]
+    return {
+        "actions": [],
+        "allowBattleBoost": True,
+        "allowDuplicatePicks": False,
+        "allowLockedEvents": False,
+        "allowRerolling": True,
+        "allowSkinSelection": True,
+        "bans": {"myTeamBans": [], "numBans": 0, "theirTeamBans": []},
+        "benchChampions": [
+            {"championId": cid, "isPriority": False} for cid in grouped["bench"]
+        ],
+        "benchEnabled": True,
+        "boostableSkinCount": 1,
+        "chatDetails": {
+            "mucJwtDto": {},
+            "multiUserChatId": "",
+            "multiUserChatPassword": "",
+        },
+        "counter": counter,
+        "gameId": game_id,
+        "hasSimultaneousBans": True,
+        "hasSimultaneousPicks": True,
+        "isCustomGame": False,
+        "isSpectating": False,
+        "localPlayerCellId": local_cell,
+        "lockedEventIndex": -1,
+        "myTeam": my_team,
+        "pickOrderSwaps": [],
+        "recoveryCounter": 0,
+        "rerollsRemaining": 0,
+        "skipChampionSelect": False,
+        "theirTeam": their_team,
+        "timer": {
+            "adjustedTimeLeftInPhase": 0,
+            "internalNowInEpochMs": 0,
+            "isInfinite": False,
+            "phase": "BAN_PICK",
+            "totalTimeInPhase": 0,
+        },
+        "trades": [],
+    }
+
+
+def _compile_templates():
+    """Serialize the static parts of a session once, leaving `%s` slots for the rest."""
+    member = _member(0, 0, "", 1)
+    member.update(cellId="@", championId="@", puuid="@", selectedSkinId="@")
+    session = to_lcu_session({"team": [], "bench": [], "player": []})
+    session.update(
+        benchChampions="@", counter="@", gameId="@", localPlayerCellId="@", myTeam="@"
+    )
+    return tuple(
+        json.dumps(template, separators=(",", ":")).replace('"@"', "%s")
+        for template in (member, session)
+    )
+
+
+_MEMBER_TEMPLATE, _SESSION_TEMPLATE = _compile_templates()
+_BENCH_TEMPLATE = '{"championId":%d,"isPriority":false}'
+
+
+def to_lcu_json(grouped, game_id=0, counter=0, player_puuid=PLAYER_PUUID):
+    """
+    Serialize the raw LCU session for a grouped lobby.
+
+    Equivalent to `json.dumps(to_lcu_session(...), separators=(",", ":"))`.
+
+    Args:
+        grouped (dict): Dictionary containing 'team', 'bench', and 'player' champion IDs.
+        game_id (int): Value of `gameId`; also seeds teammate PUUIDs.
+        counter (int): Value of `counter`.
+        player_puuid (str): PUUID assigned to the local player.
+
+    Returns:
+        str: Compact session JSON.
+    """
+    player = grouped["player"][0] if grouped["player"] else None
+    local_cell = 0
+    members = []
+    for cell_id, cid in enumerate(grouped["team"]):
+        if cid == player:
+            local_cell = cell_id
+            puuid = player_puuid
+        else:
+            puuid = _puuid(game_id, cell_id)
+        members.append(_MEMBER_TEMPLATE % (cell_id, cid, f'"{puuid}"', cid * 1000))
+    bench = ",".join(_BENCH_TEMPLATE % cid for cid in grouped["bench"])
+    return _SESSION_TEMPLATE % (
+        f"[{bench}]",
+        counter,
+        game_id,
+        local_cell,
+        f"[{','.join(members)}]",
+    )
+
+
+class LobbyGenerator:
+    """
+    Seeded generator of grouped ARAM lobbies and champion select sessions.
+
+    Attributes:
+        seed (int): Seed for all random draws.
+        champion_ids (np.ndarray): Pool of champion IDs to draw from.
+    """
+
+    def __init__(self, seed=0, champion_ids=None):
+        """
+        Initialize the generator.
+
+        Args:
+            seed (int): Random seed.
+            champion_ids (Sequence[int], optional): Champion pool. Defaults to
+                every champion in `champion_ratings.json`.
+
+        Raises:
+            ValueError: If the pool is too small to fill a team and a full bench.
+        """
+        ids = default_champion_ids() if champion_ids is None else champion_ids
+        self.seed = seed
+        self.champion_ids = np.asarray(sorted(ids), dtype=np.int64)
+        if len(self.champion_ids) < TEAM_SIZE + MAX_BENCH:
+            raise ValueError(
+                f"Need at least {TEAM_SIZE + MAX_BENCH} champions, "
+                f"got {len(self.champion_ids)}."
+            )
+
+    def lobbies(self, count, batch_size=BATCH_SIZE):
+        """
+        Generate independent grouped lobbies.
+
+        Every lobby has five distinct teammates, one of them the player, and a
+        bench of 0-10 further distinct champions.
+
+        Args:
+            count (int): Number of lobbies.
+            batch_size (int): Lobbies drawn per NumPy batch.
+
+        Yields:
+            dict: Grouped lobby.
+        """
+        rng = np.random.default_rng(self.seed)
+        slots = TEAM_SIZE + MAX_BENCH
+        remaining = count
+        while remaining > 0:
+            n = min(batch_size, remaining)
+            remaining -= n
+            keys = rng.random((n, len(self.champion_ids)))
+            picks = self.champion_ids[np.argpartition(keys, slots, axis=1)[:, :slots]]
+            bench_sizes = rng.integers(0, MAX_BENCH + 1, n).tolist()
+            players = rng.integers(0, TEAM_SIZE, n).tolist()
+            for row, size, p in zip(picks.tolist(), bench_sizes, players):
+                yield {
+                    "team": row[:TEAM_SIZE],
+                    "bench": row[TEAM_SIZE:][:size],
+                    "player": [row[p]],
+                }
+
+    def sessions(self, count, length=SESSION_LENGTH):
+        """
+        Simulate whole champion select sessions.
+
+        Args:
+            count (int): Number of sessions.
+            length (tuple[int, int]): Inclusive range of snapshots per session.
+
+        Yields:
+            tuple[int, list[dict]]: Game ID and one grouped snapshot per poll.
+        """
+        rng = random.Random(self.seed)
+        ids = self.champion_ids.tolist()
+        for game_id in range(1, count + 1):
+            picked = rng.sample(ids, TEAM_SIZE)
+            team = list(picked)
+            unused = list(set(ids) - set(picked))
+            rng.shuffle(unused)
+            bench = []
+            rerolls = [rng.randint(*REROLLS) for _ in range(TEAM_SIZE)]
+            player = rng.randrange(TEAM_SIZE)
+
+            snapshots = []
+            for _ in range(rng.randint(*length)):
+                roll = rng.random()
+                if roll < REROLL_RATE:
+                    cell = rng.randrange(TEAM_SIZE)
+                    if rerolls[cell] and unused:
+                        rerolls[cell] -= 1
+                        bench.append(team[cell])
+                        team[cell] = unused.pop()
+                        if len(bench) > MAX_BENCH:
+                            unused.insert(0, bench.pop(0))
+                elif roll < REROLL_RATE + SWAP_RATE:
+                    if bench:
+                        cell = rng.randrange(TEAM_SIZE)
+                        slot = rng.randrange(len(bench))
+                        team[cell], bench[slot] = bench[slot], team[cell]
+                elif roll < REROLL_RATE + SWAP_RATE + TRADE_RATE:
+                    a, b = rng.sample(range(TEAM_SIZE), 2)
+                    team[a], team[b] = team[b], team[a]
+                snapshots.append(
+                    {"team": team[:], "bench": bench[:], "player": [team[player]]}
+                )
+            yield game_id, snapshots
+
+
+def main():
+    """Parse arguments and write generated lobbies as JSONL."""
+    parser = argparse.ArgumentParser(description="Synthetic ARAM lobby generator.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--count", type=int, default=1000, help="Independent lobbies.")
+    mode.add_argument("--sessions", type=int, help="Simulated sessions instead.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=("grouped", "lcu"), default="grouped")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout).")
+    args = parser.parse_args()
+
+    generator = LobbyGenerator(args.seed)
+    if args.sessions:
+        items = (
+            (game_id, seq, grouped)
+            for game_id, snapshots in generator.sessions(args.sessions)
+            for seq, grouped in enumerate(snapshots)
+        )
+    else:
+        items = (
+            (i, 0, grouped) for i, grouped in enumerate(generator.lobbies(args.count))
+        )
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    start = time.perf_counter()
+    written = 0
+    with out:
+        for game_id, seq, grouped in items:
+            if args.format == "lcu":
+                line = to_lcu_json(grouped, game_id, seq)
+            elif args.sessions:
+                record = {"session": game_id, "seq": seq, **grouped}
+                line = json.dumps(record, separators=(",", ":"))
+            else:
+                line = json.dumps(grouped, separators=(",", ":"))
+            out.write(line + "\n")
+            written += 1
+    elapsed = time.perf_counter() - start
+    print(
+        f"Wrote {written} lobbies in {elapsed:.2f}s "
+        f"({written / elapsed * 60 / 1e6:.2f}M/min)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
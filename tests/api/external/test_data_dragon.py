@@ -1,8 +1,14 @@
 """Unit tests for the api > external > test data dragon."""
 
-from unittest.mock import patch
-from src.api.external.data_dragon import get_champion_names
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
+import pytest
+import requests
+
+from src.api.external.data_dragon import DataDragonClient, get_champion_names
 
 MOCK_DDRAGON_RESPONSE = {
     "data": {
@@ -14,13 +20,89 @@ MOCK_DDRAGON_RESPONSE = {
 }
 
 
-@patch("src.api.external.data_dragon.requests.get")
-def test_get_champion_names_success(mock_get):
+class StandIn:
+    """In-memory Data Dragon stand-in with ETags and a request log."""
+
+    def __init__(self, delay=0.0):
+        """Initialize with no documents."""
+        self.documents = {}
+        self.log = []
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def publish(self, version, champions, versions=None):
+        """Publish a patch: its champion list and one detail document per champion."""
+        base = f"/cdn/{version}/data/en_US"
+        self.documents[f"{base}/champion.json"] = {"version": version, **champions}
+        for champ_id, data in champions["data"].items():
+            detail = {"data": {champ_id: {"id": champ_id, "key": data["key"]}}}
+            self.documents[f"{base}/champion/{champ_id}.json"] = detail
+        self.documents["/api/versions.json"] = versions or [version]
+
+
+@pytest.fixture
+def stand_in():
+    """Serve a StandIn over HTTP on a free localhost port."""
+    state = StandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with state.lock:
+                state.log.append(self.path)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(state.delay)
+                document = state.documents.get(self.path)
+                if document is None:
+                    self.send_error(404)
+                    return
+                if document == "error":
+                    self.send_error(500)
+                    return
+                body = json.dumps(document).encode("utf-8")
+                etag = f'"{hash(body) & 0xFFFFFFFF:x}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    ).start()
+    state.url = f"http://127.0.0.1:{server.server_port}"
+    state.server = server
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def client_for(stand_in, tmp_path, **kwargs):
+    """Build a client for the stand-in with a cache in tmp_path."""
+    return DataDragonClient(stand_in.url, cache_dir=tmp_path / "cache", **kwargs)
+
+
+def test_get_champion_names_success(stand_in, tmp_path):
     """Test successful retrieval and parsing of champion names from Data Dragon."""
-    mock_get.return_value.status_code = 200
-    mock_get.return_value.json.return_value = MOCK_DDRAGON_RESPONSE
+    stand_in.publish("15.5.1", MOCK_DDRAGON_RESPONSE, ["15.5.1", "15.4.1"])
 
-    champions = get_champion_names()
+    with client_for(stand_in, tmp_path) as client:
+        champions = get_champion_names(client=client)
 
     assert champions == {
         "266": "Aatrox",
@@ -28,26 +110,93 @@ def test_get_champion_names_success(mock_get):
         "84": "Akali",
         "12": "Alistar",
     }, "Champion data should match the expected API response"
+    assert "/cdn/15.5.1/data/en_US/champion.json" in stand_in.log
 
 
-@patch("src.api.external.data_dragon.requests.get")
-def test_get_champion_names_api_failure(mock_get):
+def test_get_champion_names_api_failure(stand_in, tmp_path):
     """Test behavior when Data Dragon API returns a failure response."""
-    mock_get.return_value.status_code = 500  # Simulating a server error
+    stand_in.documents["/api/versions.json"] = "error"
 
-    champions = get_champion_names()
+    with client_for(stand_in, tmp_path) as client:
+        champions = get_champion_names(client=client)
 
     assert champions == {}, "Function should return an empty dictionary on API failure"
 
 
-@patch("src.api.external.data_dragon.requests.get")
-def test_get_champion_names_malformed_response(mock_get):
+def test_get_champion_names_malformed_response(stand_in, tmp_path):
     """Test behavior when Data Dragon API returns malformed data."""
-    mock_get.return_value.status_code = 200
-    mock_get.return_value.json.return_value = {"invalid_key": "bad_data"}
+    stand_in.documents["/api/versions.json"] = ["15.4.1"]
+    stand_in.documents["/cdn/15.4.1/data/en_US/champion.json"] = {"invalid_key": 1}
 
-    champions = get_champion_names()
+    with client_for(stand_in, tmp_path) as client:
+        champions = get_champion_names(client=client)
 
     assert (
         champions == {}
     ), "Function should return an empty dictionary if response is malformed"
+
+
+def test_latest_version_skips_legacy_entries(stand_in, tmp_path):
+    """Test that the newest released version is resolved from versions.json."""
+    stand_in.documents["/api/versions.json"] = ["lolpatch_7.20", "15.6.1", "15.5.1"]
+    with client_for(stand_in, tmp_path) as client:
+        assert client.latest_version() == "15.6.1"
+        assert client.versions() == ["15.6.1", "15.5.1"]
+
+
+def test_unchanged_refresh_is_one_conditional_request(stand_in, tmp_path):
+    """Test that refreshing an unchanged patch costs a single 304 round trip."""
+    stand_in.publish("15.4.1", MOCK_DDRAGON_RESPONSE)
+    with client_for(stand_in, tmp_path) as client:
+        first = client.champion_details()
+    assert set(first) == set(MOCK_DDRAGON_RESPONSE["data"])
+    assert len(stand_in.log) == 2 + len(first)
+
+    stand_in.log.clear()
+    with client_for(stand_in, tmp_path) as client:
+        assert client.champion_details() == first
+        assert client.champion_names() == get_champion_names(client=client)
+        assert client.stats["not_modified"] == client.stats["requests"]
+    assert set(stand_in.log) == {"/api/versions.json"}
+
+
+def test_new_patch_is_fetched_and_blobs_are_shared(stand_in, tmp_path):
+    """Test that a new patch is picked up and identical documents are stored once."""
+    stand_in.publish("15.4.1", MOCK_DDRAGON_RESPONSE)
+    with client_for(stand_in, tmp_path) as client:
+        client.champion_details()
+    blobs = len(list((tmp_path / "cache" / "objects").glob("*/*")))
+
+    stand_in.publish("15.5.1", MOCK_DDRAGON_RESPONSE, ["15.5.1", "15.4.1"])
+    stand_in.log.clear()
+    with client_for(stand_in, tmp_path) as client:
+        assert client.latest_version() == "15.5.1"
+        client.champion_details()
+    assert "/cdn/15.5.1/data/en_US/champion/Ahri.json" in stand_in.log
+    # Only the versions list and the champion list (which embeds the version) differ.
+    assert len(list((tmp_path / "cache" / "objects").glob("*/*"))) == blobs + 2
+
+
+def test_details_respect_bounded_parallelism(stand_in, tmp_path):
+    """Test that detail documents are fetched concurrently but at most `workers` at once."""
+    champions = {"data": {f"Champ{i}": {"key": str(i)} for i in range(12)}}
+    stand_in.publish("15.4.1", champions)
+    stand_in.delay = 0.05
+    with client_for(stand_in, tmp_path, workers=3) as client:
+        details = client.champion_details(version="15.4.1")
+    assert len(details) == 12
+    assert 1 < stand_in.max_in_flight <= 3
+
+
+def test_offline_uses_cached_versions(stand_in, tmp_path):
+    """Test that cached documents are used when Data Dragon is unreachable."""
+    stand_in.publish("15.4.1", MOCK_DDRAGON_RESPONSE)
+    with client_for(stand_in, tmp_path) as client:
+        expected = client.champion_names()
+    stand_in.server.shutdown()
+    stand_in.server.server_close()
+
+    with client_for(stand_in, tmp_path, timeout=1) as client:
+        assert client.champion_names() == expected
+        with pytest.raises(requests.RequestException):
+            client.champion_list("99.1.1")
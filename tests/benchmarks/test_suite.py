@@ -0,0 +1,57 @@
+"""Unit tests for the benchmarks > suite module."""
+
+import random
+import pytest
+from benchmarks import suite
+
+
+def results(median, spread=0.02, seed=0, n=15):
+    """Build fake `run_suite` results for a single case."""
+    rng = random.Random(seed)
+    samples = [median * (1 + rng.uniform(-spread, spread)) for _ in range(n)]
+    return {"case/size": {"samples": samples, "median": sorted(samples)[n // 2]}}
+
+
+def test_mann_whitney_u_separates_shifted_samples():
+    """Test p-values for identical, overlapping and clearly shifted samples."""
+    a = [1.0, 1.1, 0.9, 1.05, 0.95] * 3
+    assert suite.mann_whitney_u(a, list(a)) == pytest.approx(1.0)
+    assert suite.mann_whitney_u(a, [x + 1 for x in a]) < 0.001
+    assert suite.mann_whitney_u([1.0] * 5, [1.0] * 5) == 1.0
+
+
+@pytest.mark.parametrize(
+    "new_median, verdict",
+    [(1.0, "unchanged"), (1.2, "regression"), (0.8, "improvement")],
+)
+def test_compare_flags_significant_changes(new_median, verdict):
+    """Test that only significant changes beyond the threshold are flagged."""
+    (row,) = suite.compare(results(1.0), results(new_median, seed=1))
+    assert row["verdict"] == verdict
+
+
+def test_compare_ignores_small_significant_changes():
+    """Test that a consistent but tiny change stays below the threshold."""
+    (row,) = suite.compare(results(1.0, spread=0.001), results(1.02, spread=0.001))
+    assert row["p"] < suite.ALPHA and row["verdict"] == "unchanged"
+
+
+def test_run_suite_and_baseline_round_trip(tmp_path, monkeypatch):
+    """Test timing a case, saving it and resolving the baseline again."""
+    monkeypatch.setattr(suite, "BASELINE_DIR", tmp_path)
+    monkeypatch.setattr(suite, "current_commit", lambda: "abc1234")
+    measured = suite.run_suite(["display_lobby_champions/unchanged"], 0.01, 3)
+    timing = measured["display_lobby_champions/unchanged"]
+    assert len(timing["samples"]) == 3 and timing["median"] > 0
+
+    path = suite.save_baseline(measured)
+    assert path == tmp_path / "abc1234.json"
+    assert suite.resolve_baseline("abc1234") == path
+    with pytest.raises(FileNotFoundError):
+        suite.resolve_baseline("fff0000")
+
+
+def test_every_case_sets_up():
+    """Test that every registered case builds a callable."""
+    for name, setup in suite.CASES.items():
+        assert callable(setup()), name
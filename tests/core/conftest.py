@@ -0,0 +1,10 @@
+"""Shared fixtures for the core tests."""
+
+import pytest
+from src.core.scoring import ScoringTables
+
+
+@pytest.fixture(scope="session")
+def tables():
+    """Load the champion tables once."""
+    return ScoringTables.load()
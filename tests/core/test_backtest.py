@@ -0,0 +1,162 @@
+"""Unit tests for the core > backtest module."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.core.backtest import (
+    Corpus,
+    ModelVersion,
+    average_ranks,
+    backtest,
+    kendall,
+    main,
+    spearman,
+)
+from src.core.scoring import ScoringParams
+from src.utils import paths
+from src.utils.synthetic import LobbyGenerator
+
+
+@pytest.fixture
+def corpus_file(tmp_path):
+    """Write a corpus with a blank, an invalid and three unknown-champion lines."""
+    lobbies = list(LobbyGenerator(seed=11).lobbies(60))
+    lines = [json.dumps(g) for g in lobbies]
+    lines[3] = ""
+    lines[5] = "{not json"
+    lines[7] = json.dumps({"team": [1, 2, 3, 4, 99999], "bench": [], "player": [1]})
+    lines[9] = json.dumps({**lobbies[9], "player": ["Ahri"]})
+    lines[11] = json.dumps({**lobbies[11], "player": [99999]})
+    path = tmp_path / "lobbies.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.fixture
+def params_file(tmp_path):
+    """Write a weights file with a different blend and Catcher weights."""
+    path = tmp_path / "alt.json"
+    ScoringParams.default().replace(
+        {
+            "gain_weight": 0.4,
+            "wr_weight": 0.6,
+            "role_weights.Catcher.Control": 2.0,
+            "role_weights.Catcher.Utility": 0.5,
+        }
+    ).save(path)
+    return path
+
+
+def test_rank_correlations_match_hand_computed_values():
+    """Test average ranks, Spearman and Kendall tau-b with ties and padding."""
+    mask = np.array([[True, True, True, False], [True, True, True, True]])
+    a = np.array([[3.0, 2.0, 1.0, -np.inf], [1.0, 2.0, 3.0, 4.0]])
+    b = np.array([[1.0, 2.0, 3.0, -np.inf], [1.0, 1.0, 3.0, 4.0]])
+    assert np.array_equal(average_ranks(b, mask)[1], [3.5, 3.5, 2.0, 1.0])
+    assert np.isnan(average_ranks(a, mask)[0, 3])
+    rho = spearman(a, b, mask)
+    assert rho[0] == pytest.approx(-1.0)
+    assert rho[1] == pytest.approx(4.5 / np.sqrt(5.0 * 4.5))
+    tau = kendall(a, b, mask)
+    assert tau[0] == pytest.approx(-1.0)
+    assert tau[1] == pytest.approx(5 / np.sqrt(6 * 5))
+    constant = np.zeros((1, 3))
+    assert np.isnan(spearman(constant, a[:1, :3], mask[:1, :3])).all()
+
+
+def test_corpus_skips_bad_lines(corpus_file, tables):
+    """Test that blank, invalid and unknown-champion lines are skipped."""
+    corpus = Corpus.read(corpus_file, tables.rows)
+    assert len(corpus) == 55 and corpus.skipped == 4
+    assert not {4, 6, 8, 10, 12} & set(corpus.lines)
+    assert corpus.available[0, 0] == corpus.lobbies[0]["player"][0]
+
+
+def test_same_model_agrees_completely(corpus_file, tables, params_file):
+    """Test that the working tree agrees with itself."""
+    corpus = Corpus.read(corpus_file, tables.rows)
+    report = backtest(corpus, ModelVersion("worktree"), ModelVersion("worktree"))
+    assert report["spearman"] == 1.0 and report["kendall"] == 1.0
+    assert report["top1_agreement"] == 1.0 and report["disagreements"] == []
+
+
+def test_weights_file_disagreements_are_ranked(corpus_file, tables, params_file):
+    """Test metrics and the ordering of the largest disagreements."""
+    corpus = Corpus.read(corpus_file, tables.rows)
+    report = backtest(
+        corpus, ModelVersion("worktree"), ModelVersion(str(params_file)), top=5
+    )
+    assert report["candidate"] == "alt.json"
+    assert report["spearman"] < 1.0 and report["top1_agreement"] < 1.0
+    worst = [d["spearman"] for d in report["disagreements"]]
+    assert worst == sorted(worst) and len(worst) == 5
+    assert worst[0] < report["spearman"]
+
+
+@pytest.mark.skipif(not (paths.BASE_DIR / ".git").exists(), reason="not a git checkout")
+def test_git_ref_is_scored_by_its_own_batch(corpus_file, tables):
+    """Test that HEAD, scored in its own checkout, matches the working tree."""
+    corpus = Corpus.read(corpus_file, tables.rows)
+    report = backtest(corpus, ModelVersion("HEAD"), ModelVersion("worktree"), 1)
+    assert report["base"].startswith("HEAD (") and report["failed"] == 0
+    assert report["spearman"] == 1.0 and report["top1_agreement"] == 1.0
+
+
+@pytest.mark.skipif(not (paths.BASE_DIR / ".git").exists(), reason="not a git checkout")
+def test_git_ref_leaves_failed_lobbies_unscored():
+    """Test that lobbies a ref's batch fails on stay at -inf."""
+    lobbies = list(LobbyGenerator(seed=3).lobbies(5))
+    lobbies[2] = {**lobbies[2], "bench": [99999]}
+    corpus = Corpus(lobbies, [1, 2, 3, 4, 5])
+    scores = ModelVersion("HEAD").score(corpus, 1)
+    assert np.isneginf(scores[2]).all()
+    assert np.isfinite(scores[[0, 1, 3, 4], 0]).all()
+
+
+@pytest.mark.skipif(not (paths.BASE_DIR / ".git").exists(), reason="not a git checkout")
+def test_git_ref_batch_failure_reports_stderr(monkeypatch, corpus_file, tables):
+    """Test that a batch run that writes no scores raises with its stderr."""
+
+    def export(self, directory):
+        (directory / "src" / "core").mkdir(parents=True)
+        (directory / "src" / "core" / "batch.py").write_text(
+            "import sys\nsys.exit('no champion data')\n"
+        )
+
+    monkeypatch.setattr(ModelVersion, "_export", export)
+    corpus = Corpus.read(corpus_file, tables.rows)
+    with pytest.raises(ValueError, match="could not score the corpus:\nno champion"):
+        ModelVersion("HEAD").score(corpus)
+
+
+@pytest.mark.skipif(not (paths.BASE_DIR / ".git").exists(), reason="not a git checkout")
+def test_worktree_model_runs_the_trees_evaluator(tmp_path, corpus_file, tables):
+    """Test that uncommitted evaluator edits are part of the worktree model."""
+    tree = tmp_path / "tree"
+    ModelVersion("HEAD")._export(tree)
+    source = tree / "src" / "core" / "evaluator.py"
+    blend = "(champ.norm_gain * gain_weight) + (champ.norm_wr * wr_weight)"
+    assert blend in source.read_text()
+    source.write_text(source.read_text().replace(blend, "champ.norm_wr"))
+
+    corpus = Corpus.read(corpus_file, tables.rows)
+    edited = ModelVersion("worktree", repo=tree)
+    report = backtest(corpus, ModelVersion("worktree"), edited, 1)
+    assert report["failed"] == 0 and report["spearman"] < 1.0
+
+
+def test_unknown_model_rejected(capsys, corpus_file):
+    """Test that a spec that is neither a file nor a ref is an error."""
+    with pytest.raises(ValueError, match="not a weights file or a git ref"):
+        ModelVersion("no-such-ref-anywhere")
+    assert main([str(corpus_file), "--base", "no-such-ref-anywhere"]) == 1
+
+
+def test_cli_prints_json_report(capsys, corpus_file, params_file):
+    """Test the JSON report from the command line."""
+    argv = [str(corpus_file), "--base", "worktree", "--candidate", str(params_file)]
+    assert main(argv + ["--json", "--top", "2"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["lobbies"] == 55 and len(report["disagreements"]) == 2
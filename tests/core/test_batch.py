@@ -0,0 +1,126 @@
+"""Unit tests for the core > batch module."""
+
+import csv
+import io
+import json
+import pytest
+from src.core.batch import CSV_COLUMNS, evaluate_lines, main, run_batch
+from src.core.daemon.server import pool_to_dict
+from src.core.evaluator import Evaluator
+from src.core.reference import load_reference
+from src.core.scoring import ScoringParams
+
+LOBBIES = [
+    {
+        "team": [136, 64, 54, 875, 498],
+        "bench": [203, 517, 86, 245, 141, 893],
+        "player": [498],
+    },
+    {
+        "team": [136, 64, 54, 875, 893],
+        "bench": [203, 517, 86, 245, 141, 498],
+        "player": [893],
+    },
+    {"team": [136, 64, 54, 875, 498], "bench": [], "player": [136]},
+]
+
+
+def make_lines(count):
+    """Cycle the sample lobbies into `count` JSON lines."""
+    return [json.dumps(LOBBIES[i % len(LOBBIES)]) for i in range(count)]
+
+
+def test_jsonl_output_is_ranked_and_matches_evaluator():
+    """Test that results are ranked by score and match the in-process evaluator."""
+    out = io.StringIO()
+    stats = run_batch(make_lines(3), out, workers=1)
+    assert stats["lobbies"] == 3 and stats["errors"] == 0
+
+    for line_no, (text, grouped) in enumerate(
+        zip(out.getvalue().splitlines(), LOBBIES), 1
+    ):
+        result = json.loads(text)
+        expected = pool_to_dict(Evaluator(grouped).evaluate())
+        assert result["line"] == line_no
+        assert result["bench"] == expected["bench"]
+        scores = [c["score"] for c in result["champions"]]
+        assert scores == sorted(scores, reverse=True)
+        assert sorted(scores) == sorted(c["score"] for c in expected["champions"])
+
+
+def test_model_options_match_evaluator(tmp_path):
+    """Test that weights-file and reference settings reach the evaluator."""
+    path = tmp_path / "alt.json"
+    params = ScoringParams.default().replace({"gain_weight": 0.4, "wr_weight": 0.6})
+    params.save(path)
+    out = io.StringIO()
+    model = {"params": str(path), "reference": True}
+    run_batch(make_lines(2), out, workers=1, model=model)
+
+    reference = load_reference(params)
+    for text, grouped in zip(out.getvalue().splitlines(), LOBBIES):
+        pool = Evaluator(grouped, params=params, reference=reference).evaluate()
+        expected = {c["cid"]: c["score"] for c in pool_to_dict(pool)["champions"]}
+        assert {c["cid"]: c["score"] for c in json.loads(text)["champions"]} == expected
+
+
+def test_process_pool_preserves_input_order():
+    """Test that multi-process output is identical to single-process output."""
+    lines = make_lines(50)
+    serial = io.StringIO()
+    parallel = io.StringIO()
+    run_batch(lines, serial, workers=1, chunk_size=4)
+    run_batch(lines, parallel, workers=2, chunk_size=4)
+    assert parallel.getvalue() == serial.getvalue()
+    assert [json.loads(line)["line"] for line in parallel.getvalue().splitlines()] == (
+        list(range(1, 51))
+    )
+
+
+def test_bad_lines_are_reported_and_blank_lines_skipped():
+    """Test that invalid lobbies produce error records without stopping the batch."""
+    lines = [
+        json.dumps(LOBBIES[0]),
+        "",
+        "not json",
+        json.dumps({"team": [99999], "bench": [], "player": [99999]}),
+    ]
+    out = io.StringIO()
+    stats = run_batch(lines, out, workers=1)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert stats["lobbies"] == 3 and stats["errors"] == 2
+    assert [r["line"] for r in records] == [1, 3, 4]
+    assert "error" in records[1] and "Unknown champion" in records[2]["error"]
+
+
+def test_csv_output_has_one_row_per_available_champion():
+    """Test the long-format CSV output."""
+    out = io.StringIO()
+    run_batch(make_lines(2), out, fmt="csv", workers=1)
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert list(rows[0]) == CSV_COLUMNS
+    assert len(rows) == 7 + 7
+    first = [r for r in rows if r["line"] == "1"]
+    assert [r["rank"] for r in first] == [str(i) for i in range(1, 8)]
+    assert sum(r["is_player"] == "1" for r in first) == 1
+
+
+def test_unknown_format_rejected():
+    """Test that an unsupported output format raises ValueError."""
+    with pytest.raises(ValueError):
+        list(evaluate_lines([], fmt="parquet"))
+
+
+def test_main_closes_only_the_files_it_opened(monkeypatch, tmp_path):
+    """Test that stdin and stdout stay open and the output file is written."""
+    source = io.StringIO("\n".join(make_lines(2)) + "\n")
+    out = io.StringIO()
+    monkeypatch.setattr("sys.stdin", source)
+    monkeypatch.setattr("sys.stdout", out)
+    assert main(["--workers", "1"]) == 0
+    assert not source.closed and not out.closed
+    assert len(out.getvalue().splitlines()) == 2
+
+    path = tmp_path / "scores.csv"
+    assert main(["--workers", "1", "--format", "csv", "-o", str(path)]) == 0
+    assert path.read_text().startswith(",".join(CSV_COLUMNS))
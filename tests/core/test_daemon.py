@@ -0,0 +1,205 @@
+"""Unit tests for the core > daemon package."""
+
+import socket
+import threading
+import pytest
+from src.core.daemon.client import DaemonClient
+from src.core.daemon.protocol import (
+    HAS_UNIX_SOCKETS,
+    MAX_FRAME,
+    encode_frame,
+    parse_address,
+    recv_frame,
+    send_frame,
+)
+from src.core.daemon.server import EvaluationDaemon, MicroBatcher, pool_to_dict
+from src.core.evaluator import Evaluator
+from src.utils.synthetic import LobbyGenerator
+
+GROUPED = {
+    "team": [136, 64, 54, 875, 498],
+    "bench": [203, 517, 86, 245, 141, 893],
+    "player": [498],
+}
+GROUPED_2 = {
+    "team": [136, 64, 54, 875, 893],
+    "bench": [203, 517, 86, 245, 141, 498],
+    "player": [893],
+}
+
+
+@pytest.fixture(params=["tcp", "unix"])
+def daemon(request, tmp_path):
+    """Run a daemon on a TCP port or Unix socket for the duration of a test."""
+    if request.param == "unix":
+        if not HAS_UNIX_SOCKETS:
+            pytest.skip("AF_UNIX is not available")
+        address = tmp_path / "daemon.sock"
+    else:
+        address = ("127.0.0.1", 0)
+    daemon = EvaluationDaemon(address, max_delay=0.01).start()
+    yield daemon
+    daemon.close()
+
+
+def test_evaluate_matches_in_process_evaluator(daemon):
+    """Test that the daemon returns exactly what the cold evaluator computes."""
+    with DaemonClient(daemon.address) as client:
+        for grouped in (GROUPED, GROUPED_2):
+            assert client.evaluate(grouped) == pool_to_dict(
+                Evaluator(grouped).evaluate()
+            )
+
+
+def test_evaluate_many_preserves_order(daemon):
+    """Test that batch evaluation returns one result per lobby, in order."""
+    with DaemonClient(daemon.address) as client:
+        results = client.evaluate_many([GROUPED, GROUPED_2, GROUPED])
+    assert [r["player"] for r in results] == [498, 893, 498]
+    assert results[0] == results[2]
+
+
+def test_explain_gains_sum_to_raw_gain(daemon):
+    """Test that the per-category breakdown adds up to each champion's raw gain."""
+    with DaemonClient(daemon.address) as client:
+        explained = client.explain(GROUPED)
+    assert set(explained["base"]) == {
+        "Damage",
+        "Toughness",
+        "Control",
+        "Mobility",
+        "Utility",
+    }
+    scores = [c["score"] for c in explained["champions"]]
+    assert scores == sorted(scores, reverse=True)
+    for champ in explained["champions"]:
+        total = sum(cat["gain"] for cat in champ["categories"].values())
+        assert total == pytest.approx(champ["raw_gain"])
+
+
+def test_errors_are_reported_without_dropping_the_connection(daemon):
+    """Test that bad requests return errors and the connection stays usable."""
+    with DaemonClient(daemon.address) as client:
+        with pytest.raises(RuntimeError, match="Unknown method"):
+            client.call("nope")
+        with pytest.raises(RuntimeError, match="Unknown champion ID 99999"):
+            client.evaluate({"team": [99999], "bench": [], "player": [99999]})
+        assert client.ping()["requests"] >= 2
+
+
+def test_concurrent_requests_are_batched(daemon):
+    """Test that requests from concurrent clients share batches."""
+    clients = [DaemonClient(daemon.address) for _ in range(8)]
+    barrier = threading.Barrier(len(clients))
+    results = [None] * len(clients)
+
+    def run(i):
+        barrier.wait()
+        results[i] = [clients[i].evaluate(GROUPED)["player"] for _ in range(10)]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(clients))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for client in clients:
+        client.close()
+
+    assert results == [[498] * 10] * len(clients)
+    assert daemon.batcher.items == 80
+    assert daemon.batcher.batches < daemon.batcher.items
+
+
+def test_batch_evaluates_lobbies_in_one_pass(daemon):
+    """Test that a batch's evaluate requests share one exact vectorized pass."""
+    lobbies = list(LobbyGenerator(7).lobbies(200))
+    expected = [pool_to_dict(daemon.warm.evaluate(grouped)) for grouped in lobbies]
+    requests = [
+        {"id": 1, "method": "evaluate", "params": lobbies[0]},
+        {"id": 2, "method": "ping"},
+        {"id": 3, "method": "evaluate_many", "params": {"lobbies": lobbies[1:]}},
+        {"id": 4, "method": "evaluate", "params": {"team": [], "bench": []}},
+    ]
+    calls = []
+    original = daemon.warm.evaluate_batch
+    daemon.warm.evaluate_batch = lambda batch: calls.append(batch) or original(batch)
+
+    responses = daemon.handle_batch(requests)
+    assert len(calls) == 1 and len(calls[0]) == len(lobbies) + 1
+    assert responses[0] == {"id": 1, "result": expected[0]}
+    assert "version" in responses[1]["result"]
+    assert responses[2] == {"id": 3, "result": expected[1:]}
+    assert responses[3] == {"id": 4, "error": "KeyError: 'player'"}
+
+
+def test_batch_evaluates_oversized_teams_like_evaluate(daemon):
+    """Test that lobbies with six teammates match `evaluate` in a batch."""
+    grouped = {"team": [136, 64, 54, 875, 498, 203], "bench": [517], "player": [893]}
+    expected = pool_to_dict(daemon.warm.evaluate(grouped))
+    assert daemon.warm.evaluate_batch([grouped, GROUPED])[0] == expected
+
+
+def test_unix_socket_refuses_second_daemon(tmp_path):
+    """Test that a live socket is not stolen while a stale one is replaced."""
+    if not HAS_UNIX_SOCKETS:
+        pytest.skip("AF_UNIX is not available")
+    path = tmp_path / "daemon.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    daemon = EvaluationDaemon(path).start()
+    try:
+        with pytest.raises(OSError, match="already listening"):
+            EvaluationDaemon(path)
+    finally:
+        daemon.close()
+    assert not path.exists()
+
+
+def test_micro_batcher_handles_failures():
+    """Test that a failing batch rejects its futures and the worker keeps going."""
+    calls = []
+
+    def handler(items):
+        calls.append(items)
+        if "bad" in items:
+            raise ValueError("bad batch")
+        return [item.upper() for item in items]
+
+    batcher = MicroBatcher(handler)
+    with pytest.raises(ValueError):
+        batcher.submit("bad").result(timeout=5)
+    assert batcher.submit("ok").result(timeout=5) == "OK"
+    batcher.close()
+
+
+def test_framing_round_trip_and_limits():
+    """Test frame encoding over a socket pair and oversized frame rejection."""
+    left, right = socket.socketpair()
+    with left, right:
+        send_frame(left, {"id": 1, "method": "ping", "params": {}})
+        assert recv_frame(right) == {"id": 1, "method": "ping", "params": {}}
+        left.sendall((MAX_FRAME + 1).to_bytes(4, "big"))
+        with pytest.raises(ValueError):
+            recv_frame(right)
+        left.close()
+        assert recv_frame(right) is None
+    assert encode_frame({})[:4] == b"\0\0\0\x02"
+
+
+def test_parse_address():
+    """Test that host:port and socket paths are told apart."""
+    assert parse_address("127.0.0.1:47913") == ("127.0.0.1", 47913)
+    assert str(parse_address("/tmp/nomad.sock")) == "/tmp/nomad.sock"
+
+
+def test_sensitivity_reports_first_place_probabilities(daemon):
+    """Test the sensitivity method over the socket."""
+    with DaemonClient(daemon.address) as client:
+        report = client.sensitivity(GROUPED, samples=200, seed=1)
+    assert report["samples"] == 200
+    assert [c["cid"] for c in report["champions"]][0] == max(
+        report["champions"], key=lambda c: c["score"]
+    )["cid"]
+    assert sum(c["p_first"] for c in report["champions"]) == pytest.approx(1.0)
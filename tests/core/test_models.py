@@ -0,0 +1,122 @@
+"""Unit tests for the core > models module."""
+
+import json
+
+import pytest
+
+from src.api.client.champion import load_champions
+from src.core import models as models_module
+from src.core.daemon.server import pool_to_dict
+from src.core.evaluator import Evaluator
+from src.core.models import ModelConfig, ModelRegistry
+from src.core.reference import GainReference
+from src.core.scoring import ScoringParams
+from src.core.synergy import build_prior
+from src.utils.synthetic import LobbyGenerator
+
+GROUPED = {
+    "team": [136, 64, 54, 875, 498],
+    "bench": [203, 517, 86, 245, 141, 893],
+    "player": [498],
+}
+BLEND = {"gain_weight": 0.5, "wr_weight": 0.5}
+
+
+@pytest.fixture(scope="module")
+def prior():
+    """Build the synergy prior over the real champion data."""
+    return build_prior(state.meta for state in load_champions().values())
+
+
+@pytest.fixture
+def registry_file(tmp_path, monkeypatch, prior):
+    """Write a registry with several shadows of the production model."""
+    monkeypatch.setattr(models_module, "load_synergy", lambda: prior)
+    ScoringParams.default().replace({"dr_rate": 2.0}).save(tmp_path / "v0001.json")
+    path = tmp_path / "models.json"
+    path.write_text(
+        json.dumps(
+            {
+                "primary": "production",
+                "models": {
+                    "production": {},
+                    "copy": {},
+                    "tuned": {"params": "v0001.json"},
+                    "blend": {"params": BLEND},
+                    "synergy": {"synergy": True},
+                    "stable": {"params": BLEND, "reference": True},
+                },
+            }
+        )
+    )
+    return path
+
+
+def expected_scores(pool, **kwargs):
+    """Score the primary's snapshot with the cold evaluator, in its order."""
+    grouped = {
+        "team": [c.cid for c in pool.team],
+        "bench": [c.cid for c in pool.bench],
+        "player": [pool.player.cid],
+    }
+    scores = {c.cid: c.score for c in Evaluator(grouped, **kwargs).evaluate().available}
+    return [scores[c.cid] for c in [pool.player] + list(pool.bench)]
+
+
+def test_missing_registry_has_no_shadows(tmp_path):
+    """Test that without a registry file only production runs."""
+    registry = ModelRegistry.load(tmp_path / "models.json")
+    assert registry.primary == "production" and registry.shadows == []
+    pool = registry.evaluate(GROUPED)
+    assert pool_to_dict(pool) == pool_to_dict(Evaluator(GROUPED).evaluate())
+    assert registry.shadow(pool) == {}
+
+
+def test_shadows_match_their_own_evaluator(registry_file, prior):
+    """Test that every shadow scores exactly like a cold evaluator configured alike."""
+    registry = ModelRegistry.load(registry_file)
+    assert registry.shadows == ["copy", "tuned", "blend", "synergy", "stable"]
+    blend = ScoringParams.default().replace(BLEND)
+    reference = GainReference.build(registry.tables, blend)
+    for grouped in LobbyGenerator(seed=4).lobbies(30):
+        pool = registry.evaluate(grouped)
+        shadow = registry.shadow(pool)
+        primary = [c.score for c in [pool.player] + list(pool.bench)]
+        assert shadow["copy"]["score"] == pytest.approx(primary)
+        tuned = ScoringParams.default().replace({"dr_rate": 2.0})
+        assert shadow["tuned"]["score"] == pytest.approx(
+            expected_scores(pool, params=tuned)
+        )
+        assert shadow["blend"]["score"] == pytest.approx(
+            expected_scores(pool, params=blend)
+        )
+        assert shadow["synergy"]["score"] == pytest.approx(
+            expected_scores(pool, synergy=prior)
+        )
+        assert shadow["stable"]["score"] == pytest.approx(
+            expected_scores(pool, params=blend, reference=reference)
+        )
+        for result in shadow.values():
+            best = max(result["score"])
+            cids = [int(c.cid) for c in [pool.player] + list(pool.bench)]
+            assert result["score"][cids.index(result["top"])] == best
+
+
+def test_primary_can_be_a_candidate_model(registry_file):
+    """Test that the displayed model is whichever one is primary."""
+    data = json.loads(registry_file.read_text())
+    data["primary"] = "blend"
+    registry_file.write_text(json.dumps(data))
+    registry = ModelRegistry.load(registry_file)
+    assert "production" in registry.shadows and "blend" not in registry.shadows
+    pool = registry.evaluate(GROUPED)
+    blend = ScoringParams.default().replace(BLEND)
+    assert [c.score for c in pool.available] == expected_scores(pool, params=blend)
+
+
+def test_invalid_registries_rejected():
+    """Test unknown primaries and parameters that break the constraints."""
+    with pytest.raises(ValueError, match="not in the registry"):
+        ModelRegistry([ModelConfig("production")], primary="missing")
+    with pytest.raises(ValueError):
+        ModelConfig.from_dict("bad", {"params": {"role_weights.Catcher.Control": 9}})
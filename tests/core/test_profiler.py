@@ -0,0 +1,168 @@
+"""Unit tests for the core > watcher > profiler."""
+
+import pstats
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from src.api.client.status import Status
+from src.core.watcher import watcher
+from src.core.watcher.profiler import (
+    NULL_PROFILER,
+    CycleProfiler,
+    create_profiler,
+    profiling_requested,
+)
+from src.core.watcher.tracing import Tracer
+
+
+def busy(seconds):
+    """Spin for `seconds` so the stack sampler has something to record."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def run_cycles(profiler, cycles, seconds=0.02):
+    """Run profiled cycles with a fetch and an evaluate phase."""
+    for _ in range(cycles):
+        profiler.begin_cycle()
+        with profiler.phase("fetch"):
+            busy(seconds)
+        with profiler.phase("evaluate"):
+            data = [bytearray(1024) for _ in range(64)]
+            busy(seconds)
+            del data
+        profiler.end_cycle()
+
+
+@pytest.mark.parametrize(
+    "flag, env, expected",
+    [
+        (False, None, False),
+        (True, None, True),
+        (False, "1", True),
+        (False, "yes", True),
+        (False, "0", False),
+        (False, "false", False),
+    ],
+)
+def test_profiling_requested(monkeypatch, flag, env, expected):
+    """Test that profiling is enabled by the flag or a truthy NOMAD_PROFILE."""
+    if env is None:
+        monkeypatch.delenv("NOMAD_PROFILE", raising=False)
+    else:
+        monkeypatch.setenv("NOMAD_PROFILE", env)
+    assert profiling_requested(flag) is expected
+
+
+def test_disabled_profiler_is_a_no_op(monkeypatch, tmp_path):
+    """Test that the disabled profiler shares one no-op phase and writes nothing."""
+    monkeypatch.delenv("NOMAD_PROFILE", raising=False)
+    profiler = create_profiler(False, directory=tmp_path)
+    assert profiler is NULL_PROFILER
+    profiler.begin_session("s")
+    profiler.begin_cycle()
+    with profiler.phase("fetch") as phase:
+        assert phase is profiler.phase("evaluate")
+    profiler.end_cycle()
+    assert profiler.end_session() is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_session_reports(tmp_path):
+    """Test that a profiled session writes summary, stats and collapsed stacks."""
+    profiler = CycleProfiler(directory=tmp_path, interval=0.001)
+    profiler.begin_session("session-1")
+    run_cycles(profiler, 3)
+    reports = profiler.end_session()
+    profiler.close()
+
+    assert set(reports) == {"summary", "stats", "collapsed"}
+    assert reports["summary"] == tmp_path / "session-1.txt"
+
+    rows = {row["phase"]: row for row in profiler.summary()}
+    assert list(rows) == ["fetch", "evaluate"]
+    assert rows["fetch"]["count"] == 3
+    assert rows["fetch"]["p50_ms"] >= 15
+    assert rows["evaluate"]["peak_kib"] >= 64
+
+    summary = reports["summary"].read_text(encoding="utf-8")
+    assert "3 cycle(s), 3 sampled" in summary
+    assert "Top functions by cumulative time" in summary
+    assert "busy" in summary
+
+    stats = pstats.Stats(str(reports["stats"]))
+    assert any(func[2] == "busy" for func in stats.stats)
+
+    lines = reports["collapsed"].read_text(encoding="utf-8").splitlines()
+    assert lines
+    roots = set()
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) > 0
+        roots.add(stack.split(";")[0])
+    assert roots <= {"fetch", "evaluate", "other"}
+    assert any(line.startswith("fetch;") and "busy" in line for line in lines)
+
+
+def test_sample_every(tmp_path):
+    """Test that only every n-th cycle is profiled while every cycle is timed."""
+    profiler = CycleProfiler(
+        directory=tmp_path, sample_every=3, interval=0.001, memory=False
+    )
+    profiler.begin_session("s")
+    run_cycles(profiler, 7, seconds=0.001)
+    assert (profiler.cycles, profiler.sampled) == (7, 3)
+    assert len(profiler.timings["fetch"]) == 7
+    assert profiler.peaks == {}
+    profiler.close()
+    assert (tmp_path / "s.txt").exists()
+
+
+def test_sample_every_must_be_positive():
+    """Test that a non-positive sampling rate is rejected."""
+    with pytest.raises(ValueError):
+        CycleProfiler(sample_every=0)
+
+
+def test_monitor_sessions_profiles_each_phase(tmp_path):
+    """Test that the watcher loop reports every phase and ends the session."""
+    statuses = iter([Status.CHAMPSELECT.value] * 3 + [Status.NONE.value])
+
+    def get_status(port, password):
+        try:
+            return next(statuses)
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    profiler = CycleProfiler(directory=tmp_path, memory=False)
+    session_log = MagicMock(session_id="game-1")
+    with patch.object(watcher, "get_status", side_effect=get_status), patch.object(
+        watcher, "fetch_lobby_champions", return_value={"lobby": True}
+    ), patch.object(watcher, "sanitize_champion_data", return_value={}), patch(
+        "src.core.models.ModelRegistry.load", return_value=MagicMock()
+    ), patch.object(
+        watcher, "display_lobby_champions"
+    ), patch.object(
+        watcher, "log_final_champion_select"
+    ), patch.object(
+        watcher.time, "sleep"
+    ), pytest.raises(
+        KeyboardInterrupt
+    ):
+        tracer = Tracer(directory=tmp_path, profiler=profiler)
+        watcher._monitor_sessions("port", "password", "puuid", session_log, tracer)
+    profiler.close()
+
+    counts = {row["phase"]: row["count"] for row in profiler.summary()}
+    assert counts == {
+        "status": 3,
+        "fetch": 2,
+        "sanitize": 2,
+        "evaluate": 2,
+        "display": 2,
+        "shadow": 2,
+        "log": 3,
+    }
+    assert (tmp_path / "game-1.txt").exists()
+    assert (tmp_path / "game-1.collapsed").exists()
@@ -0,0 +1,116 @@
+"""Unit tests for the core > query."""
+
+import pytest
+
+from src.api.client.champion import ChampionMetadata, load_champions
+from src.core.query import ChampionQueryEngine, get_query_engine, load_class_hierarchy
+
+
+def meta(cid, name, primary, secondary="N/A", dtype="Magic", diff=1, style=50):
+    """Build champion metadata with the given attributes."""
+    return ChampionMetadata(
+        cid,
+        {
+            "name": name,
+            "Primary": primary,
+            "Secondary": secondary,
+            "Ratings": {"Damage": diff, "Utility": 3 - diff},
+            "Basic Attacks": "inactive",
+            "Style": style,
+            "Abilities": "active",
+            "Damage Type": dtype,
+            "Difficulty": diff,
+        },
+    )
+
+
+@pytest.fixture
+def engine():
+    """Build an engine over a handful of champions."""
+    champions = [
+        meta("40", "Janna", "Enchanter", diff=2, style=90),
+        meta("412", "Thresh", "Catcher", "Warden", dtype="Physical", diff=3),
+        meta("25", "Morgana", "Catcher", "Burst", diff=1, style=75),
+        meta("1", "Annie", "Burst", diff=1, style=30),
+        meta("86", "Garen", "Juggernaut", dtype="Physical", diff=1, style=10),
+    ]
+    hierarchy = {"Controller": ["Catcher", "Enchanter"], "Mage": ["Burst"]}
+    return ChampionQueryEngine(champions, hierarchy)
+
+
+def test_rows_follow_champion_id(engine):
+    """Test that rows and columns are ordered by numeric champion ID."""
+    assert engine.cids == ["1", "25", "40", "86", "412"]
+    assert engine.columns["name"][engine.rows["40"]] == "Janna"
+    assert engine.columns["utility"] == [2, 2, 1, 2, 0]
+    assert engine.values("diff") == [1, 2, 3]
+    assert engine.values("type") == ["Magic", "Physical"]
+    with pytest.raises(ValueError):
+        engine.values("nope")
+
+
+def test_equality_and_ranges(engine):
+    """Test equality, inclusive ranges and complements."""
+    magic = engine.eq("type", "Magic")
+    assert engine.select(magic) == ["1", "25", "40"]
+    assert engine.select(engine.range("diff", high=2)) == ["1", "25", "40", "86"]
+    assert engine.select(engine.range("style", 30, 75)) == ["1", "25", "412"]
+    assert engine.select(engine.range("style", low=76)) == ["40"]
+    assert engine.eq("diff", 2, 3) == engine.range("diff", low=2)
+    assert engine.select(~magic) == ["86", "412"]
+    assert engine.count(engine.all) == len(engine) == 5
+    with pytest.raises(ValueError):
+        engine.range("type", high=1)
+
+
+def test_class_membership(engine):
+    """Test subclass membership by primary or secondary and class roll-up."""
+    assert engine.select(engine.member("Catcher")) == ["25", "412"]
+    assert engine.select(engine.member("Burst")) == ["1", "25"]
+    assert engine.select(engine.member("Controller")) == ["25", "40", "412"]
+    assert engine.select(engine.member("Mage")) == ["1", "25"]
+    assert "N/A" not in engine.classes
+    with pytest.raises(ValueError):
+        engine.member("Jungler")
+
+
+def test_query_filters_and_ranks_bench(engine):
+    """Test a bench query with attribute, class and ranking conditions."""
+    bench = ["25", 40, "412", "86", "999"]
+    scores = {"25": 1.5, "40": 2.5, "412": 9.0}
+    assert engine.query(
+        within=bench,
+        type="Magic",
+        diff=(None, 2),
+        member=["Catcher", "Enchanter"],
+        scores=scores,
+    ) == [("40", 2.5), ("25", 1.5)]
+    assert engine.query(within=bench, member="Controller", scores=scores, limit=1) == [
+        ("412", 9.0)
+    ]
+    assert engine.query(type=["Physical"], limit=1) == ["86"]
+    assert engine.top(engine.all, "style", 2) == [("40", 90), ("25", 75)]
+
+
+def test_mask_accepts_champion_states(engine):
+    """Test that a bench of ChampionState-like objects can be masked."""
+    states = load_champions()
+    bench = [states["25"], states["40"]]
+    assert engine.select(engine.mask(bench)) == ["25", "40"]
+
+
+def test_real_assets():
+    """Test the shared engine against the real champion data and class tree."""
+    hierarchy = load_class_hierarchy()
+    assert hierarchy["Controller"] == ["Catcher", "Enchanter"]
+    assert hierarchy["Marksman"] == []
+    engine = get_query_engine()
+    assert engine is get_query_engine()
+    assert len(engine) == 170
+    assert set(hierarchy) | {c for sub in hierarchy.values() for c in sub} == set(
+        engine.classes
+    )
+    supports = engine.query(type="Magic", diff=(None, 2), member="Controller")
+    names = {engine.columns["name"][engine.rows[cid]] for cid in supports}
+    assert {"Janna", "Soraka", "Lulu"} <= names
+    assert "Thresh" not in names
@@ -0,0 +1,96 @@
+"""Unit tests for the core > reference module."""
+
+import numpy as np
+import pytest
+
+from src.core import reference as reference_module
+from src.core.daemon.server import WarmEvaluator
+from src.core.evaluator import (
+    Evaluator,
+    compute_raw_composition_gains,
+    convert_grouped_to_champs,
+    team_base,
+)
+from src.core.reference import GainReference, load_reference
+from src.core.scoring import LobbyBatch, ScoringParams, score_batch
+from src.utils.synthetic import LobbyGenerator
+
+TEAM = [136, 64, 54, 875, 498]
+
+
+@pytest.fixture(scope="module")
+def reference(tables):
+    """Build the reference for the default parameters."""
+    return GainReference.build(tables)
+
+
+def test_stats_match_gains_over_every_champion(tables, reference):
+    """Test the closed form against raw gains computed champion by champion."""
+    bench = [int(cid) for cid in tables.cids if int(cid) != TEAM[-1]]
+    pool = convert_grouped_to_champs({"team": TEAM, "bench": bench, "player": [498]})
+    compute_raw_composition_gains(pool)
+    gains = [champ.raw_gain for champ in pool.available]
+    mean, std = reference.stats(team_base(pool))
+    assert mean == pytest.approx(np.mean(gains))
+    assert std == pytest.approx(np.std(gains))
+    assert reference.stats(list(team_base(pool).values())) == (mean, std)
+
+
+def test_evaluator_matches_vectorized_reference_scores(tables, reference):
+    """Test that both implementations of reference normalization agree."""
+    lobbies = list(LobbyGenerator(seed=6).lobbies(100))
+    batch = LobbyBatch.from_grouped(lobbies, tables)
+    scores = score_batch(tables, batch, [ScoringParams.default()], reference=True)[0]
+    for grouped, row, mask in zip(lobbies, scores, batch.mask):
+        pool = Evaluator(grouped, reference=reference).evaluate()
+        expected = {c.cid: c.score for c in pool.available}
+        available = [str(c) for c in grouped["player"] + grouped["bench"]]
+        assert row[mask].tolist() == pytest.approx([expected[c] for c in available])
+
+
+def test_normalized_gain_does_not_depend_on_the_bench(reference):
+    """Test that a champion's reference-normalized gain ignores its benchmates."""
+    benches = [[203], [203, 517], [203, 86, 245, 141, 893, 1, 2, 3, 4, 5]]
+    plain, stable = set(), set()
+    for bench in benches:
+        grouped = {"team": TEAM, "bench": bench, "player": [498]}
+        for champ in Evaluator(grouped).evaluate().bench:
+            if champ.cid == "203":
+                plain.add(champ.norm_gain)
+        for champ in Evaluator(grouped, reference=reference).evaluate().bench:
+            if champ.cid == "203":
+                stable.add(champ.norm_gain)
+    assert len(plain) == len(benches) and len(stable) == 1
+
+
+def test_mixed_normalization_flags_per_parameter_set(tables):
+    """Test that reference flags apply per parameter set."""
+    batch = LobbyBatch.from_grouped(list(LobbyGenerator(seed=2).lobbies(10)), tables)
+    params = [ScoringParams.default()] * 2
+    mixed = score_batch(tables, batch, params, reference=[False, True])
+    assert np.array_equal(mixed[0], score_batch(tables, batch, params[:1])[0])
+    assert np.array_equal(
+        mixed[1], score_batch(tables, batch, params[:1], reference=True)[0]
+    )
+
+
+def test_reference_for_other_params_is_rejected(tables, reference):
+    """Test that a reference only normalizes evaluations with its parameters."""
+    grouped = {"team": TEAM, "bench": [203, 517], "player": [498]}
+    default = ScoringParams.default()
+    Evaluator(grouped, params=default, reference=reference).evaluate()
+    tuned = default.replace({"role_weights.Catcher.Control": 2.0})
+    with pytest.raises(ValueError, match="different scoring parameters"):
+        Evaluator(grouped, params=tuned, reference=reference)
+    with pytest.raises(ValueError, match="different scoring parameters"):
+        Evaluator(grouped, reference=GainReference.build(tables, tuned))
+    warm = WarmEvaluator(params=tuned, reference=reference)
+    assert isinstance(warm.evaluate_batch([grouped])[0], ValueError)
+
+
+def test_default_reference_is_shared(monkeypatch, tables):
+    """Test caching of the default reference and per-parameter references."""
+    monkeypatch.setattr(reference_module, "_shared", None)
+    assert load_reference(tables=tables) is load_reference()
+    tuned = load_reference(ScoringParams.default().replace({"dr_rate": 2.0}), tables)
+    assert tuned.rate == 2.0 and not np.allclose(tuned.mean, load_reference().mean)
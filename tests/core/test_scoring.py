@@ -0,0 +1,108 @@
+"""Unit tests for the core > scoring module."""
+
+import numpy as np
+import pytest
+
+from src.core.evaluator import Evaluator
+from src.core.scoring import (
+    LobbyBatch,
+    ParamArrays,
+    ScoringParams,
+    score_batch,
+)
+from src.utils.synthetic import LobbyGenerator
+
+
+@pytest.fixture(scope="module")
+def lobbies():
+    """Generate a fixed set of synthetic lobbies."""
+    return list(LobbyGenerator(seed=7).lobbies(150))
+
+
+def modified():
+    """Return non-default parameters that still pass `check`."""
+    return ScoringParams.default().replace(
+        {
+            "gain_weight": 0.5,
+            "wr_weight": 0.5,
+            "dr_rate": 2.5,
+            "role_weights.Catcher.Control": 2.0,
+            "role_weights.Catcher.Utility": 0.5,
+        }
+    )
+
+
+@pytest.mark.parametrize("make_params", [ScoringParams.default, modified])
+def test_scores_match_evaluator(tables, lobbies, make_params):
+    """Test that batch scores equal the live evaluator's scores."""
+    params = make_params()
+    batch = LobbyBatch.from_grouped(lobbies, tables)
+    scores = score_batch(tables, batch, [params])[0]
+    for grouped, row, mask in zip(lobbies, scores, batch.mask):
+        pool = Evaluator(grouped, params=params).evaluate()
+        expected = {c.cid: c.score for c in pool.available}
+        available = [str(c) for c in grouped["player"] + grouped["bench"]]
+        assert row[mask].tolist() == pytest.approx([expected[c] for c in available])
+        assert np.isneginf(row[~mask]).all()
+
+
+def test_param_axis_scores_every_set(tables, lobbies):
+    """Test that stacked parameter sets are scored independently."""
+    batch = LobbyBatch.from_grouped(lobbies[:20], tables)
+    sets = [ScoringParams.default(), modified()]
+    stacked = score_batch(tables, batch, ParamArrays.from_params(tables, sets))
+    assert stacked.shape == (2, 20, batch.available.shape[1])
+    for i, params in enumerate(sets):
+        assert np.array_equal(stacked[i], score_batch(tables, batch, [params])[0])
+
+
+def test_unknown_champion_rejected(tables):
+    """Test that unknown champion IDs raise ValueError."""
+    with pytest.raises(ValueError, match="Unknown champion"):
+        LobbyBatch.from_grouped(
+            [{"team": [1, 2, 3, 4, 99999], "bench": [], "player": [1]}], tables
+        )
+
+
+def test_more_than_five_teammates_rejected(tables):
+    """Test that teammates beyond the batch layout raise instead of being dropped."""
+    grouped = {"team": [136, 64, 54, 875, 498, 203], "bench": [517], "player": [893]}
+    with pytest.raises(ValueError, match="more than 5 teammates"):
+        LobbyBatch.from_grouped([grouped], tables)
+
+
+def test_replace_copies_and_get_reads_names():
+    """Test named access and that `replace` leaves the original unchanged."""
+    base = ScoringParams.default()
+    changed = base.replace({"dr_rate": 3, "role_weights.Catcher.Control": 1.7})
+    assert changed.get("dr_rate") == 3.0
+    assert changed.get("role_weights.Catcher.Control") == 1.7
+    assert base.get("role_weights.Catcher.Control") != 1.7
+    assert "role_weights.Catcher.Control" in base.names()
+    with pytest.raises(ValueError, match="Unknown parameter"):
+        base.get("role_weights.Nobody.Damage")
+
+
+def test_check_rejects_invalid_parameters():
+    """Test role sum, curve and blend validation."""
+    base = ScoringParams.default()
+    base.check()
+    for values in (
+        {"role_weights.Catcher.Control": 4.0},
+        {"dr_rate": 0},
+        {"gain_weight": -0.1},
+    ):
+        with pytest.raises(ValueError):
+            base.replace(values).check()
+
+
+def test_round_trip_through_file(tmp_path):
+    """Test saving, loading and reading versioned and plain files."""
+    params = modified()
+    path = tmp_path / "params.json"
+    params.save(path)
+    assert ScoringParams.load(path) == params
+    assert ScoringParams.from_dict({"params": params.to_dict()}) == params
+    plain = ScoringParams.from_dict(params.role_weights)
+    assert plain.role_weights == params.role_weights
+    assert plain.dr_rate == ScoringParams.default().dr_rate
@@ -0,0 +1,61 @@
+"""Unit tests for the core > sensitivity module."""
+
+import numpy as np
+import pytest
+
+from src.core.evaluator import Evaluator
+from src.core.scoring import ScoringParams
+from src.core.sensitivity import (
+    analyze,
+    first_place_probabilities,
+    mean_ranks,
+    perturb,
+)
+
+GROUPED = {
+    "team": [136, 64, 54, 875, 498],
+    "bench": [203, 517, 86, 245, 141, 893],
+    "player": [498],
+}
+
+
+def test_perturbed_weights_keep_role_sums(tables):
+    """Test that every sampled role keeps its sum and the blend its total."""
+    params = ScoringParams.default()
+    arrays = perturb(tables, params, samples=500, seed=1)
+    assert len(arrays) == 500
+    base = tables.role_weight_table(params)
+    assert np.allclose(arrays.weights.sum(axis=2), base.sum(axis=1))
+    assert not np.allclose(arrays.weights, base)
+    blend = arrays.gain_weight + arrays.wr_weight
+    assert np.allclose(blend, params.gain_weight + params.wr_weight)
+    assert (arrays.gain_weight >= 0).all() and (arrays.rate > 0).all()
+
+
+def test_ties_share_first_place():
+    """Test first-place probabilities and mean ranks with ties and padding."""
+    scores = np.array([[2.0, 2.0, 1.0, -np.inf], [3.0, 1.0, 2.0, -np.inf]])
+    assert first_place_probabilities(scores).tolist() == [0.75, 0.25, 0.0, 0.0]
+    assert mean_ranks(scores).tolist() == [1.0, 2.0, 2.5, 4.0]
+
+
+def test_report_follows_unperturbed_ranking(tables):
+    """Test the report order, probabilities and reproducibility."""
+    report = analyze(tables, GROUPED, samples=1000, seed=3)
+    pool = Evaluator(GROUPED).evaluate()
+    expected = sorted(pool.available, key=lambda c: -c.score)
+    assert [c["cid"] for c in report["champions"]] == [int(c.cid) for c in expected]
+    assert [c["score"] for c in report["champions"]] == [c.score for c in expected]
+    assert sum(c["p_first"] for c in report["champions"]) == pytest.approx(1.0)
+    assert report["stability"] == report["champions"][0]["p_first"]
+    assert analyze(tables, GROUPED, samples=1000, seed=3) == report
+
+
+def test_no_noise_means_certain_ranking(tables):
+    """Test that zero noise reproduces the unperturbed ranking every time."""
+    report = analyze(
+        tables, GROUPED, samples=50, weight_noise=0, blend_noise=0, rate_noise=0
+    )
+    assert report["stability"] == 1.0
+    ranks = [c["mean_rank"] for c in report["champions"]]
+    assert ranks == sorted(ranks)
@@ -0,0 +1,121 @@
+"""Unit tests for the core > watcher > session log."""
+
+import time
+import pytest
+from unittest.mock import MagicMock
+from src.core.watcher.session_log import (
+    SCHEMA_VERSION,
+    SessionLogWriter,
+    read_session_records,
+    snapshot_record,
+)
+from src.api.client.champion import ChampionPool
+
+
+def make_champ(cid, score):
+    """Build a mocked evaluated ChampionState."""
+    champ = MagicMock()
+    champ.cid = cid
+    champ.score = score
+    champ.norm_gain = score / 2
+    champ.norm_wr = score / 4
+    champ.raw_wr = 50.0
+    return champ
+
+
+@pytest.fixture
+def mock_pool():
+    """Fixture that returns a mocked evaluated ChampionPool."""
+    player = make_champ("64", 10.0)
+    pool = MagicMock(spec=ChampionPool)
+    pool.team = [player, make_champ("136", 0.0)]
+    pool.bench = [make_champ("875", 20.0), make_champ("203", 5.0)]
+    pool.player = player
+    return pool
+
+
+def test_snapshot_record(mock_pool):
+    """Test that snapshots are converted to schema-versioned records."""
+    record = snapshot_record(mock_pool, "s1", 3, 1.0, final=True)
+    assert record["schema"] == SCHEMA_VERSION
+    assert record["session"] == "s1"
+    assert record["seq"] == 3
+    assert record["final"] is True
+    assert record["player"] == 64
+    assert record["team"] == [64, 136]
+    assert record["bench"] == [875, 203]
+    assert record["score"] == [10.0, 20.0, 5.0]
+
+
+def test_shadow_results_are_logged_with_the_snapshot(tmp_path, mock_pool):
+    """Test that shadow results are written only when given."""
+    assert "shadow" not in snapshot_record(mock_pool, "s1", 0, 1.0)
+    shadow = {"tuned": {"score": [1.0, 3.0, 2.0], "top": 875}}
+    writer = SessionLogWriter(directory=tmp_path, flush_interval=0.01).start()
+    writer.log_snapshot(mock_pool, shadow)
+    writer.log_snapshot(mock_pool)
+    writer.close()
+
+    records = list(read_session_records(writer.active_path))
+    assert records[0]["shadow"] == shadow and "shadow" not in records[1]
+
+
+def test_writer_appends_and_marks_final(tmp_path, mock_pool):
+    """Test that every snapshot is written and the last one is marked final."""
+    writer = SessionLogWriter(directory=tmp_path, flush_interval=0.01).start()
+    session_id = writer.begin_session()
+    for _ in range(3):
+        writer.log_snapshot(mock_pool)
+    writer.end_session()
+    writer.log_snapshot(mock_pool)
+    writer.close()
+
+    records = list(read_session_records(writer.active_path))
+    assert len(records) == 4
+    assert [r["seq"] for r in records[:3]] == [0, 1, 2]
+    assert all(r["session"] == session_id for r in records[:3])
+    assert [r["final"] for r in records] == [False, False, True, True]
+    assert records[3]["session"] != session_id
+
+
+def test_writer_rotates_and_compresses(tmp_path, mock_pool):
+    """Test that the active file is rotated and gzipped once it exceeds max_bytes."""
+    writer = SessionLogWriter(
+        directory=tmp_path, batch_size=1, flush_interval=0.01, max_bytes=1
+    ).start()
+    writer.begin_session()
+    writer.log_snapshot(mock_pool)
+    writer.log_snapshot(mock_pool)
+    writer.close()
+
+    rotated = sorted(tmp_path.glob("session_log-*.jsonl.gz"))
+    assert len(rotated) == 2
+    assert not list(tmp_path.glob("session_log-*.jsonl"))
+    records = [r for path in rotated for r in read_session_records(path)]
+    assert [r["seq"] for r in records] == [0, 1]
+
+
+def test_writer_survives_write_errors(tmp_path, mock_pool):
+    """Test that failed writes are dropped, counted and reported by close()."""
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    writer = SessionLogWriter(
+        directory=blocker / "sessions", batch_size=1, flush_interval=0.01
+    ).start()
+    for _ in range(5):
+        writer.log_snapshot(mock_pool)
+    writer.log_snapshot("not a pool")
+    writer.end_session()
+    deadline = time.monotonic() + 5
+    while writer.dropped < 6 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert writer._thread.is_alive()
+
+    writer.directory = tmp_path / "sessions"
+    writer.log_snapshot(mock_pool)
+    message = writer.close()
+    assert writer.dropped == 6
+    assert message.startswith("Session log: 6 record(s) could not be written")
+    records = list(read_session_records(writer.active_path))
+    assert [r["seq"] for r in records] == [0]
+    assert SessionLogWriter(directory=tmp_path).start().close() is None
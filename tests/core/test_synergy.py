@@ -0,0 +1,120 @@
+"""Unit tests for the core > synergy."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.api.client.champion import load_champions
+from src.core import synergy as synergy_module
+from src.core.evaluator import Evaluator
+from src.core.synergy import (
+    SynergyMatrix,
+    apply_outcomes,
+    build_prior,
+    load_synergy,
+    read_outcomes,
+)
+
+THRESH, JINX, LEONA, ORNN, JANNA, LUX = "412", "222", "89", "516", "40", "99"
+GROUPED = {
+    "team": [412, 89, 222, 516, 99],
+    "bench": [40, 86, 1],
+    "player": [222],
+}
+
+
+@pytest.fixture(scope="module")
+def prior():
+    """Build the prior over the real champion data."""
+    return build_prior(state.meta for state in load_champions().values())
+
+
+def test_prior_is_symmetric_with_zero_diagonal(prior):
+    """Test the matrix shape and symmetry."""
+    matrix = np.asarray(prior.matrix)
+    assert matrix.shape == (170, 170) and matrix.dtype == np.float32
+    assert np.array_equal(matrix, matrix.T)
+    assert not np.diagonal(matrix).any()
+    assert prior.cids == sorted(prior.cids, key=int)
+
+
+def test_prior_expresses_pair_effects(prior):
+    """Test engage plus follow-up, peel and redundancy."""
+    assert prior.pair(THRESH, LUX) > 0
+    assert prior.pair(JANNA, JINX) > 0
+    assert prior.pair(LEONA, ORNN) < 0
+    assert prior.pair(LEONA, ORNN) < prior.pair(LEONA, JINX)
+    assert prior.pair(THRESH, "99999") == 0.0
+
+
+def test_gains_sum_rows_over_teammates(prior):
+    """Test that gains are the row sums over known teammates."""
+    gains = prior.gains([JANNA, "99999", LEONA], [THRESH, JINX, "99999"])
+    expected = [
+        prior.pair(JANNA, THRESH) + prior.pair(JANNA, JINX),
+        0.0,
+        prior.pair(LEONA, THRESH) + prior.pair(LEONA, JINX),
+    ]
+    assert gains == pytest.approx(expected)
+    assert prior.gains([JANNA], []).tolist() == [0.0]
+
+
+def test_matrix_shape_is_checked():
+    """Test that a matrix that does not match the IDs is rejected."""
+    with pytest.raises(ValueError):
+        SynergyMatrix(["1", "2"], np.zeros((3, 3)))
+
+
+def test_save_and_memory_map(prior, tmp_path):
+    """Test the stored matrix round trip and building on first load."""
+    loaded = load_synergy(prior.save(tmp_path / "saved"))
+    assert isinstance(loaded.matrix, np.memmap)
+    assert loaded.cids == prior.cids
+    assert np.array_equal(loaded.matrix, prior.matrix)
+
+    built = load_synergy(tmp_path / "missing")
+    assert (tmp_path / "missing" / "matrix.npy").exists()
+    assert len(built) == 170
+
+
+def test_outcomes_are_shrunk_into_prior(prior, tmp_path):
+    """Test that observed pair lift moves the prior by the evidence weight."""
+    path = tmp_path / "outcomes.jsonl"
+    lines = [json.dumps({"team": [412, 516], "win": True})] * 30
+    lines += [json.dumps({"team": [1, 86], "win": False})] * 30
+    lines += ["not json", json.dumps({"team": [1]})]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    games = read_outcomes(path)
+    assert len(games) == 60
+    assert read_outcomes(tmp_path / "none.jsonl") == []
+
+    refined = apply_outcomes(prior, games, scale=10.0, strength=30)
+    observed = (1.0 - 0.5) * 10.0
+    assert refined.pair(THRESH, ORNN) == pytest.approx(
+        (30 * observed + 30 * prior.pair(THRESH, ORNN)) / 60, rel=1e-5
+    )
+    assert refined.pair(JANNA, JINX) == pytest.approx(prior.pair(JANNA, JINX))
+    assert apply_outcomes(prior, []) is prior
+
+
+def test_evaluator_stage_adds_synergy(prior):
+    """Test that the stage adds summed teammate synergy to raw gains."""
+    plain = Evaluator(GROUPED).evaluate()
+    with_synergy = Evaluator(GROUPED, synergy=prior).evaluate()
+    mates = [c.cid for c in with_synergy.unavailable]
+    raw = {c.cid: c.raw_gain for c in plain.available}
+    for champ in with_synergy.available:
+        expected = sum(prior.pair(champ.cid, mate) for mate in mates)
+        assert champ.synergy == pytest.approx(expected)
+        assert champ.raw_gain == pytest.approx(raw[champ.cid] + expected)
+    assert all(c.synergy == 0.0 for c in plain.available)
+
+
+def test_shared_matrix_is_loaded_once(monkeypatch, tmp_path, prior):
+    """Test that the default matrix is memory-mapped once and shared."""
+    prior.save(tmp_path)
+    monkeypatch.setattr(synergy_module, "SYNERGY_DIR", tmp_path)
+    monkeypatch.setattr(synergy_module, "_shared", None)
+    assert load_synergy() is load_synergy()
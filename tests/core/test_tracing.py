@@ -0,0 +1,141 @@
+"""Unit tests for the core > watcher > tracing."""
+
+import json
+import numpy as np
+import pytest
+from src.core.watcher import tracing
+from src.core.watcher.profiler import CycleProfiler
+from src.core.watcher.tracing import (
+    END_TO_END,
+    LatencyHistogram,
+    Tracer,
+    bucket_bounds,
+    bucket_index,
+    load_summaries,
+)
+
+
+def test_bucket_bounds_contain_value():
+    """Test that every duration falls inside its bucket and buckets are ordered."""
+    values = list(range(0, 4096)) + [
+        10**k + d for k in range(4, 12) for d in (-1, 0, 1)
+    ]
+    previous = -1
+    for ns in values:
+        index = bucket_index(ns)
+        low, high = bucket_bounds(index)
+        assert low <= ns < high
+        assert (high - low) <= max(1, low / tracing.SUB_BUCKETS)
+        assert index >= previous
+        previous = index
+
+
+def test_percentiles_match_exact_within_bucket_error():
+    """Test that histogram percentiles stay within the bucket's relative error."""
+    rng = np.random.default_rng(0)
+    samples = rng.lognormal(mean=15, sigma=1.0, size=20_000).astype(int)
+    histogram = LatencyHistogram()
+    for ns in samples:
+        histogram.record(int(ns))
+    for q in (50, 90, 99):
+        exact = np.percentile(samples, q, method="inverted_cdf")
+        assert histogram.percentile(q) == pytest.approx(exact, rel=1 / 16)
+    assert histogram.percentile(100) == samples.max()
+    assert histogram.percentile(0) >= samples.min()
+
+
+def test_empty_histogram_summary():
+    """Test that an empty histogram reports no percentiles."""
+    summary = LatencyHistogram().summary()
+    assert summary["count"] == 0
+    assert summary["p99_ms"] is None
+
+
+def test_merge_and_round_trip():
+    """Test that merging and JSON round trips preserve the histogram."""
+    a, b, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+    for ns in (1_000, 2_000_000, 3_500_000):
+        a.record(ns)
+        both.record(ns)
+    for ns in (40, 9_000_000):
+        b.record(ns)
+        both.record(ns)
+    a.merge(b)
+    assert a.to_dict() == both.to_dict()
+    restored = LatencyHistogram.from_dict(json.loads(json.dumps(a.to_dict())))
+    assert restored.summary() == both.summary()
+
+
+def test_tracer_session_summary(tmp_path):
+    """Test that spans and detection-to-display latency are exported per session."""
+    tracer = Tracer(directory=tmp_path)
+    tracer.begin_session("game-1")
+    for redrawn in (True, False, True):
+        tracer.begin_cycle()
+        for stage in ("status", "fetch", "evaluate", "display"):
+            with tracer.span(stage):
+                pass
+        if redrawn:
+            tracer.mark_displayed()
+    path = tracer.end_session()
+
+    assert path == tmp_path / "game-1.json"
+    summary = json.loads(path.read_text(encoding="utf-8"))
+    assert summary["cycles"] == 3
+    assert list(summary["stages"]) == [
+        "status",
+        "fetch",
+        "evaluate",
+        "display",
+        END_TO_END,
+    ]
+    assert summary["stages"]["fetch"]["count"] == 3
+    assert summary["stages"][END_TO_END]["count"] == 2
+    assert len(tracer.spans) == 3 * 4 + 2
+    cycle, name, start, end = tracer.spans[-1]
+    assert (cycle, name) == (3, END_TO_END) and end >= start
+    assert tracer.end_session() is None
+
+
+def test_tracer_drives_profiler_phases(tmp_path):
+    """Test that spans also time the matching profiler phases."""
+    profiler = CycleProfiler(directory=tmp_path, memory=False)
+    profiler.begin_session("s")
+    tracer = Tracer(directory=tmp_path, profiler=profiler)
+    tracer.begin_session("s")
+    profiler.begin_cycle()
+    tracer.begin_cycle()
+    with tracer.span("fetch"):
+        pass
+    profiler.end_cycle()
+    profiler.close()
+    assert len(profiler.timings["fetch"]) == 1
+
+
+def test_load_summaries_groups_by_version(tmp_path, capsys, monkeypatch):
+    """Test that summaries are merged per app version and printed."""
+    files = []
+    for session, app_version in (("a", "0.1.0"), ("b", "0.1.0"), ("c", "0.2.0")):
+        monkeypatch.setattr(tracing, "version", app_version)
+        tracer = Tracer(directory=tmp_path)
+        tracer.begin_session(session)
+        tracer.begin_cycle()
+        tracer.record("fetch", 0, 2_000_000)
+        files.append(tracer.end_session())
+
+    merged = load_summaries(files)
+    assert sorted(merged) == ["0.1.0", "0.2.0"]
+    assert merged["0.1.0"]["fetch"].count == 2
+    assert merged["0.2.0"]["fetch"].count == 1
+
+    assert tracing.main([str(f) for f in files]) == 0
+    out = capsys.readouterr().out
+    assert "0.2.0" in out and "fetch" in out
+
+
+def test_load_summaries_rejects_unknown_schema(tmp_path):
+    """Test that summaries with another schema version are rejected."""
+    path = tmp_path / "bad.json"
+    path.write_text(json.dumps({"schema": 99}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_summaries([path])
@@ -0,0 +1,146 @@
+"""Unit tests for the core > tuning module."""
+
+import json
+
+import numpy as np
+import pytest
+
+from src.core.scoring import LobbyBatch, ScoringParams, score_batch
+from src.core.tuning import (
+    PickDataset,
+    Tuner,
+    constrain,
+    grid_candidates,
+    main,
+    pick_metrics,
+    write_weights,
+)
+from src.utils.synthetic import LobbyGenerator
+
+TRUTH = {"gain_weight": 0.2, "dr_rate": 2.0}
+
+
+@pytest.fixture(scope="module")
+def examples(tables):
+    """Lobbies whose picks are the top choice under `TRUTH` parameters."""
+    lobbies = [g for g in LobbyGenerator(seed=3).lobbies(400) if len(g["bench"]) >= 2]
+    batch = LobbyBatch.from_grouped(lobbies, tables)
+    truth = ScoringParams.default().replace(TRUTH)
+    best = score_batch(tables, batch, [truth])[0].argmax(axis=1)
+    return [{**g, "pick": (g["player"] + g["bench"])[i]} for g, i in zip(lobbies, best)]
+
+
+@pytest.fixture(scope="module")
+def dataset(examples):
+    """Dataset built from the synthetic examples."""
+    return PickDataset.from_examples(examples)
+
+
+def test_pick_metrics_ranks_ties_against_the_pick():
+    """Test reciprocal ranks and top-1 counts."""
+    scores = np.array([[[3.0, 1.0, 2.0], [1.0, 1.0, -np.inf]]])
+    reciprocal, top1 = pick_metrics(scores, np.array([2, 0]))
+    assert reciprocal.tolist() == [1 / 2 + 1 / 2]
+    assert top1.tolist() == [0]
+
+
+def test_examples_without_available_pick_are_skipped():
+    """Test dataset filtering."""
+    dataset = PickDataset.from_examples(
+        [
+            {"team": [1, 2, 3, 4, 5], "bench": [6], "player": [1], "pick": 6},
+            {"team": [1, 2, 3, 4, 5], "bench": [6], "player": [1], "pick": 7},
+            {"team": [1, 2, 3, 4, 5], "bench": [], "player": [1], "pick": 1},
+        ]
+    )
+    assert len(dataset) == 1 and dataset.picks == ["6"]
+
+
+def test_session_logs_use_the_lobby_the_pick_was_made_from(tmp_path):
+    """Test that examples come from the snapshot before the final change."""
+    snapshots = [
+        {"team": [1, 2, 3, 4, 5], "bench": [], "player": 1},
+        {"team": [1, 2, 3, 4, 5], "bench": [6, 7], "player": 1},
+        {"team": [7, 2, 3, 4, 5], "bench": [6, 1], "player": 7},
+        {"team": [7, 2, 3, 4, 5], "bench": [6, 1, 8], "player": 7},
+    ]
+    with open(tmp_path / "session_log.jsonl", "w") as f:
+        for seq, snapshot in enumerate(snapshots):
+            record = {"session": "a", "seq": seq, "final": seq == 3, **snapshot}
+            f.write(json.dumps(record) + "\n")
+            kept = {**record, "session": "b", "team": [1, 2, 3, 4, 5], "player": 1}
+            f.write(json.dumps({**kept, "bench": [9, 10][:seq]}) + "\n")
+
+    dataset = PickDataset.from_session_logs(tmp_path)
+    assert dataset.lobbies == [
+        {"team": [1, 2, 3, 4, 5], "bench": [6, 7], "player": [1]},
+        {"team": [1, 2, 3, 4, 5], "bench": [9, 10], "player": [1]},
+    ]
+    assert dataset.picks == ["7", "1"]
+
+
+def test_constrain_keeps_role_sums():
+    """Test that changed roles are rebalanced or rejected."""
+    base = ScoringParams.default()
+    name = "role_weights.Catcher.Control"
+    params = constrain(base.replace({name: 2.5}), [name])
+    assert sum(params.role_weights["Catcher"].values()) == pytest.approx(5.0)
+    assert params.get(name) == 2.5
+    assert constrain(base.replace({name: 5.0}), [name]) is None
+    assert constrain(base.replace({"dr_rate": -1.0}), ["dr_rate"]) is None
+
+
+def test_grid_search_recovers_generating_blend(tables, dataset):
+    """Test that the grid search finds the parameters that made the picks."""
+    grid = {"gain_weight": [0.2, 0.7], "dr_rate": [2.0, 4.0]}
+    assert len(grid_candidates(ScoringParams.default(), grid)) == 4
+    with Tuner(dataset, tables=tables, workers=1) as tuner:
+        metrics, best = tuner.grid(grid)
+    assert best.gain_weight == 0.2 and best.dr_rate == 2.0
+    assert metrics["top1"] == 1.0 and metrics["mrr"] == 1.0
+
+
+def test_parallel_random_search_matches_in_process(tables, dataset):
+    """Test that worker processes score exactly like the in-process path."""
+    ranges = {"gain_weight": (0.0, 1.0)}
+    with Tuner(dataset, tables=tables, workers=1) as tuner:
+        serial = tuner.random(ranges, trials=6, seed=1)
+    with Tuner(dataset, tables=tables, workers=2) as tuner:
+        parallel = tuner.random(ranges, trials=6, seed=1)
+        assert tuner.evaluated == 6
+    assert serial[0] == parallel[0] and serial[1] == parallel[1]
+
+
+def test_coordinate_descent_improves_objective(tables, dataset):
+    """Test that coordinate descent beats the starting parameters."""
+    with Tuner(dataset, tables=tables, workers=1) as tuner:
+        (baseline,) = tuner.score([tuner.base])
+        metrics, best = tuner.coordinate_descent(["gain_weight", "dr_rate"], rounds=6)
+        report = tuner.report("coordinate", baseline, 0.0)
+    assert metrics["mrr"] > baseline["mrr"]
+    assert best.gain_weight < ScoringParams.default().gain_weight
+    assert report["best"] == metrics and "gain_weight" in report["changed"]
+
+
+def test_write_weights_numbers_versions(tmp_path):
+    """Test versioned weights files."""
+    params = ScoringParams.default().replace({"dr_rate": 3.0})
+    first = write_weights(params, {"strategy": "grid"}, tmp_path)
+    second = write_weights(params, {"strategy": "grid"}, tmp_path)
+    assert (first.name, second.name) == ("v0001.json", "v0002.json")
+    document = json.loads(second.read_text())
+    assert document["version"] == 2 and document["report"] == {"strategy": "grid"}
+    assert ScoringParams.load(second) == params
+
+
+def test_cli_writes_best_parameters(tmp_path, examples, capsys):
+    """Test the command line from a JSONL dataset to a weights file."""
+    data = tmp_path / "picks.jsonl"
+    data.write_text("".join(json.dumps(e) + "\n" for e in examples[:80]))
+    out = tmp_path / "weights"
+    argv = ["--dataset", str(data), "--strategy", "grid", "--workers", "1"]
+    argv += ["--param", "gain_weight=0.2,0.7", "-o", str(out)]
+    assert main(argv) == 0
+    printed = capsys.readouterr().out
+    assert "best" in printed and "gain_weight" in printed
+    assert ScoringParams.load(out / "v0001.json").gain_weight == 0.2
@@ -0,0 +1,60 @@
+"""Unit tests for the history > codec module."""
+
+import io
+import pytest
+from src.history.codec import (
+    SnapshotDecoder,
+    SnapshotEncoder,
+    decode_snapshots,
+    encode_snapshots,
+    frame_from_record,
+    pack_frame,
+)
+
+TEAM = [136, 64, 54, 875, 498]
+BENCH = [203, 517, 86, 245, 141, 893]
+
+
+def test_round_trip_with_keyframes_and_deltas():
+    """Test that snapshots survive encoding across keyframe boundaries."""
+    snapshots = [
+        (TEAM, BENCH, 136, 1000),
+        (TEAM, BENCH, 136, 2000),
+        (TEAM[:4] + [893], BENCH[:5] + [498], 136, 3000),
+        (TEAM[:4] + [893], [], 893, 3500),
+        ([], [], 0, 4000),
+    ]
+    decoded = decode_snapshots(encode_snapshots(snapshots, keyframe_interval=3))
+    assert [tuple(d[:3]) for d in decoded] == [tuple(s[:3]) for s in snapshots]
+    assert [d[3] for d in decoded] == [1000, 2000, 3000, 3500, 4000]
+
+
+def test_absolute_time_and_version_1_streams():
+    """Test that the start time is absolute and version 1 streams still decode."""
+    record = {"team": TEAM, "bench": BENCH, "player": 136, "ts": 1742667302.25}
+    data = encode_snapshots([frame_from_record(record)])
+    assert decode_snapshots(data)[0][3] == 1742667302250
+
+    legacy = encode_snapshots([(TEAM, BENCH, 136, 0), (TEAM, BENCH, 136, 500)])
+    legacy = legacy[:4] + bytes([1]) + legacy[5:]
+    assert [d[3] for d in decode_snapshots(legacy)] == [0, 500]
+
+
+def test_delta_frames_are_compact():
+    """Test that an unchanged snapshot costs a few bytes and a keyframe 34."""
+    encoder = SnapshotEncoder(io.BytesIO(), keyframe_interval=32)
+    assert encoder.write(TEAM, BENCH, 136) == 34
+    assert encoder.write(TEAM, BENCH, 136) == 4
+    swapped = BENCH[1:2] + BENCH[:1] + BENCH[2:]
+    assert encoder.write(TEAM, swapped, 136) == 8
+
+
+def test_invalid_streams():
+    """Test that bad headers, truncation and oversized snapshots are rejected."""
+    with pytest.raises(ValueError):
+        SnapshotDecoder(io.BytesIO(b"XXXX\x01\x20\x00"))
+    data = encode_snapshots([(TEAM, BENCH, 136)])
+    with pytest.raises(ValueError):
+        decode_snapshots(data[:-1])
+    with pytest.raises(ValueError):
+        pack_frame(TEAM + [1], BENCH, 136)
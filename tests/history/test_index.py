@@ -0,0 +1,121 @@
+"""Unit tests for the history > index module."""
+
+import json
+import src.history.index as index_module
+from src.history.index import SnapshotIndex, record_terms
+
+
+def make_record(session, seq, player, bench, score, final=True):
+    """Build a structured session log record."""
+    return {
+        "schema": 1,
+        "app_version": "0.1.0",
+        "session": session,
+        "seq": seq,
+        "ts": 1742667302.0 + seq,
+        "final": final,
+        "player": player,
+        "team": [player, 64],
+        "bench": bench,
+        "score": score,
+    }
+
+
+def test_record_terms():
+    """Test that champions scoring above the pick are indexed as outscored."""
+    terms = record_terms(make_record("a", 0, 1, [203, 86], [5.0, 9.0, 2.0]))
+    assert terms["player"] == [1]
+    assert terms["team"] == [1, 64]
+    assert terms["outscored"] == [203]
+
+
+def test_add_and_query(tmp_path):
+    """Test posting lists, intersections and resolution across segments."""
+    index = SnapshotIndex(tmp_path)
+    index.add_records([make_record("a", 0, 1, [203, 86], [5.0, 9.0, 2.0])])
+    index.add_records(
+        [
+            make_record("b", 0, 1, [203], [1.0, 0.0]),
+            make_record("b", 1, 86, [203], [1.0, 3.0]),
+        ]
+    )
+    assert index.add_records([make_record("a", 0, 1, [203], [1.0, 0.0])]) == 0
+
+    assert index.postings("bench", 203).tolist() == [0, 1, 2]
+    assert index.postings("player", 999).tolist() == []
+    assert index.intersect(("player", 1), ("outscored", 203)).tolist() == [0]
+    assert index.intersect(("bench", 203), ("team", 86)).tolist() == [2]
+    assert index.resolve([0, 2]) == [("a", 0), ("b", 1)]
+
+
+def test_persistence_and_compaction(tmp_path):
+    """Test that the index reloads from disk and compaction preserves postings."""
+    index = SnapshotIndex(tmp_path)
+    for i in range(5):
+        index.add_records([make_record(f"s{i}", 0, 1 + i % 2, [203], [0.0, 1.0])])
+    before = index.postings("player", 1).tolist()
+    index.compact()
+
+    reopened = SnapshotIndex(tmp_path)
+    assert len(reopened) == 5
+    assert reopened.postings("player", 1).tolist() == before == [0, 2, 4]
+    assert len(list(tmp_path.glob("segment-*"))) == 1
+
+
+def test_update_from_logs_skips_open_sessions(tmp_path):
+    """Test that only sessions with a final record are indexed from logs."""
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    with open(logs / "session_log.jsonl", "w") as f:
+        f.write(json.dumps(make_record("done", 0, 1, [], [0.0])) + "\n")
+        f.write(json.dumps(make_record("open", 0, 1, [], [0.0], final=False)) + "\n")
+
+    index = SnapshotIndex(tmp_path / "index")
+    assert index.update_from_logs(logs) == 1
+    assert index.update_from_logs(logs) == 0
+    assert index.resolve(index.postings("player", 1)) == [("done", 0)]
+
+
+def test_update_from_logs_reads_only_new_data(tmp_path, monkeypatch):
+    """Test that updates resume from the stored offsets and keep open sessions."""
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    log = logs / "session_log.jsonl"
+    with open(log, "w") as f:
+        f.write(json.dumps(make_record("a", 0, 1, [], [0.0])) + "\n")
+        f.write(json.dumps(make_record("b", 0, 2, [], [0.0], final=False)) + "\n")
+
+    index = SnapshotIndex(tmp_path / "index")
+    assert index.update_from_logs(logs) == 1
+
+    read = []
+    original = index_module.read_new_records
+    monkeypatch.setattr(
+        index_module,
+        "read_new_records",
+        lambda path, offset=0: read.append(offset) or original(path, offset),
+    )
+    reopened = SnapshotIndex(tmp_path / "index")
+    assert reopened.update_from_logs(logs) == 0
+    assert read == []
+
+    size = log.stat().st_size
+    with open(log, "a") as f:
+        f.write(json.dumps(make_record("b", 1, 2, [], [0.0])) + "\n")
+        f.write('{"session": "c", "seq"')
+    assert reopened.update_from_logs(logs) == 2
+    assert read == [size]
+    assert reopened.resolve(reopened.postings("player", 2)) == [("b", 0), ("b", 1)]
+
+
+def test_tiered_merges(tmp_path):
+    """Test that each segment stays under half the size of the one before it."""
+    index = SnapshotIndex(tmp_path)
+    for i in range(100):
+        index.add_records([make_record(f"s{i}", j, 1, [203], [0.0]) for j in range(3)])
+
+    sizes = [seg["end"] - seg["start"] for seg in index._segments]
+    assert sum(sizes) == 300
+    assert all(newer * 2 <= older for older, newer in zip(sizes, sizes[1:]))
+    assert len(list(tmp_path.glob("segment-*"))) == len(sizes)
+    assert index.postings("player", 1).tolist() == list(range(300))
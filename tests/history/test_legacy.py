@@ -0,0 +1,69 @@
+"""Unit tests for the history > legacy module."""
+
+from datetime import datetime
+from unittest.mock import MagicMock
+from src.core.watcher.logging import format_champion_select
+from src.history.legacy import backfill, parse_legacy_file, parse_legacy_lines
+from src.history.store import records_to_columns
+
+
+def make_champ(cid, name, score):
+    """Build a mocked evaluated ChampionState."""
+    champ = MagicMock()
+    champ.cid = cid
+    champ.meta.name = name
+    champ.score = score
+    champ.norm_gain = score / 2
+    champ.norm_wr = score / 4
+    champ.raw_wr = 51.5
+    return champ
+
+
+def make_log():
+    """Render a legacy log for a small pool."""
+    player = make_champ("136", "Aurelion Sol", 12.0)
+    pool = MagicMock()
+    pool.player = player
+    pool.team = [make_champ("64", "Lee Sin", 0.0), player]
+    pool.bench = [make_champ("203", "Kindred", 40.0), make_champ("86", "Garen", -8.0)]
+    return format_champion_select(pool, datetime(2025, 3, 22, 18, 15, 2))
+
+
+def test_parse_legacy_lines_round_trip():
+    """Test that a rendered legacy log parses back into a structured record."""
+    record = parse_legacy_lines(make_log().splitlines(), "s", "0.1.0", 0.0)
+    assert record["player"] == 136
+    assert record["team"] == [64, 136]
+    assert record["bench"] == [203, 86]
+    assert record["score"] == [12.0, 40.0, -8.0]
+    assert record["raw_wr"] == [51.5, 51.5, 51.5]
+    assert record["ts"] == datetime(2025, 3, 22, 18, 15, 2).timestamp()
+    assert records_to_columns([record])["avail_cid"].tolist() == [136, 203, 86]
+
+
+def test_parse_legacy_lines_malformed():
+    """Test that truncated or garbage logs are tolerated."""
+    lines = make_log().splitlines()
+    assert parse_legacy_lines(["garbage", "", "Bench ==="], "s", "v", 0.0) is None
+    truncated = parse_legacy_lines(lines[:7] + ["  203    Kin"], "s", "v", 7.0)
+    assert truncated["bench"] == [203]
+    assert truncated["score"] == [12.0, None]
+
+
+def test_parse_legacy_file_and_backfill(tmp_path):
+    """Test single-file parsing and the process-pool backfill driver."""
+    version_dir = tmp_path / "0.1.0"
+    version_dir.mkdir()
+    for minute in range(3):
+        path = version_dir / f"champion_select_2025-03-22_18-0{minute}.log"
+        path.write_text(make_log(), encoding="utf-8")
+    (version_dir / "champion_select_broken.log").write_text("oops", encoding="utf-8")
+
+    record = parse_legacy_file(version_dir / "champion_select_2025-03-22_18-00.log")
+    assert record["app_version"] == "0.1.0"
+    assert record["session"] == "legacy-champion_select_2025-03-22_18-00"
+
+    output = tmp_path / "out.jsonl"
+    stats = backfill(tmp_path, output, workers=2, chunksize=1)
+    assert stats == {"files": 4, "records": 3, "skipped": 1}
+    assert len(output.read_text().splitlines()) == 3
@@ -0,0 +1,78 @@
+"""Unit tests for the history > store and query modules."""
+
+import json
+import pytest
+from src.history.store import compact, records_to_columns
+from src.history.query import bench_frequency, list_partitions, picked_vs_best
+
+TS = 1742667302.0
+
+
+def make_record(session, seq, final, player, bench, score):
+    """Build a structured session log record."""
+    return {
+        "schema": 1,
+        "app_version": "0.1.0",
+        "session": session,
+        "seq": seq,
+        "ts": TS + seq,
+        "final": final,
+        "player": player,
+        "team": [player, 64, 54],
+        "bench": bench,
+        "score": score,
+        "norm_gain": score,
+        "norm_wr": score,
+        "raw_wr": [50.0] * len(score),
+    }
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    """Write a small structured session log and return its directory."""
+    records = [
+        make_record("a", 0, False, 136, [203, 517], [1.0, 9.0, 2.0]),
+        make_record("a", 1, True, 136, [203, 517], [5.0, 9.0, 2.0]),
+        make_record("b", 0, True, 875, [203], [8.0, 3.0]),
+    ]
+    source = tmp_path / "logs" / "0.1.0" / "sessions"
+    source.mkdir(parents=True)
+    with open(source / "session_log.jsonl", "w") as f:
+        for record in records + records[:1]:
+            f.write(json.dumps(record) + "\n")
+    return tmp_path / "logs"
+
+
+def test_records_to_columns():
+    """Test that ragged team and available lists are flattened with offsets."""
+    columns = records_to_columns(
+        [make_record("a", 0, True, 136, [203, 517], [1.0, 2.0, 3.0])]
+    )
+    assert columns["team_offsets"].tolist() == [0, 3]
+    assert columns["avail_offsets"].tolist() == [0, 3]
+    assert columns["avail_cid"].tolist() == [136, 203, 517]
+
+
+def test_compact_and_query(tmp_path, log_dir):
+    """Test compaction into partitions and aggregate queries over them."""
+    store = tmp_path / "history"
+    written = compact(log_dir, store)
+    assert sum(written.values()) == 3
+
+    partitions = list_partitions(store, version="0.1.0")
+    assert len(partitions) >= 1
+
+    result = picked_vs_best(partitions)
+    assert result["sessions"] == 2
+    assert result["picked_mean"] == pytest.approx(6.5)
+    assert result["best_mean"] == pytest.approx(8.5)
+    assert result["picked_best_rate"] == pytest.approx(0.5)
+
+    assert bench_frequency(partitions) == {203: 2, 517: 1}
+    assert bench_frequency(partitions, final_only=False) == {203: 3, 517: 2}
+
+
+def test_compact_is_idempotent(tmp_path, log_dir):
+    """Test that re-running compaction produces the same partitions."""
+    store = tmp_path / "history"
+    assert compact(log_dir, store) == compact(log_dir, store)
@@ -0,0 +1,108 @@
+"""Unit tests for the scripts > processing > pipeline module."""
+
+import threading
+from scripts.processing.pipeline import Stage, run_pipeline
+
+
+def make_stage(tmp_path, name, deps=(), runs=None, barrier=None):
+    """Create a stage that concatenates its input and dependency outputs."""
+    source = tmp_path / f"{name}.in"
+    target = tmp_path / f"{name}.out"
+    if not source.exists():
+        source.write_text(name)
+
+    def inputs():
+        return [source] + [tmp_path / f"{dep}.out" for dep in deps]
+
+    def run():
+        if barrier is not None:
+            barrier.wait(timeout=5)
+        if runs is not None:
+            runs.append(name)
+        target.write_text("".join(p.read_text() for p in inputs()))
+
+    return Stage(name, inputs, lambda: [target], run, deps=deps)
+
+
+def make_graph(tmp_path, runs, barrier=None):
+    """Build a graph where a and b are independent and c depends on both."""
+    return [
+        make_stage(tmp_path, "a", runs=runs, barrier=barrier),
+        make_stage(tmp_path, "b", runs=runs, barrier=barrier),
+        make_stage(tmp_path, "c", deps=("a", "b"), runs=runs),
+    ]
+
+
+def statuses(report):
+    """Map stage names to their report status."""
+    return {entry["stage"]: entry["status"] for entry in report}
+
+
+def test_second_run_is_a_no_op(tmp_path):
+    """Test that unchanged inputs and outputs skip every stage."""
+    runs = []
+    state = tmp_path / "state.json"
+    first = run_pipeline(make_graph(tmp_path, runs), state)
+    assert statuses(first) == {"a": "ran", "b": "ran", "c": "ran"}
+    assert (tmp_path / "c.out").read_text() == "cab"
+
+    runs.clear()
+    second = run_pipeline(make_graph(tmp_path, runs), state)
+    assert runs == []
+    assert set(statuses(second).values()) == {"up to date"}
+
+
+def test_changed_input_reruns_stage_and_dependents(tmp_path):
+    """Test that editing one input reruns only that stage and downstream ones."""
+    runs = []
+    state = tmp_path / "state.json"
+    run_pipeline(make_graph(tmp_path, runs), state)
+
+    runs.clear()
+    (tmp_path / "a.in").write_text("A")
+    report = run_pipeline(make_graph(tmp_path, runs), state)
+    assert statuses(report) == {"a": "ran", "b": "up to date", "c": "ran"}
+    assert (tmp_path / "c.out").read_text() == "cAb"
+
+
+def test_missing_or_edited_output_reruns_stage(tmp_path):
+    """Test that a deleted or hand-edited output makes a stage stale."""
+    state = tmp_path / "state.json"
+    run_pipeline(make_graph(tmp_path, []), state)
+
+    (tmp_path / "b.out").unlink()
+    (tmp_path / "c.out").write_text("edited")
+    report = run_pipeline(make_graph(tmp_path, []), state)
+    assert statuses(report) == {"a": "up to date", "b": "ran", "c": "ran"}
+    assert (tmp_path / "c.out").read_text() == "cab"
+
+
+def test_force_runs_up_to_date_stage(tmp_path):
+    """Test that a forced stage runs even when nothing changed."""
+    state = tmp_path / "state.json"
+    run_pipeline(make_graph(tmp_path, []), state)
+    report = run_pipeline(make_graph(tmp_path, []), state, force=["b"])
+    assert statuses(report)["b"] == "ran"
+    assert report[1]["reason"] == "forced"
+
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    """Test that stages without a dependency between them overlap."""
+    barrier = threading.Barrier(2)
+    report = run_pipeline(
+        make_graph(tmp_path, [], barrier), tmp_path / "state.json", jobs=2
+    )
+    assert statuses(report) == {"a": "ran", "b": "ran", "c": "ran"}
+
+
+def test_failure_skips_dependents(tmp_path):
+    """Test that a failing stage skips its dependents and records no state."""
+    stages = make_graph(tmp_path, [])
+
+    def fail():
+        raise RuntimeError("boom")
+
+    stages[0].run = fail
+    report = run_pipeline(stages, tmp_path / "state.json")
+    assert statuses(report) == {"a": "failed", "b": "ran", "c": "skipped"}
+    assert "boom" in report[0]["reason"]
@@ -0,0 +1,117 @@
+"""Unit tests for the scripts > scraping > scraper_dd."""
+
+import functools
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from scripts.scraping import scraper_dd
+from scripts.scraping.scraper_dd import Source, parse_champion_table, write_csv
+from src.utils import paths
+
+FIXTURES = paths.BASE_DIR / "tests" / "fixtures"
+PAGE = FIXTURES / "dd_winrates.html"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler that does not log requests."""
+
+    def log_message(self, format, *args):
+        """Silence request logging."""
+
+
+@pytest.fixture(scope="module")
+def fixture_server():
+    """Serve the fixtures directory over HTTP on a free localhost port."""
+    handler = functools.partial(QuietHandler, directory=str(FIXTURES))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_fixture_reproduces_committed_csv(tmp_path):
+    """Test that parsing the saved page reproduces dd_wr.csv byte for byte."""
+    rows = parse_champion_table(PAGE.read_text(encoding="utf-8"))
+    output = tmp_path / "dd_wr.csv"
+    write_csv(rows, output)
+    assert output.read_bytes() == scraper_dd.OUTPUT_PATH.read_bytes()
+
+
+def test_parse_is_fast():
+    """Test that parsing a full page takes a fraction of a second of CPU."""
+    html = PAGE.read_text(encoding="utf-8")
+    start = time.process_time()
+    parse_champion_table(html)
+    assert time.process_time() - start < 0.25
+
+
+def test_parse_row_layouts():
+    """Test entities, whitespace, missing cells and non-champion rows."""
+    html = """
+    <table>
+      <tr><th>Champion</th><th>WR</th></tr>
+      <tr><td>not a champion</td><td>1%</td></tr>
+      <tr>
+        <td class="x champion-cell">
+          <img src="https://cdn.example/icons/20.png"><img src="other.png">
+          Nunu &amp;
+          Willump
+        </td>
+        <td> 49.9% </td><td>3.8%</td>
+      </tr>
+      <tr><td class="champion-cell"><img src="/i/1.png">Annie<td>58.1%</tr>
+    </table>
+    """
+    assert parse_champion_table(html) == [
+        ("Nunu & Willump", "20", "49.9%", "3.8%"),
+        ("Annie", "1", "58.1%", ""),
+    ]
+
+
+def test_parse_without_rows_raises():
+    """Test that a page without champion cells is rejected."""
+    with pytest.raises(ValueError):
+        parse_champion_table("<html><body><div id='app'></div></body></html>")
+
+
+def test_refresh_from_local_server(fixture_server, tmp_path):
+    """Test that several sources are scraped concurrently and written as CSV."""
+    sources = [
+        Source("a", f"{fixture_server}/dd_winrates.html", tmp_path / "a.csv"),
+        Source("b", f"{fixture_server}/dd_winrates.html", tmp_path / "b" / "b.csv"),
+    ]
+    counts = scraper_dd.refresh(sources)
+    assert counts == {"a": 170, "b": 170}
+    expected = scraper_dd.OUTPUT_PATH.read_bytes()
+    assert (tmp_path / "a.csv").read_bytes() == expected
+    assert (tmp_path / "b" / "b.csv").read_bytes() == expected
+
+
+def test_refresh_writes_nothing_on_failure(fixture_server, tmp_path):
+    """Test that one failing source leaves every output untouched."""
+    sources = [
+        Source("ok", f"{fixture_server}/dd_winrates.html", tmp_path / "ok.csv"),
+        Source("missing", f"{fixture_server}/missing.html", tmp_path / "missing.csv"),
+    ]
+    with pytest.raises(requests.HTTPError):
+        scraper_dd.refresh(sources)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_main_with_url(fixture_server, tmp_path, capsys):
+    """Test the command-line entry point against the local server."""
+    output = tmp_path / "out.csv"
+    assert (
+        scraper_dd.main(
+            ["--url", f"{fixture_server}/dd_winrates.html", "-o", str(output)]
+        )
+        == 0
+    )
+    assert output.read_bytes() == scraper_dd.OUTPUT_PATH.read_bytes()
+    assert "170 champions" in capsys.readouterr().out
@@ -0,0 +1,46 @@
+"""Start-up tests for the main entry point."""
+
+import subprocess
+import sys
+from src.utils import paths
+
+IMPORT_BUDGET_MS = 150
+DEFERRED_MODULES = ["numpy", "requests.sessions", "urllib3.connectionpool"]
+
+
+def run_import(code):
+    """Run `code` in a fresh interpreter with `-X importtime` and return the result."""
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=paths.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def test_entry_point_defers_heavy_modules():
+    """Test that importing the entry point does not load NumPy or requests."""
+    result = run_import(
+        "import sys, src.main; "
+        f"print([m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def cumulative_import_us(stderr, module):
+    """Return a module's cumulative import time in microseconds from `-X importtime` output."""
+    for line in stderr.splitlines():
+        fields = line.partition(":")[2].split("|")
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[1])
+    raise AssertionError(f"{module} not found in import time output")
+
+
+def test_entry_point_import_time_budget():
+    """Test that importing the entry point stays within the start-up budget."""
+    timings = [
+        cumulative_import_us(run_import("import src.main").stderr, "src.main")
+        for _ in range(3)
+    ]
+    assert min(timings) / 1000 < IMPORT_BUDGET_MS
@@ -0,0 +1,99 @@
+"""Unit tests for the utils > test bundle."""
+
+import json
+import os
+import numpy as np
+import pytest
+from unittest.mock import patch
+from src.core import evaluator
+from src.utils import paths
+from src.utils.bundle import (
+    CATEGORIES,
+    build_bundle,
+    ensure_bundle,
+    load_bundle,
+    runtime_bundle,
+    source_files,
+)
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    """Build a bundle from the real assets into a temporary file."""
+    return build_bundle(tmp_path / "assets.bundle")
+
+
+def test_bundle_matches_sources(bundle_path):
+    """Test that bundle sections match the JSON assets they were compiled from."""
+    with open(paths.ASSETS_DIR / "champion_ratings.json", encoding="utf-8") as f:
+        ratings = json.load(f)
+
+    bundle = load_bundle(bundle_path, verify=True)
+    ids = bundle["champion_ids"].tolist()
+    assert ids == sorted(int(cid) for cid in ratings)
+
+    row = ids.index(266)
+    assert bundle.strings("names")[row] == ratings["266"]["name"]
+    assert CATEGORIES == evaluator.CATEGORIES
+    expected = [ratings["266"]["Ratings"][cat] for cat in CATEGORIES]
+    assert bundle["ratings"][row].tolist() == expected
+    role_names = bundle.strings("role_names")
+    assert role_names[bundle["primary"][row]] == ratings["266"]["Primary"]
+    assert not np.isnan(bundle["win_rates"][ids.index(1)])
+    assert not bundle.is_stale()
+    bundle.close()
+
+
+def test_verify_detects_corruption(bundle_path):
+    """Test that a flipped payload byte fails the integrity check."""
+    data = bytearray(bundle_path.read_bytes())
+    data[-40] ^= 0xFF
+    bundle_path.write_bytes(bytes(data))
+    load_bundle(bundle_path).close()
+    with pytest.raises(ValueError):
+        load_bundle(bundle_path, verify=True)
+
+
+def test_ensure_bundle_rebuilds(tmp_path, bundle_path):
+    """Test that invalid or stale bundles are rebuilt."""
+    invalid = tmp_path / "invalid.bundle"
+    invalid.write_bytes(b"not a bundle")
+    ensure_bundle(invalid).close()
+    assert invalid.read_bytes().startswith(b"NMDB")
+
+    extra = source_files() + [paths.ASSETS_DIR / "champions.json"]
+    with patch("src.utils.bundle.source_files", return_value=extra):
+        bundle = load_bundle(bundle_path)
+        assert bundle.is_stale()
+        bundle.close()
+
+
+def test_runtime_views_match_sources(bundle_path):
+    """Test that the runtime loader views rebuild the source assets exactly."""
+    from src.core import evaluator
+
+    with open(paths.ASSETS_DIR / "champion_ratings.json", encoding="utf-8") as f:
+        ratings = json.load(f)
+    with open(evaluator.weights, encoding="utf-8") as f:
+        weights = json.load(f)
+
+    bundle = load_bundle(bundle_path)
+    assert list(bundle.champion_data().items()) == list(ratings.items())
+    assert list(bundle.role_weights().items()) == list(weights.items())
+    with patch("src.utils.bundle.runtime_bundle", return_value=None):
+        expected = evaluator.load_win_rates(evaluator.wr)
+    assert list(bundle.win_rates().items()) == list(expected.items())
+    bundle.close()
+
+
+def test_runtime_bundle_freshness(tmp_path, bundle_path):
+    """Test that a bundle older than its sources or another asset is not used."""
+    source = paths.ASSETS_DIR / "champions.json"
+    with patch("src.utils.bundle._runtime", {}):
+        assert runtime_bundle(source, bundle_path) is not None
+        assert runtime_bundle(tmp_path / "other.json", bundle_path) is None
+        assert runtime_bundle(source, tmp_path / "missing.bundle") is None
+
+    os.utime(bundle_path, ns=(0, 0))
+    with patch("src.utils.bundle._runtime", {}):
+        assert runtime_bundle(source, bundle_path) is None
@@ -0,0 +1,86 @@
+"""Unit tests for the utils > champion index."""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.utils import champion_index, converter
+from src.utils.champion_index import ChampionIndex, load_champion_index, normalize_name
+
+NAMES = {"96": "KogMaw", "62": "MonkeyKing", "20": "Nunu", "222": "Jinx", "24": "Jax"}
+ALIASES = [("Kog'Maw", "96"), ("Wukong", "62"), ("Nunu & Willump", "20"), ("X", "9")]
+
+
+@pytest.fixture
+def index():
+    """Build a small index with display-name aliases."""
+    return ChampionIndex(NAMES, ALIASES)
+
+
+def test_normalize_name():
+    """Test that case, spaces and punctuation are ignored."""
+    assert normalize_name("Kog'Maw") == normalize_name(" KOG MAW ") == "kogmaw"
+    assert normalize_name("Nunu & Willump") == "nunuwillump"
+
+
+def test_bidirectional_lookup(index):
+    """Test ID to name and every known spelling back to the ID."""
+    assert len(index) == 5
+    assert index.name(96) == index.name("96") == "KogMaw"
+    assert index.name(999) is None and index.name("x", "Unknown") == "Unknown"
+    for spelling in ("KogMaw", "kog'maw", "KOG MAW"):
+        assert index.id(spelling) == 96
+    assert index.id("Wukong") == index.id("monkey king") == 62
+    assert index.id("X") is None  # alias of an unknown champion is ignored
+    assert 20 in index and "20" in index and "abc" not in index
+
+
+def test_substitute(index):
+    """Test batch substitution with unknown IDs."""
+    assert index.substitute({"team": [96, "62"], "bench": [1]}) == {
+        "team": ["KogMaw", "MonkeyKing"],
+        "bench": ["Unknown"],
+    }
+
+
+def test_prefix_search(index):
+    """Test alphabetical prefix matches, deduplicated per champion."""
+    assert index.search("j") == [(24, "Jax"), (222, "Jinx")]
+    assert index.search("nunu") == [(20, "Nunu")]
+    assert index.search("wu") == [(62, "MonkeyKing")]
+    assert index.search("j", limit=1) == [(24, "Jax")]
+    assert index.search("q") == []
+
+
+def test_fuzzy_search(index):
+    """Test typo-tolerant matches ordered by distance."""
+    assert index.fuzzy("kogmow") == [(96, "KogMaw")]
+    assert index.fuzzy("jinxx") == [(222, "Jinx")]
+    assert index.fuzzy("jnx") == [(24, "Jax"), (222, "Jinx")]
+    assert index.fuzzy("jnx", max_distance=0) == []
+    assert index.fuzzy("wokong", limit=1) == [(62, "MonkeyKing")]
+
+
+def test_load_champion_index_reads_files_once():
+    """Test that the shared index and mapping are built from the assets once."""
+    champion_index._indexes.clear()
+    converter.clear_champion_mapping_cache()
+    with patch("json.load", wraps=converter.json.load) as json_load:
+        index = load_champion_index()
+        assert load_champion_index() is index
+        assert converter.load_champion_mapping() is converter.load_champion_mapping()
+        for _ in range(100):
+            converter.substitute_champion_ids({"team": [96, 62]})
+    assert json_load.call_count == 1
+    assert len(index) == len(converter.load_champion_mapping())
+    assert index.id("Kog'Maw") == 96
+    assert index.id("Wukong") == 62
+    assert index.id("Nunu & Willump") == 20
+
+
+def test_main_prints_matches(capsys):
+    """Test the command-line lookup."""
+    assert champion_index.main(["kogmow", "zzzz"]) == 0
+    out = capsys.readouterr().out
+    assert "96" in out and "KogMaw" in out
+    assert "zzzz: no match" in out
@@ -0,0 +1,150 @@
+"""Unit tests for the utils > metrics."""
+
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from unittest.mock import MagicMock, patch
+from src.api.client import status
+from src.core.watcher import watcher
+from src.utils import metrics
+from src.utils.metrics import Registry
+
+
+@pytest.fixture
+def registry():
+    """Fixture providing an empty registry."""
+    return Registry()
+
+
+def test_render_exposition_format(registry):
+    """Test that counters, gauges and histograms render in the text format."""
+    requests = registry.counter("app_requests_total", "Requests.", ["code"])
+    requests.labels(code="200").inc(3)
+    requests.labels("500").inc()
+    registry.gauge("app_temperature", "Temp.").set(21.5)
+    latency = registry.histogram("app_latency_seconds", "Latency.", buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP app_requests_total Requests.",
+        "# TYPE app_requests_total counter",
+        'app_requests_total{code="200"} 3',
+        'app_requests_total{code="500"} 1',
+        "# HELP app_temperature Temp.",
+        "# TYPE app_temperature gauge",
+        "app_temperature 21.5",
+        "# HELP app_latency_seconds Latency.",
+        "# TYPE app_latency_seconds histogram",
+        'app_latency_seconds_bucket{le="0.1"} 2',
+        'app_latency_seconds_bucket{le="1"} 3',
+        'app_latency_seconds_bucket{le="+Inf"} 4',
+        "app_latency_seconds_sum 3.65",
+        "app_latency_seconds_count 4",
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    """Test that quotes, backslashes and newlines in label values are escaped."""
+    registry.counter("x_total", "X.", ["path"]).labels('a"b\\c\nd').inc()
+    assert 'x_total{path="a\\"b\\\\c\\nd"} 1' in registry.render()
+
+
+def test_gauge_function_and_updates(registry):
+    """Test gauge inc/dec and values computed on collection."""
+    gauge = registry.gauge("queue_depth", "Depth.")
+    gauge.inc(5)
+    gauge.dec(2)
+    assert gauge.value == 3
+    gauge.set_function(lambda: 42)
+    assert registry.get_sample_value("queue_depth") == 42
+
+
+def test_registry_get_or_create(registry):
+    """Test that re-registering returns the same metric and conflicts raise."""
+    counter = registry.counter("y_total", "Y.")
+    assert registry.counter("y_total", "Y.") is counter
+    with pytest.raises(ValueError):
+        registry.gauge("y_total", "Y.")
+    with pytest.raises(ValueError):
+        registry.counter("y_total", "Y.", ["label"])
+
+
+@pytest.mark.parametrize(
+    "action",
+    [
+        lambda r: r.counter("bad name", "."),
+        lambda r: r.counter("z_total", ".", ["le"]),
+        lambda r: r.counter("z_total", ".").inc(-1),
+        lambda r: r.counter("w_total", ".", ["a"]).inc(),
+        lambda r: r.counter("v_total", ".", ["a"]).labels(b="1"),
+        lambda r: r.histogram("h", ".", buckets=(1, 0.5)),
+    ],
+)
+def test_invalid_usage(registry, action):
+    """Test that invalid names, labels and updates raise ValueError."""
+    with pytest.raises(ValueError):
+        action(registry)
+
+
+def test_concurrent_increments(registry):
+    """Test that increments from several threads are not lost."""
+    counter = registry.counter("c_total", "C.")
+
+    def work():
+        for _ in range(10_000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value == 40_000
+
+
+def test_serve_local_scrape(registry):
+    """Test that the registry can be scraped over HTTP on localhost."""
+    registry.counter("scrapes_total", "Scrapes.").inc(7)
+    server = metrics.serve(0, registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}"
+        with urllib.request.urlopen(f"{url}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+            body = response.read().decode("utf-8")
+        assert "scrapes_total 7" in body
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{url}/other", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_dump_writes_file(registry, tmp_path):
+    """Test that dump writes the rendered registry to a file."""
+    registry.gauge("g", "G.").set(1)
+    path = tmp_path / "out" / "metrics.prom"
+    metrics.dump(path, registry)
+    assert path.read_text(encoding="utf-8") == registry.render()
+
+
+def test_client_and_watcher_update_default_registry():
+    """Test that LCU errors and "Unknown" statuses are counted in REGISTRY."""
+    sample = metrics.REGISTRY.get_sample_value
+    errors = {"endpoint": "gameflow_phase", "outcome": "http_error"}
+    before_errors = sample("nomad_lcu_requests_total", errors) or 0
+    before_unknown = sample("nomad_watcher_polls_total", {"status": "Unknown"}) or 0
+    before_other = sample("nomad_watcher_polls_total", {"status": "other"}) or 0
+
+    with patch.object(status.requests, "get", return_value=MagicMock(status_code=503)):
+        result = status.get_status("port", "password")
+    watcher.count_poll(result)
+    watcher.count_poll("SomethingNew")
+
+    assert sample("nomad_lcu_requests_total", errors) == before_errors + 1
+    assert sample("nomad_watcher_polls_total", {"status": "Unknown"}) == (
+        before_unknown + 1
+    )
+    assert sample("nomad_watcher_polls_total", {"status": "other"}) == before_other + 1
@@ -0,0 +1,77 @@
+"""Unit tests for the utils > synthetic module."""
+
+import json
+import pytest
+from src.api.client.sanitize import sanitize_champion_data
+from src.utils import paths
+from src.utils.synthetic import (
+    MAX_BENCH,
+    PLAYER_PUUID,
+    LobbyGenerator,
+    to_lcu_json,
+    to_lcu_session,
+)
+
+FIXTURE = paths.BASE_DIR / "tests" / "fixtures" / "lobby.json"
+
+
+def check_lobby(grouped):
+    """Assert the structural invariants of a grouped lobby."""
+    ids = grouped["team"] + grouped["bench"]
+    assert len(grouped["team"]) == 5
+    assert 0 <= len(grouped["bench"]) <= MAX_BENCH
+    assert len(set(ids)) == len(ids)
+    assert len(grouped["player"]) == 1 and grouped["player"][0] in grouped["team"]
+
+
+def test_lobbies_are_valid_and_reproducible():
+    """Test that lobbies satisfy the invariants and depend only on the seed."""
+    first = list(LobbyGenerator(seed=11).lobbies(500, batch_size=64))
+    again = list(LobbyGenerator(seed=11).lobbies(500, batch_size=64))
+    other = list(LobbyGenerator(seed=12).lobbies(500, batch_size=64))
+    assert first == again and first != other
+    for grouped in first:
+        check_lobby(grouped)
+    assert {len(g["bench"]) for g in first} == set(range(MAX_BENCH + 1))
+
+
+def test_sessions_churn_like_champion_select():
+    """Test that sessions start with an empty bench and change a little per poll."""
+    sessions = list(LobbyGenerator(seed=5).sessions(200))
+    assert sessions == list(LobbyGenerator(seed=5).sessions(200))
+    assert max(len(s[-1]["bench"]) for _, s in sessions) > 0
+    for game_id, snapshots in sessions:
+        assert len(snapshots[0]["bench"]) <= 1
+        for prev, cur in zip(snapshots, snapshots[1:]):
+            check_lobby(cur)
+            changed = sum(a != b for a, b in zip(prev["team"], cur["team"]))
+            assert changed <= 2
+
+
+def test_lcu_session_matches_fixture_schema():
+    """Test that generated sessions carry the same fields as a real LCU session."""
+    with open(FIXTURE, "r", encoding="utf-8") as f:
+        real = json.load(f)
+    grouped = next(LobbyGenerator(seed=1).lobbies(1))
+    session = to_lcu_session(grouped, game_id=42, counter=3)
+    assert set(session) == set(real)
+    assert set(session["myTeam"][0]) == set(real["myTeam"][0])
+    assert set(session["benchChampions"][0] if grouped["bench"] else {}) <= set(
+        real["benchChampions"][0]
+    )
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_raw_form_sanitizes_back_to_grouped(seed):
+    """Test that both raw serializations round-trip through the sanitizer."""
+    generator = LobbyGenerator(seed)
+    for game_id, grouped in enumerate(generator.lobbies(200), 1):
+        session = to_lcu_session(grouped, game_id)
+        assert json.loads(to_lcu_json(grouped, game_id)) == session
+        assert sanitize_champion_data(session, PLAYER_PUUID) == grouped
+
+
+def test_small_champion_pool_rejected():
+    """Test that a pool too small to fill a lobby raises ValueError."""
+    with pytest.raises(ValueError):
+        LobbyGenerator(champion_ids=range(1, 10))